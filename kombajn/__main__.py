@@ -0,0 +1,11 @@
+"""
+Uruchamianie pakietu: ``python -m kombajn [POLECENIE] ...``.
+
+Bez polecenia generowany jest nowy dziennik (jak ``python -m kombajn.main``).
+"""
+
+from kombajn.main import cli
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,245 @@
+"""
+Pamięć podręczna wygenerowanych dzienników.
+
+``create_workbook()`` jest deterministyczne dla danej wersji pakietu,
+konfiguracji i danych zawodnika, więc gotowy plik można użyć ponownie.
+Klucz to skrót SHA-256 z:
+
+- ``kombajn.__version__``
+- wszystkich stałych ``kombajn.config`` (``DEFAULTS``, ``POWER_DEFAULTS``,
+  ``METABOLIC_DEFAULTS``, ``SHEET_CONFIG``, ``COLORS``, nagłówki, strefy)
+- danych wejściowych zawodnika (ustawienia, plany, baza produktów)
+
+Pliki zapisywane są w trybie powtarzalnym (stałe daty w zip i docProps),
+więc te same dane dają te same bajty. Przy trafieniu plik z pamięci jest
+kopiowany w miejsce wyniku - dziennik pozostaje zapisywalny w Excelu.
+Przy masowym generowaniu (serwer, katalogi profili) wynik może być
+hardlinkiem do wpisu (``link=True``, w CLI ``--cache-link``); wpisy
+pamięci są tylko do odczytu, więc podlinkowany wynik też, co chroni
+pamięć przed nadpisaniem w miejscu.
+
+Użycie:
+    python -m kombajn.main -o dziennik.xlsx --cache .kombajn_cache
+"""
+
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from openpyxl import Workbook
+
+from kombajn import config
+from kombajn.utils import save_workbook_to
+
+
+def canonical(value: Any) -> Any:
+    """
+    Zamienia wartość na strukturę JSON o stałej postaci (do skrótu).
+
+    Obsługuje dataclassy, słowniki, sekwencje, zbiory, daty, ścieżki,
+    tablice numpy i obiekty iterowalne (np. ``ProductStore``).
+
+    Raises:
+        TypeError: Dla typu bez stałej reprezentacji
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__type__": type(value).__name__,
+            **{f.name: canonical(getattr(value, f.name)) for f in dataclasses.fields(value)},
+        }
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(v) for v in value), key=json.dumps)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)) or hasattr(value, "__iter__"):
+        return [canonical(v) for v in value]
+    raise TypeError(f"Brak stałej reprezentacji dla typu {type(value).__name__}")
+
+
+def config_fingerprint() -> Dict[str, Any]:
+    """Zwraca wszystkie stałe modułu ``kombajn.config`` (nazwy WIELKIMI literami)."""
+    return {
+        name: canonical(getattr(config, name))
+        for name in sorted(vars(config))
+        if name.isupper() and not callable(getattr(config, name))
+    }
+
+
+def build_key(inputs: Dict[str, Any]) -> str:
+    """
+    Wyznacza klucz pamięci dla danych wejściowych zawodnika.
+
+    Args:
+        inputs: Dane wpływające na skoroszyt (nazwa -> wartość)
+
+    Returns:
+        Skrót SHA-256 (hex)
+    """
+    # Import w funkcji - kombajn/__init__ importuje main, a main ten moduł
+    import kombajn
+
+    document = {
+        "version": kombajn.__version__,
+        "config": config_fingerprint(),
+        "inputs": canonical(inputs),
+    }
+    payload = json.dumps(document, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BuildCache:
+    """
+    Katalog z plikami xlsx adresowanymi kluczem (``<klucz[:2]>/<klucz>.xlsx``).
+
+    Attributes:
+        directory: Katalog pamięci
+        link: Wynik jako hardlink (tylko do odczytu) zamiast kopii -
+            do masowego generowania, nie dla dziennika wypełnianego w Excelu
+        hits: Liczba trafień
+        misses: Liczba chybień
+    """
+
+    def __init__(self, directory: Path, link: bool = False) -> None:
+        self.directory = Path(directory)
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.xlsx"
+
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """
+        Umieszcza plik z pamięci w miejscu wyniku.
+
+        Args:
+            key: Klucz (``build_key``)
+            output_path: Ścieżka wyniku (zastępowana atomowo)
+
+        Returns:
+            True przy trafieniu
+        """
+        entry = self.path(key)
+        if not entry.is_file():
+            self.misses += 1
+            return False
+        output_path = Path(output_path)
+        if self.link and output_path.exists() and os.path.samefile(entry, output_path):
+            # Wynik już jest hardlinkiem do wpisu (rename nic by nie zmienił)
+            self.hits += 1
+            return True
+        temp_name = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        linked = False
+        if self.link:
+            try:
+                os.link(entry, temp_name)
+                linked = True
+            except OSError:
+                # Inny system plików lub brak obsługi hardlinków
+                pass
+        if not linked:
+            shutil.copyfile(entry, temp_name)
+        try:
+            os.replace(temp_name, output_path)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        self.hits += 1
+        return True
+
+    def store(self, key: str, source: Path) -> Path:
+        """
+        Dodaje plik do pamięci (kopia tylko do odczytu).
+
+        Args:
+            key: Klucz (``build_key``)
+            source: Gotowy plik xlsx
+
+        Returns:
+            Ścieżka wpisu pamięci
+        """
+        entry = self.path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(suffix=".xlsx", dir=entry.parent)
+        os.close(handle)
+        try:
+            shutil.copyfile(source, temp_name)
+            os.chmod(temp_name, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(temp_name, entry)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        return entry
+
+
+def cached_save(
+    build: Callable[[], Workbook],
+    output_path: Path,
+    inputs: Dict[str, Any],
+    cache: Optional[BuildCache] = None,
+    compresslevel: Optional[int] = None
+) -> bool:
+    """
+    Zapisuje skoroszyt, budując go tylko przy braku w pamięci.
+
+    Args:
+        build: Funkcja budująca skoroszyt (wywoływana tylko przy chybieniu)
+        output_path: Ścieżka wyniku
+        inputs: Dane wejściowe zawodnika (część klucza)
+        cache: Pamięć (None = zawsze budowanie, zapis powtarzalny)
+        compresslevel: Poziom kompresji xlsx (część klucza)
+
+    Returns:
+        True, gdy plik pochodzi z pamięci
+    """
+    key = build_key({**inputs, "compresslevel": compresslevel})
+    if cache is not None and cache.fetch(key, output_path):
+        return True
+    # Zapis przez plik tymczasowy - poprzedni wynik może być hardlinkiem do pamięci
+    output_path = Path(output_path)
+    temp_name = _create_temp(output_path)
+    try:
+        save_workbook_to(build(), temp_name, compresslevel, reproducible=True)
+        if cache is not None:
+            cache.store(key, Path(temp_name))
+        os.replace(temp_name, output_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+    return False
+
+
+def _create_temp(path: Path) -> Path:
+    """
+    Tworzy pusty plik tymczasowy obok ``path`` o zwykłych uprawnieniach.
+
+    Tryb 0o666 podany w ``os.open`` - system nakłada umask procesu bez jej
+    odczytu i zmiany (``os.umask`` jest globalne dla wszystkich wątków).
+    """
+    while True:
+        temp_name = path.with_name(f".{path.name}.{secrets.token_hex(6)}.tmp")
+        try:
+            os.close(os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            return temp_name
+        except FileExistsError:
+            continue
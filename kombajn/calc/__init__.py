@@ -0,0 +1,46 @@
+"""
+Ewaluator formuł skoroszytu (bez Excela).
+
+Ten pakiet przelicza formuły generowane przez arkusze projektu:
+- Tokenizer i parser formuł (podzbiór funkcji Excela)
+- Kompilacja formuł do domknięć Pythona
+- Rozwijanie odwołań strukturalnych do tabel (Dziennik[TSS])
+- Graf zależności komórek i przyrostowe przeliczanie brudnych komórek
+- Analiza kosztu przeliczania (funkcje ulotne, całe kolumny)
+"""
+
+from kombajn.calc.tokenizer import FormulaError, Reference, Token, parse_reference, tokenize
+from kombajn.calc.functions import ExcelError, Grid, from_serial, to_serial
+from kombajn.calc.tables import TableInfo, expand_structured, workbook_tables
+from kombajn.calc.compiler import (
+    VOLATILE_FUNCTIONS,
+    CompiledFormula,
+    compile_formula,
+    parse,
+)
+from kombajn.calc.evaluator import Evaluator
+from kombajn.calc.cost import CostReport, FormulaIssue, analyze_formula, analyze_workbook
+
+__all__ = [
+    "FormulaError",
+    "Reference",
+    "Token",
+    "parse_reference",
+    "tokenize",
+    "ExcelError",
+    "Grid",
+    "from_serial",
+    "to_serial",
+    "TableInfo",
+    "expand_structured",
+    "workbook_tables",
+    "VOLATILE_FUNCTIONS",
+    "CompiledFormula",
+    "compile_formula",
+    "parse",
+    "Evaluator",
+    "CostReport",
+    "FormulaIssue",
+    "analyze_formula",
+    "analyze_workbook",
+]
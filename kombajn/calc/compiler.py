@@ -0,0 +1,412 @@
+"""
+Parser i kompilator formuł.
+
+Formuła jest parsowana do drzewa (krotki), a następnie kompilowana
+do domknięć Pythona ``fn(evaluator, key)`` - kolejne przeliczenia nie
+parsują już tekstu. Z drzewa wyznaczane są też statyczne odwołania
+formuły, z których ewaluator buduje graf zależności.
+
+Priorytety operatorów jak w Excelu (od najniższego):
+porównania, &, + -, * /, ^, minus unarny, %.
+"""
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from kombajn.calc.functions import (
+    DIV0,
+    FUNCTIONS,
+    NAME,
+    RANGE_FUNCTIONS,
+    REF,
+    VALUE,
+    ExcelError,
+    Grid,
+    compare,
+    first_error,
+    scalar,
+    to_bool,
+    to_number,
+    to_text,
+)
+from kombajn.calc.tokenizer import (
+    BOOL,
+    ERROR,
+    FUNC,
+    LPAREN,
+    NUMBER,
+    OP,
+    REF as REF_TOKEN,
+    RPAREN,
+    SEP,
+    STRING,
+    FormulaError,
+    Reference,
+    Token,
+    parse_reference,
+    tokenize,
+)
+
+
+# Funkcje obsługiwane bezpośrednio przez kompilator (leniwe / kontekstowe)
+SPECIAL_FUNCTIONS = frozenset({"IF", "IFERROR", "ISBLANK", "ROW", "INDIRECT"})
+
+# Funkcje ulotne - przeliczane niezależnie od zmian odwołań
+VOLATILE_FUNCTIONS = frozenset({"INDIRECT", "OFFSET", "TODAY", "NOW", "RAND", "RANDBETWEEN"})
+
+Node = Tuple[Any, ...]
+Compiled = Callable[[Any, Tuple[str, int, int]], Any]
+
+_COMPARISONS = {
+    "=": lambda c: c == 0, "<>": lambda c: c != 0,
+    "<": lambda c: c < 0, ">": lambda c: c > 0,
+    "<=": lambda c: c <= 0, ">=": lambda c: c >= 0,
+}
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul}
+
+
+class _Parser:
+    """Parser zstępujący formuł (jedna instancja na formułę)."""
+
+    def __init__(self, tokens: List[Token], formula: str) -> None:
+        self.tokens = tokens
+        self.formula = formula
+        self.index = 0
+
+    def peek(self) -> Optional[Token]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def take(self) -> Token:
+        token = self.peek()
+        if token is None:
+            raise FormulaError(f"Niespodziewany koniec formuły: {self.formula}")
+        self.index += 1
+        return token
+
+    def expect(self, kind: str) -> Token:
+        token = self.take()
+        if token.kind != kind:
+            raise FormulaError(
+                f"Oczekiwano {kind}, a jest '{token.text}' (pozycja {token.position}): {self.formula}"
+            )
+        return token
+
+    def _binary(self, operators: Tuple[str, ...], operand: Callable[[], Node]) -> Node:
+        node = operand()
+        while True:
+            token = self.peek()
+            if token is None or token.kind != OP or token.text not in operators:
+                return node
+            self.take()
+            node = ("binary", token.text, node, operand())
+
+    def expression(self) -> Node:
+        return self._binary(tuple(_COMPARISONS), self.concatenation)
+
+    def concatenation(self) -> Node:
+        return self._binary(("&",), self.additive)
+
+    def additive(self) -> Node:
+        return self._binary(("+", "-"), self.term)
+
+    def term(self) -> Node:
+        return self._binary(("*", "/"), self.power)
+
+    def power(self) -> Node:
+        return self._binary(("^",), self.unary)
+
+    def unary(self) -> Node:
+        token = self.peek()
+        if token is not None and token.kind == OP and token.text in "+-":
+            self.take()
+            return ("unary", token.text, self.unary())
+        node = self.primary()
+        while (token := self.peek()) is not None and token.kind == OP and token.text == "%":
+            self.take()
+            node = ("percent", node)
+        return node
+
+    def primary(self) -> Node:
+        token = self.take()
+        if token.kind == NUMBER:
+            return ("const", float(token.text))
+        if token.kind == STRING:
+            return ("const", token.text)
+        if token.kind == BOOL:
+            return ("const", token.text.upper() == "TRUE")
+        if token.kind == ERROR:
+            return ("const", ExcelError(token.text))
+        if token.kind == REF_TOKEN:
+            return ("ref", parse_reference(token.text))
+        if token.kind == LPAREN:
+            node = self.expression()
+            self.expect(RPAREN)
+            return node
+        if token.kind == FUNC:
+            self.expect(LPAREN)
+            args: List[Node] = []
+            if (nxt := self.peek()) is not None and nxt.kind == RPAREN:
+                self.take()
+                return ("call", token.text, args)
+            while True:
+                nxt = self.peek()
+                # Pominięty argument, np. IF(A1,,0)
+                if nxt is not None and nxt.kind in (SEP, RPAREN):
+                    args.append(("const", None))
+                else:
+                    args.append(self.expression())
+                if self.take().kind == RPAREN:
+                    return ("call", token.text, args)
+        raise FormulaError(
+            f"Niespodziewany token '{token.text}' (pozycja {token.position}): {self.formula}"
+        )
+
+
+def parse(formula: str) -> Node:
+    """
+    Parsuje formułę do drzewa.
+
+    Args:
+        formula: Tekst formuły (z "=" lub bez)
+
+    Returns:
+        Korzeń drzewa - krotka ("const" | "ref" | "call" | "unary" | "binary" | "percent", ...)
+
+    Raises:
+        FormulaError: Przy błędzie składni
+    """
+    parser = _Parser(tokenize(formula), formula)
+    node = parser.expression()
+    if parser.peek() is not None:
+        token = parser.peek()
+        raise FormulaError(
+            f"Nadmiarowy token '{token.text}' (pozycja {token.position}): {formula}"
+        )
+    return node
+
+
+def references(node: Node) -> List[Reference]:
+    """Zwraca statyczne odwołania drzewa formuły."""
+    found: List[Reference] = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        kind = current[0]
+        if kind == "ref":
+            found.append(current[1])
+        elif kind == "call":
+            stack.extend(current[2])
+        elif kind == "binary":
+            stack.extend(current[2:])
+        elif kind in ("unary", "percent"):
+            stack.append(current[-1])
+    return found
+
+
+def functions(node: Node) -> List[str]:
+    """Zwraca nazwy funkcji użytych w drzewie formuły."""
+    found: List[str] = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        kind = current[0]
+        if kind == "call":
+            found.append(current[1])
+            stack.extend(current[2])
+        elif kind == "binary":
+            stack.extend(current[2:])
+        elif kind in ("unary", "percent"):
+            stack.append(current[-1])
+    return found
+
+
+# =============================================================================
+# KOMPILACJA
+# =============================================================================
+
+def _compile_ref(reference: Reference, as_range: bool) -> Compiled:
+    sheet = reference.sheet
+    if reference.is_cell and not as_range:
+        row, col = reference.min_row, reference.min_col
+        return lambda ev, key: ev.cell_value(sheet or key[0], row, col)
+    return lambda ev, key: ev.grid(reference, sheet or key[0])
+
+
+def _compile_binary(op: str, left: Compiled, right: Compiled) -> Compiled:
+    if op in _COMPARISONS:
+        test = _COMPARISONS[op]
+
+        def comparison(ev, key):
+            a, b = scalar(left(ev, key)), scalar(right(ev, key))
+            error = first_error((a, b))
+            return error if error else test(compare(a, b))
+        return comparison
+
+    if op == "&":
+        def concatenation(ev, key):
+            a, b = to_text(scalar(left(ev, key))), to_text(scalar(right(ev, key)))
+            error = first_error((a, b))
+            return error if error else a + b
+        return concatenation
+
+    def arithmetic(ev, key):
+        a, b = to_number(scalar(left(ev, key))), to_number(scalar(right(ev, key)))
+        error = first_error((a, b))
+        if error:
+            return error
+        if op == "/":
+            return DIV0 if b == 0 else a / b
+        if op == "^":
+            try:
+                return float(a) ** b
+            except (OverflowError, ZeroDivisionError, ValueError):
+                return VALUE
+        return _ARITHMETIC[op](a, b)
+    return arithmetic
+
+
+def _compile_special(name: str, args: List[Node]) -> Compiled:
+    if name == "IF":
+        if not 1 < len(args) < 4:
+            return lambda ev, key: VALUE
+        test, then = _compile(args[0]), _compile(args[1])
+        otherwise = _compile(args[2]) if len(args) == 3 else (lambda ev, key: False)
+
+        def if_(ev, key):
+            flag = to_bool(scalar(test(ev, key)))
+            if isinstance(flag, ExcelError):
+                return flag
+            return then(ev, key) if flag else otherwise(ev, key)
+        return if_
+
+    if name == "IFERROR":
+        if len(args) != 2:
+            return lambda ev, key: VALUE
+        value, fallback = _compile(args[0]), _compile(args[1])
+
+        def iferror(ev, key):
+            result = value(ev, key)
+            return fallback(ev, key) if isinstance(scalar(result), ExcelError) else result
+        return iferror
+
+    if name == "ISBLANK":
+        if len(args) != 1:
+            return lambda ev, key: VALUE
+        value = _compile(args[0])
+        return lambda ev, key: scalar(value(ev, key)) is None
+
+    if name == "ROW":
+        if not args:
+            return lambda ev, key: key[1]
+        if args[0][0] == "ref":
+            row = args[0][1].min_row
+            return lambda ev, key: row
+        return lambda ev, key: VALUE
+
+    # INDIRECT - odwołanie z tekstu; zależność rejestrowana dynamicznie
+    if len(args) != 1:
+        return lambda ev, key: VALUE
+    text = _compile(args[0])
+
+    def indirect(ev, key):
+        address = scalar(text(ev, key))
+        if not isinstance(address, str):
+            return address if isinstance(address, ExcelError) else REF
+        try:
+            reference = parse_reference(address)
+        except (FormulaError, ValueError):
+            return REF
+        ev.track(key, reference)
+        return ev.grid(reference, reference.sheet or key[0])
+    return indirect
+
+
+def _compile(node: Node, as_range: bool = False) -> Compiled:
+    kind = node[0]
+    if kind == "const":
+        value = node[1]
+        return lambda ev, key: value
+    if kind == "ref":
+        return _compile_ref(node[1], as_range)
+    if kind == "unary":
+        operand = _compile(node[2])
+        sign = -1 if node[1] == "-" else 1
+
+        def unary(ev, key):
+            number = to_number(scalar(operand(ev, key)))
+            return number if isinstance(number, ExcelError) else sign * number
+        return unary
+    if kind == "percent":
+        operand = _compile(node[1])
+
+        def percent(ev, key):
+            number = to_number(scalar(operand(ev, key)))
+            return number if isinstance(number, ExcelError) else number / 100.0
+        return percent
+    if kind == "binary":
+        return _compile_binary(node[1], _compile(node[2]), _compile(node[3]))
+
+    name, args = node[1], node[2]
+    if name in SPECIAL_FUNCTIONS:
+        return _compile_special(name, args)
+    function = FUNCTIONS.get(name)
+    if function is None:
+        return lambda ev, key: NAME
+    compiled = [_compile(arg, as_range=name in RANGE_FUNCTIONS) for arg in args]
+
+    def call(ev, key):
+        try:
+            return function(*[arg(ev, key) for arg in compiled])
+        except TypeError:
+            # Niepoprawna liczba argumentów
+            return VALUE
+    return call
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """
+    Skompilowana formuła.
+
+    Attributes:
+        text: Tekst formuły
+        evaluate: Domknięcie ``evaluate(evaluator, key)`` zwracające wartość
+        references: Statyczne odwołania (do grafu zależności)
+        functions: Nazwy użytych funkcji
+    """
+    text: str
+    evaluate: Compiled
+    references: Tuple[Reference, ...]
+    functions: Tuple[str, ...]
+
+    @property
+    def is_volatile(self) -> bool:
+        """Czy formuła używa funkcji ulotnych (np. INDIRECT)."""
+        return any(name in VOLATILE_FUNCTIONS for name in self.functions)
+
+
+def compile_formula(formula: str) -> CompiledFormula:
+    """
+    Kompiluje formułę do domknięcia.
+
+    Args:
+        formula: Tekst formuły (z "=" lub bez)
+
+    Returns:
+        Skompilowana formuła
+
+    Raises:
+        FormulaError: Przy błędzie składni
+    """
+    tree = parse(formula)
+    body = _compile(tree)
+
+    def evaluate(ev, key):
+        result = scalar(body(ev, key))
+        # Odwołanie do pustej komórki daje w Excelu 0
+        return 0.0 if result is None else result
+
+    return CompiledFormula(
+        formula, evaluate, tuple(references(tree)), tuple(functions(tree))
+    )
@@ -0,0 +1,199 @@
+"""
+Analiza kosztu przeliczania formuł.
+
+Przechodzi po wszystkich formułach skoroszytu, tokenizuje je i zgłasza:
+- funkcje ulotne (INDIRECT, OFFSET, TODAY, ...) - przeliczane przy
+  każdej zmianie w skoroszycie, niezależnie od odwołań
+- zakresy bez granic (całe kolumny, np. 'Dziennik'!X:X)
+
+oraz szacuje koszt pełnego przeliczenia arkusza jako liczbę odwiedzin
+komórek (suma rozmiarów odwołań wszystkich formuł). Całe kolumny
+liczone są jak w Excelu - do ostatniego wiersza arkusza, a odwołania do
+tabel (``Dziennik[TSS]``) - wg bieżącego zakresu tabeli.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from openpyxl import Workbook
+
+from kombajn.calc.compiler import VOLATILE_FUNCTIONS
+from kombajn.calc.tables import expand_structured, workbook_tables
+from kombajn.calc.tokenizer import FUNC, REF, parse_reference, tokenize
+from kombajn.config import SHEET_CONFIG
+
+
+EXCEL_MAX_ROWS = 1_048_576
+
+
+@dataclass(frozen=True)
+class FormulaCost:
+    """
+    Koszt pojedynczej formuły.
+
+    Attributes:
+        cell_visits: Szacowana liczba odwiedzanych komórek
+        volatile: Użyte funkcje ulotne
+        unbounded: Odwołania do całych kolumn
+    """
+    cell_visits: int
+    volatile: Tuple[str, ...]
+    unbounded: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class FormulaIssue:
+    """
+    Zgłoszenie dotyczące formuły.
+
+    Attributes:
+        sheet: Nazwa arkusza
+        coordinate: Adres komórki
+        kind: "volatile" lub "unbounded"
+        detail: Nazwa funkcji lub tekst odwołania
+    """
+    sheet: str
+    coordinate: str
+    kind: str
+    detail: str
+
+
+@dataclass
+class SheetCost:
+    """
+    Koszt przeliczenia arkusza.
+
+    Attributes:
+        sheet: Nazwa arkusza
+        formulas: Liczba formuł
+        volatile_formulas: Liczba formuł z funkcjami ulotnymi
+        cell_visits: Szacowana liczba odwiedzin komórek przy pełnym przeliczeniu
+    """
+    sheet: str
+    formulas: int = 0
+    volatile_formulas: int = 0
+    cell_visits: int = 0
+
+
+@dataclass
+class CostReport:
+    """
+    Raport kosztu formuł skoroszytu.
+
+    Attributes:
+        sheets: Koszt per arkusz
+        issues: Zgłoszenia (funkcje ulotne, całe kolumny)
+    """
+    sheets: Dict[str, SheetCost] = field(default_factory=dict)
+    issues: List[FormulaIssue] = field(default_factory=list)
+
+    @property
+    def cell_visits(self) -> int:
+        """Łączny koszt przeliczenia skoroszytu."""
+        return sum(cost.cell_visits for cost in self.sheets.values())
+
+    def issues_of(self, kind: str) -> List[FormulaIssue]:
+        """Zgłoszenia danego rodzaju ("volatile" / "unbounded")."""
+        return [issue for issue in self.issues if issue.kind == kind]
+
+    def over_budget(
+        self,
+        max_cell_visits: int = SHEET_CONFIG.MAX_RECALC_CELL_VISITS,
+        max_volatile: int = SHEET_CONFIG.MAX_VOLATILE_FORMULAS
+    ) -> List[str]:
+        """
+        Zwraca arkusze przekraczające budżet przeliczania.
+
+        Args:
+            max_cell_visits: Limit odwiedzin komórek na arkusz
+            max_volatile: Limit formuł ulotnych na arkusz
+
+        Returns:
+            Opisy przekroczeń (pusta lista = w budżecie)
+        """
+        problems = []
+        for cost in self.sheets.values():
+            if cost.cell_visits > max_cell_visits:
+                problems.append(
+                    f"[{cost.sheet}] {cost.cell_visits:,} odwiedzin komórek (limit {max_cell_visits:,})"
+                )
+            if cost.volatile_formulas > max_volatile:
+                problems.append(
+                    f"[{cost.sheet}] {cost.volatile_formulas} formuł ulotnych (limit {max_volatile})"
+                )
+        return problems
+
+    def summary(self) -> List[str]:
+        """Zwraca czytelne podsumowanie (linia na arkusz, od najdroższego)."""
+        lines = []
+        for cost in sorted(self.sheets.values(), key=lambda c: -c.cell_visits):
+            lines.append(
+                f"{cost.sheet}: {cost.formulas} formuł, {cost.volatile_formulas} ulotnych, "
+                f"{cost.cell_visits:,} odwiedzin komórek"
+            )
+        return lines
+
+
+@lru_cache(maxsize=4096)
+def analyze_formula(formula: str) -> FormulaCost:
+    """
+    Szacuje koszt pojedynczej formuły.
+
+    Wynik jest zapamiętywany - formuły kopiowane w dół (ten sam tekst)
+    tokenizowane są raz.
+
+    Args:
+        formula: Tekst formuły
+
+    Returns:
+        Koszt formuły
+    """
+    visits = 0
+    volatile: List[str] = []
+    unbounded: List[str] = []
+    for token in tokenize(formula):
+        if token.kind == FUNC and token.text in VOLATILE_FUNCTIONS:
+            volatile.append(token.text)
+        elif token.kind == REF:
+            reference = parse_reference(token.text)
+            columns = reference.max_col - reference.min_col + 1
+            if reference.is_unbounded:
+                unbounded.append(token.text)
+                visits += EXCEL_MAX_ROWS * columns
+            else:
+                visits += (reference.max_row - reference.min_row + 1) * columns
+    return FormulaCost(visits, tuple(volatile), tuple(unbounded))
+
+
+def analyze_workbook(workbook: Workbook) -> CostReport:
+    """
+    Analizuje wszystkie formuły skoroszytu.
+
+    Args:
+        workbook: Skoroszyt (np. wynik ``create_workbook()``)
+
+    Returns:
+        Raport kosztu formuł
+    """
+    report = CostReport()
+    tables = workbook_tables(workbook)
+    for ws in workbook.worksheets:
+        cost = report.sheets[ws.title] = SheetCost(ws.title)
+        # Bezpośredni dostęp do komórek - iter_rows tworzyłby puste komórki
+        for cell in ws._cells.values():
+            value = cell.value
+            if not (isinstance(value, str) and value.startswith("=")):
+                continue
+            formula = analyze_formula(
+                expand_structured(value, ws.title, cell.row, cell.column, tables)
+            )
+            cost.formulas += 1
+            cost.cell_visits += formula.cell_visits
+            if formula.volatile:
+                cost.volatile_formulas += 1
+            for name in formula.volatile:
+                report.issues.append(FormulaIssue(ws.title, cell.coordinate, "volatile", name))
+            for reference in formula.unbounded:
+                report.issues.append(FormulaIssue(ws.title, cell.coordinate, "unbounded", reference))
+    return report
@@ -0,0 +1,391 @@
+"""
+Ewaluator skoroszytu z grafem zależności.
+
+Wczytuje wartości i formuły wszystkich arkuszy, buduje graf zależności
+komórek (odwołania statyczne oraz dynamiczne - z INDIRECT) i przelicza
+formuły w kolejności topologicznej. Po zmianie wartości przeliczane są
+tylko komórki "brudne" - zależne (pośrednio) od zmienionej.
+
+Odwołania strukturalne do tabel (``Dziennik[TSS]``) rozwijane są przy
+wczytaniu formuły do odwołań A1 wg zakresów tabel skoroszytu.
+"""
+
+import bisect
+import datetime
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils.cell import (
+    column_index_from_string,
+    coordinate_from_string,
+    get_column_letter,
+)
+
+from kombajn.calc.compiler import CompiledFormula, compile_formula
+from kombajn.calc.functions import CIRCULAR, REF, Grid, to_serial
+from kombajn.calc.tables import expand_structured, workbook_tables
+from kombajn.calc.tokenizer import Reference
+
+
+Key = Tuple[str, int, int]
+# Przedział wierszy zależności w jednej kolumnie: (od, do) - do=None: bez końca
+RowSpan = Tuple[int, Optional[int]]
+
+
+def _key(sheet: str, coordinate: str) -> Key:
+    """Zamienia nazwę arkusza i adres (np. "B6") na klucz komórki."""
+    column, row = coordinate_from_string(coordinate.replace("$", "").upper())
+    return sheet, row, column_index_from_string(column)
+
+
+def _constant(value: Any) -> Any:
+    """Normalizuje stałą komórki (daty -> liczby seryjne, "" -> pusta)."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return to_serial(value)
+    if value == "":
+        return None
+    return value
+
+
+class Evaluator:
+    """
+    Przelicza formuły skoroszytu bez Excela.
+
+    Przykład:
+        ev = Evaluator(create_workbook())
+        ev.set_value("Dziennik", "O2", 250)
+        ev.value("Dziennik", "T2")   # IF = NP / FTP
+
+    Attributes:
+        evaluations: Liczba wykonanych ewaluacji formuł (do pomiaru przyrostowości)
+    """
+
+    def __init__(self, workbook: Workbook) -> None:
+        """
+        Wczytuje skoroszyt i kompiluje formuły.
+
+        Args:
+            workbook: Skoroszyt openpyxl (zbudowany lub wczytany z pliku)
+        """
+        self._values: Dict[Key, Any] = {}
+        self._formulas: Dict[Key, CompiledFormula] = {}
+        self._extent: Dict[str, int] = {}
+        # Wiersze formuł w kolumnie (posortowane) - do wyszukiwania formuł w zakresach
+        self._formula_rows: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        # Odwołania do pojedynczych komórek: komórka -> komórki zależne
+        self._cell_dependents: Dict[Key, Set[Key]] = defaultdict(set)
+        # Zakresy: (arkusz, kolumna) -> komórka zależna -> przedziały wierszy
+        self._dependents: Dict[Tuple[str, int], Dict[Key, List[RowSpan]]] = defaultdict(dict)
+        self._dynamic_dependents: Dict[Tuple[str, int], Dict[Key, List[RowSpan]]] = defaultdict(dict)
+        self._dynamic: Dict[Key, List[Tuple[str, Reference]]] = {}
+        self._dirty: Set[Key] = set()
+        self._evaluating: Set[Key] = set()
+        self._compiled_cache: Dict[str, CompiledFormula] = {}
+        self._tables = workbook_tables(workbook)
+        self.evaluations = 0
+
+        for ws in workbook.worksheets:
+            self._extent[ws.title] = 0
+            # Bezpośredni dostęp do komórek - iter_rows tworzyłby puste komórki
+            for (row, col), cell in ws._cells.items():
+                if cell.value is not None and cell.value != "":
+                    self._store(ws.title, row, col, cell.value)
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    @property
+    def sheetnames(self) -> List[str]:
+        """Nazwy arkuszy."""
+        return list(self._extent)
+
+    def value(self, sheet: str, coordinate: str) -> Any:
+        """
+        Zwraca aktualną wartość komórki (przelicza brudne formuły).
+
+        Args:
+            sheet: Nazwa arkusza
+            coordinate: Adres komórki (np. "T2")
+
+        Returns:
+            Wartość (liczba, tekst, bool, None dla pustej lub ``ExcelError``)
+        """
+        self.recalculate()
+        return self._values.get(_key(sheet, coordinate))
+
+    def formula(self, sheet: str, coordinate: str) -> Optional[str]:
+        """Zwraca tekst formuły komórki (lub None)."""
+        compiled = self._formulas.get(_key(sheet, coordinate))
+        return compiled.text if compiled is not None else None
+
+    def formulas(self) -> Iterable[Tuple[Key, CompiledFormula]]:
+        """Iteruje po skompilowanych formułach (klucz, formuła)."""
+        return self._formulas.items()
+
+    def set_value(self, sheet: str, coordinate: str, value: Any) -> int:
+        """
+        Zmienia wartość lub formułę komórki i oznacza zależne jako brudne.
+
+        Args:
+            sheet: Nazwa arkusza
+            coordinate: Adres komórki
+            value: Nowa wartość (tekst z "=" to formuła, None czyści komórkę)
+
+        Returns:
+            Liczba komórek do przeliczenia
+
+        Raises:
+            KeyError: Gdy arkusz nie istnieje
+        """
+        key = self._assign(sheet, coordinate, value)
+        before = len(self._dirty)
+        self._mark_dirty([key])
+        return len(self._dirty) - before
+
+    def set_values(self, sheet: str, values: Dict[str, Any]) -> int:
+        """
+        Zmienia wiele komórek arkusza naraz (jedno oznaczanie zależnych).
+
+        Args:
+            sheet: Nazwa arkusza
+            values: Adres -> wartość
+
+        Returns:
+            Liczba komórek do przeliczenia
+
+        Raises:
+            KeyError: Gdy arkusz nie istnieje
+        """
+        keys = [self._assign(sheet, coordinate, value) for coordinate, value in values.items()]
+        before = len(self._dirty)
+        self._mark_dirty(keys)
+        return len(self._dirty) - before
+
+    def recalculate(self) -> int:
+        """
+        Przelicza brudne formuły w kolejności topologicznej.
+
+        Returns:
+            Liczba przeliczonych formuł
+        """
+        if not self._dirty:
+            return 0
+        before = self.evaluations
+        for key in self._topological(sorted(self._dirty), self._dirty):
+            if key in self._dirty:
+                self._evaluate(key)
+        self._dirty.clear()
+        return self.evaluations - before
+
+    def values(self, sheet: str, coordinates: Iterable[str]) -> List[Any]:
+        """
+        Zwraca wartości wskazanych komórek, przeliczając tylko ich poprzedniki.
+
+        Pozostałe brudne formuły czekają na kolejne przeliczenie - przydatne,
+        gdy potrzebna jest tylko część skoroszytu (np. kolumny metryk).
+
+        Args:
+            sheet: Nazwa arkusza
+            coordinates: Adresy komórek
+
+        Returns:
+            Wartości w kolejności adresów
+        """
+        keys = [_key(sheet, coordinate) for coordinate in coordinates]
+        roots = [key for key in keys if key in self._dirty]
+        if roots:
+            for key in self._topological(roots, self._dirty):
+                if key in self._dirty:
+                    self._evaluate(key)
+        return [self._values.get(key) for key in keys]
+
+    def sheet_values(self, sheet: str) -> Dict[str, Any]:
+        """
+        Zwraca wszystkie niepuste wartości arkusza (po przeliczeniu).
+
+        Args:
+            sheet: Nazwa arkusza
+
+        Returns:
+            Adres -> wartość
+        """
+        self.recalculate()
+        return {
+            f"{get_column_letter(col)}{row}": value
+            for (name, row, col), value in sorted(self._values.items())
+            if name == sheet
+        }
+
+    # -------------------------------------------------------------------------
+    # Dostęp z formuł
+    # -------------------------------------------------------------------------
+
+    def cell_value(self, sheet: str, row: int, col: int) -> Any:
+        """Wartość komórki dla formuły (brudne formuły liczone na żądanie)."""
+        key = (sheet, row, col)
+        if key in self._dirty:
+            self._evaluate(key)
+        elif sheet not in self._extent:
+            return REF
+        return self._values.get(key)
+
+    def grid(self, reference: Reference, sheet: str) -> Any:
+        """Wartości zakresu; całe kolumny ograniczone do zajętych wierszy arkusza."""
+        if sheet not in self._extent:
+            return REF
+        max_row = reference.max_row if reference.max_row is not None else self._extent[sheet]
+        columns = range(reference.min_col, reference.max_col + 1)
+        dirty, values = self._dirty, self._values
+        rows = []
+        for row in range(reference.min_row, max(max_row, reference.min_row) + 1):
+            line = []
+            for col in columns:
+                key = (sheet, row, col)
+                if key in dirty:
+                    self._evaluate(key)
+                line.append(values.get(key))
+            rows.append(line)
+        return Grid(rows)
+
+    def track(self, key: Key, reference: Reference) -> None:
+        """Rejestruje dynamiczną zależność (np. z INDIRECT) bieżącej formuły."""
+        sheet = reference.sheet or key[0]
+        self._dynamic.setdefault(key, []).append((sheet, reference))
+        self._register(self._dynamic_dependents, key, sheet, reference)
+
+    # -------------------------------------------------------------------------
+    # Graf zależności
+    # -------------------------------------------------------------------------
+
+    def _assign(self, sheet: str, coordinate: str, value: Any) -> Key:
+        if sheet not in self._extent:
+            raise KeyError(f"Brak arkusza [{sheet}]")
+        key = _key(sheet, coordinate)
+        if key in self._formulas:
+            self._remove_formula(key)
+        self._values.pop(key, None)
+        if value is not None and value != "":
+            self._store(sheet, key[1], key[2], value)
+        return key
+
+    def _store(self, sheet: str, row: int, col: int, value: Any) -> None:
+        key = (sheet, row, col)
+        self._extent[sheet] = max(self._extent[sheet], row)
+        if isinstance(value, str) and value.startswith("="):
+            value = expand_structured(value, sheet, row, col, self._tables)
+            compiled = self._compiled_cache.get(value)
+            if compiled is None:
+                compiled = self._compiled_cache[value] = compile_formula(value)
+            self._formulas[key] = compiled
+            bisect.insort(self._formula_rows[(sheet, col)], row)
+            for reference in compiled.references:
+                target = reference.sheet or sheet
+                if reference.is_cell:
+                    self._cell_dependents[(target, reference.min_row, reference.min_col)].add(key)
+                else:
+                    self._register(self._dependents, key, target, reference)
+            self._dirty.add(key)
+        else:
+            self._values[key] = _constant(value)
+
+    def _remove_formula(self, key: Key) -> None:
+        sheet, row, col = key
+        compiled = self._formulas.pop(key)
+        rows = self._formula_rows[(sheet, col)]
+        del rows[bisect.bisect_left(rows, row)]
+        for reference in compiled.references:
+            target = reference.sheet or sheet
+            if reference.is_cell:
+                self._cell_dependents[(target, reference.min_row, reference.min_col)].discard(key)
+            else:
+                self._unregister(self._dependents, key, target, reference)
+        self._clear_dynamic(key)
+        self._dirty.discard(key)
+
+    @staticmethod
+    def _register(index, key: Key, sheet: str, reference: Reference) -> None:
+        span = (reference.min_row, reference.max_row)
+        for col in range(reference.min_col, reference.max_col + 1):
+            index[(sheet, col)].setdefault(key, []).append(span)
+
+    @staticmethod
+    def _unregister(index, key: Key, sheet: str, reference: Reference) -> None:
+        for col in range(reference.min_col, reference.max_col + 1):
+            index[(sheet, col)].pop(key, None)
+
+    def _clear_dynamic(self, key: Key) -> None:
+        for sheet, reference in self._dynamic.pop(key, ()):
+            self._unregister(self._dynamic_dependents, key, sheet, reference)
+
+    def _dependents_of(self, key: Key) -> Iterable[Key]:
+        yield from self._cell_dependents.get(key, ())
+        sheet, row, col = key
+        for index in (self._dependents, self._dynamic_dependents):
+            for dependent, spans in index.get((sheet, col), {}).items():
+                for first, last in spans:
+                    if first <= row and (last is None or row <= last):
+                        yield dependent
+                        break
+
+    def _mark_dirty(self, changed: Iterable[Key]) -> None:
+        stack = list(changed)
+        for key in stack:
+            if key in self._formulas:
+                self._dirty.add(key)
+        while stack:
+            for dependent in self._dependents_of(stack.pop()):
+                if dependent not in self._dirty and dependent in self._formulas:
+                    self._dirty.add(dependent)
+                    stack.append(dependent)
+
+    def _precedents(self, key: Key) -> Iterable[Key]:
+        """Formuły, od których zależy komórka (statycznie i dynamicznie)."""
+        sheet = key[0]
+        compiled = self._formulas[key]
+        scoped = [(reference.sheet or sheet, reference) for reference in compiled.references]
+        scoped.extend(self._dynamic.get(key, ()))
+        for ref_sheet, reference in scoped:
+            last = reference.max_row if reference.max_row is not None else self._extent.get(ref_sheet, 0)
+            for col in range(reference.min_col, reference.max_col + 1):
+                rows = self._formula_rows.get((ref_sheet, col), ())
+                start = bisect.bisect_left(rows, reference.min_row)
+                stop = bisect.bisect_right(rows, last)
+                for row in rows[start:stop]:
+                    yield ref_sheet, row, col
+
+    def _topological(self, roots: Iterable[Key], cells: Set[Key]) -> List[Key]:
+        """Porządek topologiczny brudnych poprzedników (DFS iteracyjny, cykle są cięte)."""
+        order: List[Key] = []
+        visited: Set[Key] = set()
+        for root in roots:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(self._precedents(root)))]
+            while stack:
+                node, pending = stack[-1]
+                for precedent in pending:
+                    if precedent in cells and precedent not in visited:
+                        visited.add(precedent)
+                        stack.append((precedent, iter(self._precedents(precedent))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+        return order
+
+    def _evaluate(self, key: Key) -> None:
+        if key in self._evaluating:
+            # Odwołanie cykliczne
+            self._values[key] = CIRCULAR
+            return
+        self._evaluating.add(key)
+        self._clear_dynamic(key)
+        try:
+            self._values[key] = self._formulas[key].evaluate(self, key)
+        finally:
+            self._evaluating.discard(key)
+            self._dirty.discard(key)
+        self.evaluations += 1
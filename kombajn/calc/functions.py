@@ -0,0 +1,603 @@
+"""
+Funkcje arkusza i reguły konwersji wartości.
+
+Implementuje podzbiór funkcji Excela używany przez arkusze projektu
+(IF, ISNUMBER, IFERROR, AVERAGE, SUMIFS, AVERAGEIFS, COUNTIFS,
+INDEX/MATCH, WEEKNUM, TODAY, ROUND, TEXT, EXP, ...) z semantyką Excela:
+puste komórki, błędy (#DIV/0!, #VALUE!, #N/A) i porównania tekstu
+bez rozróżniania wielkości liter. Daty są liczbami seryjnymi (1900).
+
+Funkcje leniwe (IF, IFERROR) oraz zależne od kontekstu komórki
+(ROW, INDIRECT, ISBLANK) obsługuje kompilator formuł.
+"""
+
+import datetime
+import fnmatch
+import math
+import re
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class ExcelError:
+    """Wartość błędu Excela (np. #DIV/0!)."""
+    code: str
+
+    def __str__(self) -> str:
+        return self.code
+
+
+DIV0 = ExcelError("#DIV/0!")
+VALUE = ExcelError("#VALUE!")
+NA = ExcelError("#N/A")
+REF = ExcelError("#REF!")
+NAME = ExcelError("#NAME?")
+NUM = ExcelError("#NUM!")
+# Odwołanie cykliczne - Excel pokazuje ostrzeżenie, tu zwracamy błąd
+CIRCULAR = ExcelError("#CIRC!")
+
+
+class Grid:
+    """
+    Wartości zakresu komórek (wiersze x kolumny).
+
+    Attributes:
+        rows: Lista wierszy z wartościami (None = pusta komórka)
+    """
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: List[List[Any]]) -> None:
+        self.rows = rows
+
+    def values(self) -> Iterator[Any]:
+        """Iteruje po wartościach wiersz po wierszu."""
+        for row in self.rows:
+            yield from row
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Wymiary zakresu (wiersze, kolumny)."""
+        return len(self.rows), len(self.rows[0]) if self.rows else 0
+
+
+# =============================================================================
+# KONWERSJE
+# =============================================================================
+
+_EXCEL_EPOCH = datetime.date(1899, 12, 30)
+
+
+def is_number(value: Any) -> bool:
+    """Czy wartość jest liczbą (bez wartości logicznych)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def to_serial(value: datetime.date) -> float:
+    """Zamienia datę (lub datę z czasem) na liczbę seryjną Excela."""
+    if isinstance(value, datetime.datetime):
+        delta = value - datetime.datetime.combine(_EXCEL_EPOCH, datetime.time())
+        return delta.days + delta.seconds / 86400.0
+    return float((value - _EXCEL_EPOCH).days)
+
+
+def from_serial(serial: float) -> datetime.date:
+    """Zamienia liczbę seryjną Excela na datę."""
+    return _EXCEL_EPOCH + datetime.timedelta(days=int(serial))
+
+
+def to_number(value: Any) -> Any:
+    """Konwertuje wartość skalarną na liczbę (lub zwraca błąd)."""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if is_number(value):
+        return value
+    if value is None:
+        return 0.0
+    if isinstance(value, ExcelError):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.strip()) if value.strip() else VALUE
+        except ValueError:
+            return VALUE
+    return VALUE
+
+
+def to_text(value: Any) -> Any:
+    """Konwertuje wartość skalarną na tekst jak w Excelu (format ogólny)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if is_number(value):
+        if float(value).is_integer():
+            return str(int(value))
+        return f"{value:.15g}"
+    return value
+
+
+def to_bool(value: Any) -> Any:
+    """Konwertuje wartość skalarną na wartość logiczną."""
+    if isinstance(value, (bool, ExcelError)):
+        return value
+    if value is None:
+        return False
+    if is_number(value):
+        return value != 0
+    if isinstance(value, str):
+        upper = value.upper()
+        if upper in ("TRUE", "FALSE"):
+            return upper == "TRUE"
+    return VALUE
+
+
+def scalar(value: Any) -> Any:
+    """Sprowadza argument do skalara (zakres 1x1 -> wartość, większy -> #VALUE!)."""
+    if isinstance(value, Grid):
+        return value.rows[0][0] if value.shape == (1, 1) else VALUE
+    return value
+
+
+def _type_rank(value: Any) -> int:
+    """Kolejność typów przy porównaniu: liczby < tekst < logiczne."""
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, str):
+        return 1
+    return 0
+
+
+def compare(left: Any, right: Any) -> int:
+    """
+    Porównuje dwie wartości skalarne jak Excel.
+
+    Returns:
+        -1, 0 lub 1
+    """
+    if left is None:
+        left = "" if isinstance(right, str) else (False if isinstance(right, bool) else 0.0)
+    if right is None:
+        right = "" if isinstance(left, str) else (False if isinstance(left, bool) else 0.0)
+
+    rank_left, rank_right = _type_rank(left), _type_rank(right)
+    if rank_left != rank_right:
+        return -1 if rank_left < rank_right else 1
+    if isinstance(left, str):
+        left, right = left.casefold(), right.casefold()
+    return (left > right) - (left < right)
+
+
+def first_error(values: Sequence[Any]) -> Any:
+    """Zwraca pierwszy błąd z listy wartości (lub None)."""
+    for value in values:
+        if isinstance(value, ExcelError):
+            return value
+    return None
+
+
+def _numbers(args: Sequence[Any]) -> Any:
+    """
+    Zbiera liczby z argumentów funkcji agregujących.
+
+    Z zakresów brane są tylko liczby (tekst i puste są pomijane),
+    argumenty skalarne są konwertowane. Błąd przerywa zbieranie.
+    """
+    numbers: List[float] = []
+    for arg in args:
+        if isinstance(arg, Grid):
+            for value in arg.values():
+                if isinstance(value, ExcelError):
+                    return value
+                if is_number(value):
+                    numbers.append(value)
+        else:
+            value = to_number(arg)
+            if isinstance(value, ExcelError):
+                return value
+            numbers.append(value)
+    return numbers
+
+
+# =============================================================================
+# KRYTERIA (SUMIFS / COUNTIFS)
+# =============================================================================
+
+_CRITERION_RE = re.compile(r"^(<=|>=|<>|<|>|=)?(.*)$", re.DOTALL)
+
+
+def criterion(spec: Any) -> Callable[[Any], bool]:
+    """
+    Buduje predykat z kryterium Excela (np. 5, ">0", "<>x", "Z*").
+
+    Args:
+        spec: Kryterium (liczba, tekst z operatorem lub wzorzec z * i ?)
+
+    Returns:
+        Funkcja sprawdzająca wartość komórki
+    """
+    if not isinstance(spec, str):
+        target = to_number(spec) if isinstance(spec, bool) else spec
+        return lambda value: is_number(value) and not isinstance(target, ExcelError) \
+            and compare(value, target) == 0
+
+    operator, operand = _CRITERION_RE.match(spec).groups()
+    try:
+        target: Any = float(operand)
+    except ValueError:
+        target = operand
+
+    if operator in (None, "=", "<>"):
+        if isinstance(target, str):
+            pattern = target.casefold()
+            wildcard = any(ch in pattern for ch in "*?")
+            if operator == "=" and pattern == "":
+                matches = lambda value: value is None or value == ""
+            elif wildcard:
+                matches = lambda value: isinstance(value, str) \
+                    and fnmatch.fnmatchcase(value.casefold(), pattern)
+            else:
+                matches = lambda value: isinstance(value, str) and value.casefold() == pattern
+        else:
+            matches = lambda value: is_number(value) and value == target
+        if operator == "<>":
+            return lambda value: not matches(value)
+        return matches
+
+    def ordered(value: Any) -> bool:
+        if isinstance(target, str) != isinstance(value, str) or value is None:
+            return False
+        if not isinstance(value, str) and not is_number(value):
+            return False
+        result = compare(value, target)
+        return {
+            "<": result < 0, ">": result > 0, "<=": result <= 0, ">=": result >= 0,
+        }[operator]
+
+    return ordered
+
+
+def _criteria_mask(pairs: Sequence[Any]) -> Any:
+    """Zwraca listę flag dopasowania dla par (zakres, kryterium)."""
+    if len(pairs) % 2 or not pairs:
+        return VALUE
+    mask = None
+    for rng, spec in zip(pairs[::2], pairs[1::2]):
+        if not isinstance(rng, Grid):
+            return VALUE
+        spec = scalar(spec)
+        if isinstance(spec, ExcelError):
+            return spec
+        predicate = criterion(spec)
+        flags = [predicate(value) for value in rng.values()]
+        if mask is None:
+            mask = flags
+        elif len(flags) != len(mask):
+            return VALUE
+        else:
+            mask = [a and b for a, b in zip(mask, flags)]
+    return mask
+
+
+# =============================================================================
+# FUNKCJE
+# =============================================================================
+
+def _flags(args: Sequence[Any]) -> Any:
+    """Zbiera wartości logiczne argumentów AND/OR (tekst w zakresach pomijany)."""
+    flags: List[bool] = []
+    for arg in args:
+        in_range = isinstance(arg, Grid)
+        for value in (arg.values() if in_range else [arg]):
+            if in_range and (value is None or isinstance(value, str)):
+                continue
+            flag = to_bool(value)
+            if isinstance(flag, ExcelError):
+                return flag
+            flags.append(flag)
+    return flags if flags else VALUE
+
+
+def fn_and(*args: Any) -> Any:
+    flags = _flags(args)
+    return flags if isinstance(flags, ExcelError) else all(flags)
+
+
+def fn_or(*args: Any) -> Any:
+    flags = _flags(args)
+    return flags if isinstance(flags, ExcelError) else any(flags)
+
+
+def fn_isnumber(value: Any) -> bool:
+    return is_number(scalar(value))
+
+
+def fn_sum(*args: Any) -> Any:
+    numbers = _numbers(args)
+    return numbers if isinstance(numbers, ExcelError) else float(math.fsum(numbers))
+
+
+def fn_average(*args: Any) -> Any:
+    numbers = _numbers(args)
+    if isinstance(numbers, ExcelError):
+        return numbers
+    return math.fsum(numbers) / len(numbers) if numbers else DIV0
+
+
+def fn_max(*args: Any) -> Any:
+    numbers = _numbers(args)
+    if isinstance(numbers, ExcelError):
+        return numbers
+    return max(numbers) if numbers else 0.0
+
+
+def fn_min(*args: Any) -> Any:
+    numbers = _numbers(args)
+    if isinstance(numbers, ExcelError):
+        return numbers
+    return min(numbers) if numbers else 0.0
+
+
+def fn_count(*args: Any) -> int:
+    count = 0
+    for arg in args:
+        values = arg.values() if isinstance(arg, Grid) else [arg]
+        count += sum(1 for value in values if is_number(value))
+    return count
+
+
+def fn_abs(value: Any) -> Any:
+    number = to_number(scalar(value))
+    return number if isinstance(number, ExcelError) else abs(number)
+
+
+def fn_exp(value: Any) -> Any:
+    number = to_number(scalar(value))
+    if isinstance(number, ExcelError):
+        return number
+    try:
+        return math.exp(number)
+    except OverflowError:
+        return NUM
+
+
+def fn_n(value: Any) -> Any:
+    value = scalar(value)
+    if isinstance(value, ExcelError):
+        return value
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    return value if is_number(value) else 0.0
+
+
+def fn_round(value: Any, digits: Any = 0) -> Any:
+    number, places = to_number(scalar(value)), to_number(scalar(digits))
+    error = first_error([number, places])
+    if error:
+        return error
+    # Excel zaokrągla połówki od zera (a nie "do parzystej")
+    quantum = Decimal(1).scaleb(-int(places))
+    return float(Decimal(repr(float(number))).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def fn_concatenate(*args: Any) -> Any:
+    texts = [to_text(scalar(arg)) for arg in args]
+    error = first_error(texts)
+    return error if error else "".join(texts)
+
+
+def fn_sumifs(sum_range: Any, *pairs: Any) -> Any:
+    mask = _criteria_mask(pairs)
+    if isinstance(mask, ExcelError):
+        return mask
+    if not isinstance(sum_range, Grid):
+        return VALUE
+    values = list(sum_range.values())
+    if len(values) != len(mask):
+        return VALUE
+    picked = [v for v, ok in zip(values, mask) if ok]
+    error = first_error(picked)
+    return error if error else float(math.fsum(v for v in picked if is_number(v)))
+
+
+def fn_averageifs(average_range: Any, *pairs: Any) -> Any:
+    mask = _criteria_mask(pairs)
+    if isinstance(mask, ExcelError):
+        return mask
+    if not isinstance(average_range, Grid):
+        return VALUE
+    values = list(average_range.values())
+    if len(values) != len(mask):
+        return VALUE
+    picked = [v for v, ok in zip(values, mask) if ok]
+    error = first_error(picked)
+    if error:
+        return error
+    numbers = [v for v in picked if is_number(v)]
+    return math.fsum(numbers) / len(numbers) if numbers else DIV0
+
+
+def fn_countifs(*pairs: Any) -> Any:
+    mask = _criteria_mask(pairs)
+    return mask if isinstance(mask, ExcelError) else sum(mask)
+
+
+def fn_countif(rng: Any, spec: Any) -> Any:
+    return fn_countifs(rng, spec)
+
+
+def fn_index(rng: Any, row: Any, column: Any = None) -> Any:
+    if not isinstance(rng, Grid):
+        rng = Grid([[rng]])
+    row = to_number(scalar(row))
+    column = to_number(scalar(column)) if column is not None else None
+    error = first_error([row, column])
+    if error:
+        return error
+
+    rows, columns = rng.shape
+    row = int(row)
+    if column is None:
+        # Jednowymiarowy zakres: indeks liczony wzdłuż dłuższego wymiaru
+        if rows == 1 and columns > 1:
+            row, column = 1, row
+        else:
+            column = 1
+    column = int(column)
+    if not (1 <= row <= rows and 1 <= column <= columns):
+        return REF
+    # Pusta komórka jak odwołanie: 0 w wyniku komórki i działaniach, "" przy łączeniu tekstu
+    return rng.rows[row - 1][column - 1]
+
+
+def fn_match(lookup: Any, rng: Any, match_type: Any = 1) -> Any:
+    lookup = scalar(lookup)
+    match_type = to_number(scalar(match_type))
+    error = first_error([lookup, match_type])
+    if error:
+        return error
+    if not isinstance(rng, Grid) or (rng.shape[0] > 1 and rng.shape[1] > 1):
+        return NA
+
+    values = list(rng.values())
+    if match_type == 0:
+        if isinstance(lookup, str) and any(ch in lookup for ch in "*?"):
+            pattern = lookup.casefold()
+            for i, value in enumerate(values, 1):
+                if isinstance(value, str) and fnmatch.fnmatchcase(value.casefold(), pattern):
+                    return i
+            return NA
+        for i, value in enumerate(values, 1):
+            if value is not None and _type_rank(value) == _type_rank(lookup) \
+                    and compare(value, lookup) == 0:
+                return i
+        return NA
+
+    # Dopasowanie przybliżone: ostatnia wartość tego samego typu <= (>=) szukanej.
+    # Dla idiomu MATCH(9.99E+307, X:X) daje pozycję ostatniej liczby w kolumnie.
+    found = None
+    for i, value in enumerate(values, 1):
+        if value is None or isinstance(value, ExcelError) \
+                or _type_rank(value) != _type_rank(lookup):
+            continue
+        result = compare(value, lookup)
+        if (match_type > 0 and result <= 0) or (match_type < 0 and result >= 0):
+            found = i
+        elif match_type < 0:
+            break
+    return found if found is not None else NA
+
+
+def fn_weeknum(serial: Any, return_type: Any = 1) -> Any:
+    serial, return_type = to_number(scalar(serial)), to_number(scalar(return_type))
+    error = first_error([serial, return_type])
+    if error:
+        return error
+
+    # Dzień rozpoczynający tydzień (0 = poniedziałek) dla typów WEEKNUM
+    first_days = {1: 6, 2: 0, 11: 0, 12: 1, 13: 2, 14: 3, 15: 4, 16: 5, 17: 6}
+    day = from_serial(serial)
+    return_type = int(return_type)
+    if return_type == 21:
+        return day.isocalendar()[1]
+    if return_type not in first_days:
+        return NUM
+
+    jan1 = datetime.date(day.year, 1, 1)
+    offset = (jan1.weekday() - first_days[return_type]) % 7
+    return ((day - jan1).days + offset) // 7 + 1
+
+
+def fn_weekday(serial: Any, return_type: Any = 1) -> Any:
+    serial, return_type = to_number(scalar(serial)), to_number(scalar(return_type))
+    error = first_error([serial, return_type])
+    if error:
+        return error
+
+    # Numer pierwszego dnia tygodnia (0 = poniedziałek) i numeracja od 0 lub 1
+    types = {1: (6, 1), 2: (0, 1), 3: (0, 0), 11: (0, 1), 12: (1, 1), 13: (2, 1),
+             14: (3, 1), 15: (4, 1), 16: (5, 1), 17: (6, 1)}
+    if int(return_type) not in types:
+        return NUM
+    first_day, base = types[int(return_type)]
+    return (from_serial(serial).weekday() - first_day) % 7 + base
+
+
+def fn_today() -> float:
+    return to_serial(datetime.date.today())
+
+
+_DATE_CODES = re.compile(r"yyyy|yy|mmmm|mmm|mm|m|dddd|ddd|dd|d", re.IGNORECASE)
+
+
+def _format_date(serial: float, fmt: str) -> str:
+    day = from_serial(serial)
+    codes = {
+        "yyyy": f"{day.year:04d}", "yy": f"{day.year % 100:02d}",
+        "mmmm": day.strftime("%B"), "mmm": day.strftime("%b"),
+        "mm": f"{day.month:02d}", "m": str(day.month),
+        "dddd": day.strftime("%A"), "ddd": day.strftime("%a"),
+        "dd": f"{day.day:02d}", "d": str(day.day),
+    }
+    return _DATE_CODES.sub(lambda match: codes[match.group().lower()], fmt)
+
+
+def _format_number(number: float, fmt: str) -> str:
+    percent = fmt.endswith("%")
+    if percent:
+        number *= 100
+        fmt = fmt[:-1]
+    decimals = len(fmt.split(".", 1)[1]) if "." in fmt else 0
+    rounded = fn_round(number, decimals)
+    text = f"{rounded:,.{decimals}f}" if "," in fmt else f"{rounded:.{decimals}f}"
+    return text + ("%" if percent else "")
+
+
+def fn_text(value: Any, fmt: Any) -> Any:
+    value, fmt = scalar(value), to_text(scalar(fmt))
+    error = first_error([value, fmt])
+    if error:
+        return error
+    number = to_number(value)
+    if isinstance(number, ExcelError):
+        return to_text(value)
+    if _DATE_CODES.search(fmt.replace("0", "")) and not re.fullmatch(r"[#0.,%]+", fmt):
+        return _format_date(number, fmt)
+    if re.fullmatch(r"[#0.,]+%?", fmt):
+        return _format_number(number, fmt)
+    return to_text(value)
+
+
+# Funkcje z ewaluacją wszystkich argumentów (leniwe i kontekstowe - w kompilatorze)
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "ABS": fn_abs,
+    "AND": fn_and,
+    "AVERAGE": fn_average,
+    "AVERAGEIFS": fn_averageifs,
+    "CONCATENATE": fn_concatenate,
+    "COUNT": fn_count,
+    "COUNTIF": fn_countif,
+    "COUNTIFS": fn_countifs,
+    "EXP": fn_exp,
+    "INDEX": fn_index,
+    "ISNUMBER": fn_isnumber,
+    "MATCH": fn_match,
+    "MAX": fn_max,
+    "MIN": fn_min,
+    "N": fn_n,
+    "OR": fn_or,
+    "ROUND": fn_round,
+    "SUM": fn_sum,
+    "SUMIFS": fn_sumifs,
+    "TEXT": fn_text,
+    "TODAY": fn_today,
+    "WEEKDAY": fn_weekday,
+    "WEEKNUM": fn_weeknum,
+}
+
+# Funkcje, które przyjmują zakresy bez zamiany na skalar
+RANGE_FUNCTIONS = frozenset({
+    "AND", "OR", "AVERAGE", "AVERAGEIFS", "COUNT", "COUNTIF", "COUNTIFS",
+    "INDEX", "MATCH", "MAX", "MIN", "SUM", "SUMIFS",
+})
@@ -0,0 +1,267 @@
+"""
+Odwołania strukturalne do tabel Excela.
+
+Formuły z odwołaniami do tabel (``Dziennik[TSS]``,
+``Dziennik[[#This Row],[TSS]]``, ``[@TSS]``) są przed kompilacją
+rozwijane do zwykłych odwołań A1 na podstawie zakresów tabel
+skoroszytu - tak jak robi to Excel przy przeliczaniu.
+
+Obsługiwane specyfikatory: #Data, #Headers, #All, #Totals, #This Row
+(oraz skrót @), pojedyncze kolumny i zakresy kolumn ``[A]:[B]``.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from kombajn.calc.tokenizer import FormulaError
+
+
+_AREAS = ("#data", "#headers", "#all", "#totals", "#this row")
+_NAME_CHARS = "_.\\"
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    """
+    Położenie tabeli w skoroszycie.
+
+    Attributes:
+        name: Nazwa tabeli
+        sheet: Arkusz tabeli
+        min_row: Wiersz nagłówka (pierwszy wiersz zakresu)
+        max_row: Ostatni wiersz zakresu
+        min_col: Pierwsza kolumna
+        columns: Nazwa kolumny (małe litery) -> numer kolumny arkusza
+        header_rows: Liczba wierszy nagłówka (0 lub 1)
+        totals_rows: Liczba wierszy sum (0 lub 1)
+    """
+    name: str
+    sheet: str
+    min_row: int
+    max_row: int
+    min_col: int
+    columns: Dict[str, int]
+    header_rows: int = 1
+    totals_rows: int = 0
+
+    @property
+    def max_col(self) -> int:
+        return self.min_col + len(self.columns) - 1
+
+    def rows(self, area: str, row: int) -> Optional[Tuple[int, int]]:
+        """Zakres wierszy obszaru tabeli (None = obszar nie istnieje)."""
+        first_data = self.min_row + self.header_rows
+        last_data = self.max_row - self.totals_rows
+        if area == "#data":
+            return first_data, last_data
+        if area == "#all":
+            return self.min_row, self.max_row
+        if area == "#headers":
+            return (self.min_row, self.min_row) if self.header_rows else None
+        if area == "#totals":
+            return (self.max_row, self.max_row) if self.totals_rows else None
+        # #This Row - tylko w wierszach danych
+        return (row, row) if first_data <= row <= last_data else None
+
+    def contains(self, sheet: str, row: int, col: int) -> bool:
+        return sheet == self.sheet and self.min_row <= row <= self.max_row \
+            and self.min_col <= col <= self.max_col
+
+
+def workbook_tables(workbook: Workbook) -> Dict[str, TableInfo]:
+    """
+    Zbiera tabele wszystkich arkuszy.
+
+    Args:
+        workbook: Skoroszyt openpyxl
+
+    Returns:
+        Nazwa tabeli (małe litery) -> położenie tabeli
+    """
+    tables: Dict[str, TableInfo] = {}
+    for ws in workbook.worksheets:
+        for table in ws.tables.values():
+            min_col, min_row, _, max_row = range_boundaries(table.ref)
+            columns = {
+                column.name.lower(): min_col + i
+                for i, column in enumerate(table.tableColumns)
+            }
+            tables[table.displayName.lower()] = TableInfo(
+                table.displayName, ws.title, min_row, max_row, min_col, columns,
+                header_rows=1 if table.headerRowCount is None else table.headerRowCount,
+                totals_rows=table.totalsRowCount or 0,
+            )
+    return tables
+
+
+def _unescape(text: str) -> str:
+    chars: List[str] = []
+    escaped = False
+    for char in text:
+        if char == "'" and not escaped:
+            escaped = True
+            continue
+        chars.append(char)
+        escaped = False
+    return "".join(chars).strip()
+
+
+def _matching_bracket(text: str, start: int) -> int:
+    """Indeks nawiasu zamykającego dla "[" na pozycji start."""
+    depth = 0
+    position = start
+    while position < len(text):
+        char = text[position]
+        if char == "'":
+            position += 2
+            continue
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return position
+        position += 1
+    raise FormulaError(f"Niezamknięte odwołanie strukturalne: {text}")
+
+
+def _groups(content: str) -> List[str]:
+    """Dzieli '[a],[b]:[c]' na ['a', ',', 'b', ':', 'c']."""
+    parts: List[str] = []
+    position = 0
+    while position < len(content):
+        char = content[position]
+        if char == "[":
+            end = _matching_bracket(content, position)
+            parts.append(_unescape(content[position + 1:end]))
+            position = end + 1
+        elif char in ",:":
+            parts.append(char)
+            position += 1
+        elif char.isspace():
+            position += 1
+        else:
+            raise FormulaError(f"Niepoprawne odwołanie strukturalne: [{content}]")
+    return parts
+
+
+def _specifiers(content: str) -> Tuple[str, Optional[Tuple[str, str]]]:
+    """Zwraca (obszar, (kolumna od, kolumna do) lub None = wszystkie kolumny)."""
+    content = content.strip()
+    area = "#data"
+    if content.startswith("@"):
+        area = "#this row"
+        content = content[1:].strip()
+        if not content:
+            return area, None
+        if not content.startswith("["):
+            return area, (_unescape(content),) * 2
+    if not content:
+        return area, None
+    if not content.startswith("["):
+        name = _unescape(content)
+        return (name.lower(), None) if name.lower() in _AREAS else (area, (name, name))
+
+    columns: List[str] = []
+    previous = ""
+    for part in _groups(content):
+        if part in ",:":
+            previous = part
+            continue
+        if part.lower() in _AREAS:
+            area = part.lower()
+        elif previous == ":" and columns:
+            columns.append(part)
+        else:
+            columns = [part]
+        previous = part
+    if not columns:
+        return area, None
+    return area, (columns[0], columns[-1])
+
+
+def _resolve(table: TableInfo, content: str, row: int) -> str:
+    area, columns = _specifiers(content)
+    rows = table.rows(area, row)
+    if rows is None:
+        return "#REF!"
+    if columns is None:
+        first_col, last_col = table.min_col, table.max_col
+    else:
+        try:
+            first_col, last_col = (table.columns[name.lower()] for name in columns)
+        except KeyError:
+            return "#REF!"
+    sheet = "'" + table.sheet.replace("'", "''") + "'!"
+    first = f"${get_column_letter(first_col)}${rows[0]}"
+    last = f"${get_column_letter(last_col)}${rows[1]}"
+    return sheet + first if first == last else f"{sheet}{first}:{last}"
+
+
+def expand_structured(
+    formula: str,
+    sheet: str,
+    row: int,
+    col: int,
+    tables: Dict[str, TableInfo]
+) -> str:
+    """
+    Rozwija odwołania strukturalne formuły do odwołań A1.
+
+    Args:
+        formula: Tekst formuły
+        sheet: Arkusz komórki z formułą
+        row: Wiersz komórki z formułą (dla #This Row / @)
+        col: Kolumna komórki (dla odwołań bez nazwy tabeli)
+        tables: Tabele skoroszytu (``workbook_tables``)
+
+    Returns:
+        Formuła z odwołaniami A1 (odwołanie do nieistniejącej kolumny
+        lub wiersza spoza tabeli daje #REF!)
+
+    Raises:
+        FormulaError: Przy nieznanej tabeli lub błędnej składni odwołania
+    """
+    if "[" not in formula:
+        return formula
+    out: List[str] = []
+    position = 0
+    while position < len(formula):
+        char = formula[position]
+        if char in "\"'":
+            # Tekst lub nazwa arkusza w cudzysłowie - kopiowane bez zmian
+            end = position + 1
+            while end < len(formula):
+                if formula[end] == char:
+                    if end + 1 < len(formula) and formula[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            out.append(formula[position:end + 1])
+            position = end + 1
+            continue
+        if char != "[":
+            out.append(char)
+            position += 1
+            continue
+
+        end = _matching_bracket(formula, position)
+        # Nazwa tabeli bezpośrednio przed "["
+        start = len(out)
+        while start > 0 and (out[start - 1].isalnum() or out[start - 1] in _NAME_CHARS):
+            start -= 1
+        name = "".join(out[start:])
+        del out[start:]
+        if name:
+            table = tables.get(name.lower())
+        else:
+            table = next((t for t in tables.values() if t.contains(sheet, row, col)), None)
+        if table is None:
+            raise FormulaError(f"Nieznana tabela '{name}' w formule: {formula}")
+        out.append(_resolve(table, formula[position + 1:end], row))
+        position = end + 1
+    return "".join(out)
@@ -0,0 +1,181 @@
+"""
+Tokenizer formuł Excela.
+
+Dzieli tekst formuły (z wiodącym "=" lub bez) na tokeny: liczby,
+teksty, wartości logiczne, błędy (#REF!, ...), odwołania (komórka, zakres, cała kolumna,
+z opcjonalną nazwą arkusza), nazwy funkcji, operatory i separatory.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from openpyxl.utils.cell import column_index_from_string
+
+
+class FormulaError(ValueError):
+    """Błąd składni formuły."""
+
+
+# Rodzaje tokenów
+NUMBER = "NUMBER"
+STRING = "STRING"
+BOOL = "BOOL"
+ERROR = "ERROR"
+REF = "REF"
+FUNC = "FUNC"
+OP = "OP"
+LPAREN = "LPAREN"
+RPAREN = "RPAREN"
+SEP = "SEP"
+
+_SHEET = r"(?:'(?:[^']|'')+'|[A-Za-z_À-ɏ][\w.À-ɏ]*)!"
+_CELL = r"\$?[A-Za-z]{1,3}\$?\d+"
+_COLUMN = r"\$?[A-Za-z]{1,3}"
+
+_TOKEN_RE = re.compile(
+    rf"""
+    (?P<ws>\s+)
+    |(?P<func>[A-Za-z][A-Za-z0-9._]*(?=\())
+    |(?P<ref>(?:{_SHEET})?(?:{_CELL}(?::{_CELL})?|{_COLUMN}:{_COLUMN})(?![\w(]))
+    |(?P<bool>(?:TRUE|FALSE)(?![\w(]))
+    |(?P<error>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A))
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<string>"(?:[^"]|"")*")
+    |(?P<op><>|<=|>=|[-+*/^&=<>%])
+    |(?P<lparen>\()
+    |(?P<rparen>\))
+    |(?P<sep>[,;])
+    """,
+    re.VERBOSE,
+)
+
+_CELL_RE = re.compile(r"\$?([A-Za-z]{1,3})\$?(\d+)")
+
+
+@dataclass(frozen=True)
+class Token:
+    """
+    Token formuły.
+
+    Attributes:
+        kind: Rodzaj tokenu (NUMBER, STRING, BOOL, REF, FUNC, OP, ...)
+        text: Tekst tokenu (dla STRING bez cudzysłowów, FUNC wielkimi literami)
+        position: Pozycja w formule (bez wiodącego "=")
+    """
+    kind: str
+    text: str
+    position: int
+
+
+@dataclass(frozen=True)
+class Reference:
+    """
+    Odwołanie do komórki lub zakresu.
+
+    Attributes:
+        sheet: Nazwa arkusza (None = arkusz formuły)
+        min_row: Pierwszy wiersz
+        min_col: Pierwsza kolumna
+        max_row: Ostatni wiersz (None = cała kolumna)
+        max_col: Ostatnia kolumna
+    """
+    sheet: Optional[str]
+    min_row: int
+    min_col: int
+    max_row: Optional[int]
+    max_col: int
+
+    @property
+    def is_cell(self) -> bool:
+        """Czy odwołanie wskazuje pojedynczą komórkę."""
+        return self.max_row == self.min_row and self.max_col == self.min_col
+
+    @property
+    def is_unbounded(self) -> bool:
+        """Czy odwołanie obejmuje całe kolumny (np. X:X)."""
+        return self.max_row is None
+
+
+def tokenize(formula: str) -> List[Token]:
+    """
+    Dzieli formułę na tokeny.
+
+    Args:
+        formula: Tekst formuły (np. '=IF(A2>0, A2, "")')
+
+    Returns:
+        Lista tokenów
+
+    Raises:
+        FormulaError: Gdy formuła zawiera nierozpoznany znak
+    """
+    text = formula[1:] if formula.startswith("=") else formula
+    tokens: List[Token] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            raise FormulaError(f"Nierozpoznany znak w formule na pozycji {position}: {formula}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "func":
+            tokens.append(Token(FUNC, value.upper(), position))
+        elif kind == "string":
+            tokens.append(Token(STRING, value[1:-1].replace('""', '"'), position))
+        elif kind != "ws":
+            tokens.append(Token(kind.upper(), value, position))
+        position = match.end()
+    return tokens
+
+
+def _split_sheet(text: str) -> Tuple[Optional[str], str]:
+    """Oddziela nazwę arkusza od adresu."""
+    if "!" not in text:
+        return None, text
+    sheet, address = text.rsplit("!", 1)
+    if sheet.startswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, address
+
+
+def _cell(address: str) -> Tuple[int, int]:
+    """Zamienia adres komórki (np. $B$6) na (wiersz, kolumna)."""
+    match = _CELL_RE.fullmatch(address)
+    if match is None:
+        raise FormulaError(f"Niepoprawny adres komórki: {address}")
+    return int(match.group(2)), column_index_from_string(match.group(1).upper())
+
+
+def parse_reference(text: str) -> Reference:
+    """
+    Zamienia tekst odwołania na ``Reference``.
+
+    Obsługuje komórki (A1, $B$6), zakresy (B22:B24), całe kolumny (X:X)
+    oraz prefiks arkusza ('Dziennik'!U:U, Ustawienia!$B$6).
+
+    Args:
+        text: Tekst odwołania
+
+    Returns:
+        Odwołanie
+
+    Raises:
+        FormulaError: Gdy tekst nie jest poprawnym odwołaniem
+    """
+    sheet, address = _split_sheet(text.strip())
+    start, _, end = address.partition(":")
+    if not any(ch.isdigit() for ch in address):
+        if not end:
+            raise FormulaError(f"Niepoprawne odwołanie: {text}")
+        first = column_index_from_string(start.replace("$", "").upper())
+        last = column_index_from_string(end.replace("$", "").upper())
+        return Reference(sheet, 1, min(first, last), None, max(first, last))
+
+    min_row, min_col = _cell(start)
+    max_row, max_col = _cell(end) if end else (min_row, min_col)
+    return Reference(
+        sheet,
+        min(min_row, max_row), min(min_col, max_col),
+        max(min_row, max_row), max(min_col, max_col),
+    )
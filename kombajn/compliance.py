@@ -0,0 +1,169 @@
+"""
+Realizacja planu treningowego w dzienniku.
+
+Łączy plan CSV (Data;Typ;TSS;Czas (min) lub Trening z biblioteki
+.zwo/.erg/.mrc) z wykonaniem z Dziennika, ocenia dni i tygodnie planu
+i zapisuje arkusz Realizacja planu.
+
+Użycie:
+    python -m kombajn compliance dziennik.xlsx plan.csv
+    python -m kombajn compliance dziennik.xlsx harmonogram.csv --workouts treningi/ --csv tygodnie.csv
+"""
+
+import argparse
+import csv
+import datetime
+import math
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.engine.compliance import (
+    SessionCompliance,
+    TrainingDays,
+    WeeklyCompliance,
+    load_plan,
+    session_compliance,
+    weekly_compliance,
+)
+from kombajn.engine.metrics import journal_metrics
+from kombajn.engine.workouts import summarize_library
+from kombajn.journal import load_journal, read_settings
+from kombajn.sheets import ComplianceSheet
+
+
+@dataclass(frozen=True)
+class ComplianceResult:
+    """
+    Wynik polecenia ``compliance``.
+
+    Attributes:
+        sessions: Realizacja dni planu
+        weeks: Realizacja tygodni planu
+        output_path: Zapisany dziennik
+    """
+    sessions: SessionCompliance
+    weeks: WeeklyCompliance
+    output_path: Path
+
+
+def write_compliance(workbook: Workbook, plan: TrainingDays) -> Worksheet:
+    """
+    Zapisuje (lub zastępuje) arkusz Realizacja planu.
+
+    Args:
+        workbook: Skoroszyt dziennika
+        plan: Plan jednego zawodnika
+
+    Returns:
+        Utworzony arkusz
+    """
+    sheet = ComplianceSheet(workbook, plan)
+    if sheet.title in workbook.sheetnames:
+        del workbook[sheet.title]
+    return sheet.create()
+
+
+def plan_compliance(
+    journal_path: Path,
+    plan_path: Path,
+    output_path: Optional[Path] = None,
+    workouts_dir: Optional[Path] = None,
+    cache_path: Optional[Path] = None
+) -> ComplianceResult:
+    """
+    Ocenia realizację planu i zapisuje arkusz Realizacja planu.
+
+    Args:
+        journal_path: Dziennik (xlsx)
+        plan_path: Plan CSV (``load_plan``)
+        output_path: Plik wynikowy (domyślnie nadpisuje dziennik)
+        workouts_dir: Biblioteka treningów dla kolumny "Trening" planu
+        cache_path: Pamięć podręczna biblioteki treningów
+
+    Returns:
+        Realizacja dni i tygodni planu
+
+    Raises:
+        ValueError: Przy błędnym planie lub dzienniku
+    """
+    wb = load_journal(journal_path)
+    ftp = read_settings(wb).get("FTP (W)")
+    library = None
+    if workouts_dir is not None:
+        if not isinstance(ftp, (int, float)) or ftp <= 0:
+            raise ValueError("Brak poprawnego FTP w [Ustawieniach] dla treningów z biblioteki")
+        library = summarize_library(workouts_dir, cache_path=cache_path)
+    plan = load_plan(plan_path, library, ftp or 0.0)
+
+    actual = TrainingDays.from_journal(journal_metrics(wb))
+    sessions = session_compliance(plan, actual)
+    weeks = weekly_compliance(sessions, actual)
+    write_compliance(wb, plan)
+
+    output_path = Path(output_path or journal_path)
+    wb.save(output_path)
+    return ComplianceResult(sessions, weeks, output_path)
+
+
+def write_weeks_csv(path: Path, weeks: WeeklyCompliance) -> None:
+    """Zapisuje realizację tygodni do pliku CSV (separator ";")."""
+    def value(number: float, digits: int) -> Any:
+        return "" if math.isnan(number) else round(float(number), digits)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Tydzień od", "Plan TSS", "TSS", "Realizacja", "Wynik", "Sesje", "Wykonane"])
+        for i, week in enumerate(weeks.weeks.tolist()):
+            writer.writerow([
+                datetime.date.fromordinal(week).isoformat(), value(weeks.planned_tss[i], 1),
+                value(weeks.tss[i], 1), value(weeks.ratio[i], 3), value(weeks.score[i], 0),
+                int(weeks.sessions[i]), int(weeks.completed[i]),
+            ])
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``compliance`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "compliance",
+        help="Realizacja planu: plan CSV kontra Dziennik",
+        description="Ocenia realizację dni i tygodni planu i zapisuje arkusz Realizacja planu.",
+    )
+    parser.add_argument("journal", type=Path, help="Dziennik (xlsx)")
+    parser.add_argument("plan", type=Path, help="Plan CSV (Data;Typ;TSS;Czas (min) lub Trening)")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="Plik wynikowy (domyślnie nadpisuje dziennik)")
+    parser.add_argument("--workouts", type=Path, default=None,
+                        help="Biblioteka treningów (.zwo/.erg/.mrc) dla kolumny Trening")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="Pamięć podręczna biblioteki treningów (JSON)")
+    parser.add_argument("--csv", type=Path, default=None, dest="csv_output",
+                        help="Zapisz realizację tygodni do CSV")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``compliance`` (kod wyjścia 1 przy błędzie)."""
+    try:
+        result = plan_compliance(args.journal, args.plan, args.output, args.workouts, args.cache)
+        if args.csv_output is not None:
+            write_weeks_csv(args.csv_output, result.weeks)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+
+    sessions = result.sessions
+    statuses = Counter(sessions.status.tolist())
+    scored = sessions.score[~np.isnan(sessions.score)]
+    mean = f"{scored.mean():.0f}" if scored.size else "--"
+    print(f"Plan: {len(sessions.plan)} dni, średni wynik {mean}/100 "
+          f"({', '.join(f'{name}: {count}' for name, count in statuses.most_common())})")
+    print(f"Dziennik: {result.output_path} (arkusz Realizacja planu, tygodnie: {result.weeks.weeks.size})")
+    if args.csv_output is not None:
+        print(f"CSV: {args.csv_output}")
+    return 0
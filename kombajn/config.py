@@ -59,11 +59,46 @@ class MetabolicDefaults:
     VO2MAX: float = 55.0        # ml/kg/min - maksymalne zużycie tlenu
     VLAMAX: float = 0.50        # mmol/L/s - max produkcja mleczanu
     FATMAX_PERCENT: float = 0.55  # % FTP gdzie max spalanie tłuszczu
+    GROSS_EFFICIENCY: float = 0.23  # Sprawność brutto pedałowania
     
 
 METABOLIC_DEFAULTS = MetabolicDefaults()
 
 
+# =============================================================================
+# DYSCYPLINY (TRIATHLON)
+# =============================================================================
+
+@dataclass(frozen=True)
+class SportDefaults:
+    """Domyślne progi dyscyplin dla rTSS / sTSS / hrTSS."""
+    
+    RUN_THRESHOLD_PACE: float = 4.5   # Tempo progowe biegu (min/km) - 4:30/km
+    SWIM_THRESHOLD_PACE: float = 1.75  # CSS pływanie (min/100 m) - 1:45/100 m
+    LTHR_BIKE: int = 165   # Tętno progowe na rowerze (bpm)
+    LTHR_RUN: int = 170    # Tętno progowe w biegu (bpm)
+    # TRIMP Banistera: HRr · A · e^(B · HRr)
+    TRIMP_A: float = 0.64
+    TRIMP_B: float = 1.92
+
+
+SPORT_DEFAULTS = SportDefaults()
+
+# Wartości kolumny "Sport" w Dzienniku (pusta = rower)
+SPORTS: List[str] = ["Rower", "Bieg", "Pływanie", "Inne"]
+
+# Typ aktywności z eksportów (małe litery) -> dyscyplina
+SPORT_ALIASES: Dict[str, str] = {
+    "ride": "Rower", "virtualride": "Rower", "cycling": "Rower", "road cycling": "Rower",
+    "indoor cycling": "Rower", "mountain biking": "Rower", "gravel cycling": "Rower",
+    "ebikeride": "Rower", "mountainbikeride": "Rower", "gravelride": "Rower",
+    "run": "Bieg", "virtualrun": "Bieg", "trailrun": "Bieg", "running": "Bieg",
+    "trail running": "Bieg", "treadmill running": "Bieg",
+    "swim": "Pływanie", "swimming": "Pływanie", "pool swim": "Pływanie",
+    "open water swimming": "Pływanie", "lap swimming": "Pływanie",
+}
+
+
 # =============================================================================
 # STREFY MOCY (COGGAN)
 # =============================================================================
@@ -127,13 +162,24 @@ HR_ZONES: List[HRZone] = [
 class SheetConfig:
     """Konfiguracja parametrów arkuszy."""
     
+    # Limit wierszy dzienników bez tabeli Excela (starsze pliki)
     MAX_LOG_ROWS: int = 1000
+    # Wiersze tabeli Dziennik w nowym pliku (tabela rośnie przy dopisywaniu)
     INITIAL_DAYS_COUNT: int = 90
     OUTPUT_FILENAME: str = "dziennik_kolarza_v3.xlsx"
     
     # Parametry PMC (Performance Management Chart)
     CTL_DAYS: int = 42   # Chronic Training Load - 42 dni
     ATL_DAYS: int = 7    # Acute Training Load - 7 dni
+    CTL_START: float = 0.0   # CTL przed pierwszym dniem dziennika
+    ATL_START: float = 0.0   # ATL przed pierwszym dniem dziennika
+    TSB_RACE_MIN: int = 10   # Okno formy na wyścig - dolna granica TSB
+    TSB_RACE_MAX: int = 25   # Okno formy na wyścig - górna granica TSB
+    CHART_WEEKS: int = 12    # Liczba tygodni na wykresie tygodniowego TSS
+    
+    # Budżet przeliczania formuł (na arkusz) - pilnowany przez kombajn.calc.cost
+    MAX_RECALC_CELL_VISITS: int = 100_000
+    MAX_VOLATILE_FORMULAS: int = 5
 
 
 SHEET_CONFIG = SheetConfig()
@@ -177,6 +223,12 @@ class Colors:
 
 COLORS = Colors()
 
+# Kolory stref Z1-Z7 (Strefy Mocy, kolumna "Strefa dom." w Dzienniku)
+ZONE_COLORS: List[str] = [
+    COLORS.ZONE_1, COLORS.ZONE_2, COLORS.ZONE_3, COLORS.ZONE_4,
+    COLORS.ZONE_5, COLORS.ZONE_6, COLORS.ZONE_7
+]
+
 
 # =============================================================================
 # NAGŁÓWKI DZIENNIKA KOLARSKIEGO
@@ -212,9 +264,70 @@ LOG_HEADERS: List[str] = [
     "CHO/h (g)", "Nawodnienie (L)",
     
     # === SEKCJA 9: NOTATKI ===
-    "Typ treningu", "RPE (1-10)", "Notatki"
+    "Typ treningu", "RPE (1-10)", "Notatki",
+    
+    # Nowe kolumny dopisywane wyłącznie na końcu - zapis do istniejących
+    # dzienników odbywa się według pozycji kolumn
+    
+    # === SEKCJA 10: CHO SPALONE (SPOŻYCIE VS SPALANIE) ===
+    "CHO spalone (g)",
+    
+    # === SEKCJA 11: DYSCYPLINA (TSS wg sportu) ===
+    "Sport",
+    
+    # === SEKCJA 12: ALERTY OBCIĄŻENIA (FORMUŁA) ===
+    "Alert obciążenia"
 ]
 
+
+def log_column(header: str) -> int:
+    """
+    Zwraca numer kolumny dziennika (1-based) dla nagłówka.
+    
+    Args:
+        header: Nagłówek z LOG_HEADERS
+        
+    Returns:
+        Numer kolumny
+        
+    Raises:
+        ValueError: Gdy nagłówka nie ma w LOG_HEADERS
+    """
+    try:
+        return LOG_HEADERS.index(header) + 1
+    except ValueError:
+        raise ValueError(f"Nieznana kolumna dziennika: {header}")
+
+
+# Tabela Excela obejmująca Dziennik (rośnie wraz z dopisywanymi wierszami)
+LOG_TABLE_NAME = "Dziennik"
+
+# Kolejne daty dziennika liczone od daty startowej w A2
+LOG_DATE_FORMULA = '=IF(ISBLANK($A$2), "", $A$2 + (ROW()-2))'
+
+
+def log_ref(header: str, this_row: bool = False) -> str:
+    """
+    Zwraca odwołanie strukturalne do kolumny tabeli dziennika.
+    
+    Args:
+        header: Nagłówek z LOG_HEADERS
+        this_row: Tylko bieżący wiersz (w Excelu wyświetlane jako [@Kolumna])
+        
+    Returns:
+        Np. "Dziennik[TSS]" lub "Dziennik[[#This Row],[TSS]]"
+        
+    Raises:
+        ValueError: Gdy nagłówka nie ma w LOG_HEADERS
+    """
+    log_column(header)
+    # Znaki specjalne nazwy kolumny poprzedzane apostrofem
+    name = "".join(f"'{char}" if char in "[]#'" else char for char in header)
+    if this_row:
+        return f"{LOG_TABLE_NAME}[[#This Row],[{name}]]"
+    return f"{LOG_TABLE_NAME}[[{name}]]" if not name.isalnum() else f"{LOG_TABLE_NAME}[{name}]"
+
+
 # Kolumny do ręcznego wpisania (1-based index) - żółte tło
 LOG_INPUT_COLUMNS: List[int] = [
     1,       # Data
@@ -226,8 +339,10 @@ LOG_INPUT_COLUMNS: List[int] = [
     17, 18, 19,  # Kadencja, HR
     30,      # Spożyte Kcal (kolumna 30, nie 31)
     35, 36, 37,  # Spożyte makro
-    38, 39,  # CHO/h, Nawodnienie
-    40, 41, 42   # Typ, RPE, Notatki
+    38, 39,      # CHO/h, Nawodnienie
+    40, 41, 42,  # Typ, RPE, Notatki
+    43,          # CHO spalone
+    44           # Sport
 ]
 
 # Kolumny kończące sekcje logiczne (gruba prawa krawędź)
@@ -240,6 +355,9 @@ LOG_SECTION_END_COLUMNS: List[int] = [
     31,  # Po Bilans Kcal
     37,  # Po Spożyte Węgle
     39,  # Po Nawodnienie
+    42,  # Po Notatkach
+    43,  # Po CHO spalonych
+    44,  # Po Sporcie
 ]
 
 # Szerokości kolumn dziennika
@@ -256,7 +374,10 @@ LOG_COLUMN_WIDTHS: List[int] = [
     8, 8, 8,     # Cele makro
     8, 8, 8,     # Spożyte makro
     8, 10,       # CHO/h, Nawodnienie
-    15, 8, 30    # Typ, RPE, Notatki
+    15, 8, 30,   # Typ, RPE, Notatki
+    10,          # CHO spalone
+    10,          # Sport
+    22           # Alert obciążenia
 ]
 
 
@@ -290,6 +411,29 @@ CHO_SAMPLE_DATA: List[Tuple] = [
     ("Makaron (ugotowany)", 200, 25, 131, "posiłek", "średnia", "Bazowy posiłek kolarski"),
 ]
 
+# Udział fruktozy w CHO produktu (0 = sama glukoza/maltodekstryna)
+# Używany przez planer żywienia do kontroli stosunku glukoza:fruktoza
+CHO_FRUCTOSE_SHARE: Dict[str, float] = {
+    "Żel SiS GO": 0.0,
+    "Żel Maurten 100": 0.8 / 1.8,
+    "Żel z kofeiną": 0.0,
+    "Baton Clif": 0.3,
+    "Daktyle Medjool (3 szt)": 0.5,
+    "Banan": 0.45,
+    "Napój Maurten 320": 0.8 / 1.8,
+    "Napój SiS GO": 0.0,
+    "Maltodekstryna": 0.0,
+    "Fruktoza": 1.0,
+    "Mix MD:Fruktoza 1:0.8": 0.8 / 1.8,
+    "Rodzynki": 0.5,
+    "Żelki Haribo": 0.3,
+    "Ryż biały (ugotowany)": 0.0,
+    "Makaron (ugotowany)": 0.0,
+}
+
+# Typy produktów nieprzydatne podczas jazdy (pomijane przez planer)
+CHO_OFF_BIKE_TYPES: Tuple[str, ...] = ("posiłek",)
+
 
 # =============================================================================
 # TYPY TRENINGÓW
@@ -311,6 +455,58 @@ TRAINING_TYPES: List[str] = [
 ]
 
 
+# =============================================================================
+# REALIZACJA PLANU
+# =============================================================================
+
+@dataclass(frozen=True)
+class ComplianceBands:
+    """Progi realizacji planu (wykonane / planowane TSS lub czas)."""
+    
+    FULL_MIN: float = 0.8      # Zgodny: 80-120% planu
+    FULL_MAX: float = 1.2
+    PARTIAL_MIN: float = 0.5   # Częściowo: 50-150% planu
+    PARTIAL_MAX: float = 1.5
+
+
+COMPLIANCE_BANDS = ComplianceBands()
+
+# Statusy sesji w arkuszu Realizacja planu
+COMPLIANCE_STATUSES: Tuple[str, ...] = ("Zgodny", "Częściowo", "Niezgodny", "Pominięty", "Wolne")
+
+
+# =============================================================================
+# ALERTY OBCIĄŻENIA (ACWR, RAMPA CTL)
+# =============================================================================
+
+@dataclass(frozen=True)
+class LoadAlertThresholds:
+    """
+    Bezpieczne pasma obciążenia dla kolumny "Alert obciążenia".
+    
+    ACWR = ATL / CTL (wykładnicze średnie 7/42 dni z PMC dziennika),
+    rampa = przyrost CTL w ciągu ``RAMP_DAYS`` dni.
+    """
+    
+    ACWR_LOW: float = 0.8      # Poniżej - spadek obciążenia (roztrenowanie)
+    ACWR_HIGH: float = 1.3     # Powyżej - podwyższone ryzyko przeciążenia
+    ACWR_DANGER: float = 1.5   # Powyżej - wysokie ryzyko przeciążenia
+    RAMP_MAX: float = 8.0      # Maks. przyrost CTL na tydzień
+    RAMP_DAYS: int = 7
+    MIN_CTL: float = 10.0      # Przy mniejszym CTL ACWR nie jest oceniany
+    WINDOW_DAYS: int = 28      # Okno oceny (Dashboard, ranking kadry)
+
+
+LOAD_ALERTS = LoadAlertThresholds()
+
+# Etykiety alertów w kolumnie "Alert obciążenia" (łączone " + ")
+LOAD_ALERT_LABELS: Dict[str, str] = {
+    "danger": "ACWR krytyczny",
+    "high": "ACWR wysoki",
+    "low": "ACWR niski",
+    "ramp": "Rampa CTL",
+}
+
 # =============================================================================
 # WALIDACJA KONFIGURACJI
 # =============================================================================
@@ -0,0 +1,459 @@
+"""
+Walidacja krzyżowa: formuły arkusza vs silnik wektorowy.
+
+Generuje losowe, syntetyczne dzienniki, wpisuje je do zbudowanego
+arkusza Dziennik (formuły wiersza 2 skopiowane w dół), przelicza
+formuły i porównuje metryki (IF, TSS, W/kg, strefa, CTL, ATL, TSB,
+alert obciążenia) z ``kombajn.engine.metrics.log_metrics``.
+
+Backendy przeliczania formuł:
+- "local" - ewaluator ``kombajn.calc`` (przyrostowo, szybko)
+- "libreoffice" - headless LibreOffice (gdy zainstalowany)
+- "auto" - LibreOffice, jeśli jest dostępny, w przeciwnym razie local
+
+Użycie:
+    python -m kombajn.crossval --cases 2000 --workers 4
+"""
+
+import argparse
+import datetime
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+
+from kombajn.calc import Evaluator, ExcelError
+from kombajn.config import SHEET_CONFIG, log_column
+from kombajn.engine.metrics import LogMetrics, log_metrics
+from kombajn.engine.sports import SportThresholds
+from kombajn.sheets import LogSheet, SettingsSheet
+
+
+# Kolumny porównywane z silnikiem: nagłówek -> pole LogMetrics
+COMPARED_COLUMNS = {
+    "IF": "intensity",
+    "TSS": "tss",
+    "W/kg (NP)": "w_per_kg",
+    "Strefa dom.": "zone",
+    "CTL": "ctl",
+    "ATL": "atl",
+    "TSB": "tsb",
+    "Alert obciążenia": "alert",
+}
+
+
+def _letter(header: str) -> str:
+    """Litera kolumny dziennika dla nagłówka."""
+    return get_column_letter(log_column(header))
+
+
+@dataclass(frozen=True)
+class SyntheticLog:
+    """
+    Losowy dziennik treningowy.
+
+    Attributes:
+        seed: Ziarno generatora (identyfikuje przypadek)
+        start: Data pierwszego dnia
+        minutes: Czas treningu (min) per dzień; NaN = dzień wolny
+        normalized_power: NP (W) per dzień; NaN = brak pomiaru mocy
+        ftp: FTP (W)
+        weight_kg: Waga (kg)
+        ctl0: CTL startowe
+        atl0: ATL startowe
+        sports: Kolumna "Sport" per dzień ("" = pusta komórka)
+        distance_km: Dystans (km) per dzień; NaN = brak
+        avg_hr: Tętno średnie per dzień; NaN = brak
+        thresholds: Progi dyscyplin (Ustawienia)
+    """
+    seed: int
+    start: datetime.date
+    minutes: np.ndarray
+    normalized_power: np.ndarray
+    ftp: float
+    weight_kg: float
+    ctl0: float
+    atl0: float
+    sports: List[str] = field(default_factory=list)
+    distance_km: Optional[np.ndarray] = None
+    avg_hr: Optional[np.ndarray] = None
+    thresholds: SportThresholds = SportThresholds()
+
+    @property
+    def days(self) -> int:
+        return int(self.minutes.size)
+
+    def metrics(self) -> LogMetrics:
+        """Metryki dziennika z silnika wektorowego."""
+        return log_metrics(
+            self.minutes, self.normalized_power, self.ftp, self.weight_kg, self.ctl0, self.atl0,
+            self.sports or None, self.distance_km, self.avg_hr, self.thresholds,
+        )
+
+
+def synthetic_log(seed: int, days: int = SHEET_CONFIG.INITIAL_DAYS_COUNT) -> SyntheticLog:
+    """
+    Generuje losowy dziennik.
+
+    Około 30% dni to dni wolne, a 5% treningów nie ma pomiaru mocy
+    (czas bez NP) - sprawdza to obsługę pustych komórek w formułach.
+    Dni mają losową dyscyplinę (w tym pustą i pisaną małymi literami),
+    a części brakuje dystansu lub tętna - sprawdza to rTSS, sTSS i hrTSS.
+
+    Args:
+        seed: Ziarno generatora
+        days: Liczba dni
+
+    Returns:
+        Syntetyczny dziennik
+    """
+    rng = np.random.default_rng(seed)
+    ftp = float(rng.integers(150, 400))
+    rest = rng.random(days) < 0.3
+    minutes = np.where(rest, np.nan, rng.integers(20, 360, days).astype(np.float64))
+    power = np.round(ftp * rng.uniform(0.45, 1.35, days))
+    power = np.where(rest | (rng.random(days) < 0.05), np.nan, power)
+    sports = [str(s) for s in rng.choice(["", "Rower", "Bieg", "bieg", "Pływanie", "Inne"], days)]
+    speed = np.array([{"Bieg": 12.0, "bieg": 12.0, "Pływanie": 2.5}.get(s, 30.0) for s in sports])
+    distance = np.round(minutes / 60 * speed * rng.uniform(0.7, 1.3, days), 2)
+    distance = np.where(rng.random(days) < 0.1, np.nan, distance)
+    heart_rate = np.where(rng.random(days) < 0.3, np.nan, rng.integers(95, 185, days).astype(np.float64))
+    max_hr = float(rng.integers(170, 205))
+    resting_hr = float(rng.integers(40, 65))
+    thresholds = SportThresholds(
+        ftp=ftp, max_hr=max_hr, resting_hr=resting_hr,
+        lthr_bike=max_hr - float(rng.integers(10, 25)), lthr_run=max_hr - float(rng.integers(5, 20)),
+        run_pace=round(float(rng.uniform(3.2, 6.5)), 2), swim_pace=round(float(rng.uniform(1.1, 2.5)), 2),
+    )
+    return SyntheticLog(
+        seed=seed,
+        start=datetime.date(2025, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 730))),
+        minutes=minutes,
+        normalized_power=power,
+        ftp=ftp,
+        weight_kg=round(float(rng.uniform(50.0, 100.0)), 1),
+        ctl0=round(float(rng.uniform(0.0, 100.0)), 1),
+        atl0=round(float(rng.uniform(0.0, 120.0)), 1),
+        sports=sports,
+        distance_km=distance,
+        avg_hr=heart_rate,
+        thresholds=thresholds,
+    )
+
+
+def log_template(days: int = SHEET_CONFIG.INITIAL_DAYS_COUNT) -> Workbook:
+    """
+    Buduje arkusze Ustawienia i Dziennik z tabelą na podaną liczbę dni.
+
+    Args:
+        days: Liczba wierszy tabeli dziennika
+
+    Returns:
+        Skoroszyt szablonu
+    """
+    wb = Workbook()
+    SettingsSheet(wb).create()
+    LogSheet(wb, rows=days).create()
+    return wb
+
+
+def _number(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def log_inputs(log: SyntheticLog) -> Dict[str, Dict[str, Any]]:
+    """
+    Zwraca wartości wejściowe dziennika: arkusz -> adres -> wartość.
+
+    Args:
+        log: Syntetyczny dziennik
+
+    Returns:
+        Wartości do wpisania w Ustawienia i Dziennik
+    """
+    minutes, power = _letter("Czas jazdy (min)"), _letter("NP (W)")
+    distance, heart_rate, sport = _letter("Dystans (km)"), _letter("Avg HR"), _letter("Sport")
+    nan = np.full(log.days, np.nan)
+    distances = nan if log.distance_km is None else log.distance_km
+    heart_rates = nan if log.avg_hr is None else log.avg_hr
+    dziennik: Dict[str, Any] = {"A2": log.start}
+    for i in range(log.days):
+        row = i + 2
+        dziennik[f"{minutes}{row}"] = _number(log.minutes[i])
+        dziennik[f"{power}{row}"] = _number(log.normalized_power[i])
+        dziennik[f"{distance}{row}"] = _number(distances[i])
+        dziennik[f"{heart_rate}{row}"] = _number(heart_rates[i])
+        dziennik[f"{sport}{row}"] = log.sports[i] or None if log.sports else None
+    thresholds = log.thresholds
+    return {
+        "Ustawienia": {
+            "B3": log.weight_kg, "B6": log.ftp, "B8": thresholds.max_hr, "B9": thresholds.resting_hr,
+            "B38": log.ctl0, "B39": log.atl0, "B41": thresholds.lthr_bike, "B42": thresholds.lthr_run,
+            "B43": thresholds.run_pace, "B44": thresholds.swim_pace,
+        },
+        "Dziennik": dziennik,
+    }
+
+
+def _compared_coordinates(days: int) -> Dict[str, List[str]]:
+    return {
+        header: [f"{_letter(header)}{row}" for row in range(2, days + 2)]
+        for header in COMPARED_COLUMNS
+    }
+
+
+# =============================================================================
+# BACKENDY
+# =============================================================================
+
+def libreoffice_binary() -> Optional[str]:
+    """Zwraca ścieżkę do LibreOffice (soffice) lub None."""
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+class LocalBackend:
+    """Przeliczanie ewaluatorem ``kombajn.calc`` - jeden szablon na wiele przypadków."""
+
+    name = "local"
+
+    def __init__(self, days: int) -> None:
+        self.days = days
+        self.evaluator = Evaluator(log_template(days))
+        self.coordinates = _compared_coordinates(days)
+
+    def evaluate(self, log: SyntheticLog) -> Dict[str, List[Any]]:
+        """Wpisuje dziennik do ewaluatora i zwraca wartości porównywanych kolumn."""
+        for sheet, values in log_inputs(log).items():
+            self.evaluator.set_values(sheet, values)
+        return {
+            header: self.evaluator.values("Dziennik", coordinates)
+            for header, coordinates in self.coordinates.items()
+        }
+
+
+class LibreOfficeBackend:
+    """Przeliczanie headless LibreOffice (konwersja xlsx -> xlsx z wartościami)."""
+
+    name = "libreoffice"
+
+    def __init__(self, days: int) -> None:
+        binary = libreoffice_binary()
+        if binary is None:
+            raise RuntimeError("LibreOffice (soffice) nie jest zainstalowany")
+        self.binary = binary
+        self.days = days
+        self.coordinates = _compared_coordinates(days)
+        # Osobny profil na proces - równoległe instancje soffice się nie blokują
+        self.profile = Path(tempfile.mkdtemp(prefix="kombajn_lo_"))
+
+    def evaluate(self, log: SyntheticLog) -> Dict[str, List[Any]]:
+        """Zapisuje dziennik do pliku, przelicza w LibreOffice i czyta wartości."""
+        wb = log_template(self.days)
+        for sheet, values in log_inputs(log).items():
+            for coordinate, value in values.items():
+                wb[sheet][coordinate] = value
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "in" / "case.xlsx"
+            source.parent.mkdir()
+            wb.save(source)
+            subprocess.run(
+                [
+                    self.binary, f"-env:UserInstallation={self.profile.as_uri()}",
+                    "--headless", "--calc", "--convert-to", "xlsx",
+                    "--outdir", tmpdir, str(source),
+                ],
+                check=True, capture_output=True, timeout=120,
+            )
+            ws = load_workbook(Path(tmpdir) / "case.xlsx", data_only=True)["Dziennik"]
+            return {
+                header: [ws[coordinate].value for coordinate in coordinates]
+                for header, coordinates in self.coordinates.items()
+            }
+
+
+def make_backend(name: str, days: int):
+    """
+    Tworzy backend przeliczania formuł.
+
+    Args:
+        name: "local", "libreoffice" lub "auto"
+        days: Liczba dni dziennika
+
+    Raises:
+        ValueError: Dla nieznanej nazwy backendu
+    """
+    if name == "auto":
+        name = "libreoffice" if libreoffice_binary() else "local"
+    if name == "local":
+        return LocalBackend(days)
+    if name == "libreoffice":
+        return LibreOfficeBackend(days)
+    raise ValueError(f"Nieznany backend: {name} (dostępne: local, libreoffice, auto)")
+
+
+# =============================================================================
+# PORÓWNANIE
+# =============================================================================
+
+@dataclass(frozen=True)
+class Mismatch:
+    """
+    Rozbieżność arkusza i silnika.
+
+    Attributes:
+        seed: Ziarno przypadku
+        day: Indeks dnia (0 = wiersz 2)
+        column: Nagłówek kolumny
+        sheet_value: Wartość z formuły
+        engine_value: Wartość z silnika
+    """
+    seed: int
+    day: int
+    column: str
+    sheet_value: Any
+    engine_value: Any
+
+
+def compare_case(
+    log: SyntheticLog,
+    sheet_values: Dict[str, List[Any]],
+    rel_tol: float = 1e-9,
+    abs_tol: float = 1e-7
+) -> List[Mismatch]:
+    """
+    Porównuje wartości formuł z silnikiem dla jednego dziennika.
+
+    Pusta komórka arkusza ("" lub None) odpowiada NaN silnika.
+
+    Args:
+        log: Syntetyczny dziennik
+        sheet_values: Wartości porównywanych kolumn z arkusza
+        rel_tol: Tolerancja względna
+        abs_tol: Tolerancja bezwzględna
+
+    Returns:
+        Lista rozbieżności (pusta = zgodność)
+    """
+    metrics = log.metrics()
+    mismatches = []
+    for header, attribute in COMPARED_COLUMNS.items():
+        expected = getattr(metrics, attribute)
+        for day, (actual, wanted) in enumerate(zip(sheet_values[header], expected)):
+            if isinstance(wanted, str):
+                ok = (actual or "") == wanted
+            elif math.isnan(wanted):
+                ok = actual in ("", None)
+            else:
+                ok = isinstance(actual, (int, float)) and not isinstance(actual, (bool, ExcelError)) \
+                    and math.isclose(actual, wanted, rel_tol=rel_tol, abs_tol=abs_tol)
+            if not ok:
+                engine = wanted if isinstance(wanted, str) else float(wanted)
+                mismatches.append(Mismatch(log.seed, day, header, actual, engine))
+    return mismatches
+
+
+@dataclass
+class CrossValidationReport:
+    """
+    Wynik walidacji krzyżowej.
+
+    Attributes:
+        backend: Użyty backend
+        cases: Liczba przypadków
+        mismatches: Znalezione rozbieżności
+        elapsed_s: Czas trwania (s)
+    """
+    backend: str
+    cases: int
+    mismatches: List[Mismatch] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def _run_chunk(seeds: Sequence[int], backend_name: str, days: int) -> List[Mismatch]:
+    """Waliduje porcję przypadków (funkcja modułowa - wymagana przez ProcessPool)."""
+    backend = make_backend(backend_name, days)
+    mismatches: List[Mismatch] = []
+    for seed in seeds:
+        log = synthetic_log(seed, days)
+        mismatches.extend(compare_case(log, backend.evaluate(log)))
+    return mismatches
+
+
+def cross_validate(
+    cases: int = 1000,
+    workers: Optional[int] = None,
+    backend: str = "auto",
+    days: int = SHEET_CONFIG.INITIAL_DAYS_COUNT,
+    first_seed: int = 0
+) -> CrossValidationReport:
+    """
+    Porównuje formuły arkusza z silnikiem na losowych dziennikach.
+
+    Przypadki dzielone są na porcje liczone równolegle; każdy proces
+    buduje szablon raz i przelicza kolejne przypadki przyrostowo.
+
+    Args:
+        cases: Liczba losowych dzienników
+        workers: Liczba procesów (domyślnie liczba rdzeni)
+        backend: "local", "libreoffice" lub "auto"
+        days: Liczba dni dziennika
+        first_seed: Ziarno pierwszego przypadku
+
+    Returns:
+        Raport walidacji
+    """
+    if backend == "auto":
+        backend = "libreoffice" if libreoffice_binary() else "local"
+    workers = max(1, min(workers or os.cpu_count() or 1, cases))
+    seeds = list(range(first_seed, first_seed + cases))
+    chunks = [seeds[i::workers] for i in range(workers)]
+
+    start = time.perf_counter()
+    report = CrossValidationReport(backend, cases)
+    if workers == 1:
+        report.mismatches = _run_chunk(seeds, backend, days)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunk, chunk, backend, days) for chunk in chunks]
+            for future in futures:
+                report.mismatches.extend(future.result())
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Uruchamia walidację z linii poleceń (kod wyjścia 1 przy rozbieżnościach)."""
+    parser = argparse.ArgumentParser(description="Walidacja krzyżowa formuł Dziennika z silnikiem")
+    parser.add_argument("--cases", type=int, default=1000, help="Liczba losowych dzienników")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów")
+    parser.add_argument("--backend", choices=("auto", "local", "libreoffice"), default="auto")
+    parser.add_argument("--days", type=int, default=SHEET_CONFIG.INITIAL_DAYS_COUNT)
+    args = parser.parse_args(argv)
+
+    report = cross_validate(args.cases, args.workers, args.backend, args.days)
+    print(f"Backend: {report.backend}, przypadki: {report.cases}, "
+          f"czas: {report.elapsed_s:.1f} s, rozbieżności: {len(report.mismatches)}")
+    for mismatch in report.mismatches[:20]:
+        print(f"  seed={mismatch.seed} dzień={mismatch.day} [{mismatch.column}] "
+              f"arkusz={mismatch.sheet_value!r} silnik={mismatch.engine_value!r}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Silnik obliczeniowy Kombajnu Kolarza.
+
+Ten pakiet zawiera wektorowe (NumPy) analizy danych treningowych,
+których wyniki trafiają do arkuszy skoroszytu.
+"""
+
+from kombajn.engine.activities import Activity, ActivityLog, DailyTotals, activity_tss
+from kombajn.engine.streams import activity_date, iter_archive, load_power_stream
+from kombajn.engine.intervals import (
+    Interval,
+    analyze_archive,
+    annotate_journal,
+    detect_intervals,
+    interval_notes,
+    smooth_power,
+    summarize_intervals,
+)
+from kombajn.engine.metabolic import (
+    Combustion,
+    MetabolicProfile,
+    annotate_cho_burned,
+    combustion_archive,
+    fatmax_power,
+    ride_combustion,
+    season_combustion,
+    substrate_rates,
+)
+from kombajn.engine.alerts import (
+    LoadAlerts,
+    RosterRisk,
+    ctl_ramp,
+    day_risk,
+    load_alerts,
+    roster_risk,
+)
+from kombajn.engine.metrics import JournalMetrics, LogMetrics, journal_metrics, log_metrics
+from kombajn.engine.sports import (
+    SPORT_MODELS,
+    SportModel,
+    SportThresholds,
+    daily_load,
+    hr_tss,
+    register_sport,
+    running_tss,
+    session_load,
+    sport_of,
+    stream_hr_tss,
+    stream_running_tss,
+    stream_swim_tss,
+    swim_tss,
+    trimp,
+)
+from kombajn.engine.workouts import (
+    PlanComparison,
+    PlannedDay,
+    Workout,
+    WorkoutLibrary,
+    WorkoutSummary,
+    compare_plan,
+    expand_segments,
+    load_schedule,
+    load_workout,
+    parse_erg,
+    parse_zwo,
+    planned_days,
+    summarize_library,
+    summarize_workout,
+)
+from kombajn.engine.compliance import (
+    SessionCompliance,
+    TrainingDays,
+    WeeklyCompliance,
+    compliance_score,
+    compliance_status,
+    load_plan,
+    session_compliance,
+    weekly_compliance,
+)
+from kombajn.engine.pmc import (
+    TAPER_SHAPES,
+    TaperPlan,
+    ewma_load,
+    load_planned_tss,
+    optimize_taper,
+    pmc,
+    taper_multipliers,
+)
+
+__all__ = [
+    "Activity",
+    "ActivityLog",
+    "DailyTotals",
+    "activity_tss",
+    "activity_date",
+    "iter_archive",
+    "load_power_stream",
+    "Interval",
+    "analyze_archive",
+    "annotate_journal",
+    "detect_intervals",
+    "interval_notes",
+    "smooth_power",
+    "summarize_intervals",
+    "Combustion",
+    "MetabolicProfile",
+    "annotate_cho_burned",
+    "combustion_archive",
+    "fatmax_power",
+    "ride_combustion",
+    "season_combustion",
+    "substrate_rates",
+    "LoadAlerts",
+    "RosterRisk",
+    "ctl_ramp",
+    "day_risk",
+    "load_alerts",
+    "roster_risk",
+    "JournalMetrics",
+    "LogMetrics",
+    "journal_metrics",
+    "log_metrics",
+    "SPORT_MODELS",
+    "SportModel",
+    "SportThresholds",
+    "daily_load",
+    "hr_tss",
+    "register_sport",
+    "running_tss",
+    "session_load",
+    "sport_of",
+    "stream_hr_tss",
+    "stream_running_tss",
+    "stream_swim_tss",
+    "swim_tss",
+    "trimp",
+    "PlanComparison",
+    "PlannedDay",
+    "Workout",
+    "WorkoutLibrary",
+    "WorkoutSummary",
+    "compare_plan",
+    "expand_segments",
+    "load_schedule",
+    "load_workout",
+    "parse_erg",
+    "parse_zwo",
+    "planned_days",
+    "summarize_library",
+    "summarize_workout",
+    "SessionCompliance",
+    "TrainingDays",
+    "WeeklyCompliance",
+    "compliance_score",
+    "compliance_status",
+    "load_plan",
+    "session_compliance",
+    "weekly_compliance",
+    "TAPER_SHAPES",
+    "TaperPlan",
+    "ewma_load",
+    "load_planned_tss",
+    "optimize_taper",
+    "pmc",
+    "taper_multipliers",
+]
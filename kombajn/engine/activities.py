@@ -0,0 +1,245 @@
+"""
+Aktywności pod dziennym wpisem Dziennika.
+
+Dziennik ma jeden wiersz na dzień, a dzień może mieć kilka aktywności
+(np. dojazd rano i interwały wieczorem). ``ActivityLog`` trzyma
+aktywności kolumnowo (tablice NumPy) posortowane po dacie, z indeksem
+data -> zakres wierszy. Sumy dzienne liczone są wektorowo
+(``np.add.reduceat`` na posortowanych tablicach):
+
+- czas, praca (kJ = moc średnia · czas) i TSS - sumy
+- NP - średnia potęgowa rzędu 4 ważona czasem:
+  NP = (Σ t·NP⁴ / Σ t)^(1/4), tak jak NP liczone z całego dnia jazdy
+  (NP to czwarta potęga 30-s średniej kroczącej)
+
+TSS aktywności bez TSS z eksportu liczony jest z NP i FTP tą samą
+formułą co kolumna TSS Dziennika.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+# Pola liczbowe aktywności (NaN = brak)
+ACTIVITY_FIELDS = (
+    "minutes", "distance_km", "elevation_m", "avg_power", "normalized_power",
+    "max_power", "cadence", "avg_hr", "max_hr", "tss",
+)
+
+
+@dataclass(frozen=True)
+class Activity:
+    """
+    Pojedyncza aktywność.
+
+    Attributes:
+        day: Data aktywności
+        kind: Typ / nazwa (np. "Ride", "Commute")
+        minutes: Czas (min)
+        distance_km: Dystans (km)
+        elevation_m: Przewyższenia (m)
+        avg_power: Moc średnia (W)
+        normalized_power: NP (W)
+        max_power: Moc maksymalna (W)
+        cadence: Kadencja średnia
+        avg_hr: Tętno średnie
+        max_hr: Tętno maksymalne
+        tss: TSS z eksportu (NaN = liczony z NP i FTP)
+    """
+    day: datetime.date
+    kind: str = ""
+    minutes: float = np.nan
+    distance_km: float = np.nan
+    elevation_m: float = np.nan
+    avg_power: float = np.nan
+    normalized_power: float = np.nan
+    max_power: float = np.nan
+    cadence: float = np.nan
+    avg_hr: float = np.nan
+    max_hr: float = np.nan
+    tss: float = np.nan
+
+
+@dataclass(frozen=True)
+class DailyTotals:
+    """
+    Sumy dzienne aktywności (kolejne dni z co najmniej jedną aktywnością).
+
+    Attributes:
+        days: Daty
+        count: Liczba aktywności dnia
+        first: Indeks pierwszej aktywności dnia w ``ActivityLog``
+        minutes: Łączny czas (min)
+        kilojoules: Łączna praca (kJ); NaN bez mocy średniej
+        tss: Suma TSS; NaN bez TSS i NP
+        normalized_power: NP dnia (średnia rzędu 4 ważona czasem)
+    """
+    days: List[datetime.date]
+    count: np.ndarray
+    first: np.ndarray
+    minutes: np.ndarray
+    kilojoules: np.ndarray
+    tss: np.ndarray
+    normalized_power: np.ndarray
+
+
+def activity_tss(minutes: np.ndarray, normalized_power: np.ndarray, ftp: float) -> np.ndarray:
+    """TSS z czasu i NP (kolejność działań jak w formule TSS Dziennika)."""
+    minutes = np.asarray(minutes, dtype=np.float64)
+    power = np.asarray(normalized_power, dtype=np.float64)
+    if ftp <= 0:
+        return np.full(power.shape, np.nan)
+    return (minutes * 60 * power * (power / ftp)) / (ftp * 3600) * 100
+
+
+class ActivityLog:
+    """
+    Aktywności posortowane po dacie z indeksem data -> wiersze.
+
+    Attributes:
+        days: Numery dni (``date.toordinal()``), rosnąco
+        kinds: Typy aktywności
+        columns: Pole (``ACTIVITY_FIELDS``) -> tablica wartości
+    """
+
+    def __init__(
+        self,
+        days: Sequence[int],
+        kinds: Sequence[str],
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> None:
+        """
+        Tworzy dziennik aktywności (sortowanie stabilne po dacie).
+
+        Args:
+            days: Numery dni aktywności (``date.toordinal()``)
+            kinds: Typy aktywności (ta sama długość)
+            columns: Pole -> wartości; brakujące pola to NaN
+
+        Raises:
+            ValueError: Przy nieznanym polu lub różnych długościach
+        """
+        days = np.asarray(days, dtype=np.int64)
+        columns = columns or {}
+        unknown = sorted(set(columns) - set(ACTIVITY_FIELDS))
+        if unknown:
+            raise ValueError(f"Nieznane pola aktywności: {', '.join(unknown)}")
+        if len(kinds) != len(days) or any(len(v) != len(days) for v in columns.values()):
+            raise ValueError("Kolumny aktywności mają różne długości")
+
+        order = np.argsort(days, kind="stable")
+        self.days = days[order]
+        self.kinds = [kinds[i] for i in order]
+        self.columns = {
+            name: np.asarray(columns[name], dtype=np.float64)[order] if name in columns
+            else np.full(len(days), np.nan)
+            for name in ACTIVITY_FIELDS
+        }
+        self._index_days, self._starts = np.unique(self.days, return_index=True)
+
+    @classmethod
+    def from_activities(cls, activities: Iterable[Activity]) -> "ActivityLog":
+        """Tworzy dziennik z listy aktywności."""
+        activities = list(activities)
+        return cls(
+            [a.day.toordinal() for a in activities],
+            [a.kind for a in activities],
+            {name: np.array([getattr(a, name) for a in activities], dtype=np.float64)
+             for name in ACTIVITY_FIELDS},
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, index: int) -> Activity:
+        return Activity(
+            datetime.date.fromordinal(int(self.days[index])),
+            self.kinds[index],
+            **{name: float(values[index]) for name, values in self.columns.items()},
+        )
+
+    def __iter__(self) -> Iterator[Activity]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def dates(self) -> List[datetime.date]:
+        """Daty z aktywnościami (rosnąco, bez powtórzeń)."""
+        return [datetime.date.fromordinal(int(d)) for d in self._index_days]
+
+    def rows_for(self, day: datetime.date) -> range:
+        """Indeksy aktywności dnia (pusty zakres, gdy brak)."""
+        number = day.toordinal()
+        start = int(np.searchsorted(self.days, number, side="left"))
+        stop = int(np.searchsorted(self.days, number, side="right"))
+        return range(start, stop)
+
+    def on(self, day: datetime.date) -> List[Activity]:
+        """Aktywności dnia."""
+        return [self[i] for i in self.rows_for(day)]
+
+    def merged(self, other: "ActivityLog") -> "ActivityLog":
+        """
+        Łączy dzienniki; dni obecne w ``other`` zastępują dni z tego dziennika.
+
+        Args:
+            other: Nowe aktywności (np. z kolejnego importu)
+
+        Returns:
+            Nowy dziennik aktywności
+        """
+        keep = ~np.isin(self.days, other.days)
+        return ActivityLog(
+            np.concatenate([self.days[keep], other.days]),
+            [k for k, kept in zip(self.kinds, keep) if kept] + list(other.kinds),
+            {name: np.concatenate([self.columns[name][keep], other.columns[name]])
+             for name in ACTIVITY_FIELDS},
+        )
+
+    def tss(self, ftp: float) -> np.ndarray:
+        """TSS aktywności: z eksportu, w razie braku z NP i FTP."""
+        given = self.columns["tss"]
+        computed = activity_tss(self.columns["minutes"], self.columns["normalized_power"], ftp)
+        return np.where(np.isnan(given), computed, given)
+
+    def daily(self, ftp: float) -> DailyTotals:
+        """
+        Liczy sumy dzienne wektorowo.
+
+        Args:
+            ftp: FTP (W) dla aktywności bez TSS z eksportu
+
+        Returns:
+            Sumy dla kolejnych dni z aktywnościami
+        """
+        starts = self._starts
+        if len(self) == 0:
+            empty = np.empty(0)
+            return DailyTotals([], empty.astype(np.int64), empty.astype(np.int64),
+                               empty, empty, empty, empty)
+
+        def total(values: np.ndarray) -> np.ndarray:
+            """Suma dnia pomijająca NaN (NaN, gdy dzień nie ma żadnej wartości)."""
+            present = np.add.reduceat((~np.isnan(values)).astype(np.int64), starts)
+            sums = np.add.reduceat(np.nan_to_num(values), starts)
+            return np.where(present > 0, sums, np.nan)
+
+        minutes = self.columns["minutes"]
+        power = self.columns["normalized_power"]
+        weights = np.where(np.isnan(power) | np.isnan(minutes), 0.0, np.nan_to_num(minutes))
+        weighted = np.add.reduceat(weights * np.nan_to_num(power) ** 4, starts)
+        weight_sum = np.add.reduceat(weights, starts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(weight_sum > 0, (weighted / weight_sum) ** 0.25, np.nan)
+
+        return DailyTotals(
+            days=self.dates,
+            count=np.diff(np.append(starts, len(self))),
+            first=starts.astype(np.int64),
+            minutes=total(minutes),
+            kilojoules=total(self.columns["avg_power"] * minutes * 60 / 1000),
+            tss=total(self.tss(ftp)),
+            normalized_power=normalized,
+        )
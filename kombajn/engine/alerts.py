@@ -0,0 +1,246 @@
+"""
+Alerty obciążenia: ACWR i tempo przyrostu CTL (rampa).
+
+ACWR (acute:chronic workload ratio) liczony jest z wykładniczych
+średnich PMC dziennika: ACWR = ATL / CTL (7 i 42 dni), więc alerty
+zgadzają się z kolumnami CTL/ATL arkusza Dziennik. Rampa to przyrost
+CTL w ciągu ``RAMP_DAYS`` dni (przed początkiem dziennika - CTL
+startowe z Ustawień).
+
+Dni poza pasmami ``LOAD_ALERTS`` dostają etykiety ``LOAD_ALERT_LABELS``
+identyczne z formułą kolumny "Alert obciążenia". ``roster_risk`` liczy
+to samo dla wielu zawodników naraz (macierz zawodnicy x dni kalendarza)
+i zwraca listę posortowaną od najwyższego ryzyka.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from kombajn.config import LOAD_ALERT_LABELS, LOAD_ALERTS, LoadAlertThresholds
+
+if TYPE_CHECKING:
+    # Tylko dla adnotacji - metrics importuje load_alerts z tego modułu
+    from kombajn.engine.metrics import JournalMetrics
+
+
+@dataclass(frozen=True)
+class LoadAlerts:
+    """
+    Alerty obciążenia kolejnych dni.
+
+    Attributes:
+        acwr: ATL / CTL (NaN gdy CTL < ``MIN_CTL`` lub brak danych)
+        ramp: Przyrost CTL w ciągu ``RAMP_DAYS`` dni
+        flags: Etykiety alertów ("" = w bezpiecznych pasmach)
+    """
+    acwr: np.ndarray
+    ramp: np.ndarray
+    flags: np.ndarray
+
+
+def ctl_ramp(ctl: np.ndarray, ctl0=0.0, days: int = LOAD_ALERTS.RAMP_DAYS) -> np.ndarray:
+    """
+    Liczy przyrost CTL w ciągu ``days`` dni.
+
+    Args:
+        ctl: CTL - kształt (dni,) lub (zawodnicy, dni)
+        ctl0: CTL przed pierwszym dniem (skalar lub wektor per zawodnik)
+        days: Długość okna rampy
+
+    Returns:
+        CTL[t] - CTL[t - days] tego samego kształtu co ``ctl``
+    """
+    ctl = np.asarray(ctl, dtype=np.float64)
+    seed = np.asarray(ctl0, dtype=np.float64)
+    if ctl.ndim > 1 and seed.ndim:
+        seed = seed[:, None]
+    previous = np.empty_like(ctl)
+    previous[..., :days] = seed
+    # Puste CTL sprzed tygodnia liczy się jako 0 (N() w formule)
+    previous[..., days:] = np.nan_to_num(ctl[..., :-days], nan=0.0)
+    return ctl - previous
+
+
+def load_alerts(
+    ctl: np.ndarray,
+    atl: np.ndarray,
+    ctl0=0.0,
+    thresholds: LoadAlertThresholds = LOAD_ALERTS
+) -> LoadAlerts:
+    """
+    Liczy ACWR, rampę CTL i etykiety alertów (wektorowo).
+
+    Args:
+        ctl: CTL - kształt (dni,) lub (zawodnicy, dni); NaN = brak daty
+        atl: ATL tego samego kształtu
+        ctl0: CTL startowe (skalar lub wektor per zawodnik)
+        thresholds: Pasma bezpiecznego obciążenia
+
+    Returns:
+        Alerty obciążenia
+    """
+    ctl = np.asarray(ctl, dtype=np.float64)
+    atl = np.asarray(atl, dtype=np.float64)
+    rated = np.isfinite(atl) & (np.nan_to_num(ctl) >= thresholds.MIN_CTL)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acwr = np.where(rated, atl / ctl, np.nan)
+    ramp = ctl_ramp(ctl, ctl0, thresholds.RAMP_DAYS)
+
+    labels = LOAD_ALERT_LABELS
+    flags = np.select(
+        [acwr > thresholds.ACWR_DANGER, acwr > thresholds.ACWR_HIGH, acwr < thresholds.ACWR_LOW],
+        [labels["danger"], labels["high"], labels["low"]],
+        "",
+    )
+    steep = ramp > thresholds.RAMP_MAX
+    flags = np.where(
+        steep,
+        np.where(flags == "", labels["ramp"], np.char.add(flags, f" + {labels['ramp']}")),
+        flags,
+    )
+    return LoadAlerts(acwr, ramp, flags)
+
+
+def day_risk(alerts: LoadAlerts, thresholds: LoadAlertThresholds = LOAD_ALERTS) -> np.ndarray:
+    """
+    Ryzyko przeciążenia dnia: przekroczenie górnych pasm ACWR i rampy.
+
+    1 = ACWR na progu ``ACWR_DANGER`` lub rampa dwa razy ponad limit;
+    0 = oba wskaźniki w pasmach (niski ACWR nie jest ryzykiem przeciążenia).
+    """
+    acwr = (alerts.acwr - thresholds.ACWR_HIGH) / (thresholds.ACWR_DANGER - thresholds.ACWR_HIGH)
+    ramp = alerts.ramp / thresholds.RAMP_MAX - 1.0
+    return np.maximum(np.nan_to_num(acwr, nan=0.0).clip(0.0), np.nan_to_num(ramp, nan=0.0).clip(0.0))
+
+
+@dataclass(frozen=True)
+class RosterRisk:
+    """
+    Ranking ryzyka zawodników (od najwyższego).
+
+    Attributes:
+        as_of: Ostatni dzień okna oceny
+        days: Długość okna oceny (dni)
+        athletes: Zawodnicy w kolejności rankingu
+        score: Suma dziennego ryzyka w oknie (``day_risk``)
+        alert_days: Liczba dni z alertem w oknie
+        acwr: ACWR w dniu ``as_of``
+        ramp: Rampa CTL w dniu ``as_of``
+        max_acwr: Najwyższy ACWR w oknie
+        max_ramp: Najwyższa rampa CTL w oknie
+        flags: Alert w dniu ``as_of``
+    """
+    as_of: datetime.date
+    days: int
+    athletes: List[str]
+    score: np.ndarray
+    alert_days: np.ndarray
+    acwr: np.ndarray
+    ramp: np.ndarray
+    max_acwr: np.ndarray
+    max_ramp: np.ndarray
+    flags: List[str]
+
+    def __len__(self) -> int:
+        return len(self.athletes)
+
+
+def _nanmax(values: np.ndarray) -> np.ndarray:
+    """Maksimum wierszy z pominięciem NaN (NaN dla wierszy bez wartości)."""
+    filled = np.where(np.isnan(values), -np.inf, values)
+    best = filled.max(axis=1)
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+def roster_risk(
+    journals: Dict[str, "JournalMetrics"],
+    days: int = LOAD_ALERTS.WINDOW_DAYS,
+    as_of: Optional[datetime.date] = None,
+    thresholds: LoadAlertThresholds = LOAD_ALERTS
+) -> RosterRisk:
+    """
+    Ocenia ryzyko przeciążenia wszystkich zawodników jednym przebiegiem.
+
+    Dzienniki układane są na wspólnym kalendarzu (macierz zawodnicy x dni;
+    przed początkiem dziennika CTL/ATL startowe, po jego końcu brak danych),
+    po czym ACWR, rampa i alerty liczone są dla całej macierzy naraz.
+
+    Args:
+        journals: Zawodnik -> metryki dziennika (``journal_metrics``)
+        days: Długość okna oceny kończącego się w dniu ``as_of``
+        as_of: Dzień oceny (domyślnie ostatni dzień z treningiem w kadrze)
+        thresholds: Pasma bezpiecznego obciążenia
+
+    Returns:
+        Ranking zawodników od najwyższego ryzyka
+
+    Raises:
+        ValueError: Gdy brak dzienników z datami lub treningów
+    """
+    if days < 1:
+        raise ValueError(f"Okno oceny musi mieć co najmniej 1 dzień (podano {days})")
+    names = [name for name, journal in journals.items() if journal.days]
+    if not names:
+        raise ValueError("Brak dzienników z wpisami")
+    ordinals = [np.array([day.toordinal() for day in journals[name].days]) for name in names]
+    first = min(int(o[0]) for o in ordinals)
+    last = max(int(o[-1]) for o in ordinals)
+
+    if as_of is None:
+        trained = [
+            o[np.isfinite(journals[name].metrics.tss)] for name, o in zip(names, ordinals)
+        ]
+        trained = [o for o in trained if o.size]
+        if not trained:
+            raise ValueError("Brak treningów w dziennikach")
+        end = max(int(o[-1]) for o in trained)
+    else:
+        end = as_of.toordinal()
+    if end < first:
+        raise ValueError(f"Dzień oceny {datetime.date.fromordinal(end)} jest przed początkiem dzienników")
+
+    # Wspólny kalendarz: rozproszenie wszystkich dni wszystkich dzienników naraz
+    lengths = np.array([o.size for o in ordinals])
+    rows = np.repeat(np.arange(len(names)), lengths)
+    cols = np.concatenate(ordinals) - first
+    starts = np.array([o[0] for o in ordinals]) - first
+    ctl0 = np.array([journals[name].ctl0 for name in names], dtype=np.float64)
+    atl0 = np.array([journals[name].atl0 for name in names], dtype=np.float64)
+
+    calendar = np.arange(max(last, end) - first + 1)[None, :]
+    before = calendar < starts[:, None]
+    ctl = np.where(before, ctl0[:, None], np.nan)
+    atl = np.where(before, atl0[:, None], np.nan)
+    ctl[rows, cols] = np.concatenate([journals[name].metrics.ctl for name in names])
+    atl[rows, cols] = np.concatenate([journals[name].metrics.atl for name in names])
+
+    alerts = load_alerts(ctl, atl, ctl0, thresholds)
+    logged = ~before & np.isfinite(ctl)
+    acwr = np.where(logged, alerts.acwr, np.nan)
+    ramp = np.where(logged, alerts.ramp, np.nan)
+    flags = np.where(logged, alerts.flags, "")
+    risk = np.where(logged, day_risk(alerts, thresholds), 0.0)
+
+    today = end - first
+    window = slice(max(today + 1 - days, 0), today + 1)
+    score = risk[:, window].sum(axis=1)
+    alert_days = (flags[:, window] != "").sum(axis=1)
+    current = acwr[:, today]
+
+    # Ranking: wynik, dni z alertem, bieżący ACWR (malejąco)
+    order = np.lexsort((-np.nan_to_num(current, nan=-np.inf), -alert_days, -score))
+    return RosterRisk(
+        as_of=datetime.date.fromordinal(end),
+        days=days,
+        athletes=[names[i] for i in order],
+        score=score[order],
+        alert_days=alert_days[order],
+        acwr=current[order],
+        ramp=ramp[order, today],
+        max_acwr=_nanmax(acwr[:, window])[order],
+        max_ramp=_nanmax(ramp[:, window])[order],
+        flags=flags[order, today].tolist(),
+    )
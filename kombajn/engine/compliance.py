@@ -0,0 +1,365 @@
+"""
+Realizacja planu treningowego.
+
+Plan (data -> typ, TSS, czas) łączony jest z wykonaniem (kolumny
+"Typ treningu", TSS i czas Dziennika) przez indeksowane złączenie po
+kluczu zawodnik·2³² + numer dnia: obie strony są posortowane, a wiersze
+wykonania wyszukiwane binarnie (``np.searchsorted``), więc wieloletnie
+plany setek zawodników łączone są w jednym przebiegu O((n + m) log m).
+
+Realizacja sesji to wykonane / planowane TSS (czas, gdy plan nie ma TSS):
+
+- wynik = 100 · max(0, 1 - |realizacja - 1|)
+- status wg ``COMPLIANCE_BANDS``: Zgodny (80-120%), Częściowo (50-150%),
+  Niezgodny, Pominięty (brak wykonania) lub Wolne (plan bez obciążenia)
+
+Tydzień (od poniedziałku) porównuje planowany TSS z TSS wszystkich dni
+tygodnia z Dziennika - tak samo jak formuły arkusza Realizacja planu.
+"""
+
+import csv
+import datetime
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kombajn.config import COMPLIANCE_BANDS, COMPLIANCE_STATUSES
+from kombajn.engine.metrics import JournalMetrics
+from kombajn.engine.workouts import PlannedDay, WorkoutLibrary
+
+
+# Przesunięcie numeru zawodnika w kluczu złączenia
+_ATHLETE_SHIFT = 1 << 32
+
+
+def week_start(days: np.ndarray) -> np.ndarray:
+    """Poniedziałek tygodnia dla numerów dni (``date.toordinal()``; dzień 1 to poniedziałek)."""
+    days = np.asarray(days, dtype=np.int64)
+    return days - (days - 1) % 7
+
+
+def _keys(athletes: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Klucz złączenia zawodnik·2³² + numer dnia."""
+    return athletes.astype(np.int64) * _ATHLETE_SHIFT + days
+
+
+class TrainingDays:
+    """
+    Dni treningowe (plan lub wykonanie) jednego lub wielu zawodników.
+
+    Wpisy z tym samym zawodnikiem i dniem są sumowane (typy łączone " + "),
+    wynik jest posortowany po kluczu zawodnik, dzień.
+
+    Attributes:
+        athletes: Numery zawodników
+        days: Numery dni (``date.toordinal()``)
+        kinds: Typy treningu
+        tss: TSS (0 = brak)
+        minutes: Czas (min; 0 = brak)
+    """
+
+    def __init__(
+        self,
+        days: Sequence[int],
+        kinds: Sequence[str],
+        tss: Sequence[float],
+        minutes: Sequence[float],
+        athletes: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Tworzy tabelę dni.
+
+        Args:
+            days: Numery dni
+            kinds: Typy treningu (ta sama długość)
+            tss: TSS; NaN traktowane jako 0
+            minutes: Czas (min); NaN traktowane jako 0
+            athletes: Numery zawodników (domyślnie jeden zawodnik: 0)
+
+        Raises:
+            ValueError: Przy różnych długościach kolumn
+        """
+        days = np.asarray(days, dtype=np.int64)
+        athletes = (np.zeros(days.size, dtype=np.int64) if athletes is None
+                    else np.asarray(athletes, dtype=np.int64))
+        tss = np.nan_to_num(np.asarray(tss, dtype=np.float64))
+        minutes = np.nan_to_num(np.asarray(minutes, dtype=np.float64))
+        if not len(kinds) == athletes.size == tss.size == minutes.size == days.size:
+            raise ValueError("Kolumny dni treningowych mają różne długości")
+
+        keys = _keys(athletes, days)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self.keys, starts = np.unique(keys, return_index=True)
+        self.athletes = self.keys // _ATHLETE_SHIFT
+        self.days = self.keys % _ATHLETE_SHIFT
+        if starts.size == 0:
+            self.tss = self.minutes = np.empty(0)
+            self.kinds: List[str] = []
+            return
+
+        self.tss = np.add.reduceat(tss[order], starts)
+        self.minutes = np.add.reduceat(minutes[order], starts)
+        sorted_kinds = [kinds[i] for i in order.tolist()]
+        if starts.size == len(sorted_kinds):
+            self.kinds = sorted_kinds
+            return
+        bounds = np.append(starts, len(sorted_kinds)).tolist()
+        self.kinds = [
+            " + ".join(k for k in sorted_kinds[a:b] if k)
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def __len__(self) -> int:
+        return int(self.keys.size)
+
+    @property
+    def dates(self) -> List[datetime.date]:
+        """Daty kolejnych wierszy."""
+        return [datetime.date.fromordinal(int(d)) for d in self.days]
+
+    @classmethod
+    def from_planned(cls, planned: Sequence[PlannedDay], athlete: int = 0) -> "TrainingDays":
+        """Plan z dni harmonogramu treningów (``kombajn.engine.workouts``)."""
+        return cls(
+            [d.day.toordinal() for d in planned],
+            [" + ".join(d.workouts) for d in planned],
+            [d.tss for d in planned],
+            [d.minutes for d in planned],
+            [athlete] * len(planned),
+        )
+
+    @classmethod
+    def from_journal(cls, journal: JournalMetrics, athlete: int = 0) -> "TrainingDays":
+        """Wykonanie z Dziennika (TSS liczony jak formuły arkusza)."""
+        return cls(
+            [d.toordinal() for d in journal.days],
+            journal.kinds,
+            journal.metrics.tss,
+            journal.minutes,
+            [athlete] * len(journal.days),
+        )
+
+
+@dataclass(frozen=True)
+class SessionCompliance:
+    """
+    Realizacja kolejnych dni planu (kolumny jak ``TrainingDays`` planu).
+
+    Attributes:
+        plan: Plan
+        kinds: Wykonany typ treningu ("" = brak wpisu)
+        tss: Wykonany TSS (0 = brak)
+        minutes: Wykonany czas (min)
+        ratio: Realizacja (wykonane / planowane); NaN dla dni wolnych
+        score: Wynik 0-100; NaN dla dni wolnych
+        status: Status (``COMPLIANCE_STATUSES``)
+    """
+    plan: TrainingDays
+    kinds: List[str]
+    tss: np.ndarray
+    minutes: np.ndarray
+    ratio: np.ndarray
+    score: np.ndarray
+    status: np.ndarray
+
+
+@dataclass(frozen=True)
+class WeeklyCompliance:
+    """
+    Realizacja tygodni planu.
+
+    Attributes:
+        athletes: Numery zawodników
+        weeks: Poniedziałki tygodni (``date.toordinal()``)
+        planned_tss: Planowany TSS tygodnia
+        tss: TSS wszystkich dni tygodnia z Dziennika
+        ratio: Realizacja TSS; NaN, gdy plan nie ma TSS
+        score: Wynik 0-100; NaN, gdy plan nie ma TSS
+        sessions: Liczba dni z planem
+        completed: Dni z planem i wykonanym TSS > 0
+    """
+    athletes: np.ndarray
+    weeks: np.ndarray
+    planned_tss: np.ndarray
+    tss: np.ndarray
+    ratio: np.ndarray
+    score: np.ndarray
+    sessions: np.ndarray
+    completed: np.ndarray
+
+
+def compliance_score(ratio: np.ndarray) -> np.ndarray:
+    """Wynik 0-100: 100 przy realizacji 1, liniowo do 0 przy 0 i 2 (NaN zostaje NaN)."""
+    return 100 * np.maximum(0.0, 1 - np.abs(np.asarray(ratio, dtype=np.float64) - 1))
+
+
+def compliance_status(ratio: np.ndarray) -> np.ndarray:
+    """Status sesji wg progów ``COMPLIANCE_BANDS``."""
+    ratio = np.asarray(ratio, dtype=np.float64)
+    bands = COMPLIANCE_BANDS
+    full, partial, missed, skipped, rest = COMPLIANCE_STATUSES
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [np.isnan(ratio), ratio == 0,
+             (ratio >= bands.FULL_MIN) & (ratio <= bands.FULL_MAX),
+             (ratio >= bands.PARTIAL_MIN) & (ratio <= bands.PARTIAL_MAX)],
+            [rest, skipped, full, partial],
+            default=missed,
+        )
+
+
+def _lookup(keys: np.ndarray, index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pozycje kluczy w posortowanym indeksie i maska znalezionych."""
+    position = np.searchsorted(index, keys)
+    found = position < index.size
+    found[found] = index[position[found]] == keys[found]
+    return np.minimum(position, max(index.size - 1, 0)), found
+
+
+def session_compliance(plan: TrainingDays, actual: TrainingDays) -> SessionCompliance:
+    """
+    Łączy plan z wykonaniem po zawodniku i dniu i ocenia kolejne dni planu.
+
+    Args:
+        plan: Plan
+        actual: Wykonanie
+
+    Returns:
+        Realizacja dni planu
+    """
+    position, found = _lookup(plan.keys, actual.keys)
+    tss = np.where(found, actual.tss[position] if len(actual) else 0.0, 0.0)
+    minutes = np.where(found, actual.minutes[position] if len(actual) else 0.0, 0.0)
+    kinds = [actual.kinds[p] if f else "" for p, f in zip(position.tolist(), found.tolist())]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(
+            plan.tss > 0, tss / plan.tss,
+            np.where(plan.minutes > 0, minutes / plan.minutes, np.nan),
+        )
+    return SessionCompliance(
+        plan, kinds, tss, minutes, ratio, compliance_score(ratio), compliance_status(ratio)
+    )
+
+
+def weekly_compliance(sessions: SessionCompliance, actual: TrainingDays) -> WeeklyCompliance:
+    """
+    Sumuje realizację po tygodniach planu.
+
+    Args:
+        sessions: Realizacja dni planu (``session_compliance``)
+        actual: Wykonanie (wszystkie dni, także spoza planu)
+
+    Returns:
+        Realizacja tygodni
+    """
+    plan = sessions.plan
+    plan_weeks = _keys(plan.athletes, week_start(plan.days))
+    weeks, inverse = np.unique(plan_weeks, return_inverse=True)
+    planned_tss = np.bincount(inverse, weights=plan.tss, minlength=weeks.size)
+    count = np.bincount(inverse, minlength=weeks.size)
+    completed = np.bincount(inverse, weights=sessions.tss > 0, minlength=weeks.size)
+
+    actual_weeks, actual_inverse = np.unique(
+        _keys(actual.athletes, week_start(actual.days)), return_inverse=True
+    )
+    actual_tss = np.bincount(actual_inverse, weights=actual.tss, minlength=actual_weeks.size)
+    position, found = _lookup(weeks, actual_weeks)
+    tss = np.where(found, actual_tss[position] if actual_weeks.size else 0.0, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(planned_tss > 0, tss / planned_tss, np.nan)
+    return WeeklyCompliance(
+        athletes=weeks // _ATHLETE_SHIFT,
+        weeks=weeks % _ATHLETE_SHIFT,
+        planned_tss=planned_tss,
+        tss=tss,
+        ratio=ratio,
+        score=compliance_score(ratio),
+        sessions=count,
+        completed=completed.astype(np.int64),
+    )
+
+
+def load_plan(
+    path: Path,
+    library: Optional[WorkoutLibrary] = None,
+    ftp: float = 0.0
+) -> TrainingDays:
+    """
+    Wczytuje plan z pliku CSV.
+
+    Kolumny: "Data" (wymagana), "Typ", "TSS", "Czas (min)" oraz "Trening"
+    - nazwa pliku z biblioteki treningów, z której brany jest TSS i czas,
+    gdy wiersz ich nie podaje. Kilka wierszy z tą samą datą to kilka sesji dnia.
+
+    Args:
+        path: Plik CSV (separator ";" lub ",")
+        library: Biblioteka treningów dla kolumny "Trening"
+        ftp: FTP (W) dla treningów z biblioteki
+
+    Returns:
+        Plan
+
+    Raises:
+        ValueError: Przy braku kolumny Data, błędnej wartości lub nieznanym treningu
+    """
+    index = library.by_name() if library is not None else {}
+    days: List[int] = []
+    kinds: List[str] = []
+    tss: List[float] = []
+    minutes: List[float] = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        delimiter = ";" if ";" in f.readline() else ","
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter=delimiter)
+        fields: Dict[str, str] = {name.strip().casefold(): name for name in reader.fieldnames or []}
+
+        def field(*names: str) -> Optional[str]:
+            return next((fields[n] for n in names if n in fields), None)
+
+        date_field = field("data", "date")
+        kind_field = field("typ", "typ treningu", "type")
+        tss_field = field("tss")
+        minutes_field = field("czas (min)", "czas", "minutes", "duration")
+        workout_field = field("trening", "workout")
+        if date_field is None:
+            raise ValueError(f"Plik planu {path} wymaga kolumny 'Data'")
+
+        for line, record in enumerate(reader, start=2):
+            def text(name: Optional[str]) -> str:
+                return (record.get(name) or "").strip() if name else ""
+
+            def number(name: Optional[str]) -> Optional[float]:
+                value = text(name).replace(",", ".")
+                if not value:
+                    return None
+                try:
+                    return float(value)
+                except ValueError:
+                    raise ValueError(f"{path}: niepoprawna liczba '{value}' w wierszu {line}") from None
+
+            try:
+                day = datetime.date.fromisoformat(text(date_field))
+            except ValueError:
+                raise ValueError(f"{path}: niepoprawna data w wierszu {line}") from None
+            kind, load, duration = text(kind_field), number(tss_field), number(minutes_field)
+            workout = text(workout_field)
+            if workout:
+                summary = index.get(workout.casefold())
+                if summary is None:
+                    raise ValueError(f"{path}: trening '{workout}' spoza biblioteki (wiersz {line})")
+                load = summary.tss(ftp) if load is None else load
+                duration = summary.minutes if duration is None else duration
+                kind = kind or workout
+            days.append(day.toordinal())
+            kinds.append(kind)
+            tss.append(load or 0.0)
+            minutes.append(duration or 0.0)
+
+    if not days:
+        raise ValueError(f"Plik planu {path} nie zawiera dni")
+    return TrainingDays(days, kinds, tss, minutes)
@@ -0,0 +1,412 @@
+"""
+Planer żywienia wyścigowego na bazie źródeł CHO.
+
+Dla zadanego celu CHO/h, czasu i stosunku glukoza:fruktoza planer
+dobiera na każdy slot (domyślnie 15 min) najmniejszą liczbę produktów.
+Wybór produktów w slocie to mały problem plecakowy o minimalnej
+liczności - przeszukiwany poziomami (1, 2, 3... produkty), więc pierwsze
+dopuszczalne rozwiązanie ma najmniej sztuk.
+
+Cel slotu liczony jest narastająco (cel do końca slotu minus to, co
+już zjedzone), więc zaokrąglenia porcji nie kumulują się: CHO
+narastające mieści się w ``tolerance_g`` od celu narastającego na koniec
+każdego slotu, o ile katalog na to pozwala (tolerancja CHO ma
+pierwszeństwo przed stosunkiem fruktozy, a slot może zostać pusty). Gdy
+najmniejsza porcja jest większa niż cel slotu plus tolerancja, odchyłka
+jest ograniczona przez wielkość porcji, nie przez ``tolerance_g``. Cele
+slotów szybko się powtarzają, a rozwiązania podproblemów są zapamiętywane -
+plan dla najdłuższego czasu zawiera w sobie plany dla wszystkich
+krótszych czasów (są jego prefiksami). Duże katalogi (np. z bazy
+``ProductStore``) zawężane są w każdym slocie do ``max_products``
+produktów, więc liczba kombinacji nie rośnie z wielkością katalogu.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import combinations_with_replacement, zip_longest
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from kombajn.config import CHO_FRUCTOSE_SHARE, CHO_OFF_BIKE_TYPES, CHO_SAMPLE_DATA
+from kombajn.products import ProductStore
+
+
+@dataclass(frozen=True)
+class FuelProduct:
+    """
+    Produkt CHO w porcji gotowej do zjedzenia.
+
+    Attributes:
+        name: Nazwa produktu
+        cho_g: Węglowodany w porcji (g)
+        fructose_share: Udział fruktozy w CHO (0-1)
+        product_type: Typ produktu (żel, napój, baton...)
+    """
+    name: str
+    cho_g: float
+    fructose_share: float = 0.0
+    product_type: str = ""
+
+    @property
+    def fructose_g(self) -> float:
+        """Fruktoza w porcji (g)."""
+        return self.cho_g * self.fructose_share
+
+
+def products_from_table(rows: Iterable[Tuple] = CHO_SAMPLE_DATA) -> List[FuelProduct]:
+    """
+    Tworzy listę produktów z tabeli w formacie ``CHO_SAMPLE_DATA``.
+
+    Produkty typów z ``CHO_OFF_BIKE_TYPES`` oraz bez CHO są pomijane.
+
+    Args:
+        rows: Krotki (nazwa, porcja, CHO/100g, kcal/100g, typ, wchłanianie, uwagi)
+
+    Returns:
+        Lista produktów do planowania
+    """
+    products = []
+    for name, portion, cho_100g, _kcal, product_type, _absorption, _notes in rows:
+        cho = round(portion * cho_100g / 100, 1)
+        if cho <= 0 or product_type in CHO_OFF_BIKE_TYPES:
+            continue
+        products.append(
+            FuelProduct(name, cho, CHO_FRUCTOSE_SHARE.get(name, 0.0), product_type)
+        )
+    return products
+
+
+def products_from_store(
+    store: ProductStore,
+    product_type: Optional[str] = None,
+    absorption: Optional[str] = None
+) -> List[FuelProduct]:
+    """
+    Tworzy listę produktów z bazy ``ProductStore`` (z udziałem fruktozy z bazy).
+
+    Args:
+        store: Baza produktów
+        product_type: Opcjonalny filtr typu (np. "żel")
+        absorption: Opcjonalny filtr szybkości wchłaniania
+
+    Returns:
+        Lista produktów do planowania
+    """
+    ids = store.query(product_type=product_type, absorption=absorption)
+    cho = store.cho_per_portion[ids].tolist()
+    fructose = store.fructose_share[ids].tolist()
+
+    products = []
+    for i, cho_g, share in zip(ids.tolist(), cho, fructose):
+        product_type_i = store[i].product_type
+        if cho_g <= 0 or product_type_i in CHO_OFF_BIKE_TYPES:
+            continue
+        products.append(FuelProduct(store.names[i], cho_g, round(share, 4), product_type_i))
+    return products
+
+
+@dataclass(frozen=True)
+class FuelSlot:
+    """
+    Jeden slot planu żywienia.
+
+    Attributes:
+        start_min: Minuta rozpoczęcia slotu
+        items: Nazwy produktów do zjedzenia w slocie
+        cho_g: CHO w slocie (g)
+        fructose_g: Fruktoza w slocie (g)
+        cumulative_cho_g: CHO zjedzone od startu do końca slotu (g)
+        target_cho_g: Cel narastający na koniec slotu (g)
+    """
+    start_min: int
+    items: Tuple[str, ...]
+    cho_g: float
+    fructose_g: float
+    cumulative_cho_g: float
+    target_cho_g: float
+
+
+@dataclass(frozen=True)
+class FuelingPlan:
+    """
+    Plan żywienia na trening/wyścig.
+
+    Attributes:
+        cho_per_hour: Cel CHO/h (g)
+        duration_h: Czas trwania (h)
+        fructose_ratio: Fruktoza na 1 część glukozy (np. 0.8 dla 1:0.8)
+        slot_minutes: Długość slotu (min)
+        slots: Kolejne sloty planu
+    """
+    cho_per_hour: float
+    duration_h: float
+    fructose_ratio: float
+    slot_minutes: int
+    slots: Tuple[FuelSlot, ...] = field(default_factory=tuple)
+
+    @property
+    def total_cho_g(self) -> float:
+        """Łączne CHO w planie (g)."""
+        return self.slots[-1].cumulative_cho_g if self.slots else 0.0
+
+    @property
+    def item_count(self) -> int:
+        """Łączna liczba porcji w planie."""
+        return sum(len(slot.items) for slot in self.slots)
+
+    def shopping_list(self) -> Dict[str, int]:
+        """Zwraca liczbę porcji każdego produktu (lista zakupów)."""
+        counts: Counter = Counter()
+        for slot in self.slots:
+            counts.update(slot.items)
+        return dict(counts.most_common())
+
+
+class FuelingPlanner:
+    """
+    Planer żywienia z pamięcią rozwiązań podproblemów.
+
+    Attributes:
+        products: Dostępne produkty
+        fructose_ratio: Docelowa fruktoza na 1 część glukozy
+        tolerance_g: Dopuszczalna odchyłka CHO narastającego od celu
+            narastającego (g) - na koniec każdego slotu, o ile katalog
+            pozwala jej dotrzymać
+        ratio_tolerance: Dopuszczalna odchyłka udziału fruktozy w slocie
+        max_items: Maksymalna liczba porcji w slocie
+        max_products: Maksymalna liczba produktów przeszukiwanych w slocie
+    """
+
+    def __init__(
+        self,
+        products: Optional[Sequence[FuelProduct]] = None,
+        fructose_ratio: float = 0.8,
+        tolerance_g: float = 5.0,
+        ratio_tolerance: float = 0.1,
+        max_items: int = 3,
+        max_products: int = 24
+    ) -> None:
+        """
+        Inicjalizuje planer.
+
+        Args:
+            products: Produkty do wyboru (domyślnie z ``CHO_SAMPLE_DATA``);
+                duże katalogi zawężane są w każdym slocie do ``max_products``
+            fructose_ratio: Fruktoza na 1 część glukozy (0.8 = 1:0.8)
+            tolerance_g: Dopuszczalna odchyłka CHO narastającego od celu
+                narastającego (g); gdy żadna kombinacja (także pusty slot)
+                jej nie dotrzymuje, slot dostaje kombinację najbliższą celowi
+            ratio_tolerance: Dopuszczalna odchyłka udziału fruktozy w slocie;
+                ustępuje tolerancji CHO, gdy obu nie da się spełnić naraz
+            max_items: Maksymalna liczba porcji w slocie
+            max_products: Limit produktów w przeszukiwaniu slotu (liczba
+                kombinacji rośnie jak ``max_products ** max_items``)
+
+        Raises:
+            ValueError: Przy braku produktów lub ujemnym stosunku
+        """
+        products = list(products) if products is not None else products_from_table()
+        # Produkty o tym samym CHO i udziale fruktozy są dla planera
+        # równoważne - zostawiamy pierwszy, co ogranicza liczbę kombinacji
+        unique: Dict[Tuple[float, float], FuelProduct] = {}
+        for product in products:
+            unique.setdefault((round(product.cho_g, 1), round(product.fructose_share, 2)), product)
+        self.products = list(unique.values())
+        if not self.products:
+            raise ValueError("Brak produktów CHO do planowania")
+        if fructose_ratio < 0:
+            raise ValueError("Stosunek fruktozy nie może być ujemny")
+
+        self.fructose_ratio = fructose_ratio
+        self.target_share = fructose_ratio / (1.0 + fructose_ratio)
+        self.tolerance_g = tolerance_g
+        self.ratio_tolerance = ratio_tolerance
+        self.max_items = max_items
+        self.max_products = max_products
+        # Produkty od największej porcji CHO (do zawężania dużych katalogów)
+        self._by_cho = sorted(self.products, key=lambda p: -p.cho_g)
+
+        # Kombinacje wg (produkty, liczba sztuk): [(cho, fruktoza, nazwy)]
+        self._levels: Dict[
+            Tuple[Tuple[FuelProduct, ...], int], List[Tuple[float, float, Tuple[str, ...]]]
+        ] = {}
+        # Pamięć podproblemów: cel slotu (g, co 0.1) -> najlepsza kombinacja
+        self._memo: Dict[float, Tuple[float, float, Tuple[str, ...]]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _candidates(self, target_g: float) -> Tuple[FuelProduct, ...]:
+        """
+        Zawęża duży katalog do ``max_products`` produktów dla celu slotu.
+
+        Porcja większa niż cel + tolerancja nie wchodzi w żadne dopuszczalne
+        rozwiązanie. Z pozostałych produktów w każdym przedziale udziału
+        fruktozy (szerokość ``ratio_tolerance``) zostają te o CHO w porcji
+        najbliższym celowi, brane na zmianę z kolejnych przedziałów -
+        mieszanka glukozy i fruktozy pozostaje osiągalna.
+        """
+        if len(self.products) <= self.max_products:
+            return tuple(self.products)
+        fitting = [p for p in self._by_cho if p.cho_g <= target_g + self.tolerance_g]
+        if not fitting:
+            fitting = self._by_cho[-self.max_products:]
+        fitting.sort(key=lambda p: abs(p.cho_g - target_g))
+
+        buckets: Dict[int, List[FuelProduct]] = {}
+        for product in fitting:
+            bucket = round(product.fructose_share / max(self.ratio_tolerance, 1e-9))
+            buckets.setdefault(bucket, []).append(product)
+        chosen: List[FuelProduct] = []
+        for row in zip_longest(*buckets.values()):
+            chosen.extend(p for p in row if p is not None)
+            if len(chosen) >= self.max_products:
+                break
+        return tuple(chosen[:self.max_products])
+
+    def _combinations(
+        self,
+        products: Tuple[FuelProduct, ...],
+        count: int
+    ) -> List[Tuple[float, float, Tuple[str, ...]]]:
+        """Zwraca (z pamięci) wszystkie kombinacje ``count`` porcji z ``products``."""
+        key = (products, count)
+        if key not in self._levels:
+            self._levels[key] = [
+                (
+                    sum(p.cho_g for p in combo),
+                    sum(p.fructose_g for p in combo),
+                    tuple(p.name for p in combo),
+                )
+                for combo in combinations_with_replacement(products, count)
+            ]
+        return self._levels[key]
+
+    def best_combination(self, target_g: float) -> Tuple[float, float, Tuple[str, ...]]:
+        """
+        Dobiera najmniejszą liczbę porcji dla celu CHO w slocie.
+
+        Najpierw szuka rozwiązań spełniających tolerancję CHO i stosunku
+        fruktozy; jeśli takich nie ma, wybiera kombinację o najmniejszej
+        łącznej karze (odchyłka CHO + odchyłka stosunku) spośród mieszczących
+        się w tolerancji CHO, a dopiero gdy i takich brak - spośród
+        wszystkich, łącznie z pustym slotem.
+
+        Args:
+            target_g: Cel CHO w slocie (g, zaokrąglony do 0.1 g)
+
+        Returns:
+            Krotka (CHO g, fruktoza g, nazwy produktów)
+        """
+        if target_g in self._memo:
+            self.cache_hits += 1
+            return self._memo[target_g]
+        self.cache_misses += 1
+
+        best: Tuple[float, float, Tuple[str, ...]] = (0.0, 0.0, ())
+        if target_g > self.tolerance_g:
+            best = self._search(target_g)
+
+        self._memo[target_g] = best
+        return best
+
+    def _search(self, target_g: float) -> Tuple[float, float, Tuple[str, ...]]:
+        """
+        Przeszukuje kombinacje poziomami (rosnąca liczba sztuk).
+
+        Rozwiązanie zastępcze zawsze mieści się w tolerancji CHO, jeśli
+        jakakolwiek kombinacja to umożliwia (kosztem stosunku fruktozy) -
+        inaczej odchyłka narastająca rosłaby z każdym slotem. Pusty slot
+        też jest kandydatem: lepiej nie jeść, niż przekroczyć cel o więcej.
+        """
+        # Pusty slot: odchyłka CHO równa całemu celowi (kara 1.0)
+        fallback: Tuple[float, float, Tuple[str, ...]] = (0.0, 0.0, ())
+        fallback_key = (True, 1.0)
+        products = self._candidates(target_g)
+
+        for count in range(1, self.max_items + 1):
+            feasible = None
+            feasible_penalty = float("inf")
+            for cho, fructose, names in self._combinations(products, count):
+                cho_error = abs(cho - target_g)
+                ratio_error = abs((fructose / cho if cho else 0.0) - self.target_share)
+                penalty = cho_error / max(target_g, 1) + ratio_error
+
+                if cho_error <= self.tolerance_g and ratio_error <= self.ratio_tolerance:
+                    if penalty < feasible_penalty:
+                        feasible, feasible_penalty = (cho, fructose, names), penalty
+                else:
+                    key = (cho_error > self.tolerance_g, penalty + count * 0.01)
+                    if key < fallback_key:
+                        fallback, fallback_key = (cho, fructose, names), key
+
+            if feasible is not None:
+                return feasible
+
+        return fallback
+
+    def plan(
+        self,
+        cho_per_hour: float,
+        duration_h: float,
+        slot_minutes: int = 15
+    ) -> FuelingPlan:
+        """
+        Tworzy plan żywienia na zadany czas.
+
+        Args:
+            cho_per_hour: Cel CHO/h (g)
+            duration_h: Czas trwania (h)
+            slot_minutes: Długość slotu (min)
+
+        Returns:
+            Plan żywienia
+
+        Raises:
+            ValueError: Przy niedodatnich parametrach
+        """
+        if cho_per_hour <= 0 or duration_h <= 0 or slot_minutes <= 0:
+            raise ValueError("Cel CHO/h, czas i długość slotu muszą być dodatnie")
+
+        slot_count = max(1, round(duration_h * 60 / slot_minutes))
+        per_slot = cho_per_hour * slot_minutes / 60.0
+
+        slots: List[FuelSlot] = []
+        eaten = 0.0
+        for k in range(slot_count):
+            target = per_slot * (k + 1)
+            cho, fructose, names = self.best_combination(round(max(0.0, target - eaten), 1))
+            eaten += cho
+            slots.append(FuelSlot(k * slot_minutes, names, cho, fructose, eaten, target))
+
+        return FuelingPlan(
+            cho_per_hour, slot_count * slot_minutes / 60.0,
+            self.fructose_ratio, slot_minutes, tuple(slots)
+        )
+
+    def plan_all_durations(
+        self,
+        cho_per_hour: float,
+        max_duration_h: float,
+        slot_minutes: int = 15
+    ) -> Dict[float, FuelingPlan]:
+        """
+        Tworzy plany dla wszystkich czasów co jeden slot, aż do ``max_duration_h``.
+
+        Plan krótszy jest prefiksem dłuższego, więc wystarczy jedno
+        wyznaczenie planu najdłuższego.
+
+        Args:
+            cho_per_hour: Cel CHO/h (g)
+            max_duration_h: Najdłuższy czas (h)
+            slot_minutes: Długość slotu (min)
+
+        Returns:
+            Słownik: czas (h) -> plan
+        """
+        full = self.plan(cho_per_hour, max_duration_h, slot_minutes)
+        return {
+            n * slot_minutes / 60.0: FuelingPlan(
+                cho_per_hour, n * slot_minutes / 60.0,
+                self.fructose_ratio, slot_minutes, full.slots[:n]
+            )
+            for n in range(1, len(full.slots) + 1)
+        }
@@ -0,0 +1,296 @@
+"""
+Automatyczne wykrywanie interwałów w strumieniach mocy.
+
+Detektor działa w czasie O(n): wygładza strumień średnią kroczącą
+(sumy prefiksowe), a następnie stosuje próg z histerezą wyznaczony
+ze stref mocy Coggan (``POWER_ZONES``). Dzięki histerezie krótkie
+spadki mocy wewnątrz wysiłku nie dzielą go na kilka interwałów.
+"""
+
+import datetime
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kombajn.config import POWER_ZONES
+from kombajn.engine.streams import activity_date, iter_archive, load_power_stream
+from kombajn.journal import append_notes, load_journal, read_settings
+
+
+# Górne granice stref (% FTP) do wyszukiwania binarnego
+_ZONE_MAX_PCT = np.array([zone.max_pct for zone in POWER_ZONES[:-1]])
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    Wykryty wysiłek (interwał).
+
+    Attributes:
+        start: Sekunda rozpoczęcia (indeks w strumieniu)
+        duration: Czas trwania (s)
+        avg_power: Średnia moc w trakcie wysiłku (W)
+        zone: Numer strefy Coggan (1-7) wg średniej mocy
+    """
+    start: int
+    duration: int
+    avg_power: float
+    zone: int
+
+    @property
+    def zone_label(self) -> str:
+        """Etykieta strefy w formacie kolumny "Strefa dom." (np. "Z4")."""
+        return f"Z{self.zone}"
+
+
+def power_zones_for(power, ftp: float) -> np.ndarray:
+    """
+    Przypisuje strefy mocy (1-7) do wartości mocy.
+
+    Args:
+        power: Moc (W) - skalar lub tablica
+        ftp: Functional Threshold Power (W)
+
+    Returns:
+        Tablica numerów stref
+    """
+    pct = np.asarray(power, dtype=np.float64) / ftp
+    return np.searchsorted(_ZONE_MAX_PCT, pct, side="right") + 1
+
+
+def smooth_power(power: np.ndarray, window: int = 30) -> np.ndarray:
+    """
+    Wygładza strumień wycentrowaną średnią kroczącą w czasie O(n).
+
+    Args:
+        power: Strumień mocy 1 Hz
+        window: Szerokość okna (s)
+
+    Returns:
+        Wygładzony strumień tej samej długości
+    """
+    p = np.asarray(power, dtype=np.float64)
+    n = p.size
+    if n == 0 or window <= 1:
+        return p.copy()
+
+    csum = np.concatenate(([0.0], np.cumsum(p)))
+    idx = np.arange(n)
+    lo = np.maximum(idx - window // 2, 0)
+    hi = np.minimum(idx + window - window // 2, n)
+    return (csum[hi] - csum[lo]) / (hi - lo)
+
+
+def detect_intervals(
+    power: np.ndarray,
+    ftp: float,
+    min_zone: int = 4,
+    hysteresis: float = 0.05,
+    window: int = 30,
+    min_duration: int = 60
+) -> List[Interval]:
+    """
+    Wykrywa wysiłki powyżej progu strefy z histerezą.
+
+    Wysiłek zaczyna się, gdy wygładzona moc osiągnie dolną granicę
+    strefy ``min_zone``, a kończy, gdy spadnie poniżej tej granicy
+    pomniejszonej o ``hysteresis`` (ułamek FTP).
+
+    Args:
+        power: Strumień mocy 1 Hz (W)
+        ftp: Functional Threshold Power (W)
+        min_zone: Najniższa strefa uznawana za interwał (domyślnie Z4)
+        hysteresis: Szerokość histerezy jako ułamek FTP
+        window: Okno wygładzania (s)
+        min_duration: Minimalny czas trwania wysiłku (s)
+
+    Returns:
+        Lista wykrytych interwałów w kolejności chronologicznej
+
+    Raises:
+        ValueError: Gdy numer strefy jest spoza zakresu 1-7
+    """
+    if not 1 <= min_zone <= len(POWER_ZONES):
+        raise ValueError(f"Nieprawidłowa strefa: {min_zone}. Zakres: 1-{len(POWER_ZONES)}")
+
+    p = np.nan_to_num(np.asarray(power, dtype=np.float64), nan=0.0)
+    n = p.size
+    if n == 0 or ftp <= 0:
+        return []
+
+    smoothed = smooth_power(p, window)
+    enter = POWER_ZONES[min_zone - 1].min_pct * ftp
+    leave = enter - hysteresis * ftp
+
+    # Stan histerezy bez pętli: aktywny, gdy ostatnie przekroczenie progu
+    # wejścia nastąpiło później niż ostatni spadek poniżej progu wyjścia
+    idx = np.arange(n)
+    last_above = np.maximum.accumulate(np.where(smoothed >= enter, idx, -1))
+    last_below = np.maximum.accumulate(np.where(smoothed < leave, idx, -1))
+    active = (last_above > last_below).astype(np.int8)
+
+    edges = np.diff(active, prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    durations = ends - starts
+    keep = durations >= min_duration
+    starts, ends, durations = starts[keep], ends[keep], durations[keep]
+    if starts.size == 0:
+        return []
+
+    csum = np.concatenate(([0.0], np.cumsum(p)))
+    averages = (csum[ends] - csum[starts]) / durations
+    zones = power_zones_for(averages, ftp)
+
+    return [
+        Interval(int(s), int(d), float(a), int(z))
+        for s, d, a, z in zip(starts, durations, averages, zones)
+    ]
+
+
+def _format_duration(seconds: int) -> str:
+    """Formatuje czas w sekundach jako m:ss lub h:mm:ss."""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def summarize_intervals(intervals: List[Interval], rounding: int = 15) -> str:
+    """
+    Tworzy krótkie podsumowanie interwałów do kolumny "Notatki".
+
+    Wysiłki o tej samej strefie i zbliżonym czasie (zaokrąglonym do
+    ``rounding`` sekund) są grupowane, np. ``"4×5:00 Z5 (śr. 290 W)"``.
+
+    Args:
+        intervals: Lista wykrytych interwałów
+        rounding: Krok zaokrąglenia czasu przy grupowaniu (s)
+
+    Returns:
+        Tekst podsumowania lub pusty napis, gdy brak interwałów
+    """
+    if not intervals:
+        return ""
+
+    groups: Dict[Tuple[int, int], List[Interval]] = {}
+    for interval in intervals:
+        rounded = max(rounding, int(round(interval.duration / rounding)) * rounding)
+        groups.setdefault((interval.zone, rounded), []).append(interval)
+
+    parts = []
+    for (zone, rounded), members in groups.items():
+        total = sum(m.duration for m in members)
+        avg = sum(m.avg_power * m.duration for m in members) / total
+        parts.append(f"{len(members)}×{_format_duration(rounded)} Z{zone} (śr. {avg:.0f} W)")
+
+    return "Interwały: " + ", ".join(parts)
+
+
+def _analyze_file(args: Tuple[Path, float, dict]) -> Tuple[Path, List[Interval]]:
+    """Analizuje pojedynczy plik (funkcja modułowa - wymagana przez ProcessPool)."""
+    path, ftp, options = args
+    return path, detect_intervals(load_power_stream(path), ftp, **options)
+
+
+def analyze_archive(
+    directory: Path,
+    ftp: float,
+    workers: int = 1,
+    **options
+) -> Dict[Path, List[Interval]]:
+    """
+    Wykrywa interwały we wszystkich aktywnościach archiwum.
+
+    Args:
+        directory: Katalog archiwum aktywności (CSV/JSON 1 Hz)
+        ftp: Functional Threshold Power (W)
+        workers: Liczba procesów (1 = przetwarzanie sekwencyjne)
+        **options: Parametry przekazywane do ``detect_intervals``
+
+    Returns:
+        Słownik: ścieżka pliku -> lista interwałów
+    """
+    logger = logging.getLogger("kombajn")
+    tasks = [(path, ftp, options) for path in iter_archive(directory)]
+    logger.info(f"Analiza interwałów: {len(tasks)} plików w {directory}")
+
+    results: Dict[Path, List[Interval]] = {}
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, intervals in pool.map(_analyze_file, tasks, chunksize=8):
+                results[path] = intervals
+    else:
+        for task in tasks:
+            path, intervals = _analyze_file(task)
+            results[path] = intervals
+
+    return results
+
+
+def interval_notes(
+    results: Dict[Path, List[Interval]]
+) -> Dict[datetime.date, str]:
+    """
+    Zamienia wyniki analizy archiwum na notatki per dzień.
+
+    Pliki bez daty w nazwie oraz aktywności bez interwałów są pomijane.
+    Kilka aktywności z tego samego dnia łączone jest średnikiem.
+
+    Args:
+        results: Wynik ``analyze_archive``
+
+    Returns:
+        Słownik: data -> tekst notatki
+    """
+    notes: Dict[datetime.date, List[str]] = {}
+    for path, intervals in results.items():
+        day = activity_date(path)
+        summary = summarize_intervals(intervals)
+        if day is None or not summary:
+            continue
+        notes.setdefault(day, []).append(summary)
+    return {day: "; ".join(parts) for day, parts in sorted(notes.items())}
+
+
+def annotate_journal(
+    journal_path: Path,
+    archive_dir: Path,
+    ftp: Optional[float] = None,
+    workers: int = 1,
+    output_path: Optional[Path] = None,
+    **options
+) -> int:
+    """
+    Analizuje archiwum i dopisuje podsumowania interwałów do dziennika.
+
+    Args:
+        journal_path: Plik dziennika (xlsx)
+        archive_dir: Katalog archiwum aktywności
+        ftp: FTP (W); domyślnie odczytywane z arkusza Ustawienia
+        workers: Liczba procesów analizy
+        output_path: Plik wynikowy (domyślnie nadpisuje dziennik)
+        **options: Parametry przekazywane do ``detect_intervals``
+
+    Returns:
+        Liczba zaktualizowanych wierszy dziennika
+
+    Raises:
+        ValueError: Gdy nie można ustalić FTP
+    """
+    wb = load_journal(journal_path)
+    if ftp is None:
+        ftp = read_settings(wb).get("FTP (W)")
+    if not isinstance(ftp, (int, float)) or ftp <= 0:
+        raise ValueError("Brak poprawnego FTP - podaj je jawnie lub uzupełnij [Ustawienia]")
+
+    notes = interval_notes(analyze_archive(archive_dir, ftp, workers, **options))
+    updated = append_notes(wb["Dziennik"], notes)
+    wb.save(output_path or journal_path)
+    return updated
@@ -0,0 +1,308 @@
+"""
+Model spalania węglowodanów i tłuszczów (w stylu INSCYD).
+
+Uproszczony model Madera dla stanu ustalonego, liczony sekunda po
+sekundzie i w pełni wektorowo (NumPy):
+
+1. Moc -> zapotrzebowanie energetyczne (sprawność brutto) -> VO2 (ml/kg/min)
+2. VO2 -> stężenie ADP:  VO2 = VO2max / (1 + Ks1 / ADP²)
+3. ADP -> przepływ glikolityczny:  VLa = 60 · VLaMax / (1 + Ks2 / ADP³)
+4. Przepływ glikolityczny (mleczan) -> spalone CHO (g/s), nie więcej
+   niż wynosi cały wydatek energetyczny
+5. Pozostała energia tlenowa pokrywana jest przez tłuszcze
+
+Wynik jest szacunkiem - służy do porównania spalania CHO z podażą
+wpisaną w kolumnie "CHO/h (g)", a nie zastępuje testu laboratoryjnego.
+"""
+
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from kombajn.config import METABOLIC_DEFAULTS, POWER_DEFAULTS
+from kombajn.engine.streams import activity_date, iter_archive, load_power_stream
+from kombajn.journal import load_journal, read_settings, write_log_values
+from kombajn.profiles import AthleteProfile
+
+
+# Stałe modelu (Mader & Heck 1986, Hauser i wsp. 2014)
+KS1 = 0.035 ** 2          # Stała półnasycenia oddychania tlenowego
+KS2 = 0.15 ** 3           # Stała półnasycenia glikolizy
+RESTING_VO2 = 3.5         # ml/kg/min - spoczynkowe zużycie tlenu
+O2_ENERGY_J_PER_ML = 20.9  # Równoważnik energetyczny tlenu (J/ml)
+LACTATE_VOLUME_L_PER_KG = 0.4  # Objętość dystrybucji mleczanu
+GLUCOSE_G_PER_MMOL = 0.18016   # Masa molowa glukozy (g/mmol)
+KCAL_PER_G_CHO = 4.1
+KCAL_PER_G_FAT = 9.3
+J_PER_KCAL = 4184.0
+
+
+@dataclass(frozen=True)
+class MetabolicProfile:
+    """
+    Parametry zawodnika potrzebne do modelu metabolicznego.
+
+    Attributes:
+        weight_kg: Masa ciała (kg)
+        vo2max: VO2max (ml/kg/min)
+        vlamax: VLaMax (mmol/L/s)
+        efficiency: Sprawność brutto pedałowania
+    """
+    weight_kg: float = POWER_DEFAULTS.WEIGHT_KG
+    vo2max: float = METABOLIC_DEFAULTS.VO2MAX
+    vlamax: float = METABOLIC_DEFAULTS.VLAMAX
+    efficiency: float = METABOLIC_DEFAULTS.GROSS_EFFICIENCY
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "MetabolicProfile":
+        """
+        Tworzy profil z pól arkusza Ustawienia (puste pola -> wartości domyślne).
+
+        Args:
+            settings: Wynik ``kombajn.journal.read_settings``
+
+        Returns:
+            Profil metaboliczny
+        """
+        def number(label: str, default: float) -> float:
+            value = settings.get(label)
+            return float(value) if isinstance(value, (int, float)) and value > 0 else default
+
+        return cls(
+            weight_kg=number("Waga (kg)", cls.weight_kg),
+            vo2max=number("VO2max (ml/kg/min)", cls.vo2max),
+            vlamax=number("VLaMax (mmol/L/s)", cls.vlamax),
+        )
+
+    @classmethod
+    def from_athlete(cls, profile: AthleteProfile) -> "MetabolicProfile":
+        """
+        Tworzy profil z profilu zawodnika (``kombajn.profiles``).
+
+        Args:
+            profile: Profil zawodnika
+
+        Returns:
+            Profil metaboliczny
+        """
+        return cls(weight_kg=profile.weight_kg, vo2max=profile.vo2max, vlamax=profile.vlamax)
+
+
+@dataclass(frozen=True)
+class Combustion:
+    """
+    Bilans substratów dla aktywności.
+
+    Attributes:
+        duration_s: Czas trwania (s)
+        cho_g: Spalone węglowodany (g)
+        fat_g: Spalone tłuszcze (g)
+        kcal: Całkowity wydatek energetyczny (kcal)
+    """
+    duration_s: int
+    cho_g: float
+    fat_g: float
+    kcal: float
+
+    @property
+    def cho_per_hour(self) -> float:
+        """Średnie spalanie CHO (g/h) - do porównania z kolumną "CHO/h (g)"."""
+        return self.cho_g * 3600.0 / self.duration_s if self.duration_s else 0.0
+
+    def __add__(self, other: "Combustion") -> "Combustion":
+        return Combustion(
+            self.duration_s + other.duration_s,
+            self.cho_g + other.cho_g,
+            self.fat_g + other.fat_g,
+            self.kcal + other.kcal,
+        )
+
+
+def substrate_rates(
+    power: np.ndarray,
+    profile: MetabolicProfile = MetabolicProfile()
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liczy chwilowe tempo spalania CHO i tłuszczów.
+
+    Args:
+        power: Strumień mocy 1 Hz (W)
+        profile: Profil metaboliczny zawodnika
+
+    Returns:
+        Krotka (CHO g/s, tłuszcz g/s) - tablice długości strumienia
+    """
+    p = np.clip(np.nan_to_num(np.asarray(power, dtype=np.float64), nan=0.0), 0.0, None)
+
+    # Zapotrzebowanie energetyczne (W) i tlenowe (ml/kg/min)
+    metabolic_w = p / profile.efficiency
+    vo2 = RESTING_VO2 + metabolic_w * 60.0 / O2_ENERGY_J_PER_ML / profile.weight_kg
+    vo2 = np.minimum(vo2, 0.999 * profile.vo2max)
+
+    # Stan ustalony: ADP z równania oddychania, potem przepływ glikolityczny
+    adp = np.sqrt(KS1 * vo2 / (profile.vo2max - vo2))
+    vla = 60.0 * profile.vlamax / (1.0 + KS2 / adp ** 3)  # mmol/L/min
+
+    lactate_mmol_s = vla * LACTATE_VOLUME_L_PER_KG * profile.weight_kg / 60.0
+    cho_g_s = lactate_mmol_s / 2.0 * GLUCOSE_G_PER_MMOL
+
+    # Powyżej progu przepływ glikolityczny przekracza wydatek energetyczny
+    # (mleczan się kumuluje) - spalanie CHO ograniczamy do całego wydatku
+    metabolic_kcal_s = metabolic_w / J_PER_KCAL
+    cho_g_s = np.minimum(cho_g_s, metabolic_kcal_s / KCAL_PER_G_CHO)
+
+    # Energia tlenowa niepokryta przez CHO pochodzi z tłuszczów
+    aerobic_kcal_s = vo2 * profile.weight_kg * O2_ENERGY_J_PER_ML / 60.0 / J_PER_KCAL
+    fat_kcal_s = np.maximum(aerobic_kcal_s - cho_g_s * KCAL_PER_G_CHO, 0.0)
+    fat_g_s = fat_kcal_s / KCAL_PER_G_FAT
+
+    return cho_g_s, fat_g_s
+
+
+def ride_combustion(
+    power: np.ndarray,
+    profile: MetabolicProfile = MetabolicProfile()
+) -> Combustion:
+    """
+    Sumuje spalanie substratów dla pojedynczej aktywności.
+
+    Args:
+        power: Strumień mocy 1 Hz (W)
+        profile: Profil metaboliczny zawodnika
+
+    Returns:
+        Bilans substratów aktywności
+    """
+    return season_combustion([power], profile)[0]
+
+
+def season_combustion(
+    streams: Iterable[np.ndarray],
+    profile: MetabolicProfile = MetabolicProfile()
+) -> List[Combustion]:
+    """
+    Liczy bilans substratów dla wielu aktywności w jednym przebiegu.
+
+    Strumienie są łączone w jedną tablicę, a sumy per aktywność
+    wyznaczane przez ``np.add.reduceat`` - cały sezon danych 1 Hz
+    przetwarzany jest jednym wywołaniem modelu.
+
+    Args:
+        streams: Strumienie mocy 1 Hz kolejnych aktywności
+        profile: Profil metaboliczny zawodnika
+
+    Returns:
+        Lista bilansów w kolejności strumieni
+    """
+    arrays = [np.asarray(s, dtype=np.float64) for s in streams]
+    if not arrays:
+        return []
+
+    lengths = np.array([a.size for a in arrays])
+    power = np.concatenate(arrays)
+    cho, fat = substrate_rates(power, profile)
+    kcal = cho * KCAL_PER_G_CHO + fat * KCAL_PER_G_FAT
+
+    # reduceat nie obsługuje pustych segmentów - liczymy je osobno
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    non_empty = lengths > 0
+    sums = np.zeros((3, len(arrays)))
+    if power.size:
+        stacked = np.vstack((cho, fat, kcal))
+        sums[:, non_empty] = np.add.reduceat(stacked, offsets[non_empty], axis=1)
+
+    return [
+        Combustion(int(n), float(c), float(f), float(k))
+        for n, c, f, k in zip(lengths, sums[0], sums[1], sums[2])
+    ]
+
+
+def fatmax_power(
+    profile: MetabolicProfile = MetabolicProfile(),
+    max_power: float = 600.0
+) -> float:
+    """
+    Wyznacza moc maksymalnego spalania tłuszczów wg modelu.
+
+    Args:
+        profile: Profil metaboliczny zawodnika
+        max_power: Górna granica przeszukiwanej mocy (W)
+
+    Returns:
+        Moc FatMax (W) z dokładnością do 1 W
+    """
+    grid = np.arange(0.0, max_power + 1.0)
+    _, fat = substrate_rates(grid, profile)
+    return float(grid[int(np.argmax(fat))])
+
+
+def _load_dated_stream(path: Path) -> Tuple[Optional[datetime.date], np.ndarray]:
+    """Wczytuje strumień wraz z datą (funkcja modułowa - wymagana przez ProcessPool)."""
+    return activity_date(path), load_power_stream(path)
+
+
+def combustion_archive(
+    directory: Path,
+    profile: MetabolicProfile = MetabolicProfile(),
+    workers: int = 1
+) -> Dict[datetime.date, Combustion]:
+    """
+    Liczy bilans substratów dla całego archiwum, sumując aktywności per dzień.
+
+    Args:
+        directory: Katalog archiwum aktywności (CSV/JSON 1 Hz)
+        profile: Profil metaboliczny zawodnika
+        workers: Liczba procesów wczytujących pliki
+
+    Returns:
+        Słownik: data -> bilans substratów (pliki bez daty są pomijane)
+    """
+    paths = list(iter_archive(directory))
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(_load_dated_stream, paths, chunksize=8))
+    else:
+        loaded = [_load_dated_stream(path) for path in paths]
+
+    loaded = [(day, stream) for day, stream in loaded if day is not None]
+    results = season_combustion([stream for _, stream in loaded], profile)
+
+    per_day: Dict[datetime.date, Combustion] = {}
+    for (day, _), combustion in zip(loaded, results):
+        per_day[day] = per_day[day] + combustion if day in per_day else combustion
+    return dict(sorted(per_day.items()))
+
+
+def annotate_cho_burned(
+    journal_path: Path,
+    archive_dir: Path,
+    profile: Optional[MetabolicProfile] = None,
+    workers: int = 1,
+    output_path: Optional[Path] = None
+) -> int:
+    """
+    Wpisuje spalone CHO (g) z archiwum do kolumny "CHO spalone (g)".
+
+    Args:
+        journal_path: Plik dziennika (xlsx)
+        archive_dir: Katalog archiwum aktywności
+        profile: Profil metaboliczny; domyślnie z arkusza Ustawienia
+        workers: Liczba procesów wczytujących pliki
+        output_path: Plik wynikowy (domyślnie nadpisuje dziennik)
+
+    Returns:
+        Liczba zapisanych wierszy dziennika
+    """
+    wb = load_journal(journal_path)
+    if profile is None:
+        profile = MetabolicProfile.from_settings(read_settings(wb))
+
+    per_day = combustion_archive(archive_dir, profile, workers)
+    values = {day: round(c.cho_g) for day, c in per_day.items()}
+    written = write_log_values(wb["Dziennik"], "CHO spalone (g)", values)
+    wb.save(output_path or journal_path)
+    return written
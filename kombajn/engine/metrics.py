@@ -0,0 +1,186 @@
+"""
+Metryki dziennika liczone wektorowo.
+
+Odpowiednik formuł kolumn T-Z arkusza Dziennik (IF, TSS, W/kg, strefa,
+CTL, ATL, TSB) i kolumny "Alert obciążenia" dla całego dziennika naraz. Brak wartości w wejściu
+(NaN) daje NaN w wyniku tam, gdzie arkusz pokazuje pustą komórkę.
+TSS dni z dyscypliną lub tętnem liczy ``kombajn.engine.sports``.
+``journal_metrics`` liczy te same metryki z pól wejściowych zapisanego
+dziennika (bez przeliczania formuł przez Excela).
+"""
+
+import dataclasses
+import datetime
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook
+
+from kombajn.config import LOG_HEADERS, POWER_ZONES, log_column
+from kombajn.engine.alerts import load_alerts
+from kombajn.engine.pmc import pmc
+from kombajn.engine.sports import SportThresholds, session_load
+from kombajn.journal import iter_log_rows, read_settings
+
+
+# Górne granice stref Z1-Z6 (% FTP) - formuła strefy w Dzienniku
+ZONE_LIMITS = np.array([zone.max_pct for zone in POWER_ZONES[:-1]])
+ZONE_LABELS = np.array([f"Z{zone.number}" for zone in POWER_ZONES])
+
+
+@dataclass(frozen=True)
+class LogMetrics:
+    """
+    Metryki kolejnych dni dziennika.
+
+    Attributes:
+        intensity: IF = NP / FTP
+        tss: Training Stress Score
+        w_per_kg: NP / waga
+        zone: Strefa dominująca ("" gdy brak IF)
+        ctl: Chronic Training Load
+        atl: Acute Training Load
+        tsb: Training Stress Balance
+        alert: Alert obciążenia - ACWR / rampa CTL ("" = brak)
+    """
+    intensity: np.ndarray
+    tss: np.ndarray
+    w_per_kg: np.ndarray
+    zone: np.ndarray
+    ctl: np.ndarray
+    atl: np.ndarray
+    tsb: np.ndarray
+    alert: np.ndarray
+
+
+def log_metrics(
+    minutes: np.ndarray,
+    normalized_power: np.ndarray,
+    ftp: float,
+    weight_kg: float,
+    ctl0: float = 0.0,
+    atl0: float = 0.0,
+    sports: Optional[Sequence[Optional[str]]] = None,
+    distance_km: Optional[np.ndarray] = None,
+    avg_hr: Optional[np.ndarray] = None,
+    thresholds: Optional[SportThresholds] = None
+) -> LogMetrics:
+    """
+    Liczy metryki dziennika dla kolejnych dni.
+
+    Args:
+        minutes: Czas treningu (min) per dzień; NaN = brak treningu
+        normalized_power: NP (W) per dzień; NaN = brak
+        ftp: FTP (W) z arkusza Ustawienia
+        weight_kg: Waga (kg) z arkusza Ustawienia
+        ctl0: CTL startowe (Ustawienia)
+        atl0: ATL startowe (Ustawienia)
+        sports: Kolumna "Sport" per dzień (None = sam rower)
+        distance_km: Dystans (km) per dzień - rTSS / sTSS
+        avg_hr: Tętno średnie per dzień - hrTSS dni bez mocy / tempa
+        thresholds: Progi dyscyplin (FTP zawsze z ``ftp``)
+
+    Returns:
+        Metryki dziennika
+    """
+    minutes = np.asarray(minutes, dtype=np.float64)
+    power = np.asarray(normalized_power, dtype=np.float64)
+    nan = np.full(power.shape, np.nan)
+
+    intensity = power / ftp if ftp > 0 else nan
+    if sports is None and distance_km is None and avg_hr is None:
+        # Ta sama kolejność działań co formuła TSS w arkuszu
+        tss = (minutes * 60 * power * intensity) / (ftp * 3600) * 100 if ftp > 0 else nan
+    else:
+        thresholds = dataclasses.replace(thresholds or SportThresholds(), ftp=ftp)
+        columns = {"minutes": minutes, "normalized_power": power}
+        if distance_km is not None:
+            columns["distance_km"] = distance_km
+        if avg_hr is not None:
+            columns["avg_hr"] = avg_hr
+        tss = session_load(sports if sports is not None else [None] * power.size, columns, thresholds)
+    w_per_kg = power / weight_kg if weight_kg > 0 else nan
+
+    zone = np.where(
+        np.isnan(intensity), "",
+        ZONE_LABELS[np.searchsorted(ZONE_LIMITS, np.nan_to_num(intensity), side="right")]
+    )
+    ctl, atl, tsb = pmc(tss, ctl0, atl0)
+    alert = load_alerts(ctl, atl, ctl0).flags
+
+    return LogMetrics(intensity, tss, w_per_kg, zone, ctl, atl, tsb, alert)
+
+
+@dataclass(frozen=True)
+class JournalMetrics:
+    """
+    Metryki wierszy zapisanego dziennika.
+
+    Attributes:
+        days: Daty kolejnych wierszy Dziennika
+        minutes: Czas treningu (min); NaN = brak
+        kinds: Kolumna "Typ treningu" ("" = brak)
+        metrics: Metryki liczone jak formuły arkusza
+        ctl0: CTL startowe (Ustawienia)
+        atl0: ATL startowe (Ustawienia)
+    """
+    days: List[datetime.date]
+    minutes: np.ndarray
+    kinds: List[str]
+    metrics: LogMetrics
+    ctl0: float = 0.0
+    atl0: float = 0.0
+
+
+def _number(value: Any) -> float:
+    """Wartość liczbowa komórki (NaN dla pustych, tekstu i formuł)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+def journal_metrics(workbook: Workbook) -> JournalMetrics:
+    """
+    Liczy metryki dziennika z pól wejściowych i arkusza Ustawienia.
+
+    Args:
+        workbook: Skoroszyt dziennika
+
+    Returns:
+        Metryki kolejnych wierszy Dziennika
+    """
+    columns = {
+        header: log_column(header) - 1
+        for header in ("Czas jazdy (min)", "NP (W)", "Dystans (km)", "Avg HR", "Typ treningu", "Sport")
+    }
+    rows = [
+        (day, values) for day, _, values in
+        iter_log_rows(workbook["Dziennik"], max_col=len(LOG_HEADERS))
+    ]
+
+    def column(header: str) -> List[Any]:
+        index = columns[header]
+        return [values[index] if index < len(values) else None for _, values in rows]
+
+    def numbers(header: str) -> np.ndarray:
+        return np.array([_number(v) for v in column(header)], dtype=np.float64)
+
+    settings = read_settings(workbook)
+    thresholds = SportThresholds.from_settings(settings)
+    minutes = numbers("Czas jazdy (min)")
+    ctl0 = float(np.nan_to_num(_number(settings.get("CTL startowe"))))
+    atl0 = float(np.nan_to_num(_number(settings.get("ATL startowe"))))
+    metrics = log_metrics(
+        minutes, numbers("NP (W)"),
+        ftp=thresholds.ftp,
+        weight_kg=np.nan_to_num(_number(settings.get("Waga (kg)"))),
+        ctl0=ctl0,
+        atl0=atl0,
+        sports=[v if isinstance(v, str) else None for v in column("Sport")],
+        distance_km=numbers("Dystans (km)"),
+        avg_hr=numbers("Avg HR"),
+        thresholds=thresholds,
+    )
+    kinds = [str(v).strip() if v is not None else "" for v in column("Typ treningu")]
+    return JournalMetrics([day for day, _ in rows], minutes, kinds, metrics, ctl0, atl0)
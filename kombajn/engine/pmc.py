@@ -0,0 +1,311 @@
+"""
+Performance Management Chart (PMC) - symulacja i optymalizacja taperu.
+
+CTL i ATL liczone są rekurencją wykładniczą (Banister/Coggan):
+
+    CTL[t] = CTL[t-1] + (TSS[t] - CTL[t-1]) / CTL_DAYS
+    ATL[t] = ATL[t-1] + (TSS[t] - ATL[t-1]) / ATL_DAYS
+    TSB[t] = CTL[t] - ATL[t]
+
+tak samo jak kolumny CTL/ATL/TSB arkusza Dziennik. Rekurencja jest
+liniowa, więc dla bloku dni zapisuje się ją jako mnożenie przez
+dolnotrójkątną macierz wag - tysiące planów liczone są jednym
+mnożeniem macierzy.
+"""
+
+import csv
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kombajn.config import SHEET_CONFIG
+
+
+# Długość bloku rekurencji - ogranicza rozmiar macierzy wag przy długich logach
+_BLOCK_DAYS = 256
+
+TAPER_SHAPES: Tuple[str, ...] = ("step", "linear", "exponential")
+
+
+@lru_cache(maxsize=32)
+def _weights(days: int, time_constant: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zwraca macierz wag bloku i wektor zaniku wartości startowej.
+
+    Returns:
+        Krotka (W, decay): x = tss @ W.T + seed * decay
+    """
+    alpha = 1.0 / time_constant
+    lags = np.arange(days)[:, None] - np.arange(days)[None, :]
+    weights = np.where(lags >= 0, alpha * (1.0 - alpha) ** np.maximum(lags, 0), 0.0)
+    decay = (1.0 - alpha) ** np.arange(1, days + 1)
+    weights.setflags(write=False)
+    decay.setflags(write=False)
+    return weights, decay
+
+
+def ewma_load(
+    tss: np.ndarray,
+    seed=0.0,
+    time_constant: int = SHEET_CONFIG.CTL_DAYS
+) -> np.ndarray:
+    """
+    Liczy obciążenie wykładnicze (CTL lub ATL) dla jednego lub wielu planów.
+
+    Args:
+        tss: TSS dzienne - kształt (dni,) lub (plany, dni); NaN = 0
+        seed: Wartość startowa (skalar lub wektor per plan)
+        time_constant: Stała czasowa (42 dla CTL, 7 dla ATL)
+
+    Returns:
+        Tablica obciążenia tego samego kształtu co ``tss``
+    """
+    loads = np.nan_to_num(np.asarray(tss, dtype=np.float64), nan=0.0)
+    squeeze = loads.ndim == 1
+    loads = np.atleast_2d(loads)
+    plans, days = loads.shape
+
+    out = np.empty_like(loads)
+    carry = np.broadcast_to(np.asarray(seed, dtype=np.float64), (plans,)).astype(np.float64)
+    for start in range(0, days, _BLOCK_DAYS):
+        block = loads[:, start:start + _BLOCK_DAYS]
+        weights, decay = _weights(block.shape[1], time_constant)
+        out[:, start:start + block.shape[1]] = block @ weights.T + carry[:, None] * decay
+        carry = out[:, start + block.shape[1] - 1]
+
+    return out[0] if squeeze else out
+
+
+def pmc(
+    tss: np.ndarray,
+    ctl0=0.0,
+    atl0=0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Liczy CTL, ATL i TSB (wektorowo, także dla wielu planów naraz).
+
+    Args:
+        tss: TSS dzienne - kształt (dni,) lub (plany, dni)
+        ctl0: CTL przed pierwszym dniem
+        atl0: ATL przed pierwszym dniem
+
+    Returns:
+        Krotka (CTL, ATL, TSB)
+    """
+    ctl = ewma_load(tss, ctl0, SHEET_CONFIG.CTL_DAYS)
+    atl = ewma_load(tss, atl0, SHEET_CONFIG.ATL_DAYS)
+    return ctl, atl, ctl - atl
+
+
+def taper_multipliers(
+    days: int,
+    race_index: int,
+    taper_days: np.ndarray,
+    reduction: np.ndarray,
+    shape: np.ndarray
+) -> np.ndarray:
+    """
+    Buduje mnożniki TSS dla wielu wariantów taperu naraz.
+
+    Taper obejmuje ``taper_days`` dni przed dniem wyścigu:
+    - step: stała redukcja o ``reduction``
+    - linear: redukcja rosnąca liniowo do ``reduction`` w przeddzień
+    - exponential: redukcja rosnąca wykładniczo do ``reduction``
+
+    Args:
+        days: Liczba dni planu
+        race_index: Indeks dnia wyścigu w planie
+        taper_days: Długości taperu (wektor per wariant)
+        reduction: Redukcje objętości 0-1 (wektor per wariant)
+        shape: Indeksy kształtu z ``TAPER_SHAPES`` (wektor per wariant)
+
+    Returns:
+        Macierz mnożników (warianty, dni)
+    """
+    taper_days = np.asarray(taper_days)[:, None]
+    reduction = np.asarray(reduction, dtype=np.float64)[:, None]
+    shape = np.asarray(shape)[:, None]
+
+    # Pozycja w taperze: 1/L ... 1 w przeddzień wyścigu, <=0 przed taperem
+    until_race = race_index - np.arange(days)[None, :]
+    progress = (taper_days - until_race + 1) / taper_days
+    in_taper = (until_race >= 1) & (until_race <= taper_days)
+
+    step = np.ones_like(progress)
+    linear = progress
+    exponential = (np.exp(3.0 * progress) - 1.0) / (np.exp(3.0) - 1.0)
+    fraction = np.where(shape == 0, step, np.where(shape == 1, linear, exponential))
+
+    return np.where(in_taper, 1.0 - reduction * fraction, 1.0)
+
+
+@dataclass(frozen=True)
+class TaperPlan:
+    """
+    Wybrany plan taperu z prognozą PMC.
+
+    Attributes:
+        dates: Kolejne dni planu
+        tss: TSS po zastosowaniu taperu
+        ctl: Prognoza CTL
+        atl: Prognoza ATL
+        tsb: Prognoza TSB
+        race_date: Data wyścigu
+        taper_days: Długość taperu (dni)
+        reduction: Redukcja objętości (0-1)
+        shape: Kształt taperu (``TAPER_SHAPES``)
+        race_tsb: TSB w dniu wyścigu (forma z przeddnia)
+        ctl_loss: Utrata CTL względem planu bez taperu
+        in_window: Czy TSB mieści się w oknie startowym
+        candidates: Liczba ocenionych wariantów
+    """
+    dates: Tuple[datetime.date, ...]
+    tss: Tuple[float, ...]
+    ctl: Tuple[float, ...]
+    atl: Tuple[float, ...]
+    tsb: Tuple[float, ...]
+    race_date: datetime.date
+    taper_days: int
+    reduction: float
+    shape: str
+    race_tsb: float
+    ctl_loss: float
+    in_window: bool
+    candidates: int
+
+
+def optimize_taper(
+    planned_tss: Sequence[float],
+    start_date: datetime.date,
+    race_date: datetime.date,
+    ctl0: float = 0.0,
+    atl0: float = 0.0,
+    tsb_window: Tuple[float, float] = (SHEET_CONFIG.TSB_RACE_MIN, SHEET_CONFIG.TSB_RACE_MAX),
+    max_taper_days: int = 21,
+    reductions: Optional[Sequence[float]] = None
+) -> TaperPlan:
+    """
+    Wyszukuje taper trafiający w okno TSB przy minimalnej utracie CTL.
+
+    Oceniane są wszystkie kombinacje długości (1..``max_taper_days``),
+    redukcji i kształtu - jednym przebiegiem macierzowym. Forma w dniu
+    wyścigu to TSB z końca przeddnia (przed startem). Spośród wariantów
+    w oknie wybierany jest ten z najwyższym CTL w dniu wyścigu; gdy
+    żaden nie trafia w okno, wybierany jest najbliższy oknu.
+
+    Args:
+        planned_tss: Planowane TSS dzienne od ``start_date`` (co najmniej do wyścigu)
+        start_date: Data pierwszego dnia planu
+        race_date: Data wyścigu
+        ctl0: CTL przed pierwszym dniem planu
+        atl0: ATL przed pierwszym dniem planu
+        tsb_window: Okno TSB na wyścig (domyślnie +10 do +25 z legendy Dashboardu)
+        max_taper_days: Najdłuższy rozważany taper
+        reductions: Rozważane redukcje (domyślnie 0.10-0.90 co 0.02)
+
+    Returns:
+        Wybrany plan z prognozą PMC
+
+    Raises:
+        ValueError: Gdy wyścig wypada poza planem lub w pierwszym dniu
+    """
+    tss = np.nan_to_num(np.asarray(planned_tss, dtype=np.float64), nan=0.0)
+    race_index = (race_date - start_date).days
+    if race_index < 1 or race_index >= tss.size:
+        raise ValueError(
+            "Data wyścigu musi wypadać w planie (po pierwszym dniu) - "
+            f"plan ma {tss.size} dni, wyścig jest dniem {race_index}"
+        )
+    if reductions is None:
+        reductions = np.round(np.arange(0.10, 0.901, 0.02), 2)
+
+    lengths = np.arange(1, min(max_taper_days, race_index) + 1)
+    grid = np.array(
+        np.meshgrid(lengths, np.asarray(reductions), np.arange(len(TAPER_SHAPES)), indexing="ij")
+    ).reshape(3, -1)
+    taper_days, reduction, shape = grid[0].astype(int), grid[1], grid[2].astype(int)
+
+    # Wszystkie warianty naraz: (warianty, dni) -> PMC do przeddnia wyścigu
+    horizon = race_index
+    multipliers = taper_multipliers(horizon, race_index, taper_days, reduction, shape)
+    ctl, atl, tsb = pmc(tss[None, :horizon] * multipliers, ctl0, atl0)
+    race_ctl, race_tsb = ctl[:, -1], tsb[:, -1]
+
+    base_ctl = ewma_load(tss[:horizon], ctl0, SHEET_CONFIG.CTL_DAYS)[-1]
+    low, high = tsb_window
+    distance = np.maximum(low - race_tsb, 0.0) + np.maximum(race_tsb - high, 0.0)
+    in_window = distance == 0.0
+
+    if in_window.any():
+        # Najwyższe CTL; przy remisie - krótszy i łagodniejszy taper
+        score = np.where(in_window, race_ctl, -np.inf)
+        best = int(np.lexsort((reduction, taper_days, -score))[0])
+    else:
+        best = int(np.lexsort((-race_ctl, distance))[0])
+
+    final_multipliers = taper_multipliers(
+        tss.size, race_index, taper_days[best:best + 1],
+        reduction[best:best + 1], shape[best:best + 1]
+    )[0]
+    final_tss = tss * final_multipliers
+    final_ctl, final_atl, final_tsb = pmc(final_tss, ctl0, atl0)
+
+    return TaperPlan(
+        dates=tuple(start_date + datetime.timedelta(days=i) for i in range(tss.size)),
+        tss=tuple(final_tss.round(1).tolist()),
+        ctl=tuple(final_ctl.tolist()),
+        atl=tuple(final_atl.tolist()),
+        tsb=tuple(final_tsb.tolist()),
+        race_date=race_date,
+        taper_days=int(taper_days[best]),
+        reduction=float(reduction[best]),
+        shape=TAPER_SHAPES[shape[best]],
+        race_tsb=float(race_tsb[best]),
+        ctl_loss=float(base_ctl - race_ctl[best]),
+        in_window=bool(in_window[best]),
+        candidates=int(taper_days.size),
+    )
+
+
+def load_planned_tss(path: Path) -> Tuple[datetime.date, List[float]]:
+    """
+    Wczytuje plan TSS z pliku CSV (kolumny "Data"/"date" i "TSS").
+
+    Dni pominięte w pliku traktowane są jako dni wolne (TSS = 0).
+
+    Args:
+        path: Plik CSV z planem
+
+    Returns:
+        Krotka (data pierwszego dnia, TSS dzień po dniu)
+
+    Raises:
+        ValueError: Gdy brakuje kolumn lub plan jest pusty
+    """
+    planned: Dict[datetime.date, float] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        delimiter = ";" if ";" in f.readline() else ","
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter=delimiter)
+        fields = {name.strip().casefold(): name for name in reader.fieldnames or []}
+        date_field = fields.get("data") or fields.get("date")
+        tss_field = fields.get("tss")
+        if date_field is None or tss_field is None:
+            raise ValueError(f"Plik planu {path} wymaga kolumn 'Data' i 'TSS'")
+        for record in reader:
+            day = datetime.date.fromisoformat(record[date_field].strip())
+            value = record[tss_field].strip().replace(",", ".")
+            planned[day] = planned.get(day, 0.0) + (float(value) if value else 0.0)
+
+    if not planned:
+        raise ValueError(f"Plik planu {path} nie zawiera dni")
+
+    start, end = min(planned), max(planned)
+    days = (end - start).days + 1
+    return start, [
+        planned.get(start + datetime.timedelta(days=i), 0.0) for i in range(days)
+    ]
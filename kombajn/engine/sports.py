@@ -0,0 +1,420 @@
+"""
+Obciążenie treningowe wielu dyscyplin (rower, bieg, pływanie).
+
+TSS z mocy dotyczy tylko roweru. Pozostałe dyscypliny mają własne
+odpowiedniki, wszystkie w skali "100 = godzina na progu":
+
+- rTSS (bieg): IF = tempo progowe / tempo, rTSS = h · IF² · 100
+- sTSS (pływanie): IF = CSS / tempo na 100 m, sTSS = h · IF³ · 100
+- hrTSS (bez mocy / tempa): TRIMP Banistera względem godziny na tętnie
+  progowym, TRIMP = min · HRr · 0.64 · e^(1.92 · HRr),
+  HRr = (HR - HRrest) / (HRmax - HRrest)
+
+Modele dyscyplin są wymienne (``SPORT_MODELS``, ``register_sport``):
+model liczy obciążenie z kolumn sesji, a gdy to niemożliwe (NaN),
+używane jest hrTSS z tętnem progowym dyscypliny. Wynik sesji łączony
+jest w jedno obciążenie dzienne (``daily_load``), z którego liczone są
+CTL/ATL (``kombajn.engine.pmc``).
+
+Kolumna TSS Dziennika liczy to samo formułą dla dyscyplin wbudowanych
+(``SPORTS``); dyscypliny dodane przez ``register_sport`` działają tylko
+w silniku.
+"""
+
+import dataclasses
+import datetime
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kombajn.config import POWER_DEFAULTS, SPORT_ALIASES, SPORT_DEFAULTS, SPORTS
+from kombajn.engine.activities import activity_tss
+from kombajn.engine.intervals import smooth_power
+
+
+DEFAULT_SPORT = SPORTS[0]
+
+# Pole SportThresholds -> etykieta w arkuszu Ustawienia
+THRESHOLD_LABELS: Dict[str, str] = {
+    "ftp": "FTP (W)",
+    "max_hr": "HR Max (bpm)",
+    "resting_hr": "HR Rest (bpm)",
+    "lthr_bike": "LTHR rower (bpm)",
+    "lthr_run": "LTHR bieg (bpm)",
+    "run_pace": "Tempo progowe biegu (min/km)",
+    "swim_pace": "CSS pływanie (min/100 m)",
+}
+
+
+@dataclass(frozen=True)
+class SportThresholds:
+    """
+    Progi dyscyplin (arkusz Ustawienia).
+
+    Attributes:
+        ftp: FTP (W)
+        max_hr: Tętno maksymalne (bpm)
+        resting_hr: Tętno spoczynkowe (bpm)
+        lthr_bike: Tętno progowe na rowerze (bpm)
+        lthr_run: Tętno progowe w biegu (bpm)
+        run_pace: Tempo progowe biegu (min/km)
+        swim_pace: CSS - tempo progowe pływania (min/100 m)
+    """
+    ftp: float = POWER_DEFAULTS.FTP
+    max_hr: float = POWER_DEFAULTS.MAX_HR
+    resting_hr: float = POWER_DEFAULTS.RESTING_HR
+    lthr_bike: float = SPORT_DEFAULTS.LTHR_BIKE
+    lthr_run: float = SPORT_DEFAULTS.LTHR_RUN
+    run_pace: float = SPORT_DEFAULTS.RUN_THRESHOLD_PACE
+    swim_pace: float = SPORT_DEFAULTS.SWIM_THRESHOLD_PACE
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "SportThresholds":
+        """
+        Tworzy progi z pól arkusza Ustawienia (puste pola -> wartości domyślne).
+
+        Args:
+            settings: Wynik ``kombajn.journal.read_settings``
+
+        Returns:
+            Progi dyscyplin
+        """
+        values = {}
+        for name, label in THRESHOLD_LABELS.items():
+            value = settings.get(label)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+                values[name] = float(value)
+        return cls(**values)
+
+    @classmethod
+    def from_athlete(cls, profile: Any) -> "SportThresholds":
+        """
+        Tworzy progi z profilu zawodnika (``kombajn.profiles.AthleteProfile``).
+
+        Args:
+            profile: Profil zawodnika
+
+        Returns:
+            Progi dyscyplin
+        """
+        return cls(**{name: getattr(profile, name) for name in THRESHOLD_LABELS})
+
+
+# =============================================================================
+# OBCIĄŻENIE SESJI (WEKTOROWO)
+# =============================================================================
+
+def _positive(*arrays: np.ndarray) -> np.ndarray:
+    """Maska wierszy, w których wszystkie wartości są dodatnie (NaN = brak)."""
+    mask = np.ones(np.shape(arrays[0]), dtype=bool)
+    for values in arrays:
+        with np.errstate(invalid="ignore"):
+            mask &= np.asarray(values, dtype=np.float64) > 0
+    return mask
+
+
+def running_tss(minutes: np.ndarray, distance_km: np.ndarray, threshold_pace: float) -> np.ndarray:
+    """
+    rTSS z czasu i dystansu biegu.
+
+    Args:
+        minutes: Czas (min)
+        distance_km: Dystans (km)
+        threshold_pace: Tempo progowe (min/km)
+
+    Returns:
+        rTSS (NaN bez czasu lub dystansu)
+    """
+    minutes = np.asarray(minutes, dtype=np.float64)
+    distance = np.asarray(distance_km, dtype=np.float64)
+    if threshold_pace <= 0:
+        return np.full(minutes.shape, np.nan)
+    valid = _positive(minutes, distance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intensity = threshold_pace * distance / minutes
+        return np.where(valid, minutes / 60 * intensity ** 2 * 100, np.nan)
+
+
+def swim_tss(minutes: np.ndarray, distance_km: np.ndarray, threshold_pace: float) -> np.ndarray:
+    """
+    sTSS z czasu i dystansu pływania.
+
+    Args:
+        minutes: Czas (min)
+        distance_km: Dystans (km)
+        threshold_pace: CSS (min/100 m)
+
+    Returns:
+        sTSS (NaN bez czasu lub dystansu)
+    """
+    minutes = np.asarray(minutes, dtype=np.float64)
+    distance = np.asarray(distance_km, dtype=np.float64)
+    if threshold_pace <= 0:
+        return np.full(minutes.shape, np.nan)
+    valid = _positive(minutes, distance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intensity = threshold_pace * distance * 10 / minutes
+        return np.where(valid, minutes / 60 * intensity ** 3 * 100, np.nan)
+
+
+def trimp(minutes: np.ndarray, avg_hr: np.ndarray, resting_hr: float, max_hr: float) -> np.ndarray:
+    """
+    TRIMP Banistera (ważony wykładniczo czas w tętnie rezerwy).
+
+    Args:
+        minutes: Czas (min)
+        avg_hr: Tętno średnie (bpm)
+        resting_hr: Tętno spoczynkowe
+        max_hr: Tętno maksymalne
+
+    Returns:
+        TRIMP (NaN bez tętna lub przy HRmax <= HRrest)
+    """
+    minutes = np.asarray(minutes, dtype=np.float64)
+    heart_rate = np.asarray(avg_hr, dtype=np.float64)
+    if max_hr <= resting_hr:
+        return np.full(np.broadcast(minutes, heart_rate).shape, np.nan)
+    reserve = np.maximum(0, (heart_rate - resting_hr) / (max_hr - resting_hr))
+    return minutes * reserve * SPORT_DEFAULTS.TRIMP_A * np.exp(SPORT_DEFAULTS.TRIMP_B * reserve)
+
+
+def hr_tss(
+    minutes: np.ndarray,
+    avg_hr: np.ndarray,
+    lthr: float,
+    resting_hr: float,
+    max_hr: float
+) -> np.ndarray:
+    """
+    hrTSS - TRIMP sesji względem godziny na tętnie progowym.
+
+    Args:
+        minutes: Czas (min)
+        avg_hr: Tętno średnie (bpm)
+        lthr: Tętno progowe dyscypliny
+        resting_hr: Tętno spoczynkowe
+        max_hr: Tętno maksymalne
+
+    Returns:
+        hrTSS (NaN bez tętna)
+    """
+    if lthr <= resting_hr:
+        return np.full(np.shape(minutes), np.nan)
+    return trimp(minutes, avg_hr, resting_hr, max_hr) / trimp(60, lthr, resting_hr, max_hr) * 100
+
+
+# =============================================================================
+# OBCIĄŻENIE ZE STRUMIENI 1 Hz
+# =============================================================================
+
+def stream_hr_tss(heart_rate: np.ndarray, lthr: float, resting_hr: float, max_hr: float) -> float:
+    """
+    hrTSS ze strumienia tętna 1 Hz (TRIMP sekunda po sekundzie).
+
+    Sumowanie po sekundach docenia interwały, które tętno średnie
+    spłaszcza (e^(1.92·HRr) jest wypukłe).
+
+    Args:
+        heart_rate: Tętno 1 Hz (NaN = brak odczytu, pomijany)
+        lthr: Tętno progowe dyscypliny
+        resting_hr: Tętno spoczynkowe
+        max_hr: Tętno maksymalne
+
+    Returns:
+        hrTSS sesji
+    """
+    heart_rate = np.asarray(heart_rate, dtype=np.float64)
+    heart_rate = heart_rate[~np.isnan(heart_rate)]
+    per_second = hr_tss(np.full(heart_rate.shape, 1 / 60), heart_rate, lthr, resting_hr, max_hr)
+    return float(np.sum(per_second))
+
+
+def normalized_speed(speed: np.ndarray, window: int = 30) -> float:
+    """
+    Prędkość znormalizowana (jak NP: średnia rzędu 4 z 30-s średniej kroczącej).
+
+    Args:
+        speed: Prędkość 1 Hz (m/s)
+        window: Okno wygładzania (s)
+
+    Returns:
+        Prędkość znormalizowana (m/s)
+    """
+    speed = np.nan_to_num(np.asarray(speed, dtype=np.float64))
+    if speed.size == 0:
+        return 0.0
+    return float(np.mean(smooth_power(speed, window) ** 4) ** 0.25)
+
+
+def stream_running_tss(speed: np.ndarray, threshold_pace: float) -> float:
+    """
+    rTSS ze strumienia prędkości 1 Hz (bez korekty nachylenia).
+
+    Args:
+        speed: Prędkość 1 Hz (m/s)
+        threshold_pace: Tempo progowe (min/km)
+
+    Returns:
+        rTSS sesji
+    """
+    threshold_speed = 1000 / (threshold_pace * 60)
+    hours = np.size(speed) / 3600
+    return hours * (normalized_speed(speed) / threshold_speed) ** 2 * 100
+
+
+def stream_swim_tss(speed: np.ndarray, threshold_pace: float) -> float:
+    """
+    sTSS ze strumienia prędkości 1 Hz (średnia prędkość, przerwy liczą się jako 0).
+
+    Args:
+        speed: Prędkość 1 Hz (m/s)
+        threshold_pace: CSS (min/100 m)
+
+    Returns:
+        sTSS sesji
+    """
+    speed = np.nan_to_num(np.asarray(speed, dtype=np.float64))
+    if speed.size == 0:
+        return 0.0
+    threshold_speed = 100 / (threshold_pace * 60)
+    return speed.size / 3600 * (float(np.mean(speed)) / threshold_speed) ** 3 * 100
+
+
+# =============================================================================
+# MODELE DYSCYPLIN
+# =============================================================================
+
+# Kolumny sesji: "minutes", "distance_km", "normalized_power", "avg_hr"
+SessionColumns = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class SportModel:
+    """
+    Model obciążenia dyscypliny.
+
+    Attributes:
+        name: Nazwa (wartość kolumny "Sport", bez rozróżniania wielkości liter)
+        load: (kolumny sesji, progi) -> obciążenie; NaN = użyj hrTSS
+        lthr: Pole ``SportThresholds`` z tętnem progowym dla hrTSS
+    """
+    name: str
+    load: Callable[[SessionColumns, SportThresholds], np.ndarray]
+    lthr: str = "lthr_bike"
+
+
+def _power_load(columns: SessionColumns, thresholds: SportThresholds) -> np.ndarray:
+    return activity_tss(columns["minutes"], columns["normalized_power"], thresholds.ftp)
+
+
+def _running_load(columns: SessionColumns, thresholds: SportThresholds) -> np.ndarray:
+    return running_tss(columns["minutes"], columns["distance_km"], thresholds.run_pace)
+
+
+def _swim_load(columns: SessionColumns, thresholds: SportThresholds) -> np.ndarray:
+    return swim_tss(columns["minutes"], columns["distance_km"], thresholds.swim_pace)
+
+
+SPORT_MODELS: Dict[str, SportModel] = {
+    "Rower": SportModel("Rower", _power_load),
+    "Bieg": SportModel("Bieg", _running_load, lthr="lthr_run"),
+    "Pływanie": SportModel("Pływanie", _swim_load),
+    "Inne": SportModel("Inne", _power_load),
+}
+
+
+def register_sport(model: SportModel) -> None:
+    """
+    Dodaje (lub zastępuje) model dyscypliny.
+
+    Args:
+        model: Model obciążenia
+
+    Raises:
+        ValueError: Gdy pole tętna progowego nie istnieje
+    """
+    if model.lthr not in {f.name for f in dataclasses.fields(SportThresholds)}:
+        raise ValueError(f"Nieznane pole tętna progowego: {model.lthr}")
+    SPORT_MODELS[model.name] = model
+
+
+def sport_of(kind: str) -> Optional[str]:
+    """
+    Dyscyplina dla typu aktywności z eksportu (np. "VirtualRide" -> "Rower").
+
+    Args:
+        kind: Typ aktywności lub nazwa dyscypliny
+
+    Returns:
+        Nazwa dyscypliny lub None, gdy typ jest nieznany
+    """
+    key = kind.strip().lower()
+    for name in SPORT_MODELS:
+        if name.lower() == key:
+            return name
+    return SPORT_ALIASES.get(key)
+
+
+def session_load(
+    sports: Sequence[Optional[str]],
+    columns: SessionColumns,
+    thresholds: SportThresholds
+) -> np.ndarray:
+    """
+    Obciążenie (TSS) kolejnych sesji wg dyscypliny.
+
+    Pusta lub nieznana dyscyplina liczona jest jak rower (``DEFAULT_SPORT``).
+
+    Args:
+        sports: Dyscypliny sesji (wartości kolumny "Sport")
+        columns: Kolumny sesji; brakujące kolumny to NaN
+        thresholds: Progi dyscyplin
+
+    Returns:
+        TSS / rTSS / sTSS / hrTSS sesji (NaN, gdy nie da się policzyć)
+    """
+    keys = np.array([(sport or "").strip().lower() for sport in sports], dtype=object)
+    size = len(keys)
+    columns = {
+        name: np.asarray(columns[name], dtype=np.float64) if name in columns else np.full(size, np.nan)
+        for name in ("minutes", "distance_km", "normalized_power", "avg_hr")
+    }
+    models = {name.lower(): model for name, model in SPORT_MODELS.items()}
+    default = ~np.isin(keys, list(models))
+
+    load = np.full(size, np.nan)
+    for key, model in models.items():
+        mask = keys == key
+        if model.name == DEFAULT_SPORT:
+            mask |= default
+        if not mask.any():
+            continue
+        primary = model.load(columns, thresholds)
+        fallback = hr_tss(columns["minutes"], columns["avg_hr"], getattr(thresholds, model.lthr),
+                          thresholds.resting_hr, thresholds.max_hr)
+        load[mask] = np.where(np.isnan(primary), fallback, primary)[mask]
+    return load
+
+
+def daily_load(
+    days: Sequence[datetime.date],
+    load: np.ndarray
+) -> Tuple[Optional[datetime.date], np.ndarray]:
+    """
+    Łączy obciążenie sesji w jedno obciążenie dzienne (dni bez sesji = 0).
+
+    Args:
+        days: Daty sesji (kilka sesji jednego dnia jest sumowanych)
+        load: Obciążenie sesji (NaN = 0)
+
+    Returns:
+        Krotka (data pierwszego dnia, TSS dzień po dniu) - wejście ``pmc``
+    """
+    if len(days) == 0:
+        return None, np.zeros(0)
+    numbers = np.array([day.toordinal() for day in days], dtype=np.int64)
+    first = int(numbers.min())
+    totals = np.zeros(int(numbers.max()) - first + 1)
+    np.add.at(totals, numbers - first, np.nan_to_num(np.asarray(load, dtype=np.float64)))
+    return datetime.date.fromordinal(first), totals
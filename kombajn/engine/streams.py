@@ -0,0 +1,127 @@
+"""
+Wczytywanie strumieni aktywności.
+
+Archiwum aktywności to katalog plików CSV lub JSON z danymi 1 Hz
+(jeden wiersz = jedna sekunda). Data aktywności jest odczytywana
+z prefiksu nazwy pliku w formacie RRRR-MM-DD (np. ``2026-03-14_interwaly.csv``).
+"""
+
+import csv
+import datetime
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+# Akceptowane nazwy kolumny mocy (małe litery)
+POWER_COLUMN_NAMES: Tuple[str, ...] = ("power", "watts", "moc", "power (w)")
+
+_DATE_PREFIX = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+
+
+def activity_date(path: Path) -> Optional[datetime.date]:
+    """
+    Odczytuje datę aktywności z nazwy pliku.
+
+    Args:
+        path: Ścieżka do pliku aktywności
+
+    Returns:
+        Data aktywności lub None, gdy nazwa nie zaczyna się od RRRR-MM-DD
+    """
+    match = _DATE_PREFIX.match(Path(path).name)
+    if match is None:
+        return None
+    try:
+        return datetime.date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def _to_float_array(values) -> np.ndarray:
+    """Konwertuje wartości na tablicę float, puste/niepoprawne -> NaN."""
+    try:
+        # Szybka ścieżka - wszystkie wartości poprawne
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+
+    out = np.empty(len(values), dtype=np.float64)
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(value)
+        except (TypeError, ValueError):
+            out[i] = np.nan
+    return out
+
+
+def load_power_stream(path: Path) -> np.ndarray:
+    """
+    Wczytuje strumień mocy 1 Hz z pliku CSV lub JSON.
+
+    CSV musi mieć nagłówek z kolumną mocy (patrz ``POWER_COLUMN_NAMES``).
+    JSON może być listą liczb lub obiektem z kluczem ``power``/``watts``.
+    Brakujące próbki (dropouty) są zastępowane zerem.
+
+    Args:
+        path: Ścieżka do pliku aktywności
+
+    Returns:
+        Tablica mocy (W) o długości równej liczbie sekund
+
+    Raises:
+        ValueError: Gdy plik nie zawiera kolumny mocy lub ma nieznany format
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".json":
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            key = next((k for k in data if k.lower() in POWER_COLUMN_NAMES), None)
+            if key is None:
+                raise ValueError(f"Brak strumienia mocy w pliku {path.name}")
+            data = data[key]
+        power = _to_float_array(data)
+    elif suffix == ".csv":
+        with path.open(encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return np.zeros(0, dtype=np.float64)
+            lowered = [h.strip().lower() for h in header]
+            col = next((i for i, h in enumerate(lowered) if h in POWER_COLUMN_NAMES), None)
+            if col is None:
+                raise ValueError(f"Brak kolumny mocy w pliku {path.name}")
+            power = _to_float_array([row[col] if col < len(row) else "" for row in reader])
+    else:
+        raise ValueError(f"Nieobsługiwany format pliku aktywności: {path.name}")
+
+    return np.nan_to_num(power, nan=0.0)
+
+
+def iter_archive(
+    directory: Path,
+    patterns: Tuple[str, ...] = ("*.csv", "*.json")
+) -> Iterator[Path]:
+    """
+    Zwraca pliki aktywności z archiwum w kolejności nazw (czyli dat).
+
+    Args:
+        directory: Katalog archiwum
+        patterns: Wzorce plików do uwzględnienia
+
+    Yields:
+        Ścieżki do plików aktywności
+    """
+    directory = Path(directory)
+    files: Dict[Path, None] = {}
+    for pattern in patterns:
+        for path in directory.rglob(pattern):
+            if path.is_file():
+                files[path] = None
+    yield from sorted(files, key=lambda p: p.name)
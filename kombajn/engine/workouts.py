@@ -0,0 +1,620 @@
+"""
+Pliki treningów strukturalnych (.zwo, .erg, .mrc) i planowany TSS.
+
+Trening rozwijany jest do tablicy mocy docelowej 1 Hz:
+
+- ``.zwo`` (Zwift, XML) - bloki Warmup/Cooldown/Ramp (liniowo od
+  PowerLow do PowerHigh), SteadyState, IntervalsT, FreeRide, MaxEffort;
+  moc jako ułamek FTP
+- ``.erg`` (TrainerRoad/Golden Cheetah) - punkty MINUTES WATTS łączone
+  liniowo; z polem FTP w nagłówku przeliczane na ułamek FTP
+- ``.mrc`` - punkty MINUTES PERCENT (% FTP)
+
+Podsumowanie (czas, NP, IF, TSS) liczone jest jak dla jazdy: NP to
+średnia rzędu 4 z 30-s średniej kroczącej, TSS = h · IF² · 100.
+Treningi zapisane względem FTP mają podsumowanie niezależne od FTP
+(IF = NP względne), więc pamięć podręczna biblioteki nie wymaga
+przeliczania po zmianie FTP w Ustawieniach.
+
+Harmonogram (data -> treningi) zestawiany jest z wykonaniem z Dziennika
+(``compare_plan``).
+"""
+
+import csv
+import datetime
+import json
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kombajn.engine.intervals import smooth_power
+from kombajn.engine.metrics import JournalMetrics
+from kombajn.engine.sports import DEFAULT_SPORT
+from kombajn.engine.streams import iter_archive
+
+
+logger = logging.getLogger(__name__)
+
+# Rozszerzenia plików treningów
+WORKOUT_PATTERNS: Tuple[str, ...] = ("*.zwo", "*.erg", "*.mrc")
+
+# sportType pliku .zwo -> dyscyplina (bieg: ułamek tempa progowego)
+ZWO_SPORTS: Dict[str, str] = {"bike": "Rower", "run": "Bieg"}
+
+# Intensywność bloków bez mocy docelowej (ułamek FTP)
+FREE_RIDE_INTENSITY = 0.55
+MAX_EFFORT_INTENSITY = 1.5
+
+# Wersja formatu pliku pamięci podręcznej biblioteki
+_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Workout:
+    """
+    Trening rozwinięty do mocy docelowej 1 Hz.
+
+    Attributes:
+        name: Nazwa treningu
+        target: Moc docelowa w kolejnych sekundach
+        relative: True - ułamek FTP, False - waty
+        sport: Dyscyplina (``SPORTS``)
+    """
+    name: str
+    target: np.ndarray = field(repr=False)
+    relative: bool = True
+    sport: str = DEFAULT_SPORT
+
+    def power(self, ftp: float) -> np.ndarray:
+        """Moc docelowa w watach dla podanego FTP."""
+        return self.target * ftp if self.relative else self.target.copy()
+
+
+@dataclass(frozen=True)
+class WorkoutSummary:
+    """
+    Podsumowanie treningu.
+
+    Attributes:
+        name: Nazwa treningu
+        duration_s: Czas (s)
+        normalized: NP (ułamek FTP lub W - wg ``relative``)
+        average: Moc średnia (ułamek FTP lub W)
+        relative: True - wartości względem FTP
+        sport: Dyscyplina
+    """
+    name: str
+    duration_s: int
+    normalized: float
+    average: float
+    relative: bool = True
+    sport: str = DEFAULT_SPORT
+
+    @property
+    def minutes(self) -> float:
+        """Czas (min)."""
+        return self.duration_s / 60
+
+    def normalized_power(self, ftp: float) -> float:
+        """NP (W)."""
+        return self.normalized * ftp if self.relative else self.normalized
+
+    def intensity(self, ftp: float) -> float:
+        """IF = NP / FTP (NaN przy FTP <= 0 dla treningów w watach)."""
+        if self.relative:
+            return self.normalized
+        return self.normalized / ftp if ftp > 0 else float("nan")
+
+    def tss(self, ftp: float) -> float:
+        """Planowany TSS = h · IF² · 100."""
+        return self.duration_s / 3600 * self.intensity(ftp) ** 2 * 100
+
+
+# =============================================================================
+# ROZWIJANIE SEGMENTÓW
+# =============================================================================
+
+def expand_segments(durations: Sequence[int], low: Sequence[float], high: Sequence[float]) -> np.ndarray:
+    """
+    Rozwija segmenty liniowe do tablicy 1 Hz (wektorowo, bez pętli po sekundach).
+
+    Args:
+        durations: Czasy segmentów (s)
+        low: Wartość na początku segmentu
+        high: Wartość na końcu segmentu (równa ``low`` = blok stały)
+
+    Returns:
+        Wartości w kolejnych sekundach
+    """
+    durations = np.asarray(durations, dtype=np.int64)
+    keep = durations > 0
+    durations = durations[keep]
+    low = np.asarray(low, dtype=np.float64)[keep]
+    high = np.asarray(high, dtype=np.float64)[keep]
+    if durations.size == 0:
+        return np.empty(0)
+
+    starts = np.cumsum(durations) - durations
+    offset = np.arange(durations.sum()) - np.repeat(starts, durations)
+    step = np.repeat((high - low) / durations, durations)
+    return np.repeat(low, durations) + step * offset
+
+
+# =============================================================================
+# PARSERY
+# =============================================================================
+
+def _seconds(value: Optional[str]) -> int:
+    """Czas bloku .zwo (s); brak atrybutu -> 0."""
+    return int(round(float(value))) if value else 0
+
+
+def _attr(element: ET.Element, *names: str, default: float = 0.0) -> float:
+    """Pierwszy obecny atrybut liczbowy (nazwy bez rozróżniania wielkości liter)."""
+    attributes = {k.casefold(): v for k, v in element.attrib.items()}
+    for name in names:
+        value = attributes.get(name.casefold())
+        if value not in (None, ""):
+            return float(value)
+    return default
+
+
+def parse_zwo(text: str, name: str = "") -> Workout:
+    """
+    Parsuje trening Zwift (.zwo).
+
+    Args:
+        text: Zawartość pliku XML
+        name: Nazwa zastępcza (gdy brak znacznika <name>)
+
+    Returns:
+        Trening z mocą względną (ułamek FTP)
+
+    Raises:
+        ValueError: Przy niepoprawnym XML lub braku bloków
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        raise ValueError(f"niepoprawny XML ({e})") from None
+    body = root.find("workout")
+    if body is None:
+        raise ValueError("brak sekcji <workout>")
+
+    durations: List[int] = []
+    low: List[float] = []
+    high: List[float] = []
+
+    def block(seconds: int, start: float, end: Optional[float] = None) -> None:
+        durations.append(seconds)
+        low.append(start)
+        high.append(start if end is None else end)
+
+    for element in body:
+        tag = element.tag.casefold()
+        seconds = _seconds(element.get("Duration"))
+        if tag in ("warmup", "cooldown", "ramp"):
+            block(seconds, _attr(element, "PowerLow"), _attr(element, "PowerHigh"))
+        elif tag == "steadystate":
+            power = _attr(element, "Power", default=np.nan)
+            if np.isnan(power):
+                power = (_attr(element, "PowerLow") + _attr(element, "PowerHigh")) / 2
+            block(seconds, power)
+        elif tag == "intervalst":
+            on = (_seconds(element.get("OnDuration")), _attr(element, "OnPower", "PowerOnHigh"))
+            off = (_seconds(element.get("OffDuration")), _attr(element, "OffPower", "PowerOffLow"))
+            for _ in range(int(_attr(element, "Repeat", default=1))):
+                block(*on)
+                block(*off)
+        elif tag == "freeride":
+            block(seconds, FREE_RIDE_INTENSITY)
+        elif tag == "maxeffort":
+            block(seconds, MAX_EFFORT_INTENSITY)
+        else:
+            logger.debug("Pominięto blok .zwo <%s>", element.tag)
+
+    if sum(durations) <= 0:
+        raise ValueError("trening nie zawiera bloków z czasem")
+    sport = ZWO_SPORTS.get((root.findtext("sportType") or "bike").strip().casefold(), DEFAULT_SPORT)
+    title = (root.findtext("name") or "").strip() or name
+    return Workout(title, expand_segments(durations, low, high), True, sport)
+
+
+_SECTION_RE = re.compile(r"^\[(?P<name>[^\]]+)\]$")
+
+
+def parse_erg(text: str, name: str = "") -> Workout:
+    """
+    Parsuje trening .erg (MINUTES WATTS) lub .mrc (MINUTES PERCENT).
+
+    Punkty [COURSE DATA] łączone są liniowo; dwa punkty w tej samej
+    minucie dają skok mocy.
+
+    Args:
+        text: Zawartość pliku
+        name: Nazwa zastępcza (gdy brak pola DESCRIPTION / FILE NAME)
+
+    Returns:
+        Trening; .erg bez pola FTP ma moc w watach
+
+    Raises:
+        ValueError: Przy braku punktów lub nieznanych jednostkach
+    """
+    header: Dict[str, str] = {}
+    units: Optional[Tuple[str, str]] = None
+    points: List[Tuple[float, float]] = []
+    section = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        match = _SECTION_RE.match(line)
+        if match:
+            section = match.group("name").strip().upper()
+            continue
+        if section == "COURSE HEADER":
+            if "=" in line:
+                key, value = line.split("=", 1)
+                header[key.strip().upper()] = value.strip()
+            else:
+                parts = line.upper().split()
+                if len(parts) == 2:
+                    units = (parts[0], parts[1])
+        elif section == "COURSE DATA":
+            parts = line.replace(",", " ").split()
+            try:
+                points.append((float(parts[0]), float(parts[1])))
+            except (IndexError, ValueError):
+                raise ValueError(f"niepoprawny punkt [COURSE DATA]: {line}") from None
+
+    if units is None or units[0] != "MINUTES" or units[1] not in ("WATTS", "PERCENT"):
+        raise ValueError("nagłówek wymaga jednostek MINUTES WATTS lub MINUTES PERCENT")
+    if len(points) < 2:
+        raise ValueError("trening wymaga co najmniej dwóch punktów [COURSE DATA]")
+
+    minutes = np.array([p[0] for p in points])
+    values = np.array([p[1] for p in points])
+    if np.any(np.diff(minutes) < 0):
+        raise ValueError("punkty [COURSE DATA] muszą mieć rosnący czas")
+    seconds = np.round(minutes * 60).astype(np.int64)
+    target = expand_segments(np.diff(seconds), values[:-1], values[1:])
+
+    relative = True
+    if units[1] == "PERCENT":
+        target = target / 100
+    else:
+        try:
+            ftp = float(header.get("FTP", ""))
+        except ValueError:
+            ftp = 0.0
+        if ftp > 0:
+            target = target / ftp
+        else:
+            relative = False
+
+    title = header.get("DESCRIPTION") or header.get("FILE NAME") or name
+    return Workout(title, target, relative)
+
+
+def load_workout(path: Path) -> Workout:
+    """
+    Wczytuje trening z pliku (.zwo, .erg, .mrc).
+
+    Raises:
+        ValueError: Przy nieobsługiwanym formacie lub błędnej zawartości
+        OSError: Gdy pliku nie da się odczytać
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding="utf-8-sig", errors="replace")
+    try:
+        if suffix == ".zwo":
+            return parse_zwo(text, path.stem)
+        if suffix in (".erg", ".mrc"):
+            return parse_erg(text, path.stem)
+    except ValueError as e:
+        raise ValueError(f"{path.name}: {e}") from None
+    raise ValueError(f"Nieobsługiwany format treningu: {path.name}")
+
+
+def summarize_workout(workout: Workout) -> WorkoutSummary:
+    """
+    Liczy czas, NP i moc średnią treningu.
+
+    Args:
+        workout: Trening
+
+    Returns:
+        Podsumowanie w jednostkach treningu (względne lub W)
+    """
+    target = workout.target
+    normalized = float(np.mean(smooth_power(target, 30) ** 4) ** 0.25) if target.size else 0.0
+    average = float(np.mean(target)) if target.size else 0.0
+    return WorkoutSummary(workout.name, int(target.size), normalized, average,
+                          workout.relative, workout.sport)
+
+
+# =============================================================================
+# BIBLIOTEKA TRENINGÓW (PAMIĘĆ PODRĘCZNA)
+# =============================================================================
+
+@dataclass(frozen=True)
+class WorkoutLibrary:
+    """
+    Podsumowania treningów z katalogu.
+
+    Attributes:
+        summaries: Plik -> podsumowanie
+        errors: Plik -> opis błędu (pliki pominięte)
+        computed: Liczba plików przeliczonych (pozostałe z pamięci podręcznej)
+    """
+    summaries: Dict[Path, WorkoutSummary]
+    errors: Dict[Path, str]
+    computed: int
+
+    def by_name(self) -> Dict[str, WorkoutSummary]:
+        """Indeks nazwa pliku / nazwa bez rozszerzenia (małe litery) -> podsumowanie."""
+        index: Dict[str, WorkoutSummary] = {}
+        for path, summary in self.summaries.items():
+            index.setdefault(path.stem.casefold(), summary)
+            index[path.name.casefold()] = summary
+        return index
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    """Znacznik pliku (mtime_ns, rozmiar)."""
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+def _summarize_file(path: Path) -> Tuple[Path, Optional[WorkoutSummary], str]:
+    """Podsumowuje plik treningu (funkcja modułu - wymagana przez ProcessPool)."""
+    try:
+        return path, summarize_workout(load_workout(path)), ""
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+
+
+def _read_cache(cache_path: Optional[Path]) -> Dict[str, dict]:
+    """Wczytuje wpisy pamięci podręcznej (pusty słownik, gdy brak lub inna wersja)."""
+    if cache_path is None or not Path(cache_path).is_file():
+        return {}
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def summarize_library(
+    directory: Path,
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+    chunksize: int = 64
+) -> WorkoutLibrary:
+    """
+    Podsumowuje wszystkie treningi z katalogu (rekurencyjnie).
+
+    Pliki bez zmian (ten sam mtime i rozmiar) brane są z pamięci
+    podręcznej JSON; pozostałe liczone są równolegle.
+
+    Args:
+        directory: Katalog biblioteki treningów
+        workers: Liczba procesów (1 = bez puli procesów)
+        cache_path: Plik pamięci podręcznej (None = bez zapisu)
+        chunksize: Pliki przekazywane procesowi naraz
+
+    Returns:
+        Biblioteka treningów
+    """
+    entries = _read_cache(cache_path)
+    summaries: Dict[Path, WorkoutSummary] = {}
+    stamps: Dict[Path, Tuple[int, int]] = {}
+    missing: List[Path] = []
+    for path in iter_archive(directory, WORKOUT_PATTERNS):
+        stamp = stamps[path] = _stamp(path)
+        entry = entries.get(str(path.resolve()))
+        if entry is not None and tuple(entry.get("stamp", ())) == stamp:
+            try:
+                summaries[path] = WorkoutSummary(**entry["summary"])
+                continue
+            except (KeyError, TypeError):
+                pass
+        missing.append(path)
+
+    if workers > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_summarize_file, missing, chunksize=chunksize))
+    else:
+        results = [_summarize_file(path) for path in missing]
+
+    errors: Dict[Path, str] = {}
+    for path, summary, error in results:
+        if summary is None:
+            logger.warning("Pominięto trening %s", error)
+            errors[path] = error
+        else:
+            summaries[path] = summary
+
+    if cache_path is not None and missing:
+        data = {
+            "version": _CACHE_VERSION,
+            "entries": {
+                str(path.resolve()): {"stamp": list(stamps[path]), "summary": asdict(summary)}
+                for path, summary in summaries.items()
+            },
+        }
+        tmp = Path(f"{cache_path}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+
+    summaries = dict(sorted(summaries.items(), key=lambda item: item[0].name))
+    return WorkoutLibrary(summaries, errors, len(missing))
+
+
+# =============================================================================
+# PLAN (DZIEŃ -> TRENINGI)
+# =============================================================================
+
+@dataclass(frozen=True)
+class PlannedDay:
+    """
+    Planowane treningi dnia.
+
+    Attributes:
+        day: Data
+        workouts: Nazwy treningów
+        minutes: Łączny czas (min)
+        normalized_power: NP treningów rowerowych (W); NaN, gdy brak
+        intensity: IF dnia - średnia rzędu 4 ważona czasem
+        tss: Suma planowanego TSS
+    """
+    day: datetime.date
+    workouts: Tuple[str, ...]
+    minutes: float
+    normalized_power: float
+    intensity: float
+    tss: float
+
+
+def load_schedule(path: Path) -> Dict[datetime.date, List[str]]:
+    """
+    Wczytuje harmonogram z pliku CSV (kolumny "Data"/"date" i "Trening"/"workout").
+
+    Kilka wierszy z tą samą datą to kilka treningów dnia.
+
+    Args:
+        path: Plik CSV
+
+    Returns:
+        Data -> nazwy treningów (plik lub nazwa bez rozszerzenia)
+
+    Raises:
+        ValueError: Gdy brakuje kolumn lub data jest niepoprawna
+    """
+    schedule: Dict[datetime.date, List[str]] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        delimiter = ";" if ";" in f.readline() else ","
+        f.seek(0)
+        reader = csv.DictReader(f, delimiter=delimiter)
+        fields = {name.strip().casefold(): name for name in reader.fieldnames or []}
+        date_field = fields.get("data") or fields.get("date")
+        workout_field = fields.get("trening") or fields.get("workout")
+        if date_field is None or workout_field is None:
+            raise ValueError(f"Plik harmonogramu {path} wymaga kolumn 'Data' i 'Trening'")
+        for line, record in enumerate(reader, start=2):
+            name = (record[workout_field] or "").strip()
+            if not name:
+                continue
+            try:
+                day = datetime.date.fromisoformat((record[date_field] or "").strip())
+            except ValueError:
+                raise ValueError(f"{path}: niepoprawna data w wierszu {line}") from None
+            schedule.setdefault(day, []).append(name)
+    return schedule
+
+
+def planned_days(
+    schedule: Dict[datetime.date, Iterable[str]],
+    library: WorkoutLibrary,
+    ftp: float
+) -> List[PlannedDay]:
+    """
+    Liczy planowane obciążenie kolejnych dni harmonogramu.
+
+    Args:
+        schedule: Data -> nazwy treningów
+        library: Biblioteka treningów
+        ftp: FTP (W) z arkusza Ustawienia
+
+    Returns:
+        Dni planu posortowane po dacie
+
+    Raises:
+        ValueError: Gdy harmonogram wskazuje trening spoza biblioteki
+    """
+    index = library.by_name()
+    unknown = sorted({
+        name for names in schedule.values() for name in names
+        if name.strip().casefold() not in index
+    })
+    if unknown:
+        raise ValueError(f"Treningi spoza biblioteki: {', '.join(unknown)}")
+
+    def mean4(values: np.ndarray, weights: np.ndarray) -> float:
+        """Średnia rzędu 4 ważona czasem (jak NP z całego dnia)."""
+        total = weights.sum()
+        return float((np.sum(weights * values ** 4) / total) ** 0.25) if total > 0 else float("nan")
+
+    days: List[PlannedDay] = []
+    for day in sorted(schedule):
+        names = tuple(schedule[day])
+        summaries = [index[name.strip().casefold()] for name in names]
+        seconds = np.array([s.duration_s for s in summaries], dtype=np.float64)
+        intensity = np.array([s.intensity(ftp) for s in summaries])
+        bike = np.array([s.sport == DEFAULT_SPORT for s in summaries])
+        days.append(PlannedDay(
+            day=day,
+            workouts=names,
+            minutes=float(seconds.sum() / 60),
+            normalized_power=mean4(intensity[bike] * ftp, seconds[bike]),
+            intensity=mean4(intensity, seconds),
+            tss=float(sum(s.tss(ftp) for s in summaries)),
+        ))
+    return days
+
+
+@dataclass(frozen=True)
+class PlanComparison:
+    """
+    Plan dnia zestawiony z wykonaniem z Dziennika.
+
+    Attributes:
+        planned: Plan dnia
+        minutes: Wykonany czas (min); NaN = brak wpisu
+        tss: Wykonany TSS; NaN = brak wpisu
+    """
+    planned: PlannedDay
+    minutes: float
+    tss: float
+
+    @property
+    def tss_difference(self) -> float:
+        """Wykonany - planowany TSS (brak wykonania = 0 TSS)."""
+        return float(np.nan_to_num(self.tss)) - self.planned.tss
+
+
+def compare_plan(planned: Sequence[PlannedDay], journal: JournalMetrics) -> List[PlanComparison]:
+    """
+    Zestawia dni planu z wykonaniem (TSS liczony jak formuły Dziennika).
+
+    Args:
+        planned: Dni planu (``planned_days``)
+        journal: Metryki dziennika (``journal_metrics``)
+
+    Returns:
+        Porównanie dla kolejnych dni planu
+    """
+    rows = {day: i for i, day in enumerate(journal.days)}
+    comparison: List[PlanComparison] = []
+    for day in planned:
+        i = rows.get(day.day)
+        if i is None:
+            comparison.append(PlanComparison(day, float("nan"), float("nan")))
+        else:
+            comparison.append(PlanComparison(
+                day, float(journal.minutes[i]), float(journal.metrics.tss[i])
+            ))
+    return comparison
@@ -0,0 +1,786 @@
+"""
+Import list aktywności z plików CSV (Garmin Connect, Strava, intervals.icu).
+
+Eksport listy aktywności to jeden wiersz na aktywność. Plik czytany jest
+porcjami (``chunk_rows`` wierszy), każda porcja zamieniana na tablice
+NumPy i od razu sumowana po dniach, więc pamięć zależy od liczby dni,
+a nie od wielkości pliku. Kilka aktywności jednego dnia daje jeden wiersz:
+
+- suma: "Czas jazdy (min)", "Dystans (km)", "Przewyższenia (m)", "TSS"
+- średnia ważona czasem: "Avg Power (W)", "Avg Kadencja", "Avg HR"
+- "NP (W)": średnia kwadratowa ważona czasem wszystkich aktywności dnia
+  (także bez mocy, jak "Czas jazdy (min)") - formuła TSS dziennika
+  (czas · NP² / FTP²) daje wtedy sumę TSS aktywności z mocą
+- maksimum: "Max Power (W)", "Max HR"
+- "Typ treningu": typy aktywności dnia (bez powtórzeń)
+- "Sport": dyscyplina wg typu (``SPORT_ALIASES``), gdy wszystkie
+  aktywności dnia to ta sama dyscyplina - formuła TSS liczy wtedy
+  rTSS / sTSS / hrTSS
+
+Kolumny pliku przypisuje się nagłówkom ``LOG_HEADERS`` (gotowe formaty
+``CSV_FORMATS`` lub własne mapowanie). Dzienne wiersze trafiają do arkusza
+Dziennik (kolumny wejściowe; "TSS" liczy formuła) lub do pliku CSV.
+
+Z ``--activities`` pojedyncze aktywności trafiają dodatkowo do arkusza
+"Aktywności" (``ActivityLog``). NP dnia liczone jest wtedy średnią rzędu 4
+ważoną czasem, komórka TSS dnia sumuje TSS aktywności z arkusza, a "Typ
+treningu" jest odnośnikiem do pierwszej aktywności dnia. Aktywności bez
+TSS z eksportu i bez mocy (bieg, pływanie, trening na tętnie) dostają
+rTSS / sTSS / hrTSS z progów Ustawień, więc dzień z kilkoma dyscyplinami
+sumuje obciążenie każdej z nich. Kolejny import zastępuje w arkuszu
+aktywności importowanych dni.
+
+Użycie:
+    python -m kombajn import activities.csv dziennik.xlsx
+    python -m kombajn import export.csv dziennik.xlsx --format strava --overwrite
+    python -m kombajn import export.csv --csv dni.csv --column "Avg HR=Średnie tętno"
+    python -m kombajn import export.csv dziennik.xlsx --activities
+"""
+
+import argparse
+import csv
+import dataclasses
+import datetime
+import itertools
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.hyperlink import Hyperlink
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.config import LOG_HEADERS, LOG_INPUT_COLUMNS, log_column
+from kombajn.engine.activities import ActivityLog
+from kombajn.engine.sports import DEFAULT_SPORT, SportThresholds, session_load, sport_of
+from kombajn.journal import (
+    extend_log_table,
+    journal_column,
+    load_journal,
+    log_cell,
+    log_date_rows,
+    log_table,
+    read_settings,
+    row_for_date,
+)
+from kombajn.sheets.activities import ActivitiesSheet
+
+
+# Nagłówek -> sposób łączenia aktywności jednego dnia
+AGGREGATION: Dict[str, str] = {
+    "Czas jazdy (min)": "sum",
+    "Dystans (km)": "sum",
+    "Przewyższenia (m)": "sum",
+    "TSS": "sum",
+    "Avg Power (W)": "mean",
+    "Avg Kadencja": "mean",
+    "Avg HR": "mean",
+    "NP (W)": "rms",
+    "Max Power (W)": "max",
+    "Max HR": "max",
+}
+
+NUMERIC_HEADERS: Tuple[str, ...] = tuple(AGGREGATION)
+TIME_HEADER = "Czas jazdy (min)"
+TYPE_HEADER = "Typ treningu"
+SPORT_HEADER = "Sport"
+IMPORTED_HEADERS: Tuple[str, ...] = ("Data",) + NUMERIC_HEADERS + (TYPE_HEADER,)
+# Kolumny wyliczane z importowanych (nie mapowane na kolumny pliku)
+DERIVED_HEADERS: Tuple[str, ...] = (SPORT_HEADER,)
+
+# Miejsca po przecinku zapisywanych wartości
+ROUNDING: Dict[str, int] = {
+    "Czas jazdy (min)": 1,
+    "Dystans (km)": 2,
+    "TSS": 1,
+}
+
+# Domyślne mnożniki (czas liczbowy w sekundach)
+DEFAULT_SCALE: Dict[str, float] = {TIME_HEADER: 1 / 60}
+
+# Wartości oznaczające brak danych w eksportach
+MISSING_VALUES = frozenset({"", "--", "-", "n/a", "N/A", "null", "None"})
+
+# Formaty dat spoza ISO (Strava, eksporty z lokalnym formatem)
+DATE_FORMATS: Tuple[str, ...] = (
+    "%b %d, %Y, %I:%M:%S %p",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+)
+
+# Nagłówek dziennika -> pole aktywności (``ActivityLog``)
+ACTIVITY_FIELDS: Dict[str, str] = {
+    "Czas jazdy (min)": "minutes",
+    "Dystans (km)": "distance_km",
+    "Przewyższenia (m)": "elevation_m",
+    "Avg Power (W)": "avg_power",
+    "NP (W)": "normalized_power",
+    "Max Power (W)": "max_power",
+    "Avg Kadencja": "cadence",
+    "Avg HR": "avg_hr",
+    "Max HR": "max_hr",
+    "TSS": "tss",
+}
+
+_SLOTS = len(NUMERIC_HEADERS)
+_MAX_COLUMNS = np.array([AGGREGATION[h] == "max" for h in NUMERIC_HEADERS])
+
+
+@dataclass(frozen=True)
+class CsvFormat:
+    """
+    Mapowanie kolumn eksportu na nagłówki dziennika.
+
+    Attributes:
+        name: Nazwa formatu
+        columns: Nagłówek ``LOG_HEADERS`` -> nazwa kolumny w pliku CSV
+        scale: Nagłówek -> mnożnik wartości (np. metry -> km: 0.001);
+            domyślnie ``DEFAULT_SCALE`` - czas liczbowy w sekundach,
+            "gg:mm:ss" zamieniany jest na minuty bez mnożnika
+        decimal: Separator dziesiętny ("." lub ",")
+    """
+    name: str
+    columns: Dict[str, str]
+    scale: Dict[str, float] = field(default_factory=dict)
+    decimal: str = "."
+
+    def __post_init__(self) -> None:
+        unknown = sorted(set(self.columns) - set(IMPORTED_HEADERS))
+        if unknown:
+            raise ValueError(f"Kolumny dziennika bez importu: {', '.join(unknown)}")
+        if "Data" not in self.columns:
+            raise ValueError(f"Format {self.name}: brak kolumny daty")
+        if self.decimal not in (".", ","):
+            raise ValueError(f"Niepoprawny separator dziesiętny: {self.decimal!r}")
+
+    def with_columns(self, columns: Dict[str, str]) -> "CsvFormat":
+        """Zwraca kopię z nadpisanymi kolumnami (nagłówek -> kolumna CSV)."""
+        return dataclasses.replace(self, columns={**self.columns, **columns})
+
+
+CSV_FORMATS: Dict[str, CsvFormat] = {
+    "garmin": CsvFormat("garmin", {
+        "Data": "Date",
+        "Typ treningu": "Activity Type",
+        "Czas jazdy (min)": "Time",
+        "Dystans (km)": "Distance",
+        "Przewyższenia (m)": "Total Ascent",
+        "Avg Power (W)": "Avg Power",
+        "NP (W)": "Normalized Power® (NP®)",
+        "Max Power (W)": "Max Power",
+        "Avg Kadencja": "Avg Bike Cadence",
+        "Avg HR": "Avg HR",
+        "Max HR": "Max HR",
+        "TSS": "Training Stress Score®",
+    }),
+    "strava": CsvFormat("strava", {
+        "Data": "Activity Date",
+        "Typ treningu": "Activity Type",
+        "Czas jazdy (min)": "Moving Time",
+        "Dystans (km)": "Distance",
+        "Przewyższenia (m)": "Elevation Gain",
+        "Avg Power (W)": "Average Watts",
+        "NP (W)": "Weighted Average Power",
+        "Max Power (W)": "Max Watts",
+        "Avg Kadencja": "Average Cadence",
+        "Avg HR": "Average Heart Rate",
+        "Max HR": "Max Heart Rate",
+    }),
+    "intervals": CsvFormat("intervals", {
+        "Data": "start_date_local",
+        "Typ treningu": "type",
+        "Czas jazdy (min)": "moving_time",
+        "Dystans (km)": "distance",
+        "Przewyższenia (m)": "total_elevation_gain",
+        "Avg Power (W)": "icu_average_watts",
+        "NP (W)": "icu_weighted_avg_watts",
+        "Avg Kadencja": "average_cadence",
+        "Avg HR": "average_heartrate",
+        "Max HR": "max_heartrate",
+        "TSS": "icu_training_load",
+    }, scale={"Dystans (km)": 0.001}),
+}
+
+
+@dataclass
+class ImportResult:
+    """
+    Wynik importu pliku CSV.
+
+    Attributes:
+        format: Użyty format
+        activities: Liczba zaimportowanych aktywności
+        skipped: Wiersze pominięte (brak lub błędna data)
+        days: Data -> wartości dnia (nagłówek -> wartość)
+        written: Liczba komórek zapisanych w Dzienniku
+        activity_log: Pojedyncze aktywności (gdy ``keep_activities``)
+    """
+    format: str
+    activities: int = 0
+    skipped: int = 0
+    days: Dict[datetime.date, Dict[str, Any]] = field(default_factory=dict)
+    written: int = 0
+    activity_log: Optional[ActivityLog] = None
+
+    def write_csv(self, path: Path) -> None:
+        """Zapisuje dni do pliku CSV (separator ";", kolumny jak w dzienniku)."""
+        headers = [h for h in LOG_HEADERS if h in IMPORTED_HEADERS + DERIVED_HEADERS]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(headers)
+            for day in sorted(self.days):
+                values = {"Data": day.isoformat(), **self.days[day]}
+                writer.writerow(["" if values.get(h) is None else values[h] for h in headers])
+
+
+def parse_day(text: str) -> Optional[datetime.date]:
+    """
+    Odczytuje datę aktywności (ISO z czasem lub bez, formaty ``DATE_FORMATS``).
+
+    Returns:
+        Data lub None, gdy tekstu nie da się odczytać
+    """
+    text = text.strip()
+    try:
+        return datetime.date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_number(text: str, decimal: str = ".") -> float:
+    """
+    Odczytuje liczbę z separatorami tysięcy (brak danych -> NaN).
+
+    Args:
+        text: Tekst komórki (np. "1,234.5" lub "1 234,5")
+        decimal: Separator dziesiętny
+
+    Returns:
+        Wartość lub NaN
+    """
+    text = text.strip()
+    if text in MISSING_VALUES:
+        return math.nan
+    thousands = "," if decimal == "." else "."
+    text = text.replace(thousands, "").replace(" ", "").replace(" ", "")
+    if decimal == ",":
+        text = text.replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def parse_minutes(text: str, scale: float, decimal: str = ".") -> float:
+    """Czas "gg:mm:ss" / "mm:ss" w minutach; liczba mnożona przez ``scale``."""
+    text = text.strip()
+    if ":" not in text:
+        return parse_number(text, decimal) * scale
+    seconds = 0.0
+    try:
+        for part in text.split(":"):
+            seconds = seconds * 60 + float(part.replace(",", "."))
+    except ValueError:
+        return math.nan
+    return seconds / 60
+
+
+def detect_format(header: Sequence[str]) -> CsvFormat:
+    """
+    Rozpoznaje format eksportu po nagłówku pliku.
+
+    Args:
+        header: Pierwszy wiersz pliku CSV
+
+    Returns:
+        Format z kolumną daty i największą liczbą rozpoznanych kolumn
+
+    Raises:
+        ValueError: Gdy żaden format nie pasuje
+    """
+    present = set(h.strip() for h in header)
+    candidates = [
+        (sum(column in present for column in fmt.columns.values()), name)
+        for name, fmt in CSV_FORMATS.items() if fmt.columns["Data"] in present
+    ]
+    if not candidates:
+        raise ValueError("Nie rozpoznano formatu pliku - podaj --format lub --column Data=KOLUMNA")
+    return CSV_FORMATS[max(candidates)[1]]
+
+
+def _accumulate(values: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+    """
+    Zamienia wartości aktywności na akumulatory (licznik, mianownik).
+
+    Sumy i maksima: (wartość, liczba wartości); średnie: (w·x lub w·x², w),
+    gdzie w to czas aktywności (aktywność bez czasu ma wagę 1 min).
+    Mianownik średniej kwadratowej (NP) to czas wszystkich aktywności,
+    bo formuła TSS mnoży NP² przez czas całego dnia.
+    """
+    present = ~np.isnan(values)
+    weights = np.where(minutes > 0, minutes, 1.0)[:, None]
+    numerators = np.where(present, values, 0.0)
+    denominators = present.astype(np.float64)
+    for j, header in enumerate(NUMERIC_HEADERS):
+        kind = AGGREGATION[header]
+        if kind in ("mean", "rms"):
+            power = 2 if kind == "rms" else 1
+            numerators[:, j] = np.where(present[:, j], weights[:, 0] * values[:, j] ** power, 0.0)
+            counted = present[:, j] if kind == "mean" else np.ones(len(values), dtype=bool)
+            denominators[:, j] = np.where(counted, weights[:, 0], 0.0)
+        elif kind == "max":
+            numerators[:, j] = np.where(present[:, j], values[:, j], -np.inf)
+    return np.hstack([numerators, denominators])
+
+
+def _reduce(days: np.ndarray, accumulators: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Łączy akumulatory tych samych dni (sumy dodawane, maksima przez fmax)."""
+    unique, inverse = np.unique(days, return_inverse=True)
+    max_slots = np.concatenate([_MAX_COLUMNS, np.zeros(_SLOTS, dtype=bool)])
+    totals = np.zeros((len(unique), accumulators.shape[1]))
+    np.add.at(totals, inverse, np.where(max_slots, 0.0, accumulators))
+    maxima = np.full_like(totals, -np.inf)
+    np.fmax.at(maxima, inverse, np.where(max_slots, accumulators, -np.inf))
+    return unique, np.where(max_slots, maxima, totals)
+
+
+def _finish(day_numbers: np.ndarray, accumulators: np.ndarray) -> Iterator[Tuple[datetime.date, Dict[str, Any]]]:
+    """Zamienia akumulatory na wartości dnia (zaokrąglone)."""
+    numerators, denominators = accumulators[:, :_SLOTS], accumulators[:, _SLOTS:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results = numerators.copy()
+        for j, header in enumerate(NUMERIC_HEADERS):
+            kind = AGGREGATION[header]
+            if kind == "mean":
+                results[:, j] = numerators[:, j] / denominators[:, j]
+            elif kind == "rms":
+                results[:, j] = np.sqrt(numerators[:, j] / denominators[:, j])
+    for i, number in enumerate(day_numbers):
+        values: Dict[str, Any] = {}
+        for j, header in enumerate(NUMERIC_HEADERS):
+            # NP (rms): mianownik liczy też aktywności bez mocy
+            if denominators[i, j] <= 0 or (AGGREGATION[header] == "rms" and numerators[i, j] <= 0):
+                continue
+            digits = ROUNDING.get(header, 0)
+            value = round(float(results[i, j]), digits)
+            values[header] = value if digits else int(value)
+        yield datetime.date.fromordinal(int(number)), values
+
+
+def import_activities(
+    path: Path,
+    csv_format: Optional[CsvFormat] = None,
+    columns: Optional[Dict[str, str]] = None,
+    decimal: Optional[str] = None,
+    chunk_rows: int = 2048,
+    keep_activities: bool = False
+) -> ImportResult:
+    """
+    Czyta plik CSV porcjami i sumuje aktywności po dniach.
+
+    Args:
+        path: Eksport listy aktywności (CSV, separator wykrywany)
+        csv_format: Format pliku (domyślnie rozpoznawany po nagłówku; gdy
+            żaden nie pasuje, wystarczy ``columns`` z kolumną "Data")
+        columns: Dodatkowe/nadpisane kolumny (nagłówek dziennika -> kolumna CSV)
+        decimal: Separator dziesiętny (domyślnie wg formatu)
+        chunk_rows: Liczba wierszy przetwarzanych naraz
+        keep_activities: Zachowaj pojedyncze aktywności (``activity_log``)
+
+    Returns:
+        Wynik importu z wartościami dni
+
+    Raises:
+        ValueError: Przy pustym pliku, nieznanym formacie lub braku kolumny daty
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows musi być dodatnie")
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(8192)
+        f.seek(0)
+        try:
+            dialect: Any = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"Pusty plik: {Path(path).name}")
+
+        if csv_format is None:
+            try:
+                csv_format = detect_format(header)
+            except ValueError:
+                if not columns or "Data" not in columns:
+                    raise
+                csv_format = CsvFormat("własny", dict(columns))
+        if columns:
+            csv_format = csv_format.with_columns(columns)
+        if decimal is not None:
+            csv_format = dataclasses.replace(csv_format, decimal=decimal)
+
+        index: Dict[str, int] = {}
+        for i, name in enumerate(header):
+            index.setdefault(name.strip(), i)  # Strava ma dwie kolumny "Distance" (km, m)
+        date_column = csv_format.columns["Data"]
+        if date_column not in index:
+            raise ValueError(f"Brak kolumny daty '{date_column}' w pliku {Path(path).name}")
+        numeric = [
+            (j, index[csv_format.columns[h]], csv_format.scale.get(h, DEFAULT_SCALE.get(h, 1.0)))
+            for j, h in enumerate(NUMERIC_HEADERS)
+            if csv_format.columns.get(h) in index
+        ]
+        time_slot = NUMERIC_HEADERS.index(TIME_HEADER)
+        type_index = index.get(csv_format.columns.get(TYPE_HEADER, ""))
+        date_index = index[date_column]
+        decimal = csv_format.decimal
+
+        result = ImportResult(csv_format.name)
+        types: Dict[int, List[str]] = {}
+        kept_days: List[np.ndarray] = []
+        kept_kinds: List[str] = []
+        kept_values: List[np.ndarray] = []
+        day_numbers = np.empty(0, dtype=np.int64)
+        totals = np.empty((0, 2 * _SLOTS))
+        while True:
+            chunk = list(itertools.islice(reader, chunk_rows))
+            if not chunk:
+                break
+            days = []
+            rows = []
+            for row in chunk:
+                day = parse_day(row[date_index]) if date_index < len(row) else None
+                if day is None:
+                    if any(cell.strip() for cell in row):
+                        result.skipped += 1
+                    continue
+                days.append(day.toordinal())
+                rows.append(row)
+                kind = row[type_index].strip() \
+                    if type_index is not None and type_index < len(row) else ""
+                if keep_activities:
+                    kept_kinds.append(kind)
+                if type_index is not None:
+                    day_types = types.setdefault(days[-1], [])
+                    if kind and kind not in day_types:
+                        day_types.append(kind)
+            if not rows:
+                continue
+
+            values = np.full((len(rows), _SLOTS), np.nan)
+            for j, column, scale in numeric:
+                cells = [row[column] if column < len(row) else "" for row in rows]
+                if j == time_slot:
+                    values[:, j] = [parse_minutes(c, scale, decimal) for c in cells]
+                else:
+                    values[:, j] = [parse_number(c, decimal) for c in cells]
+                    if scale != 1.0:
+                        values[:, j] *= scale
+            minutes = np.nan_to_num(values[:, time_slot])
+            result.activities += len(rows)
+            if keep_activities:
+                kept_days.append(np.asarray(days, dtype=np.int64))
+                kept_values.append(values)
+            day_numbers, totals = _reduce(
+                np.concatenate([day_numbers, np.asarray(days, dtype=np.int64)]),
+                np.vstack([totals, _accumulate(values, minutes)]),
+            )
+
+    for day, values in _finish(day_numbers, totals):
+        day_types = types.get(day.toordinal())
+        if day_types:
+            values[TYPE_HEADER] = ", ".join(day_types)
+            sports = {sport_of(kind) for kind in day_types}
+            if len(sports) == 1 and None not in sports:
+                values[SPORT_HEADER] = sports.pop()
+        result.days[day] = values
+    if keep_activities:
+        values = np.vstack(kept_values) if kept_values else np.empty((0, _SLOTS))
+        result.activity_log = ActivityLog(
+            np.concatenate(kept_days) if kept_days else np.empty(0, dtype=np.int64),
+            kept_kinds,
+            {ACTIVITY_FIELDS[h]: values[:, j] for j, h in enumerate(NUMERIC_HEADERS)},
+        )
+    return result
+
+
+def write_days(
+    ws: Any,
+    days: Dict[datetime.date, Dict[str, Any]],
+    overwrite: bool = False
+) -> int:
+    """
+    Zapisuje dni do arkusza Dziennik (tylko kolumny wejściowe).
+
+    Tabela dziennika powiększana jest raz - do ostatniej importowanej
+    daty - zamiast wiersz po wierszu. Pusta data startowa (A2) dostaje
+    pierwszą importowaną datę; dni sprzed niej są pomijane.
+
+    Args:
+        ws: Arkusz Dziennik
+        days: Data -> wartości dnia (``ImportResult.days``)
+        overwrite: Nadpisuj niepuste komórki (domyślnie tylko puste)
+
+    Returns:
+        Liczba zapisanych komórek
+
+    Raises:
+        ValueError: Gdy układ kolumn dziennika jest nieznany
+    """
+    if not days:
+        return 0
+    columns = {
+        h: log_column(h) for h in IMPORTED_HEADERS + DERIVED_HEADERS
+        if log_column(h) in LOG_INPUT_COLUMNS
+    }
+    columns.pop("Data")
+    # Zapis wg pozycji kolumn - układ pliku sprawdzany przed zmianami
+    used = [h for values in days.values() for h in values if h in columns]
+    journal_column(ws, max(used, key=columns.get, default="Data"))
+
+    first, last = min(days), max(days)
+    if ws["A2"].value in (None, ""):
+        ws["A2"] = first
+        ws["A2"].number_format = "yyyy-mm-dd"
+    start = ws["A2"].value
+    if isinstance(start, datetime.datetime):
+        start = start.date()
+    if isinstance(start, datetime.date) and log_table(ws) is not None and last >= start:
+        extend_log_table(ws, 2 + (last - start).days)
+
+    date_rows = log_date_rows(ws)
+    written = 0
+    for day in sorted(days):
+        row = row_for_date(ws, day, date_rows)
+        if row is None:
+            continue
+        for header, value in days[day].items():
+            column = columns.get(header)
+            if column is None:
+                continue
+            cell = log_cell(ws, row, column)
+            if overwrite or cell.value in (None, ""):
+                cell.value = value
+                written += 1
+    return written
+
+
+def read_activities(ws: Worksheet) -> ActivityLog:
+    """
+    Odczytuje aktywności z arkusza Aktywności.
+
+    Komórki z formułą (TSS liczony z NP) i puste dają NaN.
+
+    Args:
+        ws: Arkusz Aktywności
+
+    Returns:
+        Dziennik aktywności
+    """
+    fields = ActivitiesSheet.COLUMNS
+    days: List[int] = []
+    kinds: List[str] = []
+    values: List[List[float]] = []
+    for row in ws.iter_rows(min_row=2, max_col=len(fields), values_only=True):
+        day = row[0]
+        if isinstance(day, datetime.datetime):
+            day = day.date()
+        if not isinstance(day, datetime.date):
+            continue
+        days.append(day.toordinal())
+        kinds.append(str(row[1] or ""))
+        values.append([
+            float(value) if isinstance(value, (int, float)) else math.nan
+            for value, (_, name) in zip(row, fields) if name is not None
+        ])
+    names = [name for _, name in fields if name is not None]
+    matrix = np.array(values, dtype=np.float64).reshape(len(values), len(names))
+    return ActivityLog(days, kinds, {name: matrix[:, j] for j, name in enumerate(names)})
+
+
+def _with_sport_load(activities: ActivityLog, thresholds: SportThresholds) -> ActivityLog:
+    """
+    Uzupełnia brakujący TSS aktywności bez mocy (rTSS / sTSS / hrTSS).
+
+    Jazdy z NP zostają bez wartości - arkusz liczy ich TSS formułą z FTP.
+    """
+    sports = [sport_of(kind) or DEFAULT_SPORT for kind in activities.kinds]
+    load = session_load(sports, activities.columns, thresholds)
+    tss = activities.columns["tss"]
+    by_power = np.array([sport in (DEFAULT_SPORT, "Inne") for sport in sports], dtype=bool) \
+        & ~np.isnan(activities.columns["normalized_power"])
+    fill = np.isnan(tss) & ~by_power & ~np.isnan(load)
+    if not fill.any():
+        return activities
+    columns = dict(activities.columns, tss=np.where(fill, np.round(load, 1), tss))
+    return ActivityLog(activities.days, activities.kinds, columns)
+
+
+def write_activities(workbook: Workbook, activities: ActivityLog) -> int:
+    """
+    Zapisuje arkusz Aktywności i łączy z nim wiersze Dziennika.
+
+    Aktywności już obecne w arkuszu są zachowane, poza dniami z
+    ``activities`` (te są zastępowane). Dla każdego dnia z aktywnościami
+    komórka TSS Dziennika sumuje TSS aktywności dnia, a "Typ treningu"
+    dostaje odnośnik do pierwszej aktywności dnia.
+
+    Args:
+        workbook: Skoroszyt dziennika
+        activities: Nowe aktywności
+
+    Returns:
+        Liczba połączonych dni Dziennika
+    """
+    title = "Aktywności"
+    activities = _with_sport_load(activities, SportThresholds.from_settings(read_settings(workbook)))
+    if title in workbook.sheetnames:
+        activities = read_activities(workbook[title]).merged(activities)
+        del workbook[title]
+    sheet = ActivitiesSheet(workbook, activities)
+    sheet.create()
+
+    ws = workbook["Dziennik"]
+    tss_column = journal_column(ws, "TSS")
+    type_column = journal_column(ws, TYPE_HEADER)
+    tss_letter = get_column_letter(ActivitiesSheet.column("TSS"))
+    date_rows = log_date_rows(ws)
+    linked = 0
+    for number, (first, last) in sheet.activity_rows().items():
+        row = row_for_date(ws, datetime.date.fromordinal(number), date_rows)
+        if row is None:
+            continue
+        span = f"'{title}'!{tss_letter}{first}:{tss_letter}{last}"
+        log_cell(ws, row, tss_column).value = f'=IF(COUNT({span})>0, SUM({span}), "")'
+        cell = log_cell(ws, row, type_column)
+        if cell.value in (None, ""):
+            cell.value = f"{title} ({last - first + 1})"
+        cell.hyperlink = Hyperlink(ref=cell.coordinate, location=f"'{title}'!A{first}")
+        linked += 1
+    return linked
+
+
+def import_journal(
+    csv_path: Path,
+    journal_path: Path,
+    output_path: Optional[Path] = None,
+    csv_format: Optional[CsvFormat] = None,
+    columns: Optional[Dict[str, str]] = None,
+    decimal: Optional[str] = None,
+    overwrite: bool = False,
+    chunk_rows: int = 2048,
+    activities_sheet: bool = False
+) -> ImportResult:
+    """
+    Importuje eksport aktywności do dziennika.
+
+    Args:
+        csv_path: Eksport listy aktywności
+        journal_path: Dziennik (xlsx)
+        output_path: Plik wynikowy (domyślnie nadpisuje dziennik)
+        csv_format: Format pliku (domyślnie rozpoznawany)
+        columns: Dodatkowe/nadpisane kolumny
+        decimal: Separator dziesiętny (domyślnie wg formatu)
+        overwrite: Nadpisuj niepuste komórki dziennika
+        chunk_rows: Liczba wierszy CSV przetwarzanych naraz
+        activities_sheet: Zapisz pojedyncze aktywności w arkuszu Aktywności
+            (NP dnia jako średnia rzędu 4, TSS dnia jako suma aktywności)
+
+    Returns:
+        Wynik importu
+    """
+    result = import_activities(csv_path, csv_format, columns, decimal, chunk_rows,
+                               keep_activities=activities_sheet)
+    workbook = load_journal(journal_path)
+    if result.activity_log is not None:
+        ftp = read_settings(workbook).get("FTP (W)")
+        totals = result.activity_log.daily(float(ftp) if isinstance(ftp, (int, float)) else 0.0)
+        for day, power in zip(totals.days, totals.normalized_power):
+            if not np.isnan(power):
+                result.days[day]["NP (W)"] = int(round(float(power)))
+    result.written = write_days(workbook["Dziennik"], result.days, overwrite)
+    if result.activity_log is not None:
+        write_activities(workbook, result.activity_log)
+    workbook.save(output_path or journal_path)
+    return result
+
+
+def _column_mapping(text: str) -> Tuple[str, str]:
+    header, separator, column = text.partition("=")
+    if not separator or not header or not column:
+        raise argparse.ArgumentTypeError(f"Oczekiwano NAGŁÓWEK=KOLUMNA_CSV, podano: {text}")
+    return header, column
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``import`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "import",
+        help="Importuj eksport aktywności CSV (Garmin/Strava/intervals.icu)",
+        description="Sumuje aktywności po dniach i zapisuje je do Dziennika lub pliku CSV.",
+    )
+    parser.add_argument("csv_path", type=Path, help="Eksport listy aktywności (CSV)")
+    parser.add_argument("journal", type=Path, nargs="?", default=None, help="Dziennik (xlsx)")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="Plik wynikowy (domyślnie nadpisuje dziennik)")
+    parser.add_argument("--format", choices=sorted(CSV_FORMATS), default=None,
+                        help="Format eksportu (domyślnie rozpoznawany po nagłówku)")
+    parser.add_argument(
+        "--column", type=_column_mapping, action="append", default=[],
+        metavar="NAGŁÓWEK=KOLUMNA", help='Kolumna pliku dla nagłówka dziennika, np. "Avg HR=Tętno"'
+    )
+    parser.add_argument("--decimal", choices=(".", ","), default=None,
+                        help="Separator dziesiętny (domyślnie wg formatu: .)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Nadpisuj niepuste komórki Dziennika")
+    parser.add_argument("--csv", type=Path, default=None, dest="csv_output",
+                        help="Zapisz dni do pliku CSV (kolumny dziennika)")
+    parser.add_argument("--activities", action="store_true",
+                        help="Zapisz pojedyncze aktywności w arkuszu Aktywności")
+    parser.add_argument("--chunk-rows", type=int, default=2048,
+                        help="Wiersze przetwarzane naraz (domyślnie: 2048)")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``import`` (kod wyjścia 1 przy błędzie)."""
+    if args.journal is None and args.csv_output is None:
+        print("[BŁĄD] Podaj dziennik (xlsx) lub --csv PLIK")
+        return 1
+    try:
+        csv_format = CSV_FORMATS[args.format] if args.format else None
+        columns = dict(args.column) or None
+        if args.journal is not None:
+            result = import_journal(
+                args.csv_path, args.journal, args.output, csv_format, columns,
+                args.decimal, args.overwrite, args.chunk_rows, args.activities,
+            )
+        else:
+            result = import_activities(
+                args.csv_path, csv_format, columns, args.decimal, args.chunk_rows
+            )
+        if args.csv_output is not None:
+            result.write_csv(args.csv_output)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+    print(f"Format: {result.format}, aktywności: {result.activities}, dni: {len(result.days)}"
+          f" (pominięte wiersze: {result.skipped})")
+    if args.journal is not None:
+        print(f"Dziennik: {args.output or args.journal} (zapisane komórki: {result.written})")
+    if args.csv_output is not None:
+        print(f"CSV: {args.csv_output}")
+    return 0
@@ -0,0 +1,490 @@
+"""
+Operacje na wypełnionych dziennikach.
+
+Ten moduł zawiera funkcje do:
+- Wczytywania istniejącego dziennika (xlsx)
+- Odczytu i zapisu parametrów arkusza Ustawienia
+- Lokalizowania wierszy dziennika po dacie (z powiększaniem tabeli Dziennik)
+- Dopisywania wyników analiz do kolumn dziennika
+"""
+
+import datetime
+import re
+from collections import OrderedDict
+from copy import copy
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import Cell
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter, range_boundaries
+from openpyxl.worksheet.cell_range import MultiCellRange
+from openpyxl.worksheet.table import Table
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.config import (
+    LOG_DATE_FORMULA, LOG_HEADERS, LOG_TABLE_NAME, SHEET_CONFIG, log_column
+)
+
+
+# Formuła kolejnych dat generowana przez LogSheet._add_date_column
+_DATE_FORMULA_ANCHOR = "$A$2"
+
+# Zakres serii wykresu, np. 'Dziennik'!$X$2:$X$91
+_CHART_RANGE_RE = re.compile(r"^(?P<head>.+!\$[A-Z]+\$\d+:\$[A-Z]+\$)(?P<row>\d+)$")
+
+
+def load_journal(path: Path) -> Workbook:
+    """
+    Wczytuje dziennik z zachowaniem formuł.
+
+    Args:
+        path: Ścieżka do pliku xlsx
+
+    Returns:
+        Skoroszyt dziennika
+
+    Raises:
+        ValueError: Gdy plik nie zawiera arkusza Dziennik
+    """
+    wb = load_workbook(path)
+    if "Dziennik" not in wb.sheetnames:
+        raise ValueError(f"Plik {Path(path).name} nie zawiera arkusza [Dziennik]")
+    return wb
+
+
+def read_settings(workbook: Workbook) -> Dict[str, Any]:
+    """
+    Odczytuje pola arkusza Ustawienia jako słownik etykieta -> wartość.
+
+    Args:
+        workbook: Skoroszyt dziennika
+
+    Returns:
+        Słownik etykiet z kolumny A i wartości z kolumny B
+        (pusty, gdy arkusza nie ma)
+    """
+    if "Ustawienia" not in workbook.sheetnames:
+        return {}
+
+    settings: Dict[str, Any] = {}
+    for label, value in workbook["Ustawienia"].iter_rows(
+        min_col=1, max_col=2, values_only=True
+    ):
+        if isinstance(label, str) and label:
+            settings[label] = value
+    return settings
+
+
+def write_settings(workbook: Workbook, values: Dict[str, Any]) -> int:
+    """
+    Zapisuje pola wejściowe arkusza Ustawienia wg etykiet z kolumny A.
+
+    Args:
+        workbook: Skoroszyt dziennika
+        values: Słownik etykieta -> wartość
+
+    Returns:
+        Liczba zapisanych pól
+
+    Raises:
+        ValueError: Przy nieznanej etykiecie lub polu liczonym formułą
+    """
+    ws = workbook["Ustawienia"]
+    rows = {
+        label: row for row, (label,) in enumerate(
+            ws.iter_rows(min_col=1, max_col=1, values_only=True), start=1
+        ) if isinstance(label, str) and label
+    }
+    for label, value in values.items():
+        if label not in rows:
+            raise ValueError(f"Nieznane pole Ustawień: {label}")
+        cell = ws.cell(row=rows[label], column=2)
+        if isinstance(cell.value, str) and cell.value.startswith("="):
+            raise ValueError(f"Pole Ustawień [{label}] jest liczone formułą")
+        cell.value = value
+    return len(values)
+
+
+def _as_date(value: Any) -> Optional[datetime.date]:
+    """Zamienia wartość komórki na datę (lub None)."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return None
+
+
+def iter_log_rows(
+    ws: Worksheet,
+    max_col: Optional[int] = None
+) -> Iterator[Tuple[datetime.date, int, Tuple[Any, ...]]]:
+    """
+    Przechodzi po wierszach dziennika z datą (działa też w trybie read-only).
+
+    Obsługuje zarówno daty wpisane ręcznie, jak i formuły kolejnych
+    dni liczone od daty startowej w A2.
+
+    Args:
+        ws: Arkusz Dziennik
+        max_col: Ostatnia odczytywana kolumna (domyślnie wszystkie)
+
+    Yields:
+        Krotki (data, numer wiersza, wartości komórek wiersza od kolumny A)
+    """
+    start: Optional[datetime.date] = None
+    for row, values in enumerate(
+        ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2
+    ):
+        value = values[0] if values else None
+        day = _as_date(value)
+        if row == 2:
+            start = day
+        if day is None and start is not None and isinstance(value, str) \
+                and _DATE_FORMULA_ANCHOR in value:
+            day = start + datetime.timedelta(days=row - 2)
+        if day is not None:
+            yield day, row, values
+
+
+def log_date_rows(ws: Worksheet) -> Dict[datetime.date, int]:
+    """
+    Buduje indeks data -> numer wiersza dla arkusza Dziennik.
+
+    Args:
+        ws: Arkusz Dziennik
+
+    Returns:
+        Słownik data -> numer wiersza (pierwszy wiersz danej daty)
+    """
+    rows: Dict[datetime.date, int] = {}
+    for day, row, _ in iter_log_rows(ws, max_col=1):
+        rows.setdefault(day, row)
+    return rows
+
+
+def log_cell(ws: Worksheet, row: int, column: int) -> Cell:
+    """
+    Zwraca komórkę dziennika z domyślnym stylem kolumny.
+
+    Dziennik formatowany jest stylami kolumn; Excel stosuje je tylko do
+    komórek nieobecnych w pliku, więc nowa komórka dostaje styl kolumny
+    (tło, ramka) jawnie.
+
+    Args:
+        ws: Arkusz Dziennik
+        row: Numer wiersza
+        column: Numer kolumny (1-based)
+
+    Returns:
+        Komórka
+    """
+    cell = ws.cell(row=row, column=column)
+    if not cell.has_style:
+        dimension = ws.column_dimensions.get(get_column_letter(column))
+        if dimension is not None and dimension.has_style:
+            cell._style = copy(dimension._style)
+    return cell
+
+
+def check_log_layout(ws: Worksheet) -> int:
+    """
+    Sprawdza układ kolumn dziennika na podstawie nagłówków z wiersza 1.
+
+    Zapis do dziennika odbywa się według pozycji kolumn, więc nagłówki
+    pliku muszą być początkiem LOG_HEADERS. Starsze dzienniki mogą nie
+    mieć kolumn dopisanych później na końcu układu.
+
+    Args:
+        ws: Arkusz Dziennik (działa też w trybie read-only)
+
+    Returns:
+        Liczba kolumn dziennika obecnych w pliku
+
+    Raises:
+        ValueError: Gdy nagłówki nie odpowiadają układowi LOG_HEADERS
+    """
+    headers = next(
+        ws.iter_rows(min_row=1, max_row=1, max_col=len(LOG_HEADERS), values_only=True), ()
+    )
+    headers = list(headers)
+    while headers and headers[-1] in (None, ""):
+        headers.pop()
+    for column, (found, expected) in enumerate(zip(headers, LOG_HEADERS), start=1):
+        if found != expected:
+            raise ValueError(
+                f"Nieznany układ kolumn Dziennika: kolumna {get_column_letter(column)} "
+                f"to [{found}], oczekiwano [{expected}]"
+            )
+    if not headers:
+        raise ValueError("Nieznany układ kolumn Dziennika: brak nagłówków w wierszu 1")
+    return len(headers)
+
+
+def journal_column(ws: Worksheet, header: str) -> int:
+    """
+    Zwraca numer kolumny dziennika po sprawdzeniu układu pliku.
+
+    Args:
+        ws: Arkusz Dziennik
+        header: Nagłówek z LOG_HEADERS
+
+    Returns:
+        Numer kolumny (1-based)
+
+    Raises:
+        ValueError: Gdy układ pliku jest nieznany lub nie ma w nim kolumny
+    """
+    column = log_column(header)
+    if column > check_log_layout(ws):
+        raise ValueError(f"Dziennik nie ma kolumny [{header}] (starszy układ pliku)")
+    return column
+
+
+def log_table(ws: Worksheet) -> Optional[Table]:
+    """
+    Zwraca tabelę Excela obejmującą dziennik.
+
+    Args:
+        ws: Arkusz Dziennik
+
+    Returns:
+        Tabela lub None (dzienniki sprzed wprowadzenia tabeli)
+    """
+    for table in ws.tables.values():
+        if table.displayName == LOG_TABLE_NAME:
+            return table
+    return None
+
+
+def extend_log_table(ws: Worksheet, last_row: int) -> int:
+    """
+    Powiększa tabelę dziennika do wskazanego wiersza.
+
+    Nowe wiersze dostają style i formuły kolumn obliczanych z pierwszego
+    wiersza danych (tak jak przy dopisywaniu wiersza pod tabelą w Excelu)
+    oraz formułę kolejnej daty w kolumnie A.
+
+    Args:
+        ws: Arkusz Dziennik
+        last_row: Ostatni wiersz, który ma należeć do tabeli
+
+    Returns:
+        Liczba dopisanych wierszy
+
+    Raises:
+        ValueError: Gdy arkusz nie zawiera tabeli dziennika
+    """
+    table = log_table(ws)
+    if table is None:
+        raise ValueError(f"Arkusz [{ws.title}] nie zawiera tabeli {LOG_TABLE_NAME}")
+    min_col, min_row, max_col, max_row = range_boundaries(table.ref)
+    if last_row <= max_row:
+        return 0
+
+    first = min_row + 1
+    templates = [ws.cell(row=first, column=col) for col in range(min_col, max_col + 1)]
+    # Jeden Translator na kolumnę (tokenizacja formuły jest kosztowna);
+    # formuły bez odwołań względnych (np. [@TSS]) kopiowane są bez zmian
+    formulas: Dict[int, Tuple[str, Optional[Translator]]] = {}
+    for cell in templates:
+        if isinstance(cell.value, str) and cell.value.startswith("="):
+            translator = Translator(cell.value, origin=cell.coordinate)
+            moved = translator.translate_formula(f"{cell.column_letter}{first + 1}")
+            formulas[cell.column] = (cell.value, None if moved == cell.value else translator)
+    for row in range(max_row + 1, last_row + 1):
+        for template in templates:
+            cell = ws.cell(row=row, column=template.column)
+            cell._style = copy(template._style)
+            formula = formulas.get(template.column)
+            if formula is not None:
+                text, translator = formula
+                cell.value = text if translator is None else \
+                    translator.translate_formula(f"{template.column_letter}{row}")
+        if ws.cell(row=row, column=1).value in (None, ""):
+            ws.cell(row=row, column=1).value = LOG_DATE_FORMULA
+
+    table.ref = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{last_row}"
+    if table.autoFilter is not None:
+        table.autoFilter.ref = table.ref
+    resize_row_ranges(ws, max_row, last_row)
+    resize_chart_ranges(ws, max_row, last_row)
+    return last_row - max_row
+
+
+def _grow_ranges(ranges: MultiCellRange, max_row: int, last_row: int) -> bool:
+    """Wydłuża zakresy kończące się na wierszu ``max_row`` (zwraca, czy coś zmieniono)."""
+    grown = False
+    for cell_range in ranges.ranges:
+        if cell_range.max_row == max_row:
+            cell_range.max_row = last_row
+            grown = True
+    return grown
+
+
+def resize_row_ranges(ws: Worksheet, max_row: int, last_row: int) -> None:
+    """
+    Wydłuża formatowanie warunkowe i walidację danych wierszy tabeli.
+
+    Kolory stref, alerty i lista dyscyplin obejmują tylko wiersze tabeli
+    (nie całe kolumny), więc rosną razem z nią - jak w Excelu przy
+    dopisywaniu wiersza pod tabelą.
+
+    Args:
+        ws: Arkusz Dziennik
+        max_row: Dotychczasowy ostatni wiersz tabeli
+        last_row: Nowy ostatni wiersz
+    """
+    formats = ws.conditional_formatting
+    entries = list(formats._cf_rules.items())
+    if any([_grow_ranges(cf.sqref, max_row, last_row) for cf, _ in entries]):
+        # Klucze słownika reguł haszowane są tekstem zakresu - budowa od nowa
+        rules: Dict[Any, List[Any]] = OrderedDict()
+        for cf, cf_rules in entries:
+            rules.setdefault(cf, []).extend(cf_rules)
+        formats._cf_rules = rules
+    for validation in ws.data_validations.dataValidation:
+        _grow_ranges(validation.sqref, max_row, last_row)
+
+
+def resize_chart_ranges(ws: Worksheet, max_row: int, last_row: int) -> None:
+    """
+    Przesuwa koniec serii wykresów kończących się na wierszu ``max_row``.
+
+    Excel robi to sam przy dopisywaniu wiersza do tabeli; tu wykresy
+    (np. PMC na Dashboardzie) nadążają za wierszami dopisanymi z Pythona.
+
+    Args:
+        ws: Arkusz, do którego odwołują się serie (Dziennik)
+        max_row: Dotychczasowy ostatni wiersz tabeli
+        last_row: Nowy ostatni wiersz
+    """
+    sheet = ws.title.replace("'", "''")
+    prefixes = (f"'{sheet}'!", f"{sheet}!")
+    for chart_sheet in ws.parent.worksheets:
+        for chart in chart_sheet._charts:
+            for series in chart.series:
+                for source in (series.val, series.cat, series.xVal, series.yVal):
+                    for ref in (getattr(source, "numRef", None), getattr(source, "strRef", None)):
+                        if ref is None or not ref.f or not ref.f.startswith(prefixes):
+                            continue
+                        match = _CHART_RANGE_RE.match(ref.f)
+                        if match and int(match.group("row")) == max_row:
+                            ref.f = f"{match.group('head')}{last_row}"
+
+
+def row_for_date(
+    ws: Worksheet,
+    day: datetime.date,
+    date_rows: Optional[Dict[datetime.date, int]] = None
+) -> Optional[int]:
+    """
+    Zwraca wiersz dziennika dla daty, w razie potrzeby dopisując datę.
+
+    Gdy data nie występuje w arkuszu, ale przypada po dacie startowej,
+    wpisywana jest do kolumny A, a tabela dziennika w razie potrzeby
+    powiększana (``extend_log_table``). Dzienniki bez tabeli są
+    ograniczone do ``MAX_LOG_ROWS`` wierszy.
+
+    Args:
+        ws: Arkusz Dziennik
+        day: Szukana data
+        date_rows: Opcjonalny, wcześniej zbudowany indeks (aktualizowany)
+
+    Returns:
+        Numer wiersza lub None, gdy data jest poza zakresem dziennika
+    """
+    if date_rows is None:
+        date_rows = log_date_rows(ws)
+    if day in date_rows:
+        return date_rows[day]
+
+    start = _as_date(ws["A2"].value)
+    if start is None:
+        return None
+    row = 2 + (day - start).days
+    if row < 2:
+        return None
+    if log_table(ws) is not None:
+        extend_log_table(ws, row)
+    elif row > SHEET_CONFIG.MAX_LOG_ROWS + 1:
+        return None
+
+    cell = log_cell(ws, row, 1)
+    if cell.value in (None, ""):
+        cell.value = day
+        cell.number_format = "yyyy-mm-dd"
+    elif cell.value != LOG_DATE_FORMULA:
+        return None
+    date_rows[day] = row
+    return row
+
+
+def write_log_values(
+    ws: Worksheet,
+    header: str,
+    values: Dict[datetime.date, Any]
+) -> int:
+    """
+    Zapisuje wartości do kolumny dziennika wg dat.
+
+    Args:
+        ws: Arkusz Dziennik
+        header: Nagłówek kolumny z LOG_HEADERS
+        values: Słownik data -> wartość
+
+    Returns:
+        Liczba zapisanych komórek
+
+    Raises:
+        ValueError: Gdy układ kolumn dziennika jest nieznany
+    """
+    column = journal_column(ws, header)
+    date_rows = log_date_rows(ws)
+    written = 0
+    for day, value in values.items():
+        row = row_for_date(ws, day, date_rows)
+        if row is None:
+            continue
+        log_cell(ws, row, column).value = value
+        written += 1
+    return written
+
+
+def append_notes(
+    ws: Worksheet,
+    notes: Dict[datetime.date, str],
+    header: str = "Notatki"
+) -> int:
+    """
+    Dopisuje notatki do kolumny "Notatki" bez nadpisywania wpisów.
+
+    Notatka już obecna w komórce nie jest dopisywana ponownie,
+    więc wielokrotne uruchomienie analizy nie tworzy duplikatów.
+
+    Args:
+        ws: Arkusz Dziennik
+        notes: Słownik data -> tekst notatki
+        header: Nagłówek kolumny notatek
+
+    Returns:
+        Liczba zaktualizowanych komórek
+
+    Raises:
+        ValueError: Gdy układ kolumn dziennika jest nieznany
+    """
+    column = journal_column(ws, header)
+    date_rows = log_date_rows(ws)
+    updated = 0
+    for day, note in notes.items():
+        row = row_for_date(ws, day, date_rows)
+        if row is None or not note:
+            continue
+        cell = log_cell(ws, row, column)
+        current = str(cell.value) if cell.value not in (None, "") else ""
+        if note in current:
+            continue
+        cell.value = f"{current}; {note}" if current else note
+        updated += 1
+    return updated
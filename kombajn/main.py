@@ -6,35 +6,57 @@ zgodnym z metrykami WKO5/INSCYD.
 """
 
 import argparse
+import datetime
 import logging
 import sys
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from openpyxl import Workbook
 
+from kombajn import compliance, importer, merge, migrate, risk, rollover, serve, workouts
+from kombajn.cache import BuildCache, cached_save
 from kombajn.config import SHEET_CONFIG
+from kombajn.engine.fueling import FuelingPlan, FuelingPlanner, products_from_store
+from kombajn.engine.pmc import TaperPlan, load_planned_tss, optimize_taper
+from kombajn.products import ProductStore
+from kombajn.profiles import AthleteProfile, load_profile, load_profiles
 from kombajn.sheets import (
     SettingsSheet,
     LogSheet,
     DashboardSheet,
     CHOSourcesSheet,
     PowerZonesSheet,
+    FuelingPlanSheet,
+    PlanSheet,
 )
-from kombajn.utils import safe_save_workbook, setup_logging
+from kombajn.utils import safe_save_workbook, setup_logging, validate_output_path
 
 
-def create_workbook() -> Workbook:
+def create_workbook(
+    fueling_plan: Optional[FuelingPlan] = None,
+    products: Optional[ProductStore] = None,
+    taper_plan: Optional[TaperPlan] = None,
+    profile: Optional[AthleteProfile] = None
+) -> Workbook:
     """
     Tworzy kompletny skoroszyt z wszystkimi arkuszami.
     
     Arkusze:
     - Ustawienia (profil mocy WKO5, profil metaboliczny INSCYD)
-    - Dziennik (42 kolumny z metrykami power i PMC)
+    - Dziennik (45 kolumn z metrykami power, PMC i alertami obciążenia)
     - Dashboard (PMC Chart, podsumowania)
     - Strefy Mocy (7 stref Coggan)
     - Źródła CHO (baza produktów)
+    - Plan żywienia (opcjonalnie, gdy podano plan)
+    - Plan (opcjonalnie, prognoza PMC z taperem na wyścig)
+    
+    Args:
+        fueling_plan: Opcjonalny plan żywienia do osobnego arkusza
+        products: Baza produktów CHO (domyślnie przykładowe produkty)
+        taper_plan: Opcjonalny plan taperu do arkusza Plan
+        profile: Profil zawodnika dla Ustawień i Stref Mocy (None = domyślny)
     
     Returns:
         Gotowy skoroszyt Excel
@@ -46,7 +68,7 @@ def create_workbook() -> Workbook:
     
     # Tworzenie arkuszy
     logger.info("Tworzę zakładkę [Ustawienia]...")
-    SettingsSheet(wb).create()
+    SettingsSheet(wb, profile).create()
     
     logger.info("Tworzę zakładkę [Dziennik]...")
     LogSheet(wb).create()
@@ -55,10 +77,18 @@ def create_workbook() -> Workbook:
     DashboardSheet(wb).create()
     
     logger.info("Tworzę zakładkę [Strefy Mocy]...")
-    PowerZonesSheet(wb).create()
+    PowerZonesSheet(wb, profile).create()
     
     logger.info("Tworzę zakładkę [Źródła CHO]...")
-    CHOSourcesSheet(wb).create()
+    CHOSourcesSheet(wb, products).create()
+    
+    if fueling_plan is not None:
+        logger.info("Tworzę zakładkę [Plan żywienia]...")
+        FuelingPlanSheet(wb, fueling_plan).create()
+    
+    if taper_plan is not None:
+        logger.info("Tworzę zakładkę [Plan]...")
+        PlanSheet(wb, taper_plan).create()
     
     # Wymuszenie pełnego przeliczenia formuł przy otwieraniu
     try:
@@ -75,9 +105,59 @@ def create_workbook() -> Workbook:
     return wb
 
 
+def build_journal(
+    filename: str,
+    output_dir: Optional[Path] = None,
+    fueling_plan: Optional[FuelingPlan] = None,
+    products: Optional[ProductStore] = None,
+    taper_plan: Optional[TaperPlan] = None,
+    profile: Optional[AthleteProfile] = None,
+    compresslevel: Optional[int] = None,
+    cache: Optional[BuildCache] = None
+) -> Path:
+    """
+    Buduje i zapisuje jeden dziennik (przez pamięć podręczną, jeśli podano).
+    
+    Args:
+        filename: Nazwa pliku wyjściowego
+        output_dir: Katalog wyjściowy (None = bieżący)
+        fueling_plan: Opcjonalny plan żywienia
+        products: Baza produktów CHO
+        taper_plan: Opcjonalny plan taperu
+        profile: Profil zawodnika (None = wartości domyślne)
+        compresslevel: Poziom kompresji pliku xlsx 0-9
+        cache: Pamięć podręczna gotowych plików
+    
+    Returns:
+        Ścieżka zapisanego pliku
+    """
+    logger = logging.getLogger("kombajn")
+    if cache is None:
+        wb = create_workbook(fueling_plan, products, taper_plan, profile)
+        return safe_save_workbook(wb, filename, output_dir, logger, compresslevel)
+    output_path = validate_output_path(filename, output_dir)
+    inputs = {
+        "fueling_plan": fueling_plan, "products": products,
+        "taper_plan": taper_plan, "profile": profile,
+    }
+    hit = cached_save(
+        lambda: create_workbook(fueling_plan, products, taper_plan, profile),
+        output_path, inputs, cache, compresslevel,
+    )
+    logger.info(f"{'Plik z pamięci podręcznej' if hit else 'Plik zbudowany'}: {output_path}")
+    return output_path
+
+
 def main(
     output_filename: Optional[str] = None,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    fueling_plan: Optional[FuelingPlan] = None,
+    products: Optional[ProductStore] = None,
+    taper_plan: Optional[TaperPlan] = None,
+    compresslevel: Optional[int] = None,
+    cache: Optional[BuildCache] = None,
+    profile: Optional[AthleteProfile] = None,
+    profiles: Optional[Dict[str, AthleteProfile]] = None
 ) -> int:
     """
     Główna funkcja programu.
@@ -85,6 +165,14 @@ def main(
     Args:
         output_filename: Opcjonalna nazwa pliku wyjściowego
         output_dir: Opcjonalny katalog wyjściowy
+        fueling_plan: Opcjonalny plan żywienia do osobnego arkusza
+        products: Baza produktów CHO (domyślnie przykładowe produkty)
+        taper_plan: Opcjonalny plan taperu do arkusza Plan
+        compresslevel: Poziom kompresji pliku xlsx 0-9 (None = domyślny)
+        cache: Pamięć podręczna gotowych plików (None = zawsze budowanie)
+        profile: Profil zawodnika (None = wartości domyślne)
+        profiles: Profile wielu zawodników (nazwa -> profil); każdy trafia
+            do pliku ``<nazwa>.xlsx`` w katalogu wyjściowym
         
     Returns:
         Kod wyjścia (0 = sukces, 1 = błąd)
@@ -95,10 +183,22 @@ def main(
     print("=" * 50)
     
     try:
-        wb = create_workbook()
+        if profiles is not None:
+            for name, athlete in profiles.items():
+                output_path = build_journal(
+                    f"{name}.xlsx", output_dir, fueling_plan, products, taper_plan,
+                    athlete, compresslevel, cache,
+                )
+                print(f"  {name}: {output_path.name}")
+            print("-" * 50)
+            print(f"GOTOWE! Dzienniki zawodników: {len(profiles)}")
+            return 0
         
         filename = output_filename or SHEET_CONFIG.OUTPUT_FILENAME
-        output_path = safe_save_workbook(wb, filename, output_dir, logger)
+        output_path = build_journal(
+            filename, output_dir, fueling_plan, products, taper_plan,
+            profile, compresslevel, cache,
+        )
         
         print("-" * 50)
         print("GOTOWE! 🚀")
@@ -148,9 +248,34 @@ Przykłady użycia:
   python -m kombajn.main
   python -m kombajn.main -o moj_dziennik.xlsx
   python -m kombajn.main -o dziennik.xlsx -d C:\\Dokumenty
+  python -m kombajn.main --fuel-plan 90 4.5 --fructose-ratio 0.8
+  python -m kombajn.main --products katalog.csv
+  python -m kombajn.main --taper plan.csv 2026-06-14 --ctl-start 70 --atl-start 75
+  python -m kombajn.main -o dziennik.xlsx --cache .kombajn_cache
+  python -m kombajn.main --profile anna.toml -o anna.xlsx
+  python -m kombajn.main --profiles zawodnicy/ -d dzienniki/ --cache .kombajn_cache
+  python -m kombajn rollover dziennik.xlsx --season 2026
+  python -m kombajn merge laptop.xlsx telefon.xlsx -o dziennik.xlsx
+  python -m kombajn migrate stare/ -o nowe/
+  python -m kombajn serve --port 8765 --workers 2
+  python -m kombajn import activities.csv dziennik.xlsx
+  python -m kombajn workouts treningi/ --schedule plan.csv --journal dziennik.xlsx
+  python -m kombajn compliance dziennik.xlsx plan.csv --workouts treningi/
+  python -m kombajn risk dzienniki/ --days 28 --csv ryzyko.csv
         """
     )
     
+    # Polecenia na istniejących dziennikach; bez polecenia - nowy dziennik
+    subparsers = parser.add_subparsers(dest="command", metavar="POLECENIE")
+    rollover.add_parser(subparsers)
+    merge.add_parser(subparsers)
+    migrate.add_parser(subparsers)
+    serve.add_parser(subparsers)
+    importer.add_parser(subparsers)
+    workouts.add_parser(subparsers)
+    compliance.add_parser(subparsers)
+    risk.add_parser(subparsers)
+    
     parser.add_argument(
         "-o", "--output",
         type=str,
@@ -165,6 +290,92 @@ Przykłady użycia:
         help="Katalog wyjściowy (domyślnie: bieżący katalog)"
     )
     
+    parser.add_argument(
+        "--products",
+        type=Path,
+        default=None,
+        help="Baza produktów CHO (CSV/JSON) dla [Źródła CHO] i planu żywienia"
+    )
+    
+    profile_group = parser.add_mutually_exclusive_group()
+    profile_group.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PLIK",
+        help="Profil zawodnika (TOML/JSON) dla [Ustawienia] i [Strefy Mocy]"
+    )
+    
+    profile_group.add_argument(
+        "--profiles",
+        type=Path,
+        default=None,
+        metavar="KATALOG",
+        help="Katalog profili - osobny dziennik <profil>.xlsx dla każdego zawodnika"
+    )
+    
+    parser.add_argument(
+        "--fuel-plan",
+        type=float,
+        nargs=2,
+        metavar=("CHO_H", "GODZINY"),
+        default=None,
+        help="Dodaj arkusz [Plan żywienia] dla celu CHO/h i czasu (h)"
+    )
+    
+    parser.add_argument(
+        "--fructose-ratio",
+        type=float,
+        default=0.8,
+        help="Fruktoza na 1 część glukozy w planie żywienia (domyślnie: 0.8)"
+    )
+    
+    parser.add_argument(
+        "--taper",
+        nargs=2,
+        metavar=("PLAN_CSV", "DATA_WYSCIGU"),
+        default=None,
+        help="Dodaj arkusz [Plan] z optymalnym taperem (CSV: Data, TSS; data RRRR-MM-DD)"
+    )
+    
+    parser.add_argument(
+        "--ctl-start",
+        type=float,
+        default=0.0,
+        help="CTL przed pierwszym dniem planu taperu (domyślnie: 0)"
+    )
+    
+    parser.add_argument(
+        "--atl-start",
+        type=float,
+        default=0.0,
+        help="ATL przed pierwszym dniem planu taperu (domyślnie: 0)"
+    )
+    
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help="Poziom kompresji pliku xlsx (domyślnie: 6; 9 = najmniejszy plik)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        metavar="KATALOG",
+        help="Pamięć podręczna gotowych plików - niezmienione dane nie są budowane ponownie"
+    )
+    
+    parser.add_argument(
+        "--cache-link",
+        action="store_true",
+        help="Hardlink do pliku z pamięci zamiast kopii (plik tylko do odczytu; "
+             "do masowego generowania)"
+    )
+    
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -176,7 +387,45 @@ Przykłady użycia:
     if args.verbose:
         logging.getLogger("kombajn").setLevel(logging.DEBUG)
     
-    exit_code = main(args.output, args.directory)
+    if args.command is not None:
+        sys.exit(args.handler(args))
+    
+    products = None
+    fueling_plan = None
+    taper_plan = None
+    profile = None
+    profiles = None
+    try:
+        if args.profile is not None:
+            profile = load_profile(args.profile)
+        if args.profiles is not None:
+            profiles = load_profiles(args.profiles)
+            if not profiles:
+                raise ValueError(f"Brak profili (.toml/.json) w katalogu {args.profiles}")
+        if args.products is not None:
+            products = ProductStore.load(args.products)
+        if args.fuel_plan is not None:
+            cho_per_hour, hours = args.fuel_plan
+            planner = FuelingPlanner(
+                products_from_store(products) if products is not None else None,
+                fructose_ratio=args.fructose_ratio,
+            )
+            fueling_plan = planner.plan(cho_per_hour, hours)
+        if args.taper is not None:
+            plan_path, race_date = args.taper
+            start_date, planned_tss = load_planned_tss(Path(plan_path))
+            taper_plan = optimize_taper(
+                planned_tss, start_date, datetime.date.fromisoformat(race_date),
+                ctl0=args.ctl_start, atl0=args.atl_start,
+            )
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    
+    cache = BuildCache(args.cache, link=args.cache_link) if args.cache is not None else None
+    exit_code = main(
+        args.output, args.directory, fueling_plan, products, taper_plan,
+        args.compress_level, cache, profile, profiles,
+    )
     sys.exit(exit_code)
 
 
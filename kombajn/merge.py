@@ -0,0 +1,324 @@
+"""
+Scalanie dwóch kopii dziennika po dacie.
+
+Oba arkusze Dziennik czytane są strumieniowo (tryb read-only) i łączone
+jak dwa posortowane strumienie dat - w pamięci jest tylko bieżący wiersz
+każdej kopii oraz lista różnic do naniesienia. Konflikty w kolumnach
+wejściowych (``LOG_INPUT_COLUMNS``) rozstrzygają polityki:
+
+- "newest-nonempty" - niepusta wartość z kopii zapisanej później
+  (data modyfikacji z właściwości pliku), w razie braku - z drugiej
+- "prefer-A" / "prefer-B" - niepusta wartość ze wskazanej kopii
+
+Wynikiem jest kopia A z naniesionymi zmianami oraz raport różnic (CSV).
+
+Użycie:
+    python -m kombajn merge laptop.xlsx telefon.xlsx -o dziennik.xlsx
+"""
+
+import argparse
+import csv
+import datetime
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from openpyxl import load_workbook
+
+from kombajn.config import LOG_HEADERS, LOG_INPUT_COLUMNS, log_column
+from kombajn.journal import (
+    check_log_layout,
+    iter_log_rows,
+    load_journal,
+    log_cell,
+    log_date_rows,
+    row_for_date,
+)
+
+
+MERGE_POLICIES: Tuple[str, ...] = ("newest-nonempty", "prefer-A", "prefer-B")
+
+# Kolumny scalane (wejściowe bez daty - data jest kluczem)
+MERGED_COLUMNS: Tuple[int, ...] = tuple(c for c in LOG_INPUT_COLUMNS if c != log_column("Data"))
+
+_Row = Tuple[datetime.date, Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class CellDiff:
+    """
+    Różnica jednej komórki między kopiami.
+
+    Attributes:
+        day: Data wiersza
+        header: Nagłówek kolumny
+        value_a: Wartość w kopii A
+        value_b: Wartość w kopii B
+        chosen: Wartość w wyniku
+        source: Skąd pochodzi wynik ("A" / "B")
+    """
+    day: datetime.date
+    header: str
+    value_a: Any
+    value_b: Any
+    chosen: Any
+    source: str
+
+
+@dataclass
+class MergeReport:
+    """
+    Podsumowanie scalania.
+
+    Attributes:
+        days: Liczba dat w wyniku (z danymi w którejkolwiek kopii)
+        only_a: Daty obecne tylko w A
+        only_b: Daty obecne tylko w B (dopisane do wyniku)
+        diffs: Różnice komórek (konflikty i uzupełnienia z B)
+    """
+    days: int = 0
+    only_a: int = 0
+    only_b: int = 0
+    diffs: List[CellDiff] = field(default_factory=list)
+
+    @property
+    def conflicts(self) -> List[CellDiff]:
+        """Różnice, w których obie kopie mają (różne) niepuste wartości."""
+        return [d for d in self.diffs if not _empty(d.value_a) and not _empty(d.value_b)]
+
+    def write_csv(self, path: Path) -> None:
+        """Zapisuje różnice do pliku CSV (separator ";")."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["Data", "Kolumna", "A", "B", "Wynik", "Źródło"])
+            for d in self.diffs:
+                writer.writerow([d.day.isoformat(), d.header, d.value_a, d.value_b, d.chosen, d.source])
+
+
+def _empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _input(value: Any) -> Any:
+    """Wartość wejściowa komórki (formuła nie jest wpisem zawodnika)."""
+    if isinstance(value, str) and value.startswith("="):
+        return None
+    return value
+
+
+def _resolve(policy: str, value_a: Any, value_b: Any, newer: str) -> Tuple[Any, str]:
+    """Zwraca (wartość, źródło) wg polityki."""
+    first = {"prefer-A": "A", "prefer-B": "B", "newest-nonempty": newer}[policy]
+    values = {"A": value_a, "B": value_b}
+    other = "B" if first == "A" else "A"
+    if _empty(values[first]):
+        return values[other], other
+    return values[first], first
+
+
+def _modified(path: Path, workbook: Any) -> datetime.datetime:
+    """Czas zapisu kopii - z właściwości pliku, w razie braku z systemu plików."""
+    modified = workbook.properties.modified
+    if isinstance(modified, datetime.datetime):
+        return modified.replace(tzinfo=None)
+    return datetime.datetime.fromtimestamp(Path(path).stat().st_mtime)
+
+
+def _stream(path: Path, workbook: Any) -> Iterator[_Row]:
+    """Strumień (data, wartości kolumn) rosnąco po dacie."""
+    previous: Optional[datetime.date] = None
+    try:
+        check_log_layout(workbook["Dziennik"])
+    except ValueError as e:
+        raise ValueError(f"{Path(path).name}: {e}") from e
+    for day, row, values in iter_log_rows(workbook["Dziennik"], max_col=len(LOG_HEADERS)):
+        if previous is not None and day <= previous:
+            raise ValueError(
+                f"{Path(path).name}: daty w Dzienniku nie rosną (wiersz {row}: {day.isoformat()})"
+            )
+        previous = day
+        yield day, tuple(values) + (None,) * (len(LOG_HEADERS) - len(values))
+
+
+def _has_data(values: Tuple[Any, ...]) -> bool:
+    return any(not _empty(_input(values[c - 1])) for c in MERGED_COLUMNS)
+
+
+def diff_journals(
+    path_a: Path,
+    path_b: Path,
+    policy: str = "newest-nonempty",
+    column_policies: Optional[Dict[str, str]] = None
+) -> Tuple[MergeReport, Dict[datetime.date, Dict[int, Any]]]:
+    """
+    Porównuje dwie kopie dziennika i wyznacza wynik scalenia.
+
+    Args:
+        path_a: Kopia A (baza wyniku)
+        path_b: Kopia B
+        policy: Domyślna polityka konfliktów (``MERGE_POLICIES``)
+        column_policies: Polityki dla wybranych kolumn (nagłówek -> polityka)
+
+    Returns:
+        Krotka (raport, zmiany do naniesienia na A: data -> kolumna -> wartość)
+
+    Raises:
+        ValueError: Przy nieznanej polityce/kolumnie, nieposortowanych datach
+            lub nieznanym układzie kolumn dziennika
+    """
+    policies = {column: policy for column in MERGED_COLUMNS}
+    for header, column_policy in (column_policies or {}).items():
+        column = log_column(header)
+        if column not in policies:
+            raise ValueError(f"Kolumna [{header}] nie jest kolumną wejściową dziennika")
+        policies[column] = column_policy
+    unknown = sorted(set(policies.values()) - set(MERGE_POLICIES))
+    if unknown:
+        raise ValueError(f"Nieznana polityka scalania: {', '.join(unknown)}")
+
+    report = MergeReport()
+    changes: Dict[datetime.date, Dict[int, Any]] = {}
+    workbook_a = load_workbook(path_a, read_only=True)
+    workbook_b = load_workbook(path_b, read_only=True)
+    try:
+        newer = "B" if _modified(path_b, workbook_b) > _modified(path_a, workbook_a) else "A"
+        stream_a, stream_b = _stream(path_a, workbook_a), _stream(path_b, workbook_b)
+        row_a, row_b = next(stream_a, None), next(stream_b, None)
+        while row_a is not None or row_b is not None:
+            if row_b is None or (row_a is not None and row_a[0] < row_b[0]):
+                day, values_a, values_b = row_a[0], row_a[1], None
+                row_a = next(stream_a, None)
+            elif row_a is None or row_b[0] < row_a[0]:
+                day, values_a, values_b = row_b[0], None, row_b[1]
+                row_b = next(stream_b, None)
+            else:
+                day, values_a, values_b = row_a[0], row_a[1], row_b[1]
+                row_a, row_b = next(stream_a, None), next(stream_b, None)
+
+            has_a = values_a is not None and _has_data(values_a)
+            has_b = values_b is not None and _has_data(values_b)
+            if not (has_a or has_b):
+                continue
+            report.days += 1
+            if not has_b:
+                report.only_a += 1
+                continue
+            if not has_a:
+                report.only_b += 1
+
+            for column in MERGED_COLUMNS:
+                value_a = _input(values_a[column - 1]) if values_a is not None else None
+                value_b = _input(values_b[column - 1])
+                if value_a == value_b or (_empty(value_a) and _empty(value_b)):
+                    continue
+                chosen, source = _resolve(policies[column], value_a, value_b, newer)
+                report.diffs.append(CellDiff(
+                    day, LOG_HEADERS[column - 1], value_a, value_b, chosen, source
+                ))
+                if source == "B":
+                    changes.setdefault(day, {})[column] = chosen
+    finally:
+        workbook_a.close()
+        workbook_b.close()
+    return report, changes
+
+
+def merge_journals(
+    path_a: Path,
+    path_b: Path,
+    output_path: Path,
+    policy: str = "newest-nonempty",
+    column_policies: Optional[Dict[str, str]] = None,
+    report_path: Optional[Path] = None
+) -> MergeReport:
+    """
+    Scala dwie kopie dziennika do nowego pliku.
+
+    Wynik to kopia A (ustawienia, formuły, wykresy) z naniesionymi
+    wartościami z B; daty obecne tylko w B są dopisywane.
+
+    Args:
+        path_a: Kopia A (baza wyniku)
+        path_b: Kopia B
+        output_path: Plik wynikowy
+        policy: Domyślna polityka konfliktów
+        column_policies: Polityki dla wybranych kolumn
+        report_path: Opcjonalny raport różnic (CSV)
+
+    Returns:
+        Raport scalania
+
+    Raises:
+        ValueError: Przy błędnej polityce, datach poza dziennikiem A
+            lub kolumnach spoza układu dziennika A
+    """
+    report, changes = diff_journals(path_a, path_b, policy, column_policies)
+
+    workbook = load_journal(path_a)
+    ws = workbook["Dziennik"]
+    available = check_log_layout(ws)
+    date_rows = log_date_rows(ws)
+    for day in sorted(changes):
+        row = row_for_date(ws, day, date_rows)
+        if row is None:
+            raise ValueError(f"Data {day.isoformat()} z kopii B nie mieści się w dzienniku A")
+        for column, value in changes[day].items():
+            if column > available:
+                raise ValueError(f"Dziennik A nie ma kolumny [{LOG_HEADERS[column - 1]}] (starszy układ pliku)")
+            log_cell(ws, row, column).value = value
+    workbook.save(output_path)
+
+    if report_path is not None:
+        report.write_csv(report_path)
+    return report
+
+
+def _column_policy(text: str) -> Tuple[str, str]:
+    header, separator, policy = text.rpartition("=")
+    if not separator or not header:
+        raise argparse.ArgumentTypeError(f"Oczekiwano KOLUMNA=POLITYKA, podano: {text}")
+    return header, policy
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``merge`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "merge",
+        help="Scal dwie kopie dziennika po dacie (z raportem różnic)",
+        description="Scala arkusze Dziennik dwóch kopii; konflikty w kolumnach "
+                    "wejściowych rozstrzyga polityka.",
+    )
+    parser.add_argument("journal_a", type=Path, help="Kopia A (baza wyniku)")
+    parser.add_argument("journal_b", type=Path, help="Kopia B")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Plik wynikowy")
+    parser.add_argument(
+        "--policy", choices=MERGE_POLICIES, default="newest-nonempty",
+        help="Polityka konfliktów (domyślnie: newest-nonempty)"
+    )
+    parser.add_argument(
+        "--column-policy", type=_column_policy, action="append", default=[],
+        metavar="KOLUMNA=POLITYKA", help='Polityka dla kolumny, np. "Notatki=prefer-A"'
+    )
+    parser.add_argument(
+        "--report", type=Path, default=None,
+        help="Raport różnic CSV (domyślnie: <wynik>_roznice.csv)"
+    )
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``merge`` (kod wyjścia 1 przy błędzie)."""
+    report_path = args.report or args.output.with_name(f"{args.output.stem}_roznice.csv")
+    try:
+        report = merge_journals(
+            args.journal_a, args.journal_b, args.output,
+            args.policy, dict(args.column_policy), report_path,
+        )
+    except (OSError, ValueError) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+    print(f"Wynik: {args.output} ({report.days} dni z danymi)")
+    print(f"Tylko w A: {report.only_a}, tylko w B: {report.only_b}, "
+          f"różnic: {len(report.diffs)} (konfliktów: {len(report.conflicts)})")
+    print(f"Raport: {report_path}")
+    return 0
@@ -0,0 +1,330 @@
+"""
+Migracja dzienników v2 (Excel_Kombajn.py) do układu v3.
+
+Pliki v2 mają arkusz "Ustawienia i Cele" i Dziennik z 27 kolumnami
+(kalorie, makro, dolegliwości). Migrator czyta je strumieniowo
+(tryb read-only, same wartości - formuły v2 są pomijane) i przenosi
+wpisy do nowego dziennika v3 wg deklaratywnych mapowań:
+
+- ``LOG_MAPPING`` - kolumna v2 -> kolumna ``LOG_HEADERS``
+- ``NOTE_COLUMNS`` - kolumny v2 bez odpowiednika, dopisywane do Notatek
+- ``SETTINGS_MAPPING`` - etykieta Ustawień v2 -> etykieta Ustawień v3
+
+Katalogi konwertowane są równolegle (osobny proces na plik), a wynik
+to podsumowanie dla każdego pliku.
+
+Użycie:
+    python -m kombajn migrate stare/ -o nowe/
+"""
+
+import argparse
+import datetime
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from kombajn.config import log_column
+from kombajn.journal import (
+    iter_log_rows,
+    log_cell,
+    log_date_rows,
+    row_for_date,
+    write_settings,
+)
+
+
+V2_SETTINGS_SHEET = "Ustawienia i Cele"
+
+# Kolumna Dziennika v2 -> kolumna Dziennika v3
+LOG_MAPPING: Dict[str, str] = {
+    "Waga (kg)": "Waga (kg)",
+    "RHR": "RHR",
+    "HRV": "HRV (ms)",
+    "Sen (h)": "Sen (h)",
+    "Jakość snu (1-5)": "Jakość snu (1-5)",
+    "Samopoczucie (1-5)": "Samopoczucie (1-5)",
+    "Trening (Czas, min)": "Czas jazdy (min)",
+    "Spożyte Kcal": "Spożyte Kcal",
+    "Spożyte Białko (g)": "Spoż. B (g)",
+    "Spożyte Tłuszcze (g)": "Spoż. T (g)",
+    "Spożyte Węgle (g)": "Spoż. W (g)",
+    "Płyny Spożyte (L)": "Nawodnienie (L)",
+    "Notatki (Ogólne)": "Notatki",
+}
+
+# Kolumny v2 bez odpowiednika w v3 (w v3 "Kcal treningu" to formuła z TSS)
+# - dopisywane do Notatek jako "etykieta: wartość"
+NOTE_COLUMNS: Dict[str, str] = {
+    "Trening (Kcal)": "Kcal treningu",
+    "Jakość Treningu (1-5)": "Jakość treningu (1-5)",
+    "Dolegliwości (Opis)": "Dolegliwości",
+    "Dolegliwości (Ból 1-5)": "Ból (1-5)",
+    "Suplementy (Notatka)": "Suplementy",
+}
+
+# Etykieta w "Ustawienia i Cele" (v2) -> etykieta w Ustawieniach (v3)
+SETTINGS_MAPPING: Dict[str, str] = {
+    "BMR (kcal)": "BMR (kcal)",
+    "TEF (kcal)": "TEF (kcal)",
+    "NEAT (kcal)": "NEAT (kcal)",
+    "Planowany Deficyt (np. 500)": "Cel (deficyt/nadwyżka)",
+    "CEL: Białko (g / kgmc)": "Białko (g / kg mc)",
+    "CEL: Tłuszcze (% TDEE)": "Tłuszcze (% TDEE)",
+}
+
+_READ_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile, InvalidFileException)
+
+
+@dataclass(frozen=True)
+class MigrationResult:
+    """
+    Podsumowanie migracji jednego pliku.
+
+    Attributes:
+        source: Plik v2
+        output: Plik v3 (None przy błędzie)
+        days: Liczba dni z danymi
+        values: Liczba zapisanych komórek Dziennika
+        notes: Liczba dni z Notatkami uzupełnionymi o kolumny v2
+        settings: Liczba przeniesionych pól Ustawień
+        error: Opis błędu (None = sukces)
+    """
+    source: Path
+    output: Optional[Path]
+    days: int = 0
+    values: int = 0
+    notes: int = 0
+    settings: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def migrated_path(source: Path, output_dir: Optional[Path] = None) -> Path:
+    """Domyślna ścieżka wyniku: <nazwa>_v3.xlsx w katalogu wyjściowym lub obok pliku v2."""
+    source = Path(source)
+    return Path(output_dir or source.parent) / f"{source.stem}_v3.xlsx"
+
+
+def _empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and (not value.strip() or value.startswith("=")))
+
+
+def _note(value: Any) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_v2(
+    path: Path
+) -> Tuple[Dict[str, Any], Dict[datetime.date, Dict[str, Any]], Set[datetime.date]]:
+    """
+    Odczytuje dziennik v2 (strumieniowo, same wartości wejściowe).
+
+    Args:
+        path: Plik v2 (xlsx)
+
+    Returns:
+        Krotka (Ustawienia v3: etykieta -> wartość,
+        wpisy: data -> nagłówek v3 -> wartość,
+        daty z Notatkami uzupełnionymi o kolumny v2)
+
+    Raises:
+        ValueError: Gdy plik nie ma układu v2
+    """
+    workbook = load_workbook(path, read_only=True)
+    try:
+        if V2_SETTINGS_SHEET not in workbook.sheetnames or "Dziennik" not in workbook.sheetnames:
+            raise ValueError(f"Plik {Path(path).name} nie jest dziennikiem v2 "
+                             f"(brak arkuszy [{V2_SETTINGS_SHEET}] i [Dziennik])")
+
+        settings: Dict[str, Any] = {}
+        for label, value in workbook[V2_SETTINGS_SHEET].iter_rows(
+            min_col=1, max_col=2, values_only=True
+        ):
+            if label in SETTINGS_MAPPING and isinstance(value, (int, float)):
+                settings[SETTINGS_MAPPING[label]] = value
+
+        ws = workbook["Dziennik"]
+        headers = next(ws.iter_rows(max_row=1, values_only=True), ())
+        if "Data" not in headers or not set(headers) & set(LOG_MAPPING):
+            raise ValueError(f"Plik {Path(path).name}: Dziennik nie ma kolumn v2")
+        mapped = [(i, LOG_MAPPING[h]) for i, h in enumerate(headers) if h in LOG_MAPPING]
+        noted = [(i, NOTE_COLUMNS[h]) for i, h in enumerate(headers) if h in NOTE_COLUMNS]
+
+        entries: Dict[datetime.date, Dict[str, Any]] = {}
+        noted_days: Set[datetime.date] = set()
+        for day, _, values in iter_log_rows(ws, max_col=len(headers)):
+            entry = {
+                target: values[i] for i, target in mapped
+                if i < len(values) and not _empty(values[i])
+            }
+            extra = [
+                f"{label}: {_note(values[i])}" for i, label in noted
+                if i < len(values) and not _empty(values[i])
+            ]
+            if extra:
+                entry["Notatki"] = "; ".join(
+                    ([_note(entry["Notatki"])] if "Notatki" in entry else []) + extra
+                )
+                noted_days.add(day)
+            if entry:
+                # Powtórzona data - pierwszy wpis wygrywa, puste pola uzupełniane
+                for header, value in entry.items():
+                    entries.setdefault(day, {}).setdefault(header, value)
+    finally:
+        workbook.close()
+    return settings, entries, noted_days
+
+
+def write_v3(
+    settings: Dict[str, Any],
+    entries: Dict[datetime.date, Dict[str, Any]],
+    output_path: Path
+) -> Workbook:
+    """
+    Tworzy dziennik v3 z przeniesionymi danymi i zapisuje go.
+
+    Args:
+        settings: Ustawienia v3 (etykieta -> wartość)
+        entries: Wpisy (data -> nagłówek v3 -> wartość)
+        output_path: Plik wynikowy
+
+    Returns:
+        Zapisany skoroszyt
+    """
+    # Import lokalny - kombajn.main rejestruje to polecenie w CLI
+    from kombajn.main import create_workbook
+
+    workbook = create_workbook()
+    weights = [e["Waga (kg)"] for _, e in sorted(entries.items()) if "Waga (kg)" in e]
+    if weights and isinstance(weights[-1], (int, float)):
+        settings = {**settings, "Waga (kg)": weights[-1]}
+    write_settings(workbook, settings)
+
+    ws = workbook["Dziennik"]
+    if entries:
+        ws["A2"] = min(entries)
+        date_rows = log_date_rows(ws)
+        for day in sorted(entries):
+            row = row_for_date(ws, day, date_rows)
+            for header, value in entries[day].items():
+                log_cell(ws, row, log_column(header)).value = value
+    workbook.save(output_path)
+    return workbook
+
+
+def migrate_file(source: Path, output_path: Optional[Path] = None) -> MigrationResult:
+    """
+    Migruje jeden dziennik v2 (błędy zwracane w wyniku, nie zgłaszane).
+
+    Args:
+        source: Plik v2
+        output_path: Plik v3 (domyślnie ``migrated_path``)
+
+    Returns:
+        Podsumowanie migracji pliku
+    """
+    source = Path(source)
+    output_path = Path(output_path or migrated_path(source))
+    if output_path.resolve() == source.resolve():
+        return MigrationResult(source, None, error="Plik wynikowy nadpisałby plik v2")
+    try:
+        settings, entries, noted_days = read_v2(source)
+        write_v3(settings, entries, output_path)
+    except _READ_ERRORS as e:
+        return MigrationResult(source, None, error=str(e) or type(e).__name__)
+    values = sum(len(entry) for entry in entries.values())
+    return MigrationResult(
+        source, output_path, len(entries), values, len(noted_days), len(settings)
+    )
+
+
+def collect_sources(paths: Sequence[Path]) -> List[Path]:
+    """Rozwija katalogi do plików .xlsx (bez plików blokady "~$" i wyników migracji)."""
+    sources: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            sources.extend(
+                p for p in sorted(path.glob("*.xlsx"))
+                if not p.name.startswith("~$") and not p.stem.endswith("_v3")
+            )
+        else:
+            sources.append(path)
+    return sources
+
+
+def _migrate_pair(pair: Tuple[Path, Path]) -> MigrationResult:
+    """Migruje jeden plik (funkcja modułowa - wymagana przez ProcessPool)."""
+    return migrate_file(*pair)
+
+
+def migrate_paths(
+    paths: Sequence[Path],
+    output_dir: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> List[MigrationResult]:
+    """
+    Migruje pliki i katalogi dzienników v2 równolegle.
+
+    Args:
+        paths: Pliki v2 lub katalogi z plikami v2
+        output_dir: Katalog wyników (domyślnie obok plików v2)
+        workers: Liczba procesów (domyślnie liczba rdzeni)
+
+    Returns:
+        Podsumowania w kolejności plików
+    """
+    sources = collect_sources(paths)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    pairs = [(source, migrated_path(source, output_dir)) for source in sources]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pairs)))
+    if workers == 1:
+        return [_migrate_pair(pair) for pair in pairs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_migrate_pair, pairs))
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``migrate`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "migrate",
+        help="Przenieś dzienniki v2 (Excel_Kombajn.py) do układu v3",
+        description="Czyta dzienniki v2 (pliki lub katalogi) i zapisuje je "
+                    "jako dzienniki v3 <nazwa>_v3.xlsx.",
+    )
+    parser.add_argument("paths", type=Path, nargs="+", metavar="SCIEZKA",
+                        help="Plik v2 lub katalog z plikami v2")
+    parser.add_argument("-o", "--output-dir", type=Path, default=None,
+                        help="Katalog wyników (domyślnie obok plików v2)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Liczba procesów (domyślnie liczba rdzeni)")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``migrate`` (kod wyjścia 1, gdy któryś plik się nie udał)."""
+    results = migrate_paths(args.paths, args.output_dir, args.workers)
+    if not results:
+        print("[BŁĄD] Nie znaleziono plików .xlsx")
+        return 1
+    for result in results:
+        if result.ok:
+            print(f"[OK]   {result.source.name} -> {result.output}: {result.days} dni, "
+                  f"{result.values} wartości, notatki v2: {result.notes}, "
+                  f"ustawienia: {result.settings}")
+        else:
+            print(f"[BŁĄD] {result.source.name}: {result.error}")
+    failed = sum(1 for result in results if not result.ok)
+    print(f"Zmigrowano {len(results) - failed}/{len(results)} plików")
+    return 1 if failed else 0
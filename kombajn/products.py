@@ -0,0 +1,346 @@
+"""
+Baza produktów CHO.
+
+Kolumnowy magazyn produktów węglowodanowych wczytywany z CSV/JSON.
+Wartości liczbowe trzymane są w tablicach NumPy, typ i szybkość
+wchłaniania jako kody kategorii (uint16), a nazwy w posortowanym
+indeksie do wyszukiwania po prefiksie (bisect). Dzięki temu katalog
+sklepu z tysiącami produktów zajmuje mało pamięci i jest szybko
+filtrowany.
+"""
+
+import bisect
+import csv
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kombajn.config import CHO_FRUCTOSE_SHARE, CHO_SAMPLE_DATA
+
+
+# Nazwy pól rekordu i akceptowane nagłówki CSV / klucze JSON
+_FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "name": ("name", "nazwa", "nazwa produktu"),
+    "portion_g": ("portion_g", "porcja", "porcja (g)"),
+    "cho_100g": ("cho_100g", "cho / 100g (g)", "cho/100g"),
+    "kcal_100g": ("kcal_100g", "kcal / 100g", "kcal/100g"),
+    "product_type": ("product_type", "type", "typ"),
+    "absorption": ("absorption", "szybkość wchłaniania", "wchłanianie"),
+    "notes": ("notes", "uwagi"),
+    "fructose_share": ("fructose_share", "fruktoza", "udział fruktozy"),
+}
+
+CSV_FIELDS: Tuple[str, ...] = tuple(_FIELD_ALIASES)
+
+
+@dataclass(frozen=True)
+class Product:
+    """
+    Pojedynczy produkt CHO.
+
+    Attributes:
+        name: Nazwa produktu
+        portion_g: Porcja (g)
+        cho_100g: Węglowodany na 100 g
+        kcal_100g: Kalorie na 100 g
+        product_type: Typ (żel, napój, baton...)
+        absorption: Szybkość wchłaniania
+        notes: Uwagi
+        fructose_share: Udział fruktozy w CHO (0-1)
+    """
+    name: str
+    portion_g: float
+    cho_100g: float
+    kcal_100g: float
+    product_type: str
+    absorption: str
+    notes: str
+    fructose_share: float
+
+    @property
+    def cho_per_portion(self) -> float:
+        """CHO w porcji (g)."""
+        return round(self.portion_g * self.cho_100g / 100, 1)
+
+
+def _number(value: Any) -> float:
+    """Zamienia wartość z pliku na liczbę (przecinek dziesiętny dozwolony)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value or "").strip().replace(",", ".")
+    return float(text) if text else 0.0
+
+
+class ProductStore:
+    """
+    Kolumnowa, indeksowana baza produktów CHO.
+
+    Attributes:
+        names: Nazwy produktów
+        portion_g: Porcje (g)
+        cho_100g: CHO na 100 g
+        kcal_100g: kcal na 100 g
+        fructose_share: Udział fruktozy w CHO
+        types: Słownik kategorii typu (kod -> nazwa)
+        absorptions: Słownik kategorii wchłaniania (kod -> nazwa)
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Buduje bazę z rekordów (słowników o polach ``CSV_FIELDS``).
+
+        Args:
+            records: Rekordy produktów; brak udziału fruktozy ->
+                wartość z ``CHO_FRUCTOSE_SHARE`` lub 0
+        """
+        names: List[str] = []
+        notes: List[str] = []
+        numbers: List[Tuple[float, float, float, float]] = []
+        type_codes: List[int] = []
+        absorption_codes: List[int] = []
+        type_lookup: Dict[str, int] = {}
+        absorption_lookup: Dict[str, int] = {}
+
+        for record in records:
+            name = str(record.get("name") or "").strip()
+            if not name:
+                continue
+            fructose = record.get("fructose_share")
+            fructose = (
+                _number(fructose) if fructose not in (None, "")
+                else CHO_FRUCTOSE_SHARE.get(name, 0.0)
+            )
+            names.append(name)
+            notes.append(str(record.get("notes") or ""))
+            numbers.append((
+                _number(record.get("portion_g")),
+                _number(record.get("cho_100g")),
+                _number(record.get("kcal_100g")),
+                fructose,
+            ))
+            product_type = str(record.get("product_type") or "")
+            absorption = str(record.get("absorption") or "")
+            type_codes.append(type_lookup.setdefault(product_type, len(type_lookup)))
+            absorption_codes.append(
+                absorption_lookup.setdefault(absorption, len(absorption_lookup))
+            )
+
+        table = np.array(numbers, dtype=np.float32).reshape(-1, 4)
+        self.names = names
+        self.notes = notes
+        self.portion_g = table[:, 0].copy()
+        self.cho_100g = table[:, 1].copy()
+        self.kcal_100g = table[:, 2].copy()
+        self.fructose_share = table[:, 3].copy()
+        self.types = list(type_lookup)
+        self.absorptions = list(absorption_lookup)
+        self._type_codes = np.array(type_codes, dtype=np.uint16)
+        self._absorption_codes = np.array(absorption_codes, dtype=np.uint16)
+
+        self._type_index = self._group(self._type_codes, len(self.types))
+        self._absorption_index = self._group(self._absorption_codes, len(self.absorptions))
+
+        # Indeks prefiksowy: posortowane klucze + odpowiadające im numery wierszy
+        order = sorted(range(len(names)), key=lambda i: names[i].casefold())
+        self._name_keys = [names[i].casefold() for i in order]
+        self._name_order = np.array(order, dtype=np.int64)
+
+    @staticmethod
+    def _group(codes: np.ndarray, count: int) -> List[np.ndarray]:
+        """Grupuje numery wierszy wg kodu kategorii (jeden argsort)."""
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=count))[:-1]
+        return np.split(order, bounds) if count else []
+
+    # --- Konstrukcja ---------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence] = CHO_SAMPLE_DATA) -> "ProductStore":
+        """
+        Tworzy bazę z krotek w formacie ``CHO_SAMPLE_DATA``.
+
+        Args:
+            rows: Krotki (nazwa, porcja, CHO/100g, kcal/100g, typ, wchłanianie, uwagi)
+
+        Returns:
+            Baza produktów
+        """
+        return cls(dict(zip(CSV_FIELDS, row)) for row in rows)
+
+    @classmethod
+    def load(cls, path: Path) -> "ProductStore":
+        """
+        Wczytuje bazę z pliku CSV lub JSON.
+
+        CSV czytany jest strumieniowo (wiersz po wierszu). Nagłówki mogą
+        być polskie (jak w arkuszu) lub angielskie (``CSV_FIELDS``).
+        JSON to lista obiektów z tymi samymi kluczami.
+
+        Args:
+            path: Ścieżka do pliku
+
+        Returns:
+            Baza produktów
+
+        Raises:
+            ValueError: Przy nieobsługiwanym formacie lub braku kolumny nazwy
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == ".json":
+            with path.open(encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(cls._normalize(item) for item in data)
+        if suffix == ".csv":
+            with path.open(encoding="utf-8-sig", newline="") as f:
+                reader = csv.DictReader(f)
+                if not any(
+                    (h or "").strip().lower() in _FIELD_ALIASES["name"]
+                    for h in reader.fieldnames or []
+                ):
+                    raise ValueError(f"Brak kolumny z nazwą produktu w pliku {path.name}")
+                return cls(cls._normalize(row) for row in reader)
+        raise ValueError(f"Nieobsługiwany format bazy produktów: {path.name}")
+
+    @staticmethod
+    def _normalize(raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Mapuje nagłówki/klucze z pliku na pola rekordu."""
+        lowered = {str(k).strip().lower(): v for k, v in raw.items() if k is not None}
+        record = {}
+        for field_name, aliases in _FIELD_ALIASES.items():
+            for alias in aliases:
+                if alias in lowered:
+                    record[field_name] = lowered[alias]
+                    break
+        return record
+
+    def save_csv(self, path: Path) -> None:
+        """
+        Zapisuje bazę do CSV (nagłówki ``CSV_FIELDS``).
+
+        Args:
+            path: Ścieżka pliku wynikowego
+        """
+        with Path(path).open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for product in self:
+                writer.writerow([
+                    product.name, product.portion_g, product.cho_100g,
+                    product.kcal_100g, product.product_type, product.absorption,
+                    product.notes, product.fructose_share,
+                ])
+
+    # --- Dostęp --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> Product:
+        return Product(
+            self.names[index],
+            float(self.portion_g[index]),
+            float(self.cho_100g[index]),
+            float(self.kcal_100g[index]),
+            self.types[self._type_codes[index]],
+            self.absorptions[self._absorption_codes[index]],
+            self.notes[index],
+            float(self.fructose_share[index]),
+        )
+
+    def __iter__(self) -> Iterator[Product]:
+        return (self[i] for i in range(len(self)))
+
+    def rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[Tuple]:
+        """
+        Zwraca produkty jako krotki w formacie ``CHO_SAMPLE_DATA``.
+
+        Args:
+            ids: Opcjonalne numery wierszy (domyślnie wszystkie)
+
+        Yields:
+            Krotki (nazwa, porcja, CHO/100g, kcal/100g, typ, wchłanianie, uwagi)
+        """
+        portion = self.portion_g.tolist()
+        cho = self.cho_100g.tolist()
+        kcal = self.kcal_100g.tolist()
+        type_codes = self._type_codes.tolist()
+        absorption_codes = self._absorption_codes.tolist()
+        for i in (range(len(self)) if ids is None else ids):
+            yield (
+                self.names[i], round(portion[i], 2), round(cho[i], 2), round(kcal[i], 2),
+                self.types[type_codes[i]], self.absorptions[absorption_codes[i]],
+                self.notes[i],
+            )
+
+    @property
+    def cho_per_portion(self) -> np.ndarray:
+        """CHO w porcji (g) dla wszystkich produktów."""
+        return np.round(self.portion_g * self.cho_100g / 100, 1)
+
+    # --- Indeksy -------------------------------------------------------------
+
+    def by_type(self, product_type: str) -> np.ndarray:
+        """Numery wierszy produktów danego typu."""
+        if product_type not in self.types:
+            return np.zeros(0, dtype=np.int64)
+        return self._type_index[self.types.index(product_type)]
+
+    def by_absorption(self, absorption: str) -> np.ndarray:
+        """Numery wierszy produktów o danej szybkości wchłaniania."""
+        if absorption not in self.absorptions:
+            return np.zeros(0, dtype=np.int64)
+        return self._absorption_index[self.absorptions.index(absorption)]
+
+    def search_prefix(self, prefix: str) -> np.ndarray:
+        """
+        Wyszukuje produkty, których nazwa zaczyna się od prefiksu.
+
+        Wielkość liter nie ma znaczenia. Złożoność O(log n + k).
+
+        Args:
+            prefix: Początek nazwy
+
+        Returns:
+            Numery wierszy w kolejności alfabetycznej
+        """
+        key = prefix.casefold()
+        lo = bisect.bisect_left(self._name_keys, key)
+        hi = bisect.bisect_left(self._name_keys, key + "\U0010ffff")
+        return self._name_order[lo:hi]
+
+    def query(
+        self,
+        product_type: Optional[str] = None,
+        absorption: Optional[str] = None,
+        prefix: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Filtruje produkty po typie, wchłanianiu i prefiksie nazwy.
+
+        Args:
+            product_type: Typ produktu
+            absorption: Szybkość wchłaniania
+            prefix: Początek nazwy
+
+        Returns:
+            Posortowane numery wierszy spełniające wszystkie warunki
+        """
+        result: Optional[np.ndarray] = None
+        for ids in (
+            self.by_type(product_type) if product_type is not None else None,
+            self.by_absorption(absorption) if absorption is not None else None,
+            self.search_prefix(prefix) if prefix is not None else None,
+        ):
+            if ids is None:
+                continue
+            result = np.sort(ids) if result is None else np.intersect1d(result, ids)
+        return np.arange(len(self)) if result is None else result
+
+
+def default_store() -> ProductStore:
+    """Zwraca bazę z przykładowych produktów (``CHO_SAMPLE_DATA``)."""
+    return ProductStore.from_rows(CHO_SAMPLE_DATA)
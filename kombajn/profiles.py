@@ -0,0 +1,293 @@
+"""
+Profile zawodników (pliki TOML/JSON).
+
+Profil zastępuje wartości domyślne z ``kombajn.config`` w arkuszach
+Ustawienia i Strefy Mocy oraz w silniku (``MetabolicProfile``). Plik to
+płaski zestaw pól ``AthleteProfile`` - brakujące pola przyjmują wartości
+domyślne, nieznane pola są błędem (literówka nie przechodzi po cichu):
+
+    name = "Anna"
+    weight_kg = 62.0
+    ftp = 240
+    max_hr = 190
+    vo2max = 60.0
+    run_pace = 4.75                                    # min/km (4:45)
+    power_zones = [0.55, 0.75, 0.90, 1.05, 1.20, 1.50]  # granice Z1/Z2 ... Z6/Z7
+    hr_zones = [0.60, 0.70, 0.80, 0.90]                # granice Z1/Z2 ... Z4/Z5
+
+Pliki walidowane są raz - ``load_profile`` pamięta wynik dla ścieżki
+i (mtime, rozmiar) pliku, więc wsadowe generowanie i serwis nie
+parsują niezmienionych profili ponownie.
+
+TOML wymaga Pythona 3.11+ (``tomllib``) lub pakietu ``tomli``; JSON
+działa zawsze.
+
+Użycie:
+    python -m kombajn.main --profile anna.toml
+    python -m kombajn.main --profiles zawodnicy/ -d dzienniki/
+"""
+
+import dataclasses
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from kombajn.config import (
+    DEFAULTS, HR_ZONES, METABOLIC_DEFAULTS, POWER_DEFAULTS, POWER_ZONES, SHEET_CONFIG,
+    SPORT_DEFAULTS, HRZone, PowerZone
+)
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+PROFILE_SUFFIXES: Tuple[str, ...] = (".toml", ".json")
+
+# Pole -> (typ, minimum, maksimum); zakresy odrzucają pomyłki jednostek
+PROFILE_LIMITS: Dict[str, Tuple[type, float, float]] = {
+    "weight_kg": (float, 30.0, 200.0),
+    "height_cm": (float, 100.0, 230.0),
+    "ftp": (int, 50, 700),
+    "max_hr": (int, 100, 230),
+    "resting_hr": (int, 25, 120),
+    "vo2max": (float, 20.0, 100.0),
+    "vlamax": (float, 0.05, 1.5),
+    "bmr": (int, 800, 4000),
+    "tef": (int, 0, 1000),
+    "neat": (int, 0, 3000),
+    "deficit": (int, -2000, 2000),
+    "protein_ratio": (float, 0.5, 4.0),
+    "fat_ratio": (float, 0.1, 0.6),
+    "cho_per_hour": (float, 0.0, 150.0),
+    "ctl_start": (float, 0.0, 250.0),
+    "atl_start": (float, 0.0, 250.0),
+    "lthr_bike": (int, 80, 220),
+    "lthr_run": (int, 80, 220),
+    "run_pace": (float, 2.0, 12.0),
+    "swim_pace": (float, 0.8, 5.0),
+}
+
+
+@dataclass(frozen=True)
+class AthleteProfile:
+    """
+    Parametry zawodnika dla arkuszy i silnika.
+
+    Attributes:
+        name: Imię / pseudonim (pole "Imię / Pseudonim")
+        weight_kg: Waga (kg)
+        height_cm: Wzrost (cm)
+        ftp: Functional Threshold Power (W)
+        max_hr: Tętno maksymalne (bpm)
+        resting_hr: Tętno spoczynkowe (bpm)
+        vo2max: VO2max (ml/kg/min)
+        vlamax: VLaMax (mmol/L/s)
+        bmr: Basal Metabolic Rate (kcal)
+        tef: Thermic Effect of Food (kcal)
+        neat: Non-Exercise Activity (kcal)
+        deficit: Cel kaloryczny (ujemny = deficyt)
+        protein_ratio: Białko (g / kg mc)
+        fat_ratio: Tłuszcze (% TDEE)
+        cho_per_hour: CHO podczas treningu (g/h)
+        ctl_start: CTL startowe
+        atl_start: ATL startowe
+        lthr_bike: Tętno progowe na rowerze (bpm)
+        lthr_run: Tętno progowe w biegu (bpm)
+        run_pace: Tempo progowe biegu (min/km)
+        swim_pace: CSS pływanie (min/100 m)
+        power_zones: Strefy mocy (% FTP)
+        hr_zones: Strefy tętna (% HRmax)
+    """
+    name: str = ""
+    weight_kg: float = POWER_DEFAULTS.WEIGHT_KG
+    height_cm: float = 175
+    ftp: int = POWER_DEFAULTS.FTP
+    max_hr: int = POWER_DEFAULTS.MAX_HR
+    resting_hr: int = POWER_DEFAULTS.RESTING_HR
+    vo2max: float = METABOLIC_DEFAULTS.VO2MAX
+    vlamax: float = METABOLIC_DEFAULTS.VLAMAX
+    bmr: int = DEFAULTS.BMR
+    tef: int = DEFAULTS.TEF
+    neat: int = DEFAULTS.NEAT
+    deficit: int = DEFAULTS.DEFICIT
+    protein_ratio: float = DEFAULTS.PROTEIN_RATIO
+    fat_ratio: float = DEFAULTS.FAT_RATIO
+    cho_per_hour: float = 60
+    ctl_start: float = SHEET_CONFIG.CTL_START
+    atl_start: float = SHEET_CONFIG.ATL_START
+    lthr_bike: int = SPORT_DEFAULTS.LTHR_BIKE
+    lthr_run: int = SPORT_DEFAULTS.LTHR_RUN
+    run_pace: float = SPORT_DEFAULTS.RUN_THRESHOLD_PACE
+    swim_pace: float = SPORT_DEFAULTS.SWIM_THRESHOLD_PACE
+    power_zones: Tuple[PowerZone, ...] = tuple(POWER_ZONES)
+    hr_zones: Tuple[HRZone, ...] = tuple(HR_ZONES)
+
+
+def _number(field: str, value: Any) -> Any:
+    """Waliduje pole liczbowe wg ``PROFILE_LIMITS``."""
+    kind, low, high = PROFILE_LIMITS[field]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Pole '{field}' musi być liczbą, podano: {value!r}")
+    if kind is int:
+        if value != int(value):
+            raise ValueError(f"Pole '{field}' musi być liczbą całkowitą, podano: {value}")
+        value = int(value)
+    else:
+        value = float(value)
+    if not low <= value <= high:
+        raise ValueError(f"Pole '{field}' poza zakresem {low}-{high}: {value}")
+    return value
+
+
+def _bounds(field: str, value: Any, count: int, low: float, high: float) -> List[float]:
+    """Waliduje rosnące granice stref (ułamki progu) w przedziale (low, high)."""
+    if not isinstance(value, list) or len(value) != count:
+        raise ValueError(f"Pole '{field}' musi być listą {count} granic stref")
+    bounds = []
+    for bound in value:
+        if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+            raise ValueError(f"Pole '{field}': granica musi być liczbą, podano: {bound!r}")
+        bounds.append(float(bound))
+    edges = [low] + bounds + [high]
+    if any(a >= b for a, b in zip(edges, edges[1:])):
+        raise ValueError(f"Pole '{field}': granice muszą rosnąć w przedziale {low}-{high}")
+    return bounds
+
+
+def profile_from_dict(data: Any) -> AthleteProfile:
+    """
+    Tworzy zwalidowany profil ze słownika (zawartość pliku lub żądania).
+
+    Args:
+        data: Pola profilu (nazwa pola -> wartość)
+
+    Returns:
+        Profil zawodnika
+
+    Raises:
+        ValueError: Przy nieznanym polu lub wartości spoza zakresu
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Profil musi być obiektem pole -> wartość")
+    known = {f.name for f in dataclasses.fields(AthleteProfile)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"Nieznane pola profilu: {', '.join(unknown)}")
+
+    values: Dict[str, Any] = {}
+    for field, value in data.items():
+        if field == "name":
+            if not isinstance(value, str):
+                raise ValueError(f"Pole 'name' musi być tekstem, podano: {value!r}")
+            values[field] = value.strip()
+        elif field == "power_zones":
+            # Strefa Z7 sięga do 300% FTP (jak w POWER_ZONES)
+            edges = [0.0] + _bounds(field, value, len(POWER_ZONES) - 1, 0.0, 3.0) + [3.0]
+            values[field] = tuple(
+                dataclasses.replace(zone, min_pct=edges[i], max_pct=edges[i + 1])
+                for i, zone in enumerate(POWER_ZONES)
+            )
+        elif field == "hr_zones":
+            low, high = HR_ZONES[0].min_pct, HR_ZONES[-1].max_pct
+            edges = [low] + _bounds(field, value, len(HR_ZONES) - 1, low, high) + [high]
+            values[field] = tuple(
+                dataclasses.replace(zone, min_pct=edges[i], max_pct=edges[i + 1])
+                for i, zone in enumerate(HR_ZONES)
+            )
+        else:
+            values[field] = _number(field, value)
+
+    profile = AthleteProfile(**values)
+    if profile.resting_hr >= profile.max_hr:
+        raise ValueError(
+            f"Tętno spoczynkowe ({profile.resting_hr}) musi być niższe od maksymalnego ({profile.max_hr})"
+        )
+    for field in ("lthr_bike", "lthr_run"):
+        lthr = getattr(profile, field)
+        if not profile.resting_hr < lthr <= profile.max_hr:
+            raise ValueError(
+                f"Pole '{field}' ({lthr}) musi leżeć między tętnem spoczynkowym a maksymalnym"
+            )
+    return profile
+
+
+def _read(path: Path) -> Any:
+    """Wczytuje zawartość pliku profilu (TOML/JSON)."""
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"niepoprawny JSON ({e})") from None
+    if suffix == ".toml":
+        if tomllib is None:
+            raise ValueError("profile TOML wymagają Pythona 3.11+ lub pakietu tomli")
+        with open(path, "rb") as f:
+            try:
+                return tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"niepoprawny TOML ({e})") from None
+    raise ValueError(f"nieobsługiwany format profilu ({path.suffix or 'brak rozszerzenia'})")
+
+
+# Ścieżka -> ((mtime_ns, rozmiar), profil)
+_PROFILE_CACHE: Dict[Path, Tuple[Tuple[int, int], AthleteProfile]] = {}
+
+
+def load_profile(path: Path) -> AthleteProfile:
+    """
+    Wczytuje profil z pliku (wynik pamiętany do zmiany pliku).
+
+    Args:
+        path: Plik .toml lub .json
+
+    Returns:
+        Profil zawodnika
+
+    Raises:
+        ValueError: Przy nieobsługiwanym formacie lub błędnych polach
+        OSError: Gdy pliku nie da się odczytać
+    """
+    path = Path(path).resolve()
+    info = os.stat(path)
+    stamp = (info.st_mtime_ns, info.st_size)
+    cached = _PROFILE_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        profile = profile_from_dict(_read(path))
+    except ValueError as e:
+        raise ValueError(f"{path.name}: {e}") from None
+    _PROFILE_CACHE[path] = (stamp, profile)
+    return profile
+
+
+def load_profiles(directory: Path) -> Dict[str, AthleteProfile]:
+    """
+    Wczytuje wszystkie profile z katalogu (bez podkatalogów).
+
+    Args:
+        directory: Katalog z plikami .toml / .json
+
+    Returns:
+        Nazwa pliku bez rozszerzenia -> profil (kolejność alfabetyczna)
+
+    Raises:
+        ValueError: Przy dwóch plikach o tej samej nazwie lub błędnym profilu
+    """
+    profiles: Dict[str, AthleteProfile] = {}
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file() or path.suffix.lower() not in PROFILE_SUFFIXES:
+            continue
+        if path.stem in profiles:
+            raise ValueError(f"Dwa profile o nazwie '{path.stem}' w katalogu {directory}")
+        profiles[path.stem] = load_profile(path)
+    return profiles
@@ -0,0 +1,155 @@
+"""
+Ranking ryzyka przeciążenia kadry.
+
+Wczytuje dzienniki zawodników (pliki lub katalogi, np. wynik
+``--profiles zawodnicy/ -d dzienniki/``), liczy ACWR, rampę CTL
+i alerty wszystkich zawodników jednym przebiegiem na wspólnym
+kalendarzu i wypisuje ranking od najwyższego ryzyka.
+
+Użycie:
+    python -m kombajn risk dzienniki/
+    python -m kombajn risk dzienniki/ --days 14 --date 2026-05-31 --csv ryzyko.csv
+"""
+
+import argparse
+import csv
+import datetime
+import math
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from openpyxl.utils.exceptions import InvalidFileException
+
+from kombajn.config import LOAD_ALERTS
+from kombajn.engine.alerts import RosterRisk, roster_risk
+from kombajn.engine.metrics import JournalMetrics, journal_metrics
+from kombajn.journal import load_journal
+
+
+_READ_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile, InvalidFileException)
+
+
+def journal_paths(paths: Sequence[Path]) -> List[Path]:
+    """Rozwija katalogi do plików .xlsx (bez plików blokady "~$")."""
+    found: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(p for p in sorted(path.glob("*.xlsx")) if not p.name.startswith("~$"))
+        else:
+            found.append(path)
+    return found
+
+
+def _read_journal(path: Path) -> Tuple[Path, Optional[JournalMetrics], str]:
+    """Metryki jednego dziennika (funkcja modułowa - wymagana przez ProcessPool)."""
+    try:
+        return path, journal_metrics(load_journal(path)), ""
+    except _READ_ERRORS as e:
+        return path, None, str(e) or type(e).__name__
+
+
+def load_roster(
+    paths: Sequence[Path],
+    workers: Optional[int] = None
+) -> Tuple[Dict[str, JournalMetrics], Dict[Path, str]]:
+    """
+    Wczytuje dzienniki kadry równolegle.
+
+    Zawodnik to nazwa pliku bez rozszerzenia (przy powtórzeniu - ścieżka).
+
+    Args:
+        paths: Dzienniki lub katalogi z dziennikami
+        workers: Liczba procesów (domyślnie liczba rdzeni)
+
+    Returns:
+        Krotka (zawodnik -> metryki dziennika, plik -> błąd odczytu)
+    """
+    files = journal_paths(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files) or 1))
+    if workers == 1:
+        results = [_read_journal(path) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_read_journal, files))
+
+    journals: Dict[str, JournalMetrics] = {}
+    errors: Dict[Path, str] = {}
+    for path, metrics, error in results:
+        if metrics is None:
+            errors[path] = error
+        else:
+            journals[path.stem if path.stem not in journals else str(path)] = metrics
+    return journals, errors
+
+
+def _value(number: float, digits: int) -> Any:
+    """Liczba zaokrąglona do zapisu w CSV (NaN -> pusta komórka)."""
+    return "" if math.isnan(number) else round(float(number), digits)
+
+
+def write_risk_csv(path: Path, risk: RosterRisk) -> None:
+    """Zapisuje ranking ryzyka do pliku CSV (separator ";")."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow([
+            "Miejsce", "Zawodnik", "Wynik", "Dni z alertem", "ACWR", "Rampa CTL",
+            "Maks. ACWR", "Maks. rampa", "Alert",
+        ])
+        for i, athlete in enumerate(risk.athletes):
+            writer.writerow([
+                i + 1, athlete, _value(risk.score[i], 2), int(risk.alert_days[i]),
+                _value(risk.acwr[i], 2), _value(risk.ramp[i], 1),
+                _value(risk.max_acwr[i], 2), _value(risk.max_ramp[i], 1), risk.flags[i],
+            ])
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``risk`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "risk",
+        help="Ranking ryzyka przeciążenia kadry (ACWR, rampa CTL)",
+        description="Liczy alerty obciążenia wszystkich dzienników naraz i szereguje zawodników "
+                    "od najwyższego ryzyka.",
+    )
+    parser.add_argument("paths", type=Path, nargs="+", metavar="SCIEZKA",
+                        help="Dziennik (xlsx) lub katalog z dziennikami")
+    parser.add_argument("--days", type=int, default=LOAD_ALERTS.WINDOW_DAYS,
+                        help=f"Okno oceny w dniach (domyślnie: {LOAD_ALERTS.WINDOW_DAYS})")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=None,
+                        help="Dzień oceny RRRR-MM-DD (domyślnie ostatni trening w kadrze)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Liczba procesów odczytu (domyślnie liczba rdzeni)")
+    parser.add_argument("--csv", type=Path, default=None, dest="csv_output",
+                        help="Zapisz ranking do CSV")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``risk`` (kod wyjścia 1 przy błędzie)."""
+    try:
+        journals, errors = load_roster(args.paths, args.workers)
+        for path, error in errors.items():
+            print(f"[BŁĄD] {path.name}: {error}")
+        if not journals:
+            raise ValueError("Nie znaleziono dzienników")
+        risk = roster_risk(journals, args.days, args.date)
+        if args.csv_output is not None:
+            write_risk_csv(args.csv_output, risk)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+
+    print(f"Ryzyko przeciążenia na {risk.as_of.isoformat()} ({risk.days} dni, zawodnicy: {len(risk)})")
+    width = max(len(athlete) for athlete in risk.athletes)
+    for i, athlete in enumerate(risk.athletes):
+        acwr = "--" if math.isnan(risk.acwr[i]) else f"{risk.acwr[i]:.2f}"
+        ramp = "--" if math.isnan(risk.ramp[i]) else f"{risk.ramp[i]:+.1f}"
+        flag = f"  [{risk.flags[i]}]" if risk.flags[i] else ""
+        print(f"{i + 1:>3}. {athlete:<{width}}  wynik {risk.score[i]:5.2f}  "
+              f"alerty {int(risk.alert_days[i]):>2}  ACWR {acwr:>4}  rampa {ramp:>5}{flag}")
+    if args.csv_output is not None:
+        print(f"CSV: {args.csv_output}")
+    return 0
@@ -0,0 +1,280 @@
+"""
+Zamknięcie sezonu: archiwum starych wpisów i świeży Dziennik.
+
+Wpisy sprzed początku nowego sezonu trafiają do osobnego skoroszytu
+z samymi wartościami (bez formuł), a aktywny dziennik dostaje nowy
+arkusz Dziennik z wpisami od początku sezonu. CTL i ATL ostatniego
+zarchiwizowanego dnia - wygaszone o dni przerwy przed początkiem
+sezonu - zapisywane są jako wartości startowe PMC w arkuszu Ustawienia
+(B38/B39), więc wykres PMC pozostaje ciągły.
+
+Użycie:
+    python -m kombajn rollover dziennik.xlsx --season 2026
+"""
+
+import argparse
+import datetime
+import logging
+import math
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import range_boundaries
+
+from kombajn.calc import Evaluator, ExcelError
+from kombajn.config import LOG_HEADERS, SHEET_CONFIG, log_column
+from kombajn.journal import (
+    check_log_layout,
+    load_journal,
+    log_cell,
+    log_date_rows,
+    log_table,
+    resize_chart_ranges,
+    row_for_date,
+)
+from kombajn.sheets import LogSheet
+
+
+# Komórki wartości startowych PMC w arkuszu Ustawienia
+CTL_SEED_CELL = "B38"
+ATL_SEED_CELL = "B39"
+
+
+@dataclass(frozen=True)
+class RolloverResult:
+    """
+    Wynik zamknięcia sezonu.
+
+    Attributes:
+        archive_path: Skoroszyt archiwum (same wartości)
+        journal_path: Aktywny dziennik z nowym arkuszem Dziennik
+        archived_days: Liczba dni przeniesionych do archiwum
+        kept_days: Liczba dni z danymi przeniesionych do nowego Dziennika
+        ctl_seed: CTL startowe nowego sezonu
+        atl_seed: ATL startowe nowego sezonu
+    """
+    archive_path: Path
+    journal_path: Path
+    archived_days: int
+    kept_days: int
+    ctl_seed: float
+    atl_seed: float
+
+
+def archive_path_for(path: Path, season: int) -> Path:
+    """Domyślna ścieżka archiwum: <nazwa>_sezon_<poprzedni sezon>.xlsx obok dziennika."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_sezon_{season - 1}.xlsx")
+
+
+def _is_formula(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("=")
+
+
+def _archived_values(
+    path: Path,
+    workbook: Workbook,
+    rows: List[int]
+) -> Dict[int, List[Any]]:
+    """
+    Zwraca wartości wierszy Dziennika (formuły zastąpione wynikami).
+
+    Wyniki formuł pochodzą z wartości zapisanych przez Excela (odczyt
+    strumieniowy); gdy pliku nie przeliczał Excel, liczy je ``kombajn.calc``.
+    """
+    ws = workbook["Dziennik"]
+    width = len(LOG_HEADERS)
+    wanted = set(rows)
+    values: Dict[int, List[Any]] = {}
+
+    cached = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row, cells in enumerate(cached["Dziennik"].iter_rows(
+            min_row=2, max_row=max(rows), max_col=width, values_only=True
+        ), start=2):
+            if row in wanted:
+                values[row] = list(cells) + [None] * (width - len(cells))
+    finally:
+        cached.close()
+
+    missing = [
+        (row, col) for row in rows for col in range(1, width + 1)
+        if values[row][col - 1] is None and _is_formula(ws.cell(row=row, column=col).value)
+    ]
+    if missing:
+        evaluator = Evaluator(workbook)
+        for row, col in missing:
+            value = evaluator.cell_value("Dziennik", row, col)
+            if isinstance(value, ExcelError):
+                value = str(value)
+            values[row][col - 1] = None if value == "" else value
+    return values
+
+
+def _number(value: Any, default: float) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return default
+
+
+def carry_load(value: float, gap_days: int, time_constant: int) -> float:
+    """
+    Wygasza obciążenie (CTL/ATL) przez dni przerwy bez treningów.
+
+    Args:
+        value: CTL/ATL ostatniego zarchiwizowanego dnia
+        gap_days: Dni bez wpisów między tym dniem a początkiem sezonu
+        time_constant: Stała czasowa (42 / 7)
+
+    Returns:
+        Wartość startowa nowego sezonu (pełna precyzja)
+    """
+    return value * math.exp(-max(gap_days, 0) / time_constant)
+
+
+def rollover(
+    path: Path,
+    season: int,
+    start: Optional[datetime.date] = None,
+    archive_path: Optional[Path] = None,
+    output_path: Optional[Path] = None
+) -> RolloverResult:
+    """
+    Zamyka sezon dziennika.
+
+    Args:
+        path: Dziennik (xlsx)
+        season: Rok nowego sezonu
+        start: Pierwszy dzień nowego sezonu (domyślnie 1 stycznia)
+        archive_path: Ścieżka archiwum (domyślnie ``archive_path_for``)
+        output_path: Ścieżka aktywnego dziennika (domyślnie nadpisywany ``path``)
+
+    Returns:
+        Podsumowanie zamknięcia sezonu
+
+    Raises:
+        ValueError: Gdy archiwum już istnieje, brak wpisów sprzed sezonu
+            lub układ kolumn dziennika jest nieznany
+    """
+    path = Path(path)
+    start = start or datetime.date(season, 1, 1)
+    archive_path = Path(archive_path or archive_path_for(path, season))
+    output_path = Path(output_path or path)
+    if archive_path.exists():
+        raise ValueError(f"Archiwum {archive_path.name} już istnieje")
+
+    workbook = load_journal(path)
+    ws = workbook["Dziennik"]
+    check_log_layout(ws)
+    date_rows = log_date_rows(ws)
+    archived = sorted((day, row) for day, row in date_rows.items() if day < start)
+    if not archived:
+        raise ValueError(f"Dziennik nie zawiera wpisów sprzed {start.isoformat()}")
+
+    # Archiwum - zapis strumieniowy, same wartości
+    values = _archived_values(path, workbook, [row for _, row in archived])
+    archive = Workbook(write_only=True)
+    archive_ws = archive.create_sheet("Dziennik")
+    archive_ws.freeze_panes = "B2"
+    archive_ws.append(LOG_HEADERS)
+    for day, row in archived:
+        archive_ws.append([day] + values[row][1:])
+    archive.save(archive_path)
+
+    # Wartości startowe PMC - obciążenie ostatniego zarchiwizowanego dnia
+    # wygaszone o dni bez wpisów do dnia przed początkiem sezonu; bez
+    # zaokrąglania (zaokrągla tylko format liczb komórek B38/B39)
+    settings = workbook["Ustawienia"]
+    last_day, last_row = archived[-1]
+    last = values[last_row]
+    gap = (start - last_day).days - 1
+    ctl_seed = carry_load(
+        _number(last[log_column("CTL") - 1], _number(settings[CTL_SEED_CELL].value, 0.0)),
+        gap, SHEET_CONFIG.CTL_DAYS,
+    )
+    atl_seed = carry_load(
+        _number(last[log_column("ATL") - 1], _number(settings[ATL_SEED_CELL].value, 0.0)),
+        gap, SHEET_CONFIG.ATL_DAYS,
+    )
+    settings[CTL_SEED_CELL] = ctl_seed
+    settings[ATL_SEED_CELL] = atl_seed
+
+    # Wpisy nowego sezonu (bez formuł) - do świeżego arkusza
+    kept: Dict[datetime.date, Dict[int, Any]] = {}
+    for day, row in date_rows.items():
+        if day < start:
+            continue
+        entries = {
+            cell.column: cell.value for cell in ws[row][1:len(LOG_HEADERS)]
+            if cell.value not in (None, "") and not _is_formula(cell.value)
+        }
+        if entries:
+            kept[day] = entries
+
+    table = log_table(ws)
+    index = workbook.sheetnames.index("Dziennik")
+    workbook.remove(ws)
+    fresh = LogSheet(workbook).create()
+    workbook.move_sheet(fresh, offset=index - workbook.index(fresh))
+    if table is not None:
+        # Wykresy Dashboardu wracają do zakresu nowej tabeli
+        resize_chart_ranges(fresh, range_boundaries(table.ref)[3], fresh.max_row)
+    fresh["A2"] = start
+    fresh_rows = log_date_rows(fresh)
+    for day in sorted(kept):
+        row = row_for_date(fresh, day, fresh_rows)
+        for column, value in kept[day].items():
+            log_cell(fresh, row, column).value = value
+
+    # Zapis przez plik tymczasowy - dziennik nie zostaje uszkodzony przy błędzie
+    handle, temp_name = tempfile.mkstemp(suffix=".xlsx", dir=output_path.parent)
+    os.close(handle)
+    try:
+        workbook.save(temp_name)
+        shutil.copymode(path, temp_name)
+        os.replace(temp_name, output_path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+    logging.getLogger("kombajn").info(
+        f"Sezon {season}: {len(archived)} dni w {archive_path.name}, "
+        f"CTL {ctl_seed:.1f}, ATL {atl_seed:.1f}"
+    )
+    return RolloverResult(archive_path, output_path, len(archived), len(kept), ctl_seed, atl_seed)
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``rollover`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "rollover",
+        help="Zamknij sezon: archiwum starych wpisów i świeży Dziennik",
+        description="Przenosi wpisy sprzed sezonu do archiwum (same wartości) "
+                    "i przenosi CTL/ATL jako wartości startowe nowego sezonu.",
+    )
+    parser.add_argument("journal", type=Path, help="Dziennik (xlsx)")
+    parser.add_argument("--season", type=int, required=True, help="Rok nowego sezonu")
+    parser.add_argument(
+        "--start", type=datetime.date.fromisoformat, default=None,
+        help="Pierwszy dzień sezonu RRRR-MM-DD (domyślnie 1 stycznia)"
+    )
+    parser.add_argument("--archive", type=Path, default=None, help="Ścieżka archiwum")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``rollover`` (kod wyjścia 1 przy błędzie)."""
+    try:
+        result = rollover(args.journal, args.season, args.start, args.archive)
+    except (OSError, ValueError) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+    print(f"Archiwum: {result.archive_path} ({result.archived_days} dni)")
+    print(f"Dziennik: {result.journal_path} ({result.kept_days} dni z danymi w sezonie {args.season})")
+    print(f"PMC - wartości startowe: CTL {result.ctl_seed:.1f}, ATL {result.atl_seed:.1f}")
+    return 0
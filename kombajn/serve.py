@@ -0,0 +1,389 @@
+"""
+Lokalny serwis HTTP generujący dzienniki na żądanie.
+
+Portal zamiast uruchamiać ``python -m kombajn.main`` dla każdego pobrania
+wysyła ustawienia zawodnika jako JSON do działającego procesu:
+
+    POST /workbook   {"settings": {"FTP (W)": 280, "Waga (kg)": 70},
+                      "start": "2026-01-05", "filename": "jan.xlsx"}
+    POST /workbook   {"profile": {"name": "Jan", "ftp": 280, "weight_kg": 70}}
+    GET  /metrics    liczniki i opóźnienia (p50/p95/max, ms)
+    GET  /health
+
+Serwer działa na asyncio (tylko biblioteka standardowa). Skoroszyty
+budowane są w ograniczonej puli procesów - każdy proces raz importuje
+openpyxl i buduje skoroszyt rozgrzewający, więc kolejne żądania nie płacą
+za start interpretera. Plik xlsx powstaje w pamięci i jest wysyłany
+porcjami bez zapisu na dysk. Żądania ponad limit kolejki dostają 503.
+
+Użycie:
+    python -m kombajn serve --port 8765 --workers 2
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from kombajn.config import SHEET_CONFIG
+from kombajn.profiles import AthleteProfile, profile_from_dict
+from kombajn.utils import sanitize_filename, workbook_to_bytes
+
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Maksymalny rozmiar treści żądania (bajty)
+MAX_BODY_BYTES = 64 * 1024
+
+# Rozmiar porcji wysyłanej odpowiedzi (bajty)
+CHUNK_BYTES = 64 * 1024
+
+# Czas na przesłanie nagłówków i treści żądania (s)
+READ_TIMEOUT_S = 10.0
+
+# Nazwa pobieranego pliku: litery, cyfry, spacja i ._-() (reszta -> "_")
+_FILENAME_UNSAFE_RE = re.compile(r"[^\w .()-]")
+MAX_FILENAME_LENGTH = 100
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+@dataclass
+class LatencyStats:
+    """
+    Opóźnienia z ostatnich żądań (okno przesuwne).
+
+    Attributes:
+        window: Liczba pamiętanych pomiarów
+    """
+    window: int = 1000
+    samples: Deque[float] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.samples = deque(maxlen=self.window)
+
+    def record(self, milliseconds: float) -> None:
+        self.samples.append(milliseconds)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Zwraca p50/p95/max w ms (None, gdy brak pomiarów)."""
+        if not self.samples:
+            return {"p50": None, "p95": None, "max": None}
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+        return {"p50": percentile(0.50), "p95": percentile(0.95), "max": round(ordered[-1], 1)}
+
+
+def parse_request(
+    payload: Any
+) -> Tuple[Optional[AthleteProfile], Dict[str, Any], Optional[datetime.date], str]:
+    """
+    Waliduje treść żądania POST /workbook.
+
+    Args:
+        payload: Zdekodowany JSON
+
+    Returns:
+        Krotka (profil zawodnika lub None, ustawienia: etykieta -> wartość,
+        data startowa Dziennika, nazwa pliku)
+
+    Raises:
+        ValueError: Przy niepoprawnej strukturze lub wartościach
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Treść żądania musi być obiektem JSON")
+    unknown = sorted(set(payload) - {"profile", "settings", "start", "filename"})
+    if unknown:
+        raise ValueError(f"Nieznane pola żądania: {', '.join(unknown)}")
+
+    profile = payload.get("profile")
+    if profile is not None:
+        profile = profile_from_dict(profile)
+
+    settings = payload.get("settings", {})
+    if not isinstance(settings, dict):
+        raise ValueError("Pole 'settings' musi być obiektem etykieta -> wartość")
+    for label, value in settings.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"Niepoprawna wartość pola [{label}]: {value!r}")
+
+    start = payload.get("start")
+    if start is not None:
+        if not isinstance(start, str):
+            raise ValueError("Pole 'start' musi być datą RRRR-MM-DD")
+        start = datetime.date.fromisoformat(start)
+
+    filename = str(payload.get("filename") or SHEET_CONFIG.OUTPUT_FILENAME)
+    # Nazwa trafia do nagłówka Content-Disposition - bez znaków sterujących,
+    # cudzysłowów i ukośników wstecznych (rozbicie lub domknięcie nagłówka)
+    if any(unicodedata.category(char) == "Cc" or char in '"\\' for char in filename):
+        raise ValueError("Pole 'filename' zawiera niedozwolone znaki")
+    filename = _FILENAME_UNSAFE_RE.sub("_", sanitize_filename(filename))
+    if filename.lower().endswith(".xlsx"):
+        filename = filename[:-5]
+    filename = filename[:MAX_FILENAME_LENGTH - 5].rstrip(". ") or "dziennik"
+    return profile, settings, start, filename + ".xlsx"
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Nagłówek Content-Disposition z nazwą ASCII i wersją UTF-8 (RFC 5987).
+
+    Args:
+        filename: Nazwa pliku po walidacji ``parse_request``
+
+    Returns:
+        Np. ``attachment; filename="Zo_w.xlsx"; filename*=UTF-8''%C5%BB%C3%B3%C5%82w.xlsx``
+    """
+    # Znaki diakrytyczne bez akcentów (ó -> o), pozostałe spoza ASCII -> "_"
+    letters = unicodedata.normalize("NFKD", filename)
+    ascii_name = "".join(
+        char if char.isascii() else "_"
+        for char in letters if unicodedata.category(char) != "Mn"
+    )
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _warm_worker() -> None:
+    """Rozgrzewa proces puli: importy i jeden pełny skoroszyt."""
+    render_workbook(None, {}, None)
+
+
+def render_workbook(
+    profile: Optional[AthleteProfile],
+    settings: Dict[str, Any],
+    start: Optional[datetime.date]
+) -> bytes:
+    """
+    Buduje dziennik z ustawieniami zawodnika i zwraca plik xlsx w pamięci.
+
+    Args:
+        profile: Profil zawodnika (None = wartości domyślne)
+        settings: Pola arkusza Ustawienia nadpisujące profil (etykieta -> wartość)
+        start: Data startowa Dziennika (A2) lub None
+
+    Returns:
+        Zawartość pliku xlsx
+
+    Raises:
+        ValueError: Przy nieznanym lub wyliczanym polu Ustawień
+    """
+    from kombajn.journal import write_settings
+    from kombajn.main import create_workbook
+
+    workbook = create_workbook(profile=profile)
+    write_settings(workbook, settings)
+    if start is not None:
+        workbook["Dziennik"]["A2"] = start
+    return workbook_to_bytes(workbook)
+
+
+class WorkbookServer:
+    """
+    Serwer HTTP/1.1 (połączenie zamykane po odpowiedzi).
+
+    Attributes:
+        host: Adres nasłuchu
+        port: Port (0 = wolny port, właściwy dostępny po ``start``)
+        workers: Liczba procesów generujących
+        queue_limit: Maksymalna liczba żądań w toku (pozostałe dostają 503)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: Optional[int] = None,
+        queue_limit: Optional[int] = None
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.queue_limit = queue_limit or 4 * self.workers
+        self.latency = LatencyStats()
+        self.render_latency = LatencyStats()
+        self.counters: Dict[str, int] = {"requests": 0, "workbooks": 0, "errors": 0, "rejected": 0}
+        self.in_flight = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.Server] = None
+
+    async def start(self) -> None:
+        """Uruchamia pulę procesów (rozgrzaną) i nasłuch."""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        loop = asyncio.get_running_loop()
+        # Wymuszenie startu wszystkich procesów przed przyjęciem żądań
+        await asyncio.gather(*(
+            loop.run_in_executor(self._pool, time.sleep, 0) for _ in range(self.workers)
+        ))
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "latency_ms": self.latency.summary(),
+            "render_ms": self.render_latency.summary(),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        started = time.perf_counter()
+        self.counters["requests"] += 1
+        try:
+            status, body, headers = await self._dispatch(reader)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            status, body, headers = 400, _json({"error": "Niepoprawne żądanie HTTP"}), {}
+        except Exception as e:
+            logging.getLogger("kombajn").error(f"Błąd serwera: {e}")
+            status, body, headers = 500, _json({"error": "Błąd serwera"}), {}
+        if status >= 400:
+            self.counters["rejected" if status == 503 else "errors"] += 1
+        try:
+            await _respond(writer, status, body, headers)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+        self.latency.record((time.perf_counter() - started) * 1000)
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, bytes, Dict[str, str]]:
+        request_line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT_S)
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT_S)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        path = target.split("?", 1)[0]
+        if path == "/health":
+            return 200, _json({"status": "ok"}), {}
+        if path == "/metrics":
+            return 200, _json(self.metrics()), {}
+        if path != "/workbook":
+            return 404, _json({"error": f"Nieznana ścieżka: {path}"}), {}
+        if method != "POST":
+            return 405, _json({"error": "Dozwolona metoda: POST"}), {"Allow": "POST"}
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY_BYTES:
+            return 413, _json({"error": f"Treść ponad {MAX_BODY_BYTES} B"}), {}
+        body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT_S)
+        try:
+            profile, settings, start, filename = parse_request(json.loads(body or b"{}"))
+        except ValueError as e:
+            return 400, _json({"error": str(e)}), {}
+
+        if self.in_flight >= self.queue_limit:
+            return 503, _json({"error": "Serwer zajęty, spróbuj ponownie"}), {"Retry-After": "1"}
+        self.in_flight += 1
+        rendered = time.perf_counter()
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(
+                self._pool, render_workbook, profile, settings, start
+            )
+        except ValueError as e:
+            return 400, _json({"error": str(e)}), {}
+        finally:
+            self.in_flight -= 1
+        self.render_latency.record((time.perf_counter() - rendered) * 1000)
+        self.counters["workbooks"] += 1
+        return 200, data, {
+            "Content-Type": XLSX_CONTENT_TYPE,
+            "Content-Disposition": content_disposition(filename),
+        }
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+async def _respond(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    headers: Dict[str, str]
+) -> None:
+    """Wysyła odpowiedź, treść porcjami z kontrolą przepływu."""
+    headers = {"Content-Type": "application/json; charset=utf-8", **headers}
+    head = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+    head += [f"{name}: {value}" for name, value in headers.items()]
+    head += [f"Content-Length: {len(body)}", "Connection: close", "", ""]
+    writer.write("\r\n".join(head).encode("latin-1", errors="replace"))
+    for offset in range(0, len(body), CHUNK_BYTES):
+        writer.write(body[offset:offset + CHUNK_BYTES])
+        await writer.drain()
+    await writer.drain()
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``serve`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "serve",
+        help="Uruchom lokalny serwis HTTP generujący dzienniki",
+        description="Serwis HTTP: POST /workbook (JSON z ustawieniami) zwraca plik xlsx; "
+                    "GET /metrics - opóźnienia i liczniki.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Adres (domyślnie: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (domyślnie: 8765)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Liczba procesów generujących (domyślnie: min(4, rdzenie))")
+    parser.add_argument("--queue", type=int, default=None,
+                        help="Limit żądań w toku (domyślnie: 4 x procesy)")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``serve`` (do przerwania Ctrl+C)."""
+    server = WorkbookServer(args.host, args.port, args.workers, args.queue)
+
+    async def main() -> None:
+        await server.start()
+        print(f"Serwis: http://{server.host}:{server.port} "
+              f"(procesy: {server.workers}, limit kolejki: {server.queue_limit})")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+    return 0
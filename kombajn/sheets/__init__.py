@@ -11,6 +11,10 @@ from kombajn.sheets.log import LogSheet
 from kombajn.sheets.dashboard import DashboardSheet
 from kombajn.sheets.cho_sources import CHOSourcesSheet
 from kombajn.sheets.power_zones import PowerZonesSheet
+from kombajn.sheets.fueling_plan import FuelingPlanSheet
+from kombajn.sheets.plan import PlanSheet
+from kombajn.sheets.activities import ActivitiesSheet
+from kombajn.sheets.compliance import ComplianceSheet
 
 __all__ = [
     "BaseSheet",
@@ -19,4 +23,8 @@ __all__ = [
     "DashboardSheet",
     "CHOSourcesSheet",
     "PowerZonesSheet",
+    "FuelingPlanSheet",
+    "PlanSheet",
+    "ActivitiesSheet",
+    "ComplianceSheet",
 ]
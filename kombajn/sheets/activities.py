@@ -0,0 +1,125 @@
+"""
+Arkusz Aktywności.
+
+Lista aktywności pod dziennymi wierszami Dziennika (kilka na dzień).
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.engine.activities import ActivityLog
+from kombajn.sheets.base import BaseSheet
+
+
+class ActivitiesSheet(BaseSheet):
+    """
+    Arkusz z listą aktywności posortowanych po dacie.
+
+    Zawiera:
+    - Jeden wiersz na aktywność (od wiersza 2, nagłówki w wierszu 1)
+    - kJ = moc średnia · czas (formuła)
+    - TSS z eksportu, a w razie braku formułę z NP i FTP (Ustawienia)
+
+    Aktywności dnia zajmują kolejne wiersze - Dziennik sumuje ich TSS
+    (``activity_rows`` podaje zakres wierszy każdego dnia).
+    """
+
+    # Nagłówek -> pole ActivityLog (None = formuła / tekst)
+    COLUMNS: List[Tuple[str, Optional[str]]] = [
+        ("Data", None),
+        ("Aktywność", None),
+        ("Czas (min)", "minutes"),
+        ("Dystans (km)", "distance_km"),
+        ("Przewyższenia (m)", "elevation_m"),
+        ("Avg Power (W)", "avg_power"),
+        ("NP (W)", "normalized_power"),
+        ("Max Power (W)", "max_power"),
+        ("Avg Kadencja", "cadence"),
+        ("Avg HR", "avg_hr"),
+        ("Max HR", "max_hr"),
+        ("kJ", None),
+        ("TSS", "tss"),
+    ]
+
+    HEADERS = [header for header, _ in COLUMNS]
+
+    def __init__(self, workbook: Workbook, activities: ActivityLog) -> None:
+        """Inicjalizuje arkusz Aktywności."""
+        super().__init__(workbook, "Aktywności")
+        self.activities = activities
+
+    @classmethod
+    def column(cls, header: str) -> int:
+        """Numer kolumny (1-based) dla nagłówka."""
+        return cls.HEADERS.index(header) + 1
+
+    def activity_rows(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Zakresy wierszy arkusza dla kolejnych dni.
+
+        Returns:
+            Numer dnia (``date.toordinal()``) -> (pierwszy, ostatni wiersz)
+        """
+        rows: Dict[int, Tuple[int, int]] = {}
+        for i, day in enumerate(self.activities.days):
+            first, _ = rows.get(int(day), (i + 2, i + 2))
+            rows[int(day)] = (first, i + 2)
+        return rows
+
+    def create(self) -> Worksheet:
+        """
+        Tworzy arkusz Aktywności.
+
+        Returns:
+            Utworzony arkusz
+        """
+        ws = self._create_worksheet()
+
+        for col, header in enumerate(self.HEADERS, 1):
+            self.styles.apply_header_style(ws.cell(row=1, column=col, value=header))
+        self._add_activity_rows(ws)
+        self._set_column_widths([12, 22, 10, 12, 16, 14, 10, 14, 12, 10, 10, 10, 10])
+
+        ws.freeze_panes = 'A2'
+
+        return ws
+
+    def _add_activity_rows(self, ws: Worksheet) -> None:
+        """Dodaje wiersze aktywności."""
+        styles = self.styles
+        border = styles.thin_border
+        minutes = get_column_letter(self.column("Czas (min)"))
+        avg_power = get_column_letter(self.column("Avg Power (W)"))
+        power = get_column_letter(self.column("NP (W)"))
+        ftp = "Ustawienia!$B$6"
+
+        for i, activity in enumerate(self.activities):
+            row = i + 2
+            values = []
+            for header, field in self.COLUMNS:
+                if header == "Data":
+                    value = activity.day
+                elif header == "Aktywność":
+                    value = activity.kind
+                elif header == "kJ":
+                    value = (f'=IF(AND(ISNUMBER({avg_power}{row}), ISNUMBER({minutes}{row})), '
+                             f'ROUND({avg_power}{row}*{minutes}{row}*60/1000, 0), "")')
+                else:
+                    value = getattr(activity, field)
+                    value = None if math.isnan(value) else value
+                    if field == "tss" and value is None:
+                        # TSS = (czas_sek * NP * IF) / (FTP * 3600) * 100
+                        value = (f'=IF(AND(ISNUMBER({minutes}{row}), ISNUMBER({power}{row}), {ftp}>0), '
+                                 f'ROUND(({minutes}{row}*60*{power}{row}*({power}{row}/{ftp}))'
+                                 f'/({ftp}*3600)*100, 1), "")')
+                values.append(value)
+
+            for col, value in enumerate(values, 1):
+                cell = ws.cell(row=row, column=col)
+                cell.value = value
+                styles.apply(cell, border=border)
+            ws.cell(row=row, column=1).number_format = 'yyyy-mm-dd'
@@ -4,19 +4,16 @@ Arkusz Źródła CHO.
 Baza produktów węglowodanowych dla kolarzy z rozszerzonymi danymi.
 """
 
-from typing import List, Tuple
+from typing import Iterator, List, Optional
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill
 from openpyxl.worksheet.worksheet import Worksheet
 
 from kombajn.config import (
     CHO_HEADERS,
     CHO_COLUMN_WIDTHS,
-    CHO_SAMPLE_DATA,
-    SHEET_CONFIG,
-    COLORS,
 )
+from kombajn.products import ProductStore, default_store
 from kombajn.sheets.base import BaseSheet
 
 
@@ -28,11 +25,28 @@ class CHOSourcesSheet(BaseSheet):
     - Szybkość wchłaniania
     - Produkty typowe dla kolarstwa (żele, napoje, mix MD:FR)
     - Planowanie CHO/h na trening
+    
+    Produkty pochodzą z bazy ``ProductStore`` (domyślnie ``CHO_SAMPLE_DATA``).
     """
     
-    def __init__(self, workbook: Workbook) -> None:
-        """Inicjalizuje arkusz Źródła CHO."""
+    INPUT_COLUMNS = [1, 2, 3, 4, 7, 8, 9]  # Nazwa, Porcja, CHO, kcal, Typ, Wchłanianie, Uwagi
+    FORMULA_COLUMNS = [5, 6]               # CHO w porcji, kcal w porcji
+    MIN_INPUT_ROWS = 100                   # Żółte wiersze do wpisywania własnych produktów
+    
+    def __init__(
+        self,
+        workbook: Workbook,
+        products: Optional[ProductStore] = None
+    ) -> None:
+        """
+        Inicjalizuje arkusz Źródła CHO.
+        
+        Args:
+            workbook: Skoroszyt Excel
+            products: Baza produktów (domyślnie przykładowe produkty)
+        """
         super().__init__(workbook, "Źródła CHO")
+        self.products = products if products is not None else default_store()
     
     def create(self) -> Worksheet:
         """
@@ -45,8 +59,8 @@ class CHOSourcesSheet(BaseSheet):
         
         self._add_title(ws)
         self._add_headers(ws)
+        self._add_product_rows(ws)
         self._format_input_columns(ws)
-        self._add_sample_data(ws)
         self._add_cho_calculator(ws)
         self._set_column_widths(CHO_COLUMN_WIDTHS)
         
@@ -57,9 +71,7 @@ class CHOSourcesSheet(BaseSheet):
     def _add_title(self, ws: Worksheet) -> None:
         """Dodaje tytuł arkusza."""
         ws['A1'] = "🍌 ŹRÓDŁA WĘGLOWODANÓW - BAZA DLA KOLARZA"
-        ws['A1'].font = Font(bold=True, size=14, color=COLORS.HEADER_TEXT)
-        ws['A1'].fill = PatternFill(start_color=COLORS.HEADER_BG, 
-                                     end_color=COLORS.HEADER_BG, fill_type="solid")
+        self.styles.apply_title_style(ws['A1'])
         ws.merge_cells('A1:I1')
         ws.row_dimensions[1].height = 28
     
@@ -70,68 +82,69 @@ class CHOSourcesSheet(BaseSheet):
             cell.value = header
             self.styles.apply_header_style(cell)
     
-    def _format_input_columns(self, ws: Worksheet) -> None:
-        """Formatuje kolumny do wpisywania (żółte tło)."""
-        input_cols = [1, 2, 3, 4, 7, 8, 9]  # Nazwa, Porcja, CHO, kcal, Typ, Wchłanianie, Uwagi
-        max_rows = 100
-        
-        for row in range(3, max_rows + 1):
-            for col in input_cols:
-                ws.cell(row=row, column=col).fill = self.styles.input_fill
-    
-    def _add_sample_data(self, ws: Worksheet) -> None:
-        """Dodaje przykładowe dane produktów."""
-        for row_idx, item in enumerate(CHO_SAMPLE_DATA, start=3):
+    def _product_rows(self) -> Iterator[list]:
+        """Generuje wiersze arkusza z bazy produktów (bez materializacji)."""
+        for row_idx, item in enumerate(self.products.rows(), start=3):
             name, portion, cho_100g, kcal_100g, product_type, absorption, notes = item
-            
-            ws.cell(row=row_idx, column=1).value = name
-            ws.cell(row=row_idx, column=2).value = portion
-            ws.cell(row=row_idx, column=3).value = cho_100g
-            ws.cell(row=row_idx, column=4).value = kcal_100g
-            ws.cell(row=row_idx, column=7).value = product_type
-            ws.cell(row=row_idx, column=8).value = absorption
-            ws.cell(row=row_idx, column=9).value = notes
-            
-            # Formuły dla obliczonych kolumn
-            self._add_portion_formulas(ws, row_idx)
+            yield [
+                name, portion, cho_100g, kcal_100g,
+                # Formuły dla obliczonych kolumn
+                f'=IF(OR(B{row_idx}="",C{row_idx}=""), "", ROUND(B{row_idx} * C{row_idx} / 100, 1))',
+                f'=IF(OR(B{row_idx}="",D{row_idx}=""), "", ROUND(B{row_idx} * D{row_idx} / 100, 0))',
+                product_type, absorption, notes,
+            ]
+    
+    def _add_product_rows(self, ws: Worksheet) -> None:
+        """
+        Dopisuje produkty strumieniowo (``ws.append``).
+        
+        Style nakładane są przez ``ExcelStyles.apply`` - od drugiego wiersza
+        to kopia zapamiętanej tablicy indeksów stylu, bez haszowania obiektów
+        Font/PatternFill dla każdej komórki.
+        """
+        input_columns = frozenset(self.INPUT_COLUMNS)
+        for row_idx, values in enumerate(self._product_rows(), start=3):
+            ws.append(values)
+            for col in range(1, len(values) + 1):
+                cell = ws.cell(row=row_idx, column=col)
+                if col in input_columns:
+                    self.styles.apply(cell, fill=self.styles.input_fill)
+                else:
+                    self.styles.apply_formula_style(cell)
     
-    def _add_portion_formulas(self, ws: Worksheet, row: int) -> None:
-        """Dodaje formuły obliczające wartości dla porcji."""
-        # CHO w porcji
-        cho_formula = f'=IF(OR(B{row}="",C{row}=""), "", ROUND(B{row} * C{row} / 100, 1))'
-        ws.cell(row=row, column=5).value = cho_formula
-        self.styles.apply_formula_style(ws.cell(row=row, column=5))
+    def _format_input_columns(self, ws: Worksheet) -> None:
+        """Formatuje puste wiersze do wpisywania (żółte tło)."""
+        first_empty = len(self.products) + 3
         
-        # kcal w porcji
-        kcal_formula = f'=IF(OR(B{row}="",D{row}=""), "", ROUND(B{row} * D{row} / 100, 0))'
-        ws.cell(row=row, column=6).value = kcal_formula
-        self.styles.apply_formula_style(ws.cell(row=row, column=6))
+        for row in range(first_empty, self.MIN_INPUT_ROWS + 1):
+            for col in self.INPUT_COLUMNS:
+                self.styles.apply(ws.cell(row=row, column=col), fill=self.styles.input_fill)
     
     def _add_cho_calculator(self, ws: Worksheet) -> None:
         """Dodaje kalkulator CHO na godzinę."""
-        start_row = len(CHO_SAMPLE_DATA) + 5
+        start_row = len(self.products) + 5
         
         ws.cell(row=start_row, column=1).value = "🧮 KALKULATOR CHO NA TRENING"
-        ws.cell(row=start_row, column=1).font = Font(bold=True, size=12)
+        ws.cell(row=start_row, column=1).font = self.styles.font(bold=True, size=12)
         ws.merge_cells(f'A{start_row}:E{start_row}')
         
         row = start_row + 2
         
         # Cel CHO/h
         ws.cell(row=row, column=1).value = "Cel CHO/h (g):"
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         ws.cell(row=row, column=2).value = 60
         ws.cell(row=row, column=2).fill = self.styles.input_fill
         
         row += 1
         ws.cell(row=row, column=1).value = "Czas treningu (h):"
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         ws.cell(row=row, column=2).value = 3
         ws.cell(row=row, column=2).fill = self.styles.input_fill
         
         row += 1
         ws.cell(row=row, column=1).value = "Całkowite CHO potrzebne:"
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         ws.cell(row=row, column=2).value = f"=B{start_row+2}*B{start_row+3}"
         self.styles.apply_formula_style(ws.cell(row=row, column=2))
         ws.cell(row=row, column=3).value = "g"
@@ -146,13 +159,14 @@ class CHOSourcesSheet(BaseSheet):
             "• Wyścig/intensywny: 80-90g/h (mix glukoza:fruktoza 1:0.8)",
             "• Ultra >5h: do 120g/h (wymaga treningu jelit!)",
             "• Zacznij od 30g/h i zwiększaj o 10g/h co tydzień",
+            "• Oś czasu żywienia co 15 min: opcja --fuel-plan (arkusz [Plan żywienia])",
         ]
         
         for tip in tips:
             ws.cell(row=row, column=1).value = tip
             ws.merge_cells(f'A{row}:E{row}')
             if tip.startswith("💡"):
-                ws.cell(row=row, column=1).font = Font(bold=True)
+                ws.cell(row=row, column=1).font = self.styles.font(bold=True)
             else:
                 self.styles.apply_info_style(ws.cell(row=row, column=1))
             row += 1
@@ -0,0 +1,166 @@
+"""
+Arkusz Realizacja planu.
+
+Plan treningowy dzień po dniu zestawiony z wykonaniem z tabeli Dziennik
+oraz podsumowanie tygodni planu.
+"""
+
+import datetime
+from typing import Dict, List
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.config import COLORS, COMPLIANCE_BANDS, COMPLIANCE_STATUSES, log_ref
+from kombajn.engine.compliance import TrainingDays, week_start
+from kombajn.sheets.base import BaseSheet
+
+
+class ComplianceSheet(BaseSheet):
+    """
+    Arkusz realizacji planu.
+
+    Zawiera:
+    - Jeden wiersz na dzień planu (od wiersza 2): plan (typ, TSS, czas)
+      i wykonanie z Dziennika (INDEX/MATCH po dacie)
+    - Realizację (wykonany / planowany TSS, czas gdy plan nie ma TSS),
+      wynik 0-100 i status wg ``COMPLIANCE_BANDS``
+    - Tabelę tygodni (kolumny M-S): planowany TSS, TSS z Dziennika, sesje
+
+    Formuły odwołują się do kolumn tabeli Dziennik i ograniczonych
+    zakresów tego arkusza (bez odwołań do całych kolumn).
+    """
+
+    HEADERS = [
+        "Data", "Tydzień od", "Plan: typ", "Plan: TSS", "Plan: czas (min)",
+        "Typ treningu", "TSS", "Czas (min)", "Realizacja", "Wynik", "Status",
+    ]
+
+    WEEK_HEADERS = [
+        "Tydzień od", "Plan TSS", "TSS", "Realizacja", "Wynik", "Sesje", "Wykonane",
+    ]
+
+    # Pierwsza kolumna tabeli tygodni (M)
+    WEEK_COLUMN = 13
+
+    STATUS_COLORS: Dict[str, str] = dict(zip(
+        COMPLIANCE_STATUSES[:4], (COLORS.ZONE_2, COLORS.ZONE_3, COLORS.ZONE_4, COLORS.ZONE_6)
+    ))
+
+    def __init__(self, workbook: Workbook, plan: TrainingDays) -> None:
+        """
+        Inicjalizuje arkusz Realizacja planu.
+
+        Raises:
+            ValueError: Gdy plan obejmuje kilku zawodników
+        """
+        super().__init__(workbook, "Realizacja planu")
+        if np.unique(plan.athletes).size > 1:
+            raise ValueError("Arkusz Realizacja planu obsługuje plan jednego zawodnika")
+        self.plan = plan
+
+    def create(self) -> Worksheet:
+        """
+        Tworzy arkusz Realizacja planu.
+
+        Returns:
+            Utworzony arkusz
+        """
+        ws = self._create_worksheet()
+
+        for col, header in enumerate(self.HEADERS, 1):
+            self.styles.apply_header_style(ws.cell(row=1, column=col, value=header))
+        for col, header in enumerate(self.WEEK_HEADERS, self.WEEK_COLUMN):
+            self.styles.apply_header_style(ws.cell(row=1, column=col, value=header))
+        self._add_plan_rows(ws)
+        self._add_week_rows(ws)
+        self._add_status_colors(ws)
+        self._set_column_widths([12, 12, 22, 10, 14, 22, 10, 12, 12, 8, 12, 3,
+                                 12, 10, 10, 12, 8, 8, 10])
+
+        ws.freeze_panes = 'B2'
+
+        return ws
+
+    @property
+    def last_row(self) -> int:
+        """Ostatni wiersz dni planu (co najmniej 2)."""
+        return max(len(self.plan) + 1, 2)
+
+    def _add_plan_rows(self, ws: Worksheet) -> None:
+        """Dodaje wiersze dni planu."""
+        styles = self.styles
+        bands = COMPLIANCE_BANDS
+        full, partial, missed, skipped, rest = COMPLIANCE_STATUSES
+        dates = log_ref("Data")
+
+        def actual(header: str, r: int) -> str:
+            return f"INDEX({log_ref(header)}, MATCH(A{r}, {dates}, 0))"
+
+        for i, day in enumerate(self.plan.dates):
+            r = i + 2
+            values = [
+                (day, "yyyy-mm-dd", False),
+                (f"=A{r}-WEEKDAY(A{r}, 2)+1", "yyyy-mm-dd", True),
+                (self.plan.kinds[i], None, False),
+                (float(self.plan.tss[i]), "0", False),
+                (float(self.plan.minutes[i]), "0", False),
+                (f'=IFERROR({actual("Typ treningu", r)}&"", "")', None, True),
+                (f"=IFERROR(N({actual('TSS', r)}), 0)", "0", True),
+                (f"=IFERROR(N({actual('Czas jazdy (min)', r)}), 0)", "0", True),
+                (f'=IF(D{r}>0, G{r}/D{r}, IF(E{r}>0, H{r}/E{r}, ""))', "0%", True),
+                (f'=IF(ISNUMBER(I{r}), 100*MAX(0, 1-ABS(I{r}-1)), "")', "0", True),
+                (f'=IF(I{r}="", "{rest}", IF(I{r}=0, "{skipped}", '
+                 f'IF(AND(I{r}>={bands.FULL_MIN}, I{r}<={bands.FULL_MAX}), "{full}", '
+                 f'IF(AND(I{r}>={bands.PARTIAL_MIN}, I{r}<={bands.PARTIAL_MAX}), '
+                 f'"{partial}", "{missed}"))))', None, True),
+            ]
+            for col, (value, number_format, formula) in enumerate(values, 1):
+                cell = ws.cell(row=r, column=col, value=value)
+                if formula:
+                    styles.apply_formula_style(cell)
+                else:
+                    styles.apply(cell, border=styles.thin_border)
+                if number_format:
+                    cell.number_format = number_format
+
+    def weeks(self) -> List[int]:
+        """Poniedziałki tygodni planu (``date.toordinal()``), rosnąco."""
+        return np.unique(week_start(self.plan.days)).tolist()
+
+    def _add_week_rows(self, ws: Worksheet) -> None:
+        """Dodaje tabelę tygodni planu."""
+        styles = self.styles
+        last = self.last_row
+        dates, tss = log_ref("Data"), log_ref("TSS")
+        in_plan = f"$B$2:$B${last}"
+
+        for i, week in enumerate(self.weeks()):
+            r = i + 2
+            values = [
+                (datetime.date.fromordinal(week), "yyyy-mm-dd"),
+                (f"=SUMIFS($D$2:$D${last}, {in_plan}, M{r})", "0"),
+                (f'=SUMIFS({tss}, {dates}, ">="&M{r}, {dates}, "<"&(M{r}+7))', "0"),
+                (f'=IF(N{r}>0, O{r}/N{r}, "")', "0%"),
+                (f'=IF(ISNUMBER(P{r}), 100*MAX(0, 1-ABS(P{r}-1)), "")', "0"),
+                (f"=COUNTIFS({in_plan}, M{r})", "0"),
+                (f'=COUNTIFS({in_plan}, M{r}, $G$2:$G${last}, ">0")', "0"),
+            ]
+            for col, (value, number_format) in enumerate(values, self.WEEK_COLUMN):
+                cell = ws.cell(row=r, column=col, value=value)
+                if col == self.WEEK_COLUMN:
+                    styles.apply(cell, border=styles.thin_border)
+                else:
+                    styles.apply_formula_style(cell)
+                cell.number_format = number_format
+
+    def _add_status_colors(self, ws: Worksheet) -> None:
+        """Koloruje statusy dni planu."""
+        target = f"K2:K{self.last_row}"
+        for status, color in self.STATUS_COLORS.items():
+            ws.conditional_formatting.add(
+                target,
+                CellIsRule(operator="equal", formula=[f'"{status}"'], fill=self.styles.fill(color))
+            )
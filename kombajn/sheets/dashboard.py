@@ -4,14 +4,14 @@ Arkusz Dashboard.
 Rozszerzony dashboard z PMC (Performance Management Chart) i podsumowaniami kolarskimi.
 """
 
-import datetime
 from typing import Dict
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from openpyxl.chart import BarChart, LineChart, Series
+from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
-from kombajn.config import COLORS
+from kombajn.config import COLORS, LOAD_ALERTS, SHEET_CONFIG, log_column, log_ref
 from kombajn.sheets.base import BaseSheet
 
 
@@ -23,12 +23,22 @@ class DashboardSheet(BaseSheet):
     - PMC (Performance Management Chart) - CTL, ATL, TSB
     - Podsumowanie tygodniowe (TSS, dystans, czas)
     - Wskaźniki trendu
+    - Obciążenie tygodniowe i wykresy (PMC, tygodniowy TSS)
+    - Alerty obciążenia (ACWR, rampa CTL)
     - Instrukcje
     """
     
-    def __init__(self, workbook: Workbook) -> None:
-        """Inicjalizuje arkusz Dashboard."""
+    def __init__(self, workbook: Workbook,
+                 log_rows: int = SHEET_CONFIG.INITIAL_DAYS_COUNT) -> None:
+        """
+        Inicjalizuje arkusz Dashboard.
+        
+        Args:
+            workbook: Skoroszyt
+            log_rows: Liczba wierszy danych tabeli Dziennik (zakres wykresu PMC)
+        """
         super().__init__(workbook, "Dashboard")
+        self.log_rows = log_rows
     
     def create(self) -> Worksheet:
         """
@@ -43,6 +53,8 @@ class DashboardSheet(BaseSheet):
         current_row = self._add_pmc_section(ws, current_row)
         current_row = self._add_weekly_summary(ws, current_row + 2)
         current_row = self._add_monthly_summary(ws, current_row + 2)
+        current_row = self._add_charts(ws, current_row + 2)
+        current_row = self._add_load_alerts(ws, current_row + 2)
         self._add_instructions(ws, current_row + 2)
         
         self._set_column_widths([25, 15, 15, 15, 40])
@@ -54,9 +66,7 @@ class DashboardSheet(BaseSheet):
         """Dodaje nagłówek sekcji."""
         cell = ws.cell(row=row, column=1)
         cell.value = title
-        cell.font = Font(bold=True, size=14, color=COLORS.HEADER_TEXT)
-        cell.fill = PatternFill(start_color=COLORS.HEADER_BG, 
-                                 end_color=COLORS.HEADER_BG, fill_type="solid")
+        self.styles.apply_title_style(cell)
         ws.merge_cells(f'A{row}:{chr(64+cols)}{row}')
         ws.row_dimensions[row].height = 28
     
@@ -75,72 +85,53 @@ class DashboardSheet(BaseSheet):
         
         row += 1
         
-        # CTL (Fitness)
-        ws.cell(row=row, column=1).value = "CTL (Fitness)"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = (
-            "=IFERROR(INDEX('Dziennik'!X:X, MATCH(9.99E+307, 'Dziennik'!X:X)), \"--\")"
-        )
-        ws.cell(row=row, column=2).fill = PatternFill(
-            start_color=COLORS.CTL_COLOR, end_color=COLORS.CTL_COLOR, fill_type="solid"
-        )
-        ws.cell(row=row, column=2).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=row, column=2).number_format = '0'
-        ws.cell(row=row, column=5).value = "Średni TSS z 42 dni - wskaźnik kondycji"
-        self.styles.apply_info_style(ws.cell(row=row, column=5))
-        
-        row += 1
+        # CTL (Fitness), ATL (Fatigue), TSB (Form) - dzień ostatniego treningu
+        # (kolumny PMC są liczone w każdym wierszu tabeli, także na zapas)
+        pmc_metrics = [
+            ("CTL (Fitness)", "CTL", COLORS.CTL_COLOR, '0',
+             f"Wykładnicza średnia TSS ({SHEET_CONFIG.CTL_DAYS} dni) - kondycja"),
+            ("ATL (Fatigue)", "ATL", COLORS.ATL_COLOR, '0',
+             f"Wykładnicza średnia TSS ({SHEET_CONFIG.ATL_DAYS} dni) - zmęczenie"),
+            ("TSB (Form)", "TSB", COLORS.TSB_COLOR, '+0;-0;0',
+             "CTL - ATL: + = świeży, - = zmęczony"),
+        ]
+        last_training = f"MATCH(9.99E+307, {log_ref('TSS')})"
+        bold = self.styles.font(bold=True)
+        value_font = self.styles.font(bold=True, color="FFFFFF")
+        for label, header, color, number_format, description in pmc_metrics:
+            ws.cell(row=row, column=1).value = label
+            ws.cell(row=row, column=1).font = bold
+            cell = ws.cell(row=row, column=2)
+            cell.value = f"=IFERROR(INDEX({log_ref(header)}, {last_training}), \"--\")"
+            self.styles.apply(cell, font=value_font, fill=self.styles.fill(color),
+                              number_format=number_format)
+            ws.cell(row=row, column=5).value = description
+            self.styles.apply_info_style(ws.cell(row=row, column=5))
+            row += 1
         
-        # ATL (Fatigue)
-        ws.cell(row=row, column=1).value = "ATL (Fatigue)"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = (
-            "=IFERROR(INDEX('Dziennik'!Y:Y, MATCH(9.99E+307, 'Dziennik'!Y:Y)), \"--\")"
-        )
-        ws.cell(row=row, column=2).fill = PatternFill(
-            start_color=COLORS.ATL_COLOR, end_color=COLORS.ATL_COLOR, fill_type="solid"
+        # Status formy (wiersz TSB)
+        tsb = f"B{row - 1}"
+        ws.cell(row=row - 1, column=4).value = (
+            f'=IF({tsb}="--", "", '
+            f'IF({tsb}>{SHEET_CONFIG.TSB_RACE_MAX}, "⚠️ Przetrenowanie?", '
+            f'IF({tsb}>{SHEET_CONFIG.TSB_RACE_MIN}, "🟢 Świeży", '
+            f'IF({tsb}>-10, "🟡 Neutralny", '
+            f'IF({tsb}>-25, "🟠 Zmęczony", "🔴 Bardzo zmęczony")))))'
         )
-        ws.cell(row=row, column=2).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=row, column=2).number_format = '0'
-        ws.cell(row=row, column=5).value = "Średni TSS z 7 dni - wskaźnik zmęczenia"
-        self.styles.apply_info_style(ws.cell(row=row, column=5))
         
         row += 1
         
-        # TSB (Form)
-        ws.cell(row=row, column=1).value = "TSB (Form)"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = (
-            "=IFERROR(INDEX('Dziennik'!Z:Z, MATCH(9.99E+307, 'Dziennik'!Z:Z)), \"--\")"
-        )
-        ws.cell(row=row, column=2).fill = PatternFill(
-            start_color=COLORS.TSB_COLOR, end_color=COLORS.TSB_COLOR, fill_type="solid"
-        )
-        ws.cell(row=row, column=2).font = Font(bold=True, color="FFFFFF")
-        ws.cell(row=row, column=2).number_format = '+0;-0;0'
-        # Status formy
-        ws.cell(row=row, column=4).value = (
-            '=IF(B' + str(row) + '="--", "", '
-            'IF(B' + str(row) + '>25, "⚠️ Przetrenowanie?", '
-            'IF(B' + str(row) + '>10, "🟢 Świeży", '
-            'IF(B' + str(row) + '>-10, "🟡 Neutralny", '
-            'IF(B' + str(row) + '>-25, "🟠 Zmęczony", "🔴 Bardzo zmęczony")))))'
-        )
-        ws.cell(row=row, column=5).value = "CTL - ATL: + = świeży, - = zmęczony"
-        self.styles.apply_info_style(ws.cell(row=row, column=5))
-        
-        row += 2
-        
         # Legenda TSB
         ws.cell(row=row, column=1).value = "📊 Interpretacja TSB:"
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         ws.merge_cells(f'A{row}:E{row}')
         row += 1
         
         tsb_legend = [
-            ("> +25", "Zbyt wypoczęty - tracisz formę", "⚠️"),
-            ("+10 do +25", "Optymalny na wyścig/test", "🟢"),
-            ("-10 do +10", "Produktywny trening", "🟡"),
+            (f"> +{SHEET_CONFIG.TSB_RACE_MAX}", "Zbyt wypoczęty - tracisz formę", "⚠️"),
+            (f"+{SHEET_CONFIG.TSB_RACE_MIN} do +{SHEET_CONFIG.TSB_RACE_MAX}",
+             "Optymalny na wyścig/test", "🟢"),
+            (f"-10 do +{SHEET_CONFIG.TSB_RACE_MIN}", "Produktywny trening", "🟡"),
             ("-25 do -10", "Ciężki blok treningowy", "🟠"),
             ("< -25", "Ryzyko przetrenowania!", "🔴"),
         ]
@@ -160,12 +151,19 @@ class DashboardSheet(BaseSheet):
         
         row = start_row + 2
         
-        # Wybór tygodnia
+        # Wybór tygodnia: B - pole do wpisania (puste = bieżący tydzień),
+        # C - tydzień podsumowania liczony formułą (numeracja jak kolumna
+        # "Tydzień"), więc zbudowany plik nie zależy od dnia budowania
+        choice = f"B{row}"
         ws.cell(row=row, column=1).value = "Wybierz tydzień:"
-        ws.cell(row=row, column=1).font = Font(bold=True)
-        ws.cell(row=row, column=2).value = datetime.date.today().isocalendar()[1]
-        ws.cell(row=row, column=2).fill = self.styles.input_fill
-        ws.cell(row=row, column=2).font = Font(bold=True, size=12)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
+        self.styles.apply(ws.cell(row=row, column=2), font=self.styles.font(bold=True, size=12),
+                          fill=self.styles.input_fill)
+        week_cell = ws.cell(row=row, column=3)
+        week_cell.value = f"=IF(ISNUMBER({choice}), {choice}, WEEKNUM(TODAY(), 2))"
+        self.styles.apply_formula_style(week_cell)
+        ws.cell(row=row, column=4).value = "← tydzień podsumowania (puste pole = bieżący)"
+        self.styles.apply_info_style(ws.cell(row=row, column=4))
         
         row += 2
         
@@ -179,28 +177,25 @@ class DashboardSheet(BaseSheet):
         row += 1
         
         # Dane tygodniowe
+        week = f"$C${start_row + 2}"
+        weeks = log_ref("Tydzień")
         weekly_metrics = [
-            ("Suma TSS", "=IFERROR(SUMIFS('Dziennik'!U:U, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", "TSS"),
-            ("Suma czasu jazdy", "=IFERROR(SUMIFS('Dziennik'!K:K, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + ")/60, \"--\")", "h"),
-            ("Suma dystansu", "=IFERROR(SUMIFS('Dziennik'!L:L, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", "km"),
-            ("Suma przewyższeń", "=IFERROR(SUMIFS('Dziennik'!M:M, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", "m"),
-            ("Średni IF", "=IFERROR(AVERAGEIFS('Dziennik'!T:T, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", ""),
-            ("Średnia NP", "=IFERROR(AVERAGEIFS('Dziennik'!O:O, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", "W"),
-            ("Średnia waga", "=IFERROR(AVERAGEIFS('Dziennik'!D:D, 'Dziennik'!B:B, $B$" + 
-             str(start_row + 2) + "), \"--\")", "kg"),
-            ("Liczba treningów", "=COUNTIFS('Dziennik'!B:B, $B$" + str(start_row + 2) + 
-             ", 'Dziennik'!K:K, \">0\")", ""),
+            ("Suma TSS", f"=IFERROR(SUMIFS({log_ref('TSS')}, {weeks}, {week}), \"--\")", "TSS"),
+            ("Suma czasu jazdy",
+             f"=IFERROR(SUMIFS({log_ref('Czas jazdy (min)')}, {weeks}, {week})/60, \"--\")", "h"),
+            ("Suma dystansu", f"=IFERROR(SUMIFS({log_ref('Dystans (km)')}, {weeks}, {week}), \"--\")", "km"),
+            ("Suma przewyższeń",
+             f"=IFERROR(SUMIFS({log_ref('Przewyższenia (m)')}, {weeks}, {week}), \"--\")", "m"),
+            ("Średni IF", f"=IFERROR(AVERAGEIFS({log_ref('IF')}, {weeks}, {week}), \"--\")", ""),
+            ("Średnia NP", f"=IFERROR(AVERAGEIFS({log_ref('NP (W)')}, {weeks}, {week}), \"--\")", "W"),
+            ("Średnia waga",
+             f"=IFERROR(AVERAGEIFS({log_ref('Waga (kg)')}, {weeks}, {week}), \"--\")", "kg"),
+            ("Liczba treningów", f"=COUNTIFS({weeks}, {week}, {log_ref('Czas jazdy (min)')}, \">0\")", ""),
         ]
         
         for label, formula, unit in weekly_metrics:
             ws.cell(row=row, column=1).value = label
-            ws.cell(row=row, column=1).font = Font(bold=True)
+            ws.cell(row=row, column=1).font = self.styles.font(bold=True)
             ws.cell(row=row, column=2).value = formula
             self.styles.apply_formula_style(ws.cell(row=row, column=2))
             if "IF" in label or "waga" in label.lower():
@@ -219,16 +214,16 @@ class DashboardSheet(BaseSheet):
         row = start_row + 2
         
         stats = [
-            ("Suma TSS (wszystkie)", "=IFERROR(SUM('Dziennik'!U:U), 0)", "TSS"),
-            ("Suma dystansu (wszystkie)", "=IFERROR(SUM('Dziennik'!L:L), 0)", "km"),
-            ("Suma przewyższeń (wszystkie)", "=IFERROR(SUM('Dziennik'!M:M), 0)", "m"),
-            ("Suma czasu (wszystkie)", "=IFERROR(SUM('Dziennik'!K:K)/60, 0)", "h"),
-            ("Liczba dni treningowych", "=COUNTIF('Dziennik'!K:K, \">0\")", "dni"),
+            ("Suma TSS (wszystkie)", "=IFERROR(SUM(" + log_ref("TSS") + "), 0)", "TSS"),
+            ("Suma dystansu (wszystkie)", "=IFERROR(SUM(" + log_ref("Dystans (km)") + "), 0)", "km"),
+            ("Suma przewyższeń (wszystkie)", "=IFERROR(SUM(" + log_ref("Przewyższenia (m)") + "), 0)", "m"),
+            ("Suma czasu (wszystkie)", "=IFERROR(SUM(" + log_ref("Czas jazdy (min)") + ")/60, 0)", "h"),
+            ("Liczba dni treningowych", "=COUNTIF(" + log_ref("Czas jazdy (min)") + ", \">0\")", "dni"),
         ]
         
         for label, formula, unit in stats:
             ws.cell(row=row, column=1).value = label
-            ws.cell(row=row, column=1).font = Font(bold=True)
+            ws.cell(row=row, column=1).font = self.styles.font(bold=True)
             ws.cell(row=row, column=2).value = formula
             self.styles.apply_formula_style(ws.cell(row=row, column=2))
             ws.cell(row=row, column=2).number_format = '#,##0'
@@ -237,6 +232,140 @@ class DashboardSheet(BaseSheet):
         
         return row
     
+    def _add_charts(self, ws: Worksheet, start_row: int) -> int:
+        """
+        Dodaje tabelę obciążenia tygodniowego oraz wykresy PMC i TSS.
+        
+        Wykresy odwołują się do ograniczonych zakresów: PMC do wierszy
+        tabeli Dziennik, TSS tygodniowy do tabeli ``CHART_WEEKS`` tygodni
+        zakończonych tygodniem ostatniego treningu.
+        """
+        self._add_section_header(ws, start_row, "📊 OBCIĄŻENIE TYGODNIOWE", cols=3)
+        
+        row = start_row + 2
+        for col, header in enumerate(["Tydzień od", "TSS", "Czas (h)"], 1):
+            self.styles.apply_header_style(ws.cell(row=row, column=col, value=header))
+        
+        first = row + 1
+        last = row + SHEET_CONFIG.CHART_WEEKS
+        dates, tss = log_ref("Data"), log_ref("TSS")
+        last_day = f"INDEX({dates}, MATCH(9.99E+307, {tss}))"
+        for row in range(first, last + 1):
+            if row == last:
+                # Poniedziałek tygodnia ostatniego treningu
+                week = f'=IFERROR({last_day} - WEEKDAY({last_day}, 2) + 1, "")'
+            else:
+                week = f'=IF(ISNUMBER(A{row + 1}), A{row + 1} - 7, "")'
+            in_week = f'{dates}, ">="&A{row}, {dates}, "<"&(A{row}+7)'
+            values = [
+                (week, "yyyy-mm-dd"),
+                (f'=IF(ISNUMBER(A{row}), SUMIFS({tss}, {in_week}), "")', "0"),
+                (f'=IF(ISNUMBER(A{row}), SUMIFS({log_ref("Czas jazdy (min)")}, {in_week})/60, "")',
+                 "0.0"),
+            ]
+            for col, (formula, number_format) in enumerate(values, 1):
+                cell = ws.cell(row=row, column=col, value=formula)
+                self.styles.apply_formula_style(cell)
+                cell.number_format = number_format
+        
+        ws.add_chart(self._pmc_chart(), "G1")
+        ws.add_chart(self._weekly_chart(first, last), "G20")
+        return last
+    
+    def _add_load_alerts(self, ws: Worksheet, start_row: int) -> int:
+        """
+        Dodaje panel alertów obciążenia z dnia ostatniego treningu.
+        
+        ACWR i rampa CTL liczone są jak kolumna "Alert obciążenia"
+        Dziennika; licznik dni z alertem obejmuje ``WINDOW_DAYS`` dni
+        zakończonych ostatnim treningiem.
+        """
+        self._add_section_header(ws, start_row, "🚨 ALERTY OBCIĄŻENIA (ACWR, RAMPA CTL)")
+        
+        row = start_row + 2
+        for col, header in enumerate(["Metryka", "Wartość", "Pasmo", "Status", "Opis"], 1):
+            self.styles.apply_header_style(ws.cell(row=row, column=col, value=header))
+        
+        bands = LOAD_ALERTS
+        dates, ctl, atl = log_ref("Data"), log_ref("CTL"), log_ref("ATL")
+        last = f"MATCH(9.99E+307, {log_ref('TSS')})"
+        day = f"INDEX({dates}, {last})"
+        ctl_now = f"INDEX({ctl}, {last})"
+        ctl_week_ago = (
+            f"IF({last}>{bands.RAMP_DAYS}, N(INDEX({ctl}, {last}-{bands.RAMP_DAYS})), "
+            f"Ustawienia!$B$38)"
+        )
+        first = row + 1
+        acwr, ramp = f"B{first + 1}", f"B{first + 2}"
+        panel = [
+            ("Ostatni trening", f'=IFERROR({day}, "--")', "yyyy-mm-dd", "", None,
+             "Dzień oceny alertów"),
+            ("ACWR (ATL / CTL)",
+             f'=IFERROR(IF({ctl_now}>={bands.MIN_CTL:g}, INDEX({atl}, {last})/{ctl_now}, "--"), "--")',
+             "0.00", f"{bands.ACWR_LOW:g}-{bands.ACWR_HIGH:g}",
+             f'=IF({acwr}="--", "", IF({acwr}>{bands.ACWR_DANGER:g}, "🔴 Krytyczny", '
+             f'IF({acwr}>{bands.ACWR_HIGH:g}, "🟠 Wysoki", '
+             f'IF({acwr}<{bands.ACWR_LOW:g}, "🔵 Niski", "🟢 Bezpieczny"))))',
+             f"Obciążenie ostre do przewlekłego (oceniane od CTL {bands.MIN_CTL:g})"),
+            (f"Rampa CTL ({bands.RAMP_DAYS} dni)", f'=IFERROR({ctl_now}-{ctl_week_ago}, "--")',
+             "+0.0;-0.0;0.0", f"≤ +{bands.RAMP_MAX:g}",
+             f'=IF({ramp}="--", "", IF({ramp}>{bands.RAMP_MAX:g}, "🔴 Za szybko", "🟢 W normie"))',
+             "Przyrost CTL w ostatnim tygodniu"),
+            ("Alert (ostatni trening)",
+             f'=IFERROR(INDEX({log_ref("Alert obciążenia")}, {last})&"", "")', None, "", None,
+             "Kolumna Alert obciążenia w Dzienniku"),
+            (f"Dni z alertem ({bands.WINDOW_DAYS} dni)",
+             f'=IFERROR(COUNTIFS({dates}, ">"&({day}-{bands.WINDOW_DAYS}), {dates}, "<="&{day}, '
+             f'{log_ref("Alert obciążenia")}, "?*"), 0)',
+             "0", "", None, f"Dni z alertem w {bands.WINDOW_DAYS} dniach do ostatniego treningu"),
+        ]
+        bold = self.styles.font(bold=True)
+        for row, (label, formula, number_format, band, status, description) in enumerate(panel, first):
+            ws.cell(row=row, column=1, value=label).font = bold
+            cell = ws.cell(row=row, column=2, value=formula)
+            self.styles.apply_formula_style(cell)
+            if number_format:
+                cell.number_format = number_format
+            ws.cell(row=row, column=3, value=band or None)
+            ws.cell(row=row, column=4, value=status)
+            ws.cell(row=row, column=5, value=description)
+            self.styles.apply_info_style(ws.cell(row=row, column=5))
+        return row
+    
+    def _pmc_chart(self) -> LineChart:
+        """Wykres liniowy CTL/ATL/TSB z kolumn tabeli Dziennik."""
+        def log_range(header: str) -> str:
+            column = get_column_letter(log_column(header))
+            return f"'Dziennik'!${column}$2:${column}${self.log_rows + 1}"
+        
+        chart = LineChart()
+        chart.title = "PMC - CTL / ATL / TSB"
+        chart.height, chart.width = 9, 18
+        chart.y_axis.title = "TSS/dzień"
+        chart.x_axis.number_format = "dd.mm"
+        for header, color in (("CTL", COLORS.CTL_COLOR), ("ATL", COLORS.ATL_COLOR),
+                              ("TSB", COLORS.TSB_COLOR)):
+            series = Series(log_range(header), title=header)
+            series.graphicalProperties.line.solidFill = color
+            series.graphicalProperties.line.width = 22000
+            series.smooth = False
+            chart.series.append(series)
+        chart.set_categories(log_range("Data"))
+        return chart
+    
+    def _weekly_chart(self, first: int, last: int) -> BarChart:
+        """Wykres słupkowy tygodniowego TSS z tabeli obciążenia."""
+        chart = BarChart()
+        chart.title = "Tygodniowy TSS"
+        chart.height, chart.width = 7.5, 18
+        chart.legend = None
+        chart.x_axis.number_format = "dd.mm"
+        series = Series(f"'Dashboard'!$B${first}:$B${last}", title="TSS")
+        series.graphicalProperties.solidFill = COLORS.CTL_COLOR
+        chart.series.append(series)
+        chart.set_categories(f"'Dashboard'!$A${first}:$A${last}")
+        return chart
+    
     def _add_instructions(self, ws: Worksheet, start_row: int) -> None:
         """Dodaje instrukcje."""
         self._add_section_header(ws, start_row, "📖 INSTRUKCJA", cols=5)
@@ -247,8 +376,10 @@ class DashboardSheet(BaseSheet):
             "1. Wypełniaj dziennik codziennie - dane z Garmina/Zwifta",
             "2. Śledź TSB: -10 do +10 = produktywny trening, >+15 = gotowy na wyścig",
             "3. Tygodniowy TSS: amator 300-500, zaawansowany 500-800, pro 800-1200+",
-            "4. Dla wykresów: zaznacz kolumny i wybierz Wstawianie → Wykres",
+            "4. Wykresy PMC i tygodniowego TSS odświeżają się same po wpisaniu treningu",
             "5. FTP aktualizuj co 4-6 tyg lub po teście",
+            f"6. Alert obciążenia: ACWR > {LOAD_ALERTS.ACWR_HIGH:g} lub rampa CTL > "
+            f"+{LOAD_ALERTS.RAMP_MAX:g}/tydz. - odpuść; ACWR < {LOAD_ALERTS.ACWR_LOW:g} - spadek formy",
         ]
         
         for instruction in instructions:
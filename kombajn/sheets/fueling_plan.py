@@ -0,0 +1,114 @@
+"""
+Arkusz Plan żywienia.
+
+Oś czasu żywienia na trening/wyścig wygenerowana przez planer CHO.
+"""
+
+from openpyxl import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.engine.fueling import FuelingPlan
+from kombajn.sheets.base import BaseSheet
+
+
+class FuelingPlanSheet(BaseSheet):
+    """
+    Arkusz z osią czasu żywienia.
+
+    Zawiera:
+    - Parametry planu (CHO/h, czas, stosunek glukoza:fruktoza)
+    - Oś czasu: produkty na każdy slot z CHO narastająco
+    - Listę zakupów (liczba porcji produktów)
+    """
+
+    TIMELINE_HEADERS = [
+        "Minuta", "Produkty", "CHO (g)", "Fruktoza (g)",
+        "CHO narastająco (g)", "Cel narastająco (g)"
+    ]
+
+    def __init__(self, workbook: Workbook, plan: FuelingPlan) -> None:
+        """Inicjalizuje arkusz Plan żywienia."""
+        super().__init__(workbook, "Plan żywienia")
+        self.plan = plan
+
+    def create(self) -> Worksheet:
+        """
+        Tworzy arkusz Plan żywienia.
+
+        Returns:
+            Utworzony arkusz
+        """
+        ws = self._create_worksheet()
+
+        self._add_title(ws)
+        row = self._add_parameters(ws, 3)
+        row = self._add_timeline(ws, row + 1)
+        self._add_shopping_list(ws, row + 1)
+        self._set_column_widths([10, 45, 10, 12, 18, 18])
+
+        ws.freeze_panes = 'A2'
+
+        return ws
+
+    def _add_title(self, ws: Worksheet) -> None:
+        """Dodaje tytuł arkusza."""
+        ws['A1'] = "🍯 PLAN ŻYWIENIA - OŚ CZASU"
+        self.styles.apply_title_style(ws['A1'])
+        ws.merge_cells('A1:F1')
+        ws.row_dimensions[1].height = 28
+
+    def _add_parameters(self, ws: Worksheet, start_row: int) -> int:
+        """Dodaje parametry planu."""
+        plan = self.plan
+        parameters = [
+            ("Cel CHO/h (g):", plan.cho_per_hour),
+            ("Czas (h):", plan.duration_h),
+            ("Glukoza : fruktoza:", f"1 : {plan.fructose_ratio:g}"),
+            ("Całkowite CHO (g):", round(plan.total_cho_g, 1)),
+            ("Liczba porcji:", plan.item_count),
+        ]
+
+        row = start_row
+        for label, value in parameters:
+            ws.cell(row=row, column=1).value = label
+            ws.cell(row=row, column=1).font = self.styles.font(bold=True)
+            ws.merge_cells(f'A{row}:B{row}')
+            ws.cell(row=row, column=3).value = value
+            self.styles.apply_formula_style(ws.cell(row=row, column=3))
+            row += 1
+
+        return row
+
+    def _add_timeline(self, ws: Worksheet, start_row: int) -> int:
+        """Dodaje oś czasu żywienia."""
+        for col, header in enumerate(self.TIMELINE_HEADERS, 1):
+            self.styles.apply_header_style(ws.cell(row=start_row, column=col, value=header))
+
+        row = start_row + 1
+        for slot in self.plan.slots:
+            values = [
+                slot.start_min,
+                " + ".join(slot.items) if slot.items else "—",
+                round(slot.cho_g, 1),
+                round(slot.fructose_g, 1),
+                round(slot.cumulative_cho_g, 1),
+                round(slot.target_cho_g, 1),
+            ]
+            for col, value in enumerate(values, 1):
+                ws.cell(row=row, column=col).value = value
+                self.styles.apply(ws.cell(row=row, column=col), border=self.styles.thin_border)
+            row += 1
+
+        return row
+
+    def _add_shopping_list(self, ws: Worksheet, start_row: int) -> None:
+        """Dodaje listę zakupów (porcje produktów)."""
+        ws.cell(row=start_row, column=1).value = "🛒 Lista zakupów"
+        ws.cell(row=start_row, column=1).font = self.styles.font(bold=True, size=12)
+
+        row = start_row + 1
+        for name, count in self.plan.shopping_list().items():
+            ws.cell(row=row, column=1).value = count
+            ws.cell(row=row, column=2).value = name
+            self.styles.apply_info_style(ws.cell(row=row, column=2))
+            row += 1
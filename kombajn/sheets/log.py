@@ -1,24 +1,239 @@
 """
 Arkusz Dziennik.
 
-Rozszerzony dziennik kolarza z metrykami WKO5 (TSS, IF, NP) i PMC (CTL, ATL, TSB).
+Rozszerzony dziennik kolarza z metrykami WKO5 (TSS, IF, NP), PMC (CTL, ATL, TSB)
+i alertami obciążenia (ACWR, rampa CTL).
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from openpyxl import Workbook
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Border, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableFormula
 from openpyxl.worksheet.worksheet import Worksheet
 
 from kombajn.config import (
+    COLORS,
+    LOAD_ALERT_LABELS,
+    LOAD_ALERTS,
     LOG_HEADERS,
     LOG_INPUT_COLUMNS,
     LOG_SECTION_END_COLUMNS,
     LOG_COLUMN_WIDTHS,
+    LOG_DATE_FORMULA,
+    LOG_TABLE_NAME,
     SHEET_CONFIG,
+    SPORT_DEFAULTS,
+    SPORTS,
+    ZONE_COLORS,
+    log_column,
+    log_ref,
 )
 from kombajn.sheets.base import BaseSheet
 
 
+def _ewma_formula(header: str, start_row: int, days: int, row: int) -> str:
+    """
+    Buduje formułę obciążenia wykładniczego (CTL/ATL) dla wiersza dziennika.
+
+    Args:
+        header: Kolumna obciążenia ("CTL" / "ATL")
+        start_row: Wiersz wartości startowej w arkuszu Ustawienia
+        days: Stała czasowa (42 / 7)
+        row: Wiersz formuły (poprzedni wiersz to "wczoraj")
+
+    Returns:
+        Formuła poprawna po skopiowaniu w dół
+    """
+    yesterday = f"{get_column_letter(log_column(header))}{row - 1}"
+    previous = f'IF(ISNUMBER({yesterday}), {yesterday}, Ustawienia!$B${start_row})'
+    return (
+        f'=IF(ISNUMBER({log_ref("Data", True)}), '
+        f'{previous} + (N({log_ref("TSS", True)}) - {previous}) / {days}, "")'
+    )
+
+
+def _tss_formula(r: Dict[str, str]) -> str:
+    """
+    Buduje formułę TSS wg dyscypliny (kolumna "Sport", pusta = rower).
+
+    Kolejność: bieg -> rTSS z tempa, pływanie -> sTSS z tempa na 100 m,
+    pozostałe -> TSS z mocy; gdy się nie da, hrTSS z tętna średniego
+    (TRIMP Banistera względem godziny na LTHR dyscypliny). Ten sam model
+    liczy ``kombajn.engine.sports.session_load``.
+
+    Args:
+        r: Nagłówek -> odwołanie do bieżącego wiersza
+
+    Returns:
+        Formuła TSS
+    """
+    sport, minutes, distance = r["Sport"], r["Czas jazdy (min)"], r["Dystans (km)"]
+    power, intensity, heart_rate = r["NP (W)"], r["IF"], r["Avg HR"]
+    ftp, max_hr, rest = "Ustawienia!$B$6", "Ustawienia!$B$8", "Ustawienia!$B$9"
+    lthr = f'IF({sport}="Bieg", Ustawienia!$B$42, Ustawienia!$B$41)'
+    run_pace, swim_pace = "Ustawienia!$B$43", "Ustawienia!$B$44"
+    a, b = SPORT_DEFAULTS.TRIMP_A, SPORT_DEFAULTS.TRIMP_B
+
+    timed = f'N({minutes})>0, N({distance})>0'
+    run = (f'AND({sport}="Bieg", {timed}, {run_pace}>0), '
+           f'{minutes}/60*({run_pace}*{distance}/{minutes})^2*100')
+    swim = (f'AND({sport}="Pływanie", {timed}, {swim_pace}>0), '
+            f'{minutes}/60*({swim_pace}*{distance}*10/{minutes})^3*100')
+    # TSS = (czas_sek * NP * IF) / (FTP * 3600) * 100
+    bike = (f'AND({sport}<>"Bieg", {sport}<>"Pływanie", ISNUMBER({minutes}), ISNUMBER({power}), '
+            f'ISNUMBER({intensity}), {ftp}>0), '
+            f'({minutes}*60*{power}*{intensity})/({ftp}*3600)*100')
+    reserve = f'MAX(0, ({heart_rate}-{rest})/({max_hr}-{rest}))'
+    threshold = f'MAX(0, ({lthr}-{rest})/({max_hr}-{rest}))'
+    heart = (f'AND(ISNUMBER({minutes}), ISNUMBER({heart_rate}), {max_hr}>{rest}, {lthr}>{rest}), '
+             f'{minutes}*{reserve}*{a}*EXP({b}*{reserve})'
+             f'/(60*{threshold}*{a}*EXP({b}*{threshold}))*100')
+    return f'=IF({run}, IF({swim}, IF({bike}, IF({heart}, ""))))'
+
+
+def _alert_formula(r: Dict[str, str]) -> str:
+    """
+    Buduje formułę alertu obciążenia (ta sama co ``kombajn.engine.alerts``).
+
+    ACWR = ATL / CTL oceniany od CTL >= ``MIN_CTL``; rampa to przyrost CTL
+    względem wiersza sprzed ``RAMP_DAYS`` dni (INDEX po numerze wiersza,
+    więc formuła jest taka sama w każdym wierszu tabeli). Wcześniej niż
+    tydzień od startu dziennika porównanie z CTL startowym (B38).
+    """
+    bands, labels = LOAD_ALERTS, LOAD_ALERT_LABELS
+    ctl, atl = r["CTL"], r["ATL"]
+    acwr = f"{atl}/{ctl}"
+    flag = (
+        f'IF(AND(ISNUMBER({atl}), N({ctl})>={bands.MIN_CTL:g}), '
+        f'IF({acwr}>{bands.ACWR_DANGER:g}, "{labels["danger"]}", '
+        f'IF({acwr}>{bands.ACWR_HIGH:g}, "{labels["high"]}", '
+        f'IF({acwr}<{bands.ACWR_LOW:g}, "{labels["low"]}", ""))), "")'
+    )
+    # Wiersz tabeli = ROW()-1 (nagłówek w wierszu 1)
+    offset = bands.RAMP_DAYS + 1
+    week_ago = f'IF(ROW()>{offset}, N(INDEX({log_ref("CTL")}, ROW()-{offset})), Ustawienia!$B$38)'
+    steep = f"AND(ISNUMBER({ctl}), N({ctl})-{week_ago}>{bands.RAMP_MAX:g})"
+    ramp = labels["ramp"]
+    return f'={flag}&IF({steep}, IF({flag}="", "{ramp}", " + {ramp}"), "")'
+
+
+def _log_formulas(row: int) -> Dict[str, str]:
+    """
+    Zwraca formuły kolumn obliczanych dla wiersza dziennika.
+
+    Formuły odwołują się do bieżącego wiersza tabeli (w Excelu
+    wyświetlane jako ``[@TSS]``), więc są takie same w każdym wierszu -
+    poza CTL/ATL, które sięgają do wiersza poprzedniego.
+
+    Args:
+        row: Numer wiersza arkusza
+
+    Returns:
+        Nagłówek kolumny -> formuła
+    """
+    r = {header: log_ref(header, this_row=True) for header in LOG_HEADERS}
+    ftp, weight = "Ustawienia!$B$6", "Ustawienia!$B$3"
+    return {
+        # === SEKCJA OGÓLNE ===
+        "Tydzień": f'=IF(ISNUMBER({r["Data"]}), WEEKNUM({r["Data"]}, 2), "")',
+        "Dzień tyg.": f'=IF(ISNUMBER({r["Data"]}), TEXT({r["Data"]}, "ddd"), "")',
+
+        # === SEKCJA FIZJOLOGIA ===
+        # Waga średnia z 7 dni kalendarzowych kończących się bieżącym
+        # (AVERAGEIFS po datach zamiast ulotnego INDIRECT)
+        "Waga śr. 7d": (
+            f'=IF(ISNUMBER({r["Waga (kg)"]}), IFERROR(AVERAGEIFS({log_ref("Waga (kg)")}, '
+            f'{log_ref("Data")}, ">="&({r["Data"]}-6), {log_ref("Data")}, "<="&{r["Data"]}), '
+            f'{r["Waga (kg)"]}), "")'
+        ),
+
+        # === SEKCJA METRYKI WKO5 ===
+        # IF = NP / FTP
+        "IF": f'=IF(AND(ISNUMBER({r["NP (W)"]}), {ftp}>0), {r["NP (W)"]}/{ftp}, "")',
+
+        # TSS wg dyscypliny: moc (rower), tempo (bieg, pływanie) lub tętno
+        "TSS": _tss_formula(r),
+
+        # W/kg (NP)
+        "W/kg (NP)": f'=IF(AND(ISNUMBER({r["NP (W)"]}), {weight}>0), {r["NP (W)"]}/{weight}, "")',
+
+        # Strefa dominująca (wg NP i FTP)
+        "Strefa dom.": (
+            f'=IF({r["IF"]}="", "", '
+            f'IF({r["IF"]}<0.55, "Z1", '
+            f'IF({r["IF"]}<0.75, "Z2", '
+            f'IF({r["IF"]}<0.90, "Z3", '
+            f'IF({r["IF"]}<1.05, "Z4", '
+            f'IF({r["IF"]}<1.20, "Z5", '
+            f'IF({r["IF"]}<1.50, "Z6", "Z7")))))))'
+        ),
+
+        # === SEKCJA PMC ===
+        # CTL / ATL - wykładnicza średnia TSS (rekurencja Banistera/Coggana,
+        # ta sama co kombajn.engine.pmc): dzisiaj = wczoraj + (TSS - wczoraj) / N.
+        # W pierwszym wierszu "wczoraj" to wartość startowa z Ustawień (B38/B39).
+        # Dzień bez treningu (puste TSS) liczy się jako TSS = 0.
+        "CTL": _ewma_formula("CTL", 38, SHEET_CONFIG.CTL_DAYS, row),
+        "ATL": _ewma_formula("ATL", 39, SHEET_CONFIG.ATL_DAYS, row),
+
+        # TSB = CTL - ATL (forma: + = świeży, - = zmęczony)
+        "TSB": f'=IF(AND(ISNUMBER({r["CTL"]}), ISNUMBER({r["ATL"]})), {r["CTL"]}-{r["ATL"]}, "")',
+
+        # === SEKCJA KALORIE ===
+        # Kcal treningu (szacunek z TSS lub manual)
+        "Kcal treningu": f'=IF(ISNUMBER({r["TSS"]}), ROUND({r["TSS"]} * {ftp} / 100 * 3.6, 0), "")',
+
+        # TDEE = CPM + kcal treningu
+        "TDEE": (
+            f'=IF(ISNUMBER({r["Kcal treningu"]}), Ustawienia!$B$25 + {r["Kcal treningu"]}, '
+            f'Ustawienia!$B$25)'
+        ),
+
+        # CEL Kcal = TDEE - deficyt
+        "CEL Kcal": f'={r["TDEE"]} - Ustawienia!$B$26',
+
+        # Bilans = Spożyte - Cel
+        "Bilans Kcal": (
+            f'=IF(ISBLANK({r["Spożyte Kcal"]}), "", {r["Spożyte Kcal"]} - {r["CEL Kcal"]})'
+        ),
+
+        # === SEKCJA MAKRO ===
+        # CEL Białko = współczynnik * waga
+        "CEL B (g)": (
+            f'=IF(OR({weight}="", {weight}=0), "", ROUND(Ustawienia!$B$28 * {weight}, 0))'
+        ),
+
+        # CEL Tłuszcze = % TDEE / 9
+        "CEL T (g)": f'=IFERROR(ROUND(({r["CEL Kcal"]} * Ustawienia!$B$29) / 9, 0), "")',
+
+        # CEL Węgle = pozostałe kcal / 4
+        "CEL W (g)": (
+            f'=IFERROR(ROUND(({r["CEL Kcal"]} - ({r["CEL B (g)"]}*4) - '
+            f'({r["CEL T (g)"]}*9)) / 4, 0), "")'
+        ),
+
+        # === SEKCJA ALERTY OBCIĄŻENIA ===
+        # ACWR poza pasmem bezpiecznym lub zbyt szybki przyrost CTL
+        "Alert obciążenia": _alert_formula(r),
+    }
+
+
+# Formaty liczb kolumn obliczanych
+_NUMBER_FORMATS: Dict[str, str] = {
+    "IF": "0.00",
+    "TSS": "0",
+    "W/kg (NP)": "0.00",
+    "CTL": "0",
+    "ATL": "0",
+    "TSB": "+0;-0;0",   # TSB z plusem
+}
+
+
 class LogSheet(BaseSheet):
     """
     Arkusz dziennika kolarskiego z metrykami WKO5/INSCYD.
@@ -32,11 +247,24 @@ class LogSheet(BaseSheet):
     - Kalorie i makroskładniki
     - CHO podczas treningu
     - Notatki
+    - Dyscyplina
+    - Alert obciążenia (ACWR, rampa CTL)
     """
     
-    def __init__(self, workbook: Workbook) -> None:
-        """Inicjalizuje arkusz Dziennik."""
+    def __init__(self, workbook: Workbook,
+                 rows: int = SHEET_CONFIG.INITIAL_DAYS_COUNT) -> None:
+        """
+        Inicjalizuje arkusz Dziennik.
+        
+        Args:
+            workbook: Skoroszyt
+            rows: Liczba wierszy danych tabeli (kolejne dopisuje Excel
+                lub ``kombajn.journal`` przy zapisie dalszych dat)
+        """
         super().__init__(workbook, "Dziennik")
+        if rows < 1:
+            raise ValueError(f"Dziennik musi mieć co najmniej 1 wiersz (podano {rows})")
+        self.rows = rows
     
     def create(self) -> Worksheet:
         """
@@ -51,6 +279,9 @@ class LogSheet(BaseSheet):
         self._format_data_rows(ws)
         self._add_formulas(ws)
         self._add_date_column(ws)
+        self._style_data_cells(ws)
+        self._add_table(ws)
+        self._add_sport_validation(ws)
         self._set_column_widths(LOG_COLUMN_WIDTHS)
         
         # Zamrożenie pierwszego wiersza i pierwszych 3 kolumn
@@ -71,141 +302,114 @@ class LogSheet(BaseSheet):
             if i in LOG_SECTION_END_COLUMNS:
                 cell.border = self.styles.thick_right_border
     
+    def _column_styles(self) -> List[Tuple[PatternFill, Border]]:
+        """Zwraca (tło, ramka) kolejnych kolumn: żółte/szare, gruba ramka na końcu sekcji."""
+        input_columns_set = frozenset(LOG_INPUT_COLUMNS)
+        section_end_set = frozenset(LOG_SECTION_END_COLUMNS)
+        styles = self.styles
+        return [
+            (
+                styles.input_fill if i in input_columns_set else styles.formula_fill,
+                styles.thick_right_border if i in section_end_set else styles.thin_border,
+            )
+            for i in range(1, len(LOG_HEADERS) + 1)
+        ]
+    
     def _format_data_rows(self, ws: Worksheet) -> None:
         """
         Formatuje wiersze danych (żółte/szare tło, ramki).
         
-        Optymalizacja: Pre-compute kolumn properties dla O(1) lookups.
+        Tło i ramki są domyślnymi stylami kolumn, a strefa dominująca
+        kolorowana jest formatowaniem warunkowym wierszy tabeli (rośnie
+        z nią w ``journal.extend_log_table``) - rozmiar arkusza i czas
+        generowania nie zależą od liczby wierszy.
         """
-        max_rows = SHEET_CONFIG.MAX_LOG_ROWS + 1
-        num_columns = len(LOG_HEADERS)
-        
-        # Pre-compute sets for O(1) membership testing
-        input_columns_set = frozenset(LOG_INPUT_COLUMNS)
-        section_end_set = frozenset(LOG_SECTION_END_COLUMNS)
+        for col_idx, (fill, border) in enumerate(self._column_styles(), 1):
+            dimension = ws.column_dimensions[get_column_letter(col_idx)]
+            dimension.fill = fill
+            dimension.border = border
         
-        # Cache style objects to avoid repeated attribute access
-        input_fill = self.styles.input_fill
-        formula_fill = self.styles.formula_fill
-        thin_border = self.styles.thin_border
-        thick_border = self.styles.thick_right_border
+        # Kolory stref (jak w arkuszu Strefy Mocy) - wiersze tabeli
+        last_row = self.rows + 1
+        zone_column = get_column_letter(log_column("Strefa dom."))
+        zone_range = f"{zone_column}2:{zone_column}{last_row}"
+        for number, color in enumerate(ZONE_COLORS, 1):
+            ws.conditional_formatting.add(
+                zone_range,
+                CellIsRule(operator="equal", formula=[f'"Z{number}"'], fill=self.styles.fill(color))
+            )
         
-        # Pre-compute column styles (fill, border) for each column
-        column_styles = []
-        for i in range(1, num_columns + 1):
-            fill = input_fill if i in input_columns_set else formula_fill
-            border = thick_border if i in section_end_set else thin_border
-            column_styles.append((fill, border))
+        # Alerty obciążenia wyróżnione w wierszach tabeli
+        alert_column = get_column_letter(log_column("Alert obciążenia"))
+        ws.conditional_formatting.add(
+            f"{alert_column}2:{alert_column}{last_row}",
+            CellIsRule(operator="notEqual", formula=['""'], fill=self.styles.fill(COLORS.ZONE_4))
+        )
+    
+    def _style_data_cells(self, ws: Worksheet) -> None:
+        """
+        Nadaje styl kolumny komórkom zapisanym w wierszach danych.
         
-        # Apply styles - iterate by column first (better cache locality)
-        for col_idx, (fill, border) in enumerate(column_styles, 1):
-            for row in range(2, max_rows + 1):
-                cell = ws.cell(row=row, column=col_idx)
-                cell.fill = fill
-                cell.border = border
+        Excel stosuje styl kolumny tylko do komórek nieobecnych w pliku,
+        więc formuły i daty dostają tło i ramkę jawnie (z zachowaniem
+        czcionki i formatu liczb).
+        """
+        column_styles = self._column_styles()
+        for (row, col), cell in ws._cells.items():
+            if row > 1 and col <= len(column_styles):
+                fill, border = column_styles[col - 1]
+                self.styles.apply(cell, fill=fill, border=border)
     
     def _add_formulas(self, ws: Worksheet) -> None:
-        """Dodaje formuły do wiersza 2 i kopiuje w dół."""
-        # Mapowanie kolumn (1-based):
-        # 1=Data, 2=Tydzień, 3=Dzień tyg
-        # 4=Waga, 5=Waga śr, 6=RHR, 7=HRV, 8=Sen, 9=Jakość snu, 10=Samopoczucie
-        # 11=Czas, 12=Dystans, 13=Przewyższ, 14=AvgP, 15=NP, 16=MaxP, 17=Kadencja, 18=AvgHR, 19=MaxHR
-        # 20=IF, 21=TSS, 22=W/kg, 23=Strefa
-        # 24=CTL, 25=ATL, 26=TSB
-        # 27=Kcal tren, 28=TDEE, 29=CEL, 30=Spożyte, 31=Bilans
-        # 32=CEL B, 33=CEL T, 34=CEL W
-        # 35=Spoż B, 36=Spoż T, 37=Spoż W
-        # 38=CHO/h, 39=Nawodnienie
-        # 40=Typ, 41=RPE, 42=Notatki
-        
-        formulas: Dict[str, str] = {
-            # === SEKCJA OGÓLNE ===
-            # Tydzień
-            'B2': '=IF(ISNUMBER(A2), WEEKNUM(A2, 2), "")',
-            # Dzień tygodnia
-            'C2': '=IF(ISNUMBER(A2), TEXT(A2, "ddd"), "")',
-            
-            # === SEKCJA FIZJOLOGIA ===
-            # Waga średnia 7-dniowa
-            'E2': '=IF(ISNUMBER(D2), IFERROR(AVERAGE(INDIRECT("D"&MAX(2,ROW()-6)&":D"&ROW())), D2), "")',
-            
-            # === SEKCJA METRYKI WKO5 ===
-            # IF = NP / FTP
-            'T2': '=IF(AND(ISNUMBER(O2), Ustawienia!$B$6>0), O2/Ustawienia!$B$6, "")',
-            
-            # TSS = (czas_sek * NP * IF) / (FTP * 3600) * 100
-            # czas jest w minutach (K2), konwersja: K2 * 60
-            'U2': '=IF(AND(ISNUMBER(K2), ISNUMBER(O2), ISNUMBER(T2), Ustawienia!$B$6>0), '
-                  '(K2*60*O2*T2)/(Ustawienia!$B$6*3600)*100, "")',
-            
-            # W/kg (NP)
-            'V2': '=IF(AND(ISNUMBER(O2), Ustawienia!$B$3>0), O2/Ustawienia!$B$3, "")',
-            
-            # Strefa dominująca (wg NP i FTP)
-            'W2': ('=IF(T2="", "", '
-                   'IF(T2<0.55, "Z1", '
-                   'IF(T2<0.75, "Z2", '
-                   'IF(T2<0.90, "Z3", '
-                   'IF(T2<1.05, "Z4", '
-                   'IF(T2<1.20, "Z5", '
-                   'IF(T2<1.50, "Z6", "Z7")))))))'),
-            
-            # === SEKCJA PMC ===
-            # CTL (42-day average TSS)
-            'X2': ('=IFERROR(AVERAGE(INDIRECT("U"&MAX(2,ROW()-41)&":U"&ROW())), "")'),
-            
-            # ATL (7-day average TSS)
-            'Y2': ('=IFERROR(AVERAGE(INDIRECT("U"&MAX(2,ROW()-6)&":U"&ROW())), "")'),
-            
-            # TSB = CTL - ATL (forma: + = świeży, - = zmęczony)
-            'Z2': '=IF(AND(ISNUMBER(X2), ISNUMBER(Y2)), X2-Y2, "")',
-            
-            # === SEKCJA KALORIE ===
-            # Kcal treningu (szacunek z TSS lub manual)
-            'AA2': '=IF(ISNUMBER(U2), ROUND(U2 * Ustawienia!$B$6 / 100 * 3.6, 0), "")',
-            
-            # TDEE = CPM + kcal treningu
-            'AB2': '=IF(ISNUMBER(AA2), Ustawienia!$B$26 + AA2, Ustawienia!$B$26)',
-            
-            # CEL Kcal = TDEE - deficyt
-            'AC2': '=AB2 - Ustawienia!$B$27',
-            
-            # Bilans = Spożyte - Cel
-            'AE2': '=IF(ISBLANK(AD2), "", AD2 - AC2)',
-            
-            # === SEKCJA MAKRO ===
-            # CEL Białko = współczynnik * waga
-            'AF2': ('=IF(OR(Ustawienia!$B$3="", Ustawienia!$B$3=0), "", '
-                   'ROUND(Ustawienia!$B$29 * Ustawienia!$B$3, 0))'),
-            
-            # CEL Tłuszcze = % TDEE / 9
-            'AG2': '=IFERROR(ROUND((AC2 * Ustawienia!$B$30) / 9, 0), "")',
-            
-            # CEL Węgle = pozostałe kcal / 4
-            'AH2': '=IFERROR(ROUND((AC2 - (AF2*4) - (AG2*9)) / 4, 0), "")',
-        }
-        
-        # Dodaj formuły do wiersza 2
-        for cell_ref, formula in formulas.items():
-            ws[cell_ref] = formula
-            ws[cell_ref].font = self.styles.formula_font
-        
-        # Ustaw formaty liczb
-        ws['T2'].number_format = '0.00'   # IF
-        ws['U2'].number_format = '0'      # TSS
-        ws['V2'].number_format = '0.00'   # W/kg
-        ws['X2'].number_format = '0'      # CTL
-        ws['Y2'].number_format = '0'      # ATL
-        ws['Z2'].number_format = '+0;-0;0'  # TSB z plusem
+        """Dodaje formuły kolumn obliczanych do wszystkich wierszy danych."""
+        font = self.styles.formula_font
+        for row in range(2, self.rows + 2):
+            for header, formula in _log_formulas(row).items():
+                cell = ws.cell(row=row, column=log_column(header), value=formula)
+                self.styles.apply(cell, font=font, number_format=_NUMBER_FORMATS.get(header))
+    
+    def _add_sport_validation(self, ws: Worksheet) -> None:
+        """Dodaje listę rozwijaną dyscyplin w kolumnie Sport (wiersze tabeli)."""
+        column = get_column_letter(log_column("Sport"))
+        validation = DataValidation(
+            type="list", formula1=f'"{",".join(SPORTS)}"', allow_blank=True,
+            errorStyle="warning", error="Nieznana dyscyplina - TSS liczony jak dla roweru",
+        )
+        validation.add(f"{column}2:{column}{self.rows + 1}")
+        ws.add_data_validation(validation)
     
     def _add_date_column(self, ws: Worksheet) -> None:
         """Dodaje kolumnę dat z automatycznym wypełnianiem."""
         # A2 - data startowa (do wpisania)
         ws['A2'] = ""
-        ws['A2'].fill = self.styles.input_fill
         ws['A2'].number_format = 'yyyy-mm-dd'
         
         # Automatyczne wypełnianie kolejnych dat
-        for row in range(3, SHEET_CONFIG.INITIAL_DAYS_COUNT + 2):
-            ws[f'A{row}'] = '=IF(ISBLANK($A$2), "", $A$2 + (ROW()-2))'
+        for row in range(3, self.rows + 2):
+            ws[f'A{row}'] = LOG_DATE_FORMULA
             ws[f'A{row}'].number_format = 'yyyy-mm-dd'
+    
+    def _add_table(self, ws: Worksheet) -> None:
+        """
+        Obejmuje dziennik tabelą Excela.
+        
+        Kolumny obliczane zapisane są jako formuły kolumn tabeli, więc
+        Excel sam wypełnia nimi wiersze dopisywane pod tabelą, a zakres
+        tabeli (i odwołania ``Dziennik[TSS]`` w innych arkuszach) rośnie
+        razem z dziennikiem.
+        """
+        formulas = _log_formulas(2)
+        columns = []
+        for i, header in enumerate(LOG_HEADERS, 1):
+            column = TableColumn(id=i, name=header)
+            if header in formulas:
+                column.calculatedColumnFormula = TableFormula(attr_text=formulas[header][1:])
+            columns.append(column)
+        
+        ref = f"A1:{get_column_letter(len(LOG_HEADERS))}{self.rows + 1}"
+        ws.add_table(Table(
+            displayName=LOG_TABLE_NAME,
+            ref=ref,
+            tableColumns=columns,
+            autoFilter=AutoFilter(ref=ref),
+        ))
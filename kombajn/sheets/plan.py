@@ -0,0 +1,116 @@
+"""
+Arkusz Plan.
+
+Prognoza PMC (CTL/ATL/TSB) dla planu treningowego z optymalnym taperem.
+"""
+
+from openpyxl import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from kombajn.config import COLORS, SHEET_CONFIG
+from kombajn.engine.pmc import TaperPlan
+from kombajn.sheets.base import BaseSheet
+
+
+class PlanSheet(BaseSheet):
+    """
+    Arkusz z prognozą formy na wyścig.
+
+    Zawiera:
+    - Parametry wybranego taperu (długość, redukcja, kształt)
+    - Prognozę dzień po dniu: TSS po taperze, CTL, ATL, TSB
+    """
+
+    FORECAST_HEADERS = ["Data", "Dzień tyg", "TSS", "CTL", "ATL", "TSB", "Uwagi"]
+
+    SHAPE_NAMES = {
+        "step": "stały",
+        "linear": "liniowy",
+        "exponential": "wykładniczy",
+    }
+
+    def __init__(self, workbook: Workbook, plan: TaperPlan) -> None:
+        """Inicjalizuje arkusz Plan."""
+        super().__init__(workbook, "Plan")
+        self.plan = plan
+
+    def create(self) -> Worksheet:
+        """
+        Tworzy arkusz Plan.
+
+        Returns:
+            Utworzony arkusz
+        """
+        ws = self._create_worksheet()
+
+        self._add_title(ws)
+        row = self._add_parameters(ws, 3)
+        self._add_forecast(ws, row + 1)
+        self._set_column_widths([12, 10, 8, 8, 8, 8, 30])
+
+        ws.freeze_panes = 'A2'
+
+        return ws
+
+    def _add_title(self, ws: Worksheet) -> None:
+        """Dodaje tytuł arkusza."""
+        ws['A1'] = "🏁 PLAN - PROGNOZA FORMY NA WYŚCIG"
+        self.styles.apply_title_style(ws['A1'])
+        ws.merge_cells('A1:G1')
+        ws.row_dimensions[1].height = 28
+
+    def _add_parameters(self, ws: Worksheet, start_row: int) -> int:
+        """Dodaje parametry wybranego taperu."""
+        plan = self.plan
+        window = f"+{SHEET_CONFIG.TSB_RACE_MIN} do +{SHEET_CONFIG.TSB_RACE_MAX}"
+        parameters = [
+            ("Data wyścigu:", plan.race_date),
+            ("Taper (dni):", plan.taper_days),
+            ("Redukcja objętości:", f"{plan.reduction:.0%}"),
+            ("Kształt taperu:", self.SHAPE_NAMES.get(plan.shape, plan.shape)),
+            ("TSB w dniu wyścigu:", round(plan.race_tsb, 1)),
+            (f"W oknie {window}:", "tak" if plan.in_window else "nie"),
+            ("Utrata CTL:", round(plan.ctl_loss, 1)),
+            ("Ocenione warianty:", plan.candidates),
+        ]
+
+        row = start_row
+        for label, value in parameters:
+            ws.cell(row=row, column=1).value = label
+            ws.cell(row=row, column=1).font = self.styles.font(bold=True)
+            ws.merge_cells(f'A{row}:B{row}')
+            ws.cell(row=row, column=3).value = value
+            self.styles.apply_formula_style(ws.cell(row=row, column=3))
+            row += 1
+
+        ws.cell(row=start_row, column=3).number_format = 'yyyy-mm-dd'
+        return row
+
+    def _add_forecast(self, ws: Worksheet, start_row: int) -> None:
+        """Dodaje prognozę PMC dzień po dniu."""
+        for col, header in enumerate(self.FORECAST_HEADERS, 1):
+            self.styles.apply_header_style(ws.cell(row=start_row, column=col, value=header))
+
+        plan = self.plan
+        race_fill = self.styles.fill(COLORS.TSB_COLOR)
+        taper_start = plan.race_date.toordinal() - plan.taper_days
+
+        row = start_row + 1
+        for day, tss, ctl, atl, tsb in zip(plan.dates, plan.tss, plan.ctl, plan.atl, plan.tsb):
+            if day == plan.race_date:
+                note = "🏁 Wyścig"
+            elif taper_start <= day.toordinal() < plan.race_date.toordinal():
+                note = "Taper"
+            else:
+                note = ""
+
+            values = [day, day.strftime("%a"), tss, round(ctl, 1), round(atl, 1), round(tsb, 1), note]
+            for col, value in enumerate(values, 1):
+                cell = ws.cell(row=row, column=col)
+                cell.value = value
+                self.styles.apply(cell, border=self.styles.thin_border)
+            ws.cell(row=row, column=1).number_format = 'yyyy-mm-dd'
+            ws.cell(row=row, column=6).number_format = '+0.0;-0.0;0.0'
+            if day == plan.race_date:
+                ws.cell(row=row, column=7).fill = race_fill
+            row += 1
@@ -4,13 +4,13 @@ Arkusz Strefy Mocy.
 Tabela 7 stref mocy wg Coggan z automatycznym przeliczaniem z FTP.
 """
 
-from typing import List
+from typing import List, Optional
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
 from openpyxl.worksheet.worksheet import Worksheet
 
-from kombajn.config import POWER_ZONES, COLORS
+from kombajn.config import ZONE_COLORS
+from kombajn.profiles import AthleteProfile
 from kombajn.sheets.base import BaseSheet
 
 
@@ -23,16 +23,22 @@ class PowerZonesSheet(BaseSheet):
     - Automatyczne przeliczanie na W z FTP
     - Opisy fizjologiczne każdej strefy
     - Strefy tętna
+    
+    Granice stref pochodzą z profilu zawodnika (domyślnie z ``kombajn.config``).
     """
     
-    ZONE_COLORS = [
-        COLORS.ZONE_1, COLORS.ZONE_2, COLORS.ZONE_3, COLORS.ZONE_4,
-        COLORS.ZONE_5, COLORS.ZONE_6, COLORS.ZONE_7
-    ]
+    ZONE_COLORS = ZONE_COLORS
     
-    def __init__(self, workbook: Workbook) -> None:
-        """Inicjalizuje arkusz Strefy Mocy."""
+    def __init__(self, workbook: Workbook, profile: Optional[AthleteProfile] = None) -> None:
+        """
+        Inicjalizuje arkusz Strefy Mocy.
+        
+        Args:
+            workbook: Skoroszyt
+            profile: Profil zawodnika (None = strefy domyślne)
+        """
         super().__init__(workbook, "Strefy Mocy")
+        self.profile = profile or AthleteProfile()
     
     def create(self) -> Worksheet:
         """
@@ -55,30 +61,27 @@ class PowerZonesSheet(BaseSheet):
     def _add_title(self, ws: Worksheet) -> None:
         """Dodaje tytuł arkusza."""
         ws['A1'] = "STREFY MOCY (COGGAN / WKO5)"
-        ws['A1'].font = Font(bold=True, size=16, color=COLORS.HEADER_TEXT)
-        ws['A1'].fill = PatternFill(start_color=COLORS.HEADER_BG, 
-                                     end_color=COLORS.HEADER_BG, fill_type="solid")
+        self.styles.apply_title_style(ws['A1'], size=16)
         ws.merge_cells('A1:G1')
         ws.row_dimensions[1].height = 30
     
     def _add_ftp_input(self, ws: Worksheet) -> None:
         """Dodaje pole FTP."""
         ws['A3'] = "Twoje FTP (W):"
-        ws['A3'].font = Font(bold=True, size=12)
+        ws['A3'].font = self.styles.font(bold=True, size=12)
         ws.merge_cells('A3:B3')
         
-        ws['C3'] = "='Ustawienia'!$B$5"  # Pobiera FTP z ustawień
-        ws['C3'].font = Font(bold=True, size=14)
-        ws['C3'].fill = self.styles.formula_fill
+        ws['C3'] = "='Ustawienia'!$B$6"  # Pobiera FTP z ustawień
+        self.styles.apply(ws['C3'], font=self.styles.font(bold=True, size=14),
+                          fill=self.styles.formula_fill)
         
         ws['D3'] = "W/kg:"
-        ws['D3'].font = Font(bold=True)
+        ws['D3'].font = self.styles.font(bold=True)
         
         # W/kg = FTP / waga
-        ws['E3'] = "=IF('Ustawienia'!$B$4>0, C3/'Ustawienia'!$B$4, \"\")"
-        ws['E3'].font = Font(bold=True, size=12)
-        ws['E3'].fill = self.styles.formula_fill
-        ws['E3'].number_format = '0.00'
+        ws['E3'] = "=IF('Ustawienia'!$B$3>0, C3/'Ustawienia'!$B$3, \"\")"
+        self.styles.apply(ws['E3'], font=self.styles.font(bold=True, size=12),
+                          fill=self.styles.formula_fill, number_format='0.00')
     
     def _add_power_zones_table(self, ws: Worksheet) -> None:
         """Dodaje tabelę stref mocy."""
@@ -86,79 +89,39 @@ class PowerZonesSheet(BaseSheet):
         headers = ["Strefa", "Nazwa", "Min %", "Max %", "Min W", "Max W", "Opis"]
         start_row = 5
         
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
+        styles = self.styles
+        border = styles.thin_border
+        bold = styles.font(bold=True)
+        center = styles.alignment(horizontal="center")
         
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=start_row, column=col)
             cell.value = header
-            self.styles.apply_header_style(cell)
+            styles.apply_header_style(cell)
         
         # Dane stref
-        for i, zone in enumerate(POWER_ZONES):
+        for i, zone in enumerate(self.profile.power_zones):
             row = start_row + 1 + i
-            zone_color = self.ZONE_COLORS[i]
-            zone_fill = PatternFill(start_color=zone_color, end_color=zone_color, 
-                                    fill_type="solid")
-            
-            # Strefa
-            cell = ws.cell(row=row, column=1)
-            cell.value = f"Z{zone.number}"
-            cell.font = Font(bold=True, size=11)
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
-            
-            # Nazwa
-            cell = ws.cell(row=row, column=2)
-            cell.value = zone.name
-            cell.font = Font(bold=True)
-            cell.fill = zone_fill
-            cell.border = thin_border
-            
-            # Min %
-            cell = ws.cell(row=row, column=3)
-            cell.value = zone.min_pct
-            cell.number_format = '0%'
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
-            
-            # Max %
-            cell = ws.cell(row=row, column=4)
-            cell.value = zone.max_pct
-            cell.number_format = '0%'
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
-            
-            # Min W (formuła)
-            cell = ws.cell(row=row, column=5)
-            cell.value = f"=ROUND($C$3*C{row}, 0)"
-            cell.font = Font(bold=True)
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
-            
-            # Max W (formuła)
-            cell = ws.cell(row=row, column=6)
-            cell.value = f"=ROUND($C$3*D{row}, 0)"
-            cell.font = Font(bold=True)
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
+            zone_fill = styles.fill(self.ZONE_COLORS[i])
             
-            # Opis
-            cell = ws.cell(row=row, column=7)
-            cell.value = zone.description
-            cell.fill = zone_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(wrap_text=True)
+            # (wartość, czcionka, wyrównanie, format) kolejnych kolumn
+            columns = [
+                (f"Z{zone.number}", styles.font(bold=True, size=11), center, None),  # Strefa
+                (zone.name, bold, None, None),                                       # Nazwa
+                (zone.min_pct, None, center, '0%'),                                  # Min %
+                (zone.max_pct, None, center, '0%'),                                  # Max %
+                (f"=ROUND($C$3*C{row}, 0)", bold, center, None),                     # Min W
+                (f"=ROUND($C$3*D{row}, 0)", bold, center, None),                     # Max W
+                (zone.description, None, styles.alignment(wrap_text=True), None),    # Opis
+            ]
+            for col, (value, font, alignment, number_format) in enumerate(columns, 1):
+                cell = ws.cell(row=row, column=col)
+                cell.value = value
+                styles.apply(cell, font=font, fill=zone_fill, border=border,
+                             alignment=alignment, number_format=number_format)
         
         # Wysokość wierszy
-        for i in range(len(POWER_ZONES)):
+        for i in range(len(self.profile.power_zones)):
             ws.row_dimensions[start_row + 1 + i].height = 25
     
     def _add_hr_zones_table(self, ws: Worksheet) -> None:
@@ -166,13 +129,13 @@ class PowerZonesSheet(BaseSheet):
         start_row = 15
         
         ws.cell(row=start_row, column=1).value = "STREFY TĘTNA"
-        ws.cell(row=start_row, column=1).font = Font(bold=True, size=14)
+        ws.cell(row=start_row, column=1).font = self.styles.font(bold=True, size=14)
         ws.merge_cells(f'A{start_row}:G{start_row}')
         
         # HR Max input
         ws.cell(row=start_row + 1, column=1).value = "HR Max:"
-        ws.cell(row=start_row + 1, column=1).font = Font(bold=True)
-        ws.cell(row=start_row + 1, column=2).value = "='Ustawienia'!$B$7"
+        ws.cell(row=start_row + 1, column=1).font = self.styles.font(bold=True)
+        ws.cell(row=start_row + 1, column=2).value = "='Ustawienia'!$B$8"
         ws.cell(row=start_row + 1, column=2).fill = self.styles.formula_fill
         
         # Nagłówki
@@ -184,51 +147,33 @@ class PowerZonesSheet(BaseSheet):
             cell.value = header
             self.styles.apply_header_style(cell)
         
-        # Strefy tętna (5 stref)
-        hr_zones = [
-            (1, "Z1 - Regeneracja", 0.50, 0.60),
-            (2, "Z2 - Wytrzymałość", 0.60, 0.70),
-            (3, "Z3 - Tempo", 0.70, 0.80),
-            (4, "Z4 - Próg", 0.80, 0.90),
-            (5, "Z5 - VO2max", 0.90, 1.00),
-        ]
-        
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
+        border = self.styles.thin_border
+        center = self.styles.alignment(horizontal="center")
+        hr_cell_ref = f"$B${start_row + 1}"
         
-        for i, (num, name, min_pct, max_pct) in enumerate(hr_zones):
+        # Strefy tętna (5 stref)
+        for i, zone in enumerate(self.profile.hr_zones):
             row = header_row + 1 + i
-            
-            ws.cell(row=row, column=1).value = f"Z{num}"
-            ws.cell(row=row, column=1).border = thin_border
-            ws.cell(row=row, column=1).alignment = Alignment(horizontal="center")
-            
-            ws.cell(row=row, column=2).value = name
-            ws.cell(row=row, column=2).border = thin_border
-            
-            ws.cell(row=row, column=3).value = min_pct
-            ws.cell(row=row, column=3).number_format = '0%'
-            ws.cell(row=row, column=3).border = thin_border
-            
-            ws.cell(row=row, column=4).value = max_pct
-            ws.cell(row=row, column=4).number_format = '0%'
-            ws.cell(row=row, column=4).border = thin_border
-            
-            hr_cell_ref = f"$B${start_row + 1}"
-            ws.cell(row=row, column=5).value = f"=ROUND({hr_cell_ref}*C{row}, 0)"
-            ws.cell(row=row, column=5).border = thin_border
-            
-            ws.cell(row=row, column=6).value = f"=ROUND({hr_cell_ref}*D{row}, 0)"
-            ws.cell(row=row, column=6).border = thin_border
+            columns = [
+                (f"Z{zone.number}", center, None),
+                (zone.name, None, None),
+                (zone.min_pct, None, '0%'),
+                (zone.max_pct, None, '0%'),
+                (f"=ROUND({hr_cell_ref}*C{row}, 0)", None, None),
+                (f"=ROUND({hr_cell_ref}*D{row}, 0)", None, None),
+            ]
+            for col, (value, alignment, number_format) in enumerate(columns, 1):
+                cell = ws.cell(row=row, column=col)
+                cell.value = value
+                self.styles.apply(cell, border=border, alignment=alignment,
+                                  number_format=number_format)
     
     def _add_usage_notes(self, ws: Worksheet) -> None:
         """Dodaje notatki z instrukcją."""
         start_row = 25
         
         ws.cell(row=start_row, column=1).value = "INSTRUKCJA"
-        ws.cell(row=start_row, column=1).font = Font(bold=True, size=12)
+        ws.cell(row=start_row, column=1).font = self.styles.font(bold=True, size=12)
         
         notes = [
             "1. Ustaw swoje FTP w arkuszu [Ustawienia] - strefy przeliczą się automatycznie",
@@ -241,5 +186,5 @@ class PowerZonesSheet(BaseSheet):
         for i, note in enumerate(notes):
             cell = ws.cell(row=start_row + 1 + i, column=1)
             cell.value = note
-            cell.font = Font(italic=True, color=COLORS.INFO_TEXT)
+            self.styles.apply_info_style(cell)
             ws.merge_cells(f'A{start_row + 1 + i}:G{start_row + 1 + i}')
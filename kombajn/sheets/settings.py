@@ -4,16 +4,14 @@ Arkusz Ustawienia.
 Zawiera profil użytkownika, parametry mocy (WKO5) i profil metaboliczny (INSCYD).
 """
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 
-from kombajn.config import (
-    DEFAULTS, POWER_DEFAULTS, METABOLIC_DEFAULTS, COLORS
-)
+from kombajn.config import METABOLIC_DEFAULTS, COLORS
+from kombajn.profiles import AthleteProfile
 from kombajn.sheets.base import BaseSheet
 
 
@@ -26,11 +24,22 @@ class SettingsSheet(BaseSheet):
     - Profil mocy WKO5 (FTP, HR)
     - Profil metaboliczny INSCYD (VO2max, VLaMax)
     - Cele kaloryczne i makroskładnikowe
+    - Wartości startowe PMC (CTL, ATL)
+    - Progi dyscyplin (LTHR, tempo progowe biegu, CSS)
+    
+    Wartości pól pochodzą z profilu zawodnika (domyślnie z ``kombajn.config``).
     """
     
-    def __init__(self, workbook: Workbook) -> None:
-        """Inicjalizuje arkusz Ustawienia."""
+    def __init__(self, workbook: Workbook, profile: Optional[AthleteProfile] = None) -> None:
+        """
+        Inicjalizuje arkusz Ustawienia.
+        
+        Args:
+            workbook: Skoroszyt
+            profile: Profil zawodnika (None = wartości domyślne)
+        """
         super().__init__(workbook, "Ustawienia")
+        self.profile = profile or AthleteProfile()
     
     def create(self) -> Worksheet:
         """
@@ -47,6 +56,8 @@ class SettingsSheet(BaseSheet):
         current_row = self._add_metabolic_profile(ws, current_row + 1)
         current_row = self._add_calorie_settings(ws, current_row + 1)
         current_row = self._add_macro_targets(ws, current_row + 1)
+        current_row = self._add_pmc_start(ws, current_row + 1)
+        current_row = self._add_sport_thresholds(ws, current_row + 1)
         
         self._set_column_widths([35, 15, 35])
         
@@ -56,10 +67,12 @@ class SettingsSheet(BaseSheet):
         """Dodaje nagłówek sekcji."""
         cell = ws.cell(row=row, column=1)
         cell.value = title
-        cell.font = Font(bold=True, size=13, color=COLORS.HEADER_TEXT)
-        cell.fill = PatternFill(start_color=COLORS.HEADER_BG, 
-                                 end_color=COLORS.HEADER_BG, fill_type="solid")
-        cell.alignment = Alignment(vertical="center")
+        self.styles.apply(
+            cell,
+            font=self.styles.font(bold=True, size=13, color=COLORS.HEADER_TEXT),
+            fill=self.styles.header_fill,
+            alignment=self.styles.alignment(vertical="center")
+        )
         ws.merge_cells(f'A{row}:C{row}')
         ws.row_dimensions[row].height = 25
     
@@ -67,13 +80,11 @@ class SettingsSheet(BaseSheet):
                        value, info: str = "", number_format: str = None) -> None:
         """Dodaje wiersz z polem do wpisania."""
         ws.cell(row=row, column=1).value = label
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         
         cell = ws.cell(row=row, column=2)
         cell.value = value
-        cell.fill = self.styles.input_fill
-        if number_format:
-            cell.number_format = number_format
+        self.styles.apply(cell, fill=self.styles.input_fill, number_format=number_format)
         
         if info:
             ws.cell(row=row, column=3).value = info
@@ -83,13 +94,12 @@ class SettingsSheet(BaseSheet):
                          formula: str, info: str = "", number_format: str = None) -> None:
         """Dodaje wiersz z formułą."""
         ws.cell(row=row, column=1).value = label
-        ws.cell(row=row, column=1).font = Font(bold=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True)
         
         cell = ws.cell(row=row, column=2)
         cell.value = formula
-        self.styles.apply_formula_style(cell)
-        if number_format:
-            cell.number_format = number_format
+        self.styles.apply(cell, font=self.styles.formula_font, fill=self.styles.formula_fill,
+                          border=self.styles.thin_border, number_format=number_format)
         
         if info:
             ws.cell(row=row, column=3).value = info
@@ -100,12 +110,12 @@ class SettingsSheet(BaseSheet):
         self._add_section_header(ws, start_row, "📊 PROFIL UŻYTKOWNIKA")
         
         row = start_row + 1
-        self._add_input_row(ws, row, "Imię / Pseudonim", "", "")
+        self._add_input_row(ws, row, "Imię / Pseudonim", self.profile.name, "")
         row += 1
-        self._add_input_row(ws, row, "Waga (kg)", POWER_DEFAULTS.WEIGHT_KG, 
+        self._add_input_row(ws, row, "Waga (kg)", self.profile.weight_kg, 
                            "Aktualna waga do obliczeń W/kg", "0.0")
         row += 1
-        self._add_input_row(ws, row, "Wzrost (cm)", 175, "")
+        self._add_input_row(ws, row, "Wzrost (cm)", self.profile.height_cm, "")
         
         return row
     
@@ -114,16 +124,16 @@ class SettingsSheet(BaseSheet):
         self._add_section_header(ws, start_row, "⚡ PROFIL MOCY (WKO5)")
         
         row = start_row + 1
-        self._add_input_row(ws, row, "FTP (W)", POWER_DEFAULTS.FTP, 
+        self._add_input_row(ws, row, "FTP (W)", self.profile.ftp, 
                            "Functional Threshold Power")
         row += 1
         self._add_formula_row(ws, row, "W/kg", "=IF(B3>0, B6/B3, \"\")", 
                              "Automatycznie z FTP / waga", "0.00")
         row += 1
-        self._add_input_row(ws, row, "HR Max (bpm)", POWER_DEFAULTS.MAX_HR, 
+        self._add_input_row(ws, row, "HR Max (bpm)", self.profile.max_hr, 
                            "Tętno maksymalne")
         row += 1
-        self._add_input_row(ws, row, "HR Rest (bpm)", POWER_DEFAULTS.RESTING_HR, 
+        self._add_input_row(ws, row, "HR Rest (bpm)", self.profile.resting_hr, 
                            "Tętno spoczynkowe")
         row += 1
         self._add_input_row(ws, row, "Max Power 5s (W)", "", 
@@ -145,10 +155,10 @@ class SettingsSheet(BaseSheet):
         self._add_section_header(ws, start_row, "🔬 PROFIL METABOLICZNY (INSCYD)")
         
         row = start_row + 1
-        self._add_input_row(ws, row, "VO2max (ml/kg/min)", METABOLIC_DEFAULTS.VO2MAX, 
+        self._add_input_row(ws, row, "VO2max (ml/kg/min)", self.profile.vo2max, 
                            "Z testu INSCYD lub szacunkowo", "0.0")
         row += 1
-        self._add_input_row(ws, row, "VLaMax (mmol/L/s)", METABOLIC_DEFAULTS.VLAMAX, 
+        self._add_input_row(ws, row, "VLaMax (mmol/L/s)", self.profile.vlamax, 
                            "Maks. produkcja mleczanu", "0.00")
         row += 1
         self._add_formula_row(ws, row, "FatMax (W)", 
@@ -172,20 +182,20 @@ class SettingsSheet(BaseSheet):
         self._add_section_header(ws, start_row, "🔥 USTAWIENIA KALORYCZNE")
         
         row = start_row + 1
-        self._add_input_row(ws, row, "BMR (kcal)", DEFAULTS.BMR, 
+        self._add_input_row(ws, row, "BMR (kcal)", self.profile.bmr, 
                            "Basal Metabolic Rate")
         row += 1
-        self._add_input_row(ws, row, "TEF (kcal)", DEFAULTS.TEF, 
+        self._add_input_row(ws, row, "TEF (kcal)", self.profile.tef, 
                            "Thermic Effect of Food (~10% BMR)")
         row += 1
-        self._add_input_row(ws, row, "NEAT (kcal)", DEFAULTS.NEAT, 
+        self._add_input_row(ws, row, "NEAT (kcal)", self.profile.neat, 
                            "Non-Exercise Activity")
         row += 1
         self._add_formula_row(ws, row, "CPM (Baza)", 
                              f"=SUM(B{row-3}:B{row-1})", 
                              "Całkowita Przemiana Materii bez treningu")
         row += 1
-        self._add_input_row(ws, row, "Cel (deficyt/nadwyżka)", DEFAULTS.DEFICIT, 
+        self._add_input_row(ws, row, "Cel (deficyt/nadwyżka)", self.profile.deficit, 
                            "Ujemna = deficyt, dodatnia = nadwyżka")
         
         return row
@@ -195,19 +205,19 @@ class SettingsSheet(BaseSheet):
         self._add_section_header(ws, start_row, "🥗 CELE MAKROSKŁADNIKOWE")
         
         row = start_row + 1
-        self._add_input_row(ws, row, "Białko (g / kg mc)", DEFAULTS.PROTEIN_RATIO, 
+        self._add_input_row(ws, row, "Białko (g / kg mc)", self.profile.protein_ratio, 
                            "1.6-2.2g dla sportowców", "0.0")
         row += 1
-        self._add_input_row(ws, row, "Tłuszcze (% TDEE)", DEFAULTS.FAT_RATIO, 
+        self._add_input_row(ws, row, "Tłuszcze (% TDEE)", self.profile.fat_ratio, 
                            "0.20-0.30 (20-30%)", "0%")
         row += 1
-        self._add_input_row(ws, row, "CHO podczas treningu (g/h)", 60, 
+        self._add_input_row(ws, row, "CHO podczas treningu (g/h)", self.profile.cho_per_hour, 
                            "60-90g/h dla intensywnych jazd")
         row += 1
         
         # Info o celach CHO
         ws.cell(row=row, column=1).value = "💡 Wskazówki CHO/h:"
-        ws.cell(row=row, column=1).font = Font(bold=True, italic=True)
+        ws.cell(row=row, column=1).font = self.styles.font(bold=True, italic=True)
         ws.merge_cells(f'A{row}:C{row}')
         row += 1
         
@@ -225,3 +235,35 @@ class SettingsSheet(BaseSheet):
             row += 1
         
         return row
+    
+    def _add_pmc_start(self, ws: Worksheet, start_row: int) -> int:
+        """Dodaje sekcję wartości startowych PMC (B38 = CTL, B39 = ATL)."""
+        self._add_section_header(ws, start_row, "📈 PMC - WARTOŚCI STARTOWE")
+        
+        row = start_row + 1
+        self._add_input_row(ws, row, "CTL startowe", self.profile.ctl_start, 
+                           "CTL z dnia przed pierwszym wpisem (np. z poprzedniego sezonu)", "0")
+        row += 1
+        self._add_input_row(ws, row, "ATL startowe", self.profile.atl_start, 
+                           "ATL z dnia przed pierwszym wpisem", "0")
+        
+        return row
+    
+    def _add_sport_thresholds(self, ws: Worksheet, start_row: int) -> int:
+        """Dodaje sekcję progów dyscyplin (B41-B44) dla rTSS, sTSS i hrTSS."""
+        self._add_section_header(ws, start_row, "🏊 PROGI DYSCYPLIN (TRIATHLON)")
+        
+        row = start_row + 1
+        self._add_input_row(ws, row, "LTHR rower (bpm)", self.profile.lthr_bike, 
+                           "Tętno progowe - hrTSS treningów bez mocy")
+        row += 1
+        self._add_input_row(ws, row, "LTHR bieg (bpm)", self.profile.lthr_run, 
+                           "Tętno progowe w biegu - hrTSS biegów bez dystansu")
+        row += 1
+        self._add_input_row(ws, row, "Tempo progowe biegu (min/km)", self.profile.run_pace, 
+                           "rTSS; np. 4.5 = 4:30/km", "0.00")
+        row += 1
+        self._add_input_row(ws, row, "CSS pływanie (min/100 m)", self.profile.swim_pace, 
+                           "sTSS; np. 1.75 = 1:45/100 m", "0.00")
+        
+        return row
@@ -5,8 +5,10 @@ Ten moduł definiuje wszystkie style używane w arkuszach Excel,
 zapewniając spójność wizualną i łatwość modyfikacji.
 """
 
+from copy import copy
 from dataclasses import dataclass, field
-
+from typing import Any, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 from openpyxl.cell import Cell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
@@ -14,10 +16,36 @@ from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from kombajn.config import COLORS
 
 
+StyleKey = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class StyleStats:
+    """
+    Statystyki rejestru stylów.
+
+    Attributes:
+        objects: Liczba unikalnych obiektów stylu (Font, PatternFill, ...)
+        hits: Trafienia - zwrócono istniejący obiekt
+        misses: Chybienia - utworzono nowy obiekt
+        cell_styles: Zapamiętane kombinacje stylu komórki (dla ``apply``)
+    """
+    objects: int
+    hits: int
+    misses: int
+    cell_styles: int
+
+
 @dataclass
 class ExcelStyles:
     """
-    Kolekcja stylów Excel używanych w całym skoroszycie.
+    Kolekcja i rejestr stylów Excel używanych w całym skoroszycie.
+    
+    Obiekty stylu tworzone są przez metody ``font``, ``fill``, ``border``
+    i ``alignment``, które dla tych samych parametrów zwracają ten sam
+    (kanoniczny) obiekt. ``apply`` zapamiętuje wynikową tablicę indeksów
+    stylu komórki, więc kolejne komórki z tą samą kombinacją dostają ją
+    kopią - bez haszowania obiektów openpyxl przy każdym przypisaniu.
     
     Attributes:
         header_font: Czcionka dla nagłówków (pogrubiona, biała)
@@ -29,90 +57,229 @@ class ExcelStyles:
         info_font: Czcionka dla informacji (kursywa, szara)
         thin_border: Cienka ramka
         thick_right_border: Gruba prawa ramka (koniec sekcji)
+        hits: Trafienia rejestru
+        misses: Chybienia rejestru
     """
     
     # Nagłówki
-    header_font: Font = field(
-        default_factory=lambda: Font(bold=True, color=COLORS.HEADER_TEXT)
-    )
-    header_fill: PatternFill = field(
-        default_factory=lambda: PatternFill(
-            start_color=COLORS.HEADER_BG, 
-            end_color=COLORS.HEADER_BG, 
-            fill_type="solid"
-        )
-    )
-    header_align: Alignment = field(
-        default_factory=lambda: Alignment(
-            horizontal="center", 
-            vertical="center", 
-            wrap_text=True
-        )
-    )
+    header_font: Optional[Font] = None
+    header_fill: Optional[PatternFill] = None
+    header_align: Optional[Alignment] = None
     
     # Komórki do wpisywania
-    input_fill: PatternFill = field(
-        default_factory=lambda: PatternFill(
-            start_color=COLORS.INPUT_BG, 
-            end_color=COLORS.INPUT_BG, 
-            fill_type="solid"
-        )
-    )
+    input_fill: Optional[PatternFill] = None
     
     # Komórki z formułami
-    formula_fill: PatternFill = field(
-        default_factory=lambda: PatternFill(
-            start_color=COLORS.FORMULA_BG, 
-            end_color=COLORS.FORMULA_BG, 
-            fill_type="solid"
-        )
-    )
-    formula_font: Font = field(default_factory=lambda: Font(bold=True))
+    formula_fill: Optional[PatternFill] = None
+    formula_font: Optional[Font] = None
     
     # Tekst informacyjny
-    info_font: Font = field(
-        default_factory=lambda: Font(italic=True, color=COLORS.INFO_TEXT)
-    )
+    info_font: Optional[Font] = None
     
     # Ramki
-    thin_border: Border = field(
-        default_factory=lambda: Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+    thin_border: Optional[Border] = None
+    thick_right_border: Optional[Border] = None
+    
+    # Rejestr
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _pool: Dict[StyleKey, Any] = field(default_factory=dict, init=False, repr=False)
+    _cell_styles: "WeakKeyDictionary[Any, Dict[StyleKey, Tuple[Any, ...]]]" = field(
+        default_factory=WeakKeyDictionary, init=False, repr=False
     )
-    thick_right_border: Border = field(
-        default_factory=lambda: Border(
-            left=Side(style='thin'),
-            right=Side(style='thick'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
+    
+    def __post_init__(self) -> None:
+        """Uzupełnia brakujące style nazwane obiektami z rejestru."""
+        defaults = {
+            "header_font": lambda: self.font(bold=True, color=COLORS.HEADER_TEXT),
+            "header_fill": lambda: self.fill(COLORS.HEADER_BG),
+            "header_align": lambda: self.alignment(horizontal="center", vertical="center", wrap_text=True),
+            "input_fill": lambda: self.fill(COLORS.INPUT_BG),
+            "formula_fill": lambda: self.fill(COLORS.FORMULA_BG),
+            "formula_font": lambda: self.font(bold=True),
+            "info_font": lambda: self.font(italic=True, color=COLORS.INFO_TEXT),
+            "thin_border": lambda: self.border(),
+            "thick_right_border": lambda: self.border(right="thick"),
+        }
+        for name, factory in defaults.items():
+            if getattr(self, name) is None:
+                setattr(self, name, factory())
+        self.hits = self.misses = 0
+    
+    # -------------------------------------------------------------------------
+    # Rejestr obiektów stylu
+    # -------------------------------------------------------------------------
+    
+    def _intern(self, key: StyleKey, factory) -> Any:
+        style = self._pool.get(key)
+        if style is None:
+            self.misses += 1
+            style = self._pool[key] = factory()
+        else:
+            self.hits += 1
+        return style
+    
+    def font(
+        self,
+        bold: bool = False,
+        italic: bool = False,
+        size: Optional[float] = None,
+        color: Optional[str] = None
+    ) -> Font:
+        """
+        Zwraca kanoniczną czcionkę.
+        
+        Args:
+            bold: Pogrubienie
+            italic: Kursywa
+            size: Rozmiar (None = domyślny)
+            color: Kolor RGB (np. "FFFFFF")
+            
+        Returns:
+            Czcionka współdzielona przez wszystkie arkusze
+        """
+        return self._intern(
+            ("font", bold, italic, size, color),
+            lambda: Font(bold=bold, italic=italic, size=size, color=color)
+        )
+    
+    def fill(self, color: str) -> PatternFill:
+        """Zwraca kanoniczne jednolite wypełnienie w kolorze RGB."""
+        return self._intern(
+            ("fill", color),
+            lambda: PatternFill(start_color=color, end_color=color, fill_type="solid")
+        )
+    
+    def border(
+        self,
+        left: str = "thin",
+        right: str = "thin",
+        top: str = "thin",
+        bottom: str = "thin"
+    ) -> Border:
+        """
+        Zwraca kanoniczną ramkę (domyślnie cienka ze wszystkich stron).
+        
+        Args:
+            left: Styl lewej krawędzi ("thin", "thick", ...)
+            right: Styl prawej krawędzi
+            top: Styl górnej krawędzi
+            bottom: Styl dolnej krawędzi
+            
+        Returns:
+            Ramka współdzielona przez wszystkie arkusze
+        """
+        return self._intern(
+            ("border", left, right, top, bottom),
+            lambda: Border(
+                left=Side(style=left),
+                right=Side(style=right),
+                top=Side(style=top),
+                bottom=Side(style=bottom)
+            )
+        )
+    
+    def alignment(
+        self,
+        horizontal: Optional[str] = None,
+        vertical: Optional[str] = None,
+        wrap_text: Optional[bool] = None
+    ) -> Alignment:
+        """Zwraca kanoniczne wyrównanie."""
+        return self._intern(
+            ("alignment", horizontal, vertical, wrap_text),
+            lambda: Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+        )
+    
+    def stats(self) -> StyleStats:
+        """Zwraca statystyki rejestru (trafienia, chybienia, rozmiar)."""
+        return StyleStats(
+            objects=len(self._pool),
+            hits=self.hits,
+            misses=self.misses,
+            cell_styles=sum(len(cache) for cache in self._cell_styles.values())
+        )
+    
+    # -------------------------------------------------------------------------
+    # Stylowanie komórek
+    # -------------------------------------------------------------------------
+    
+    def apply(
+        self,
+        cell: Cell,
+        font: Optional[Font] = None,
+        fill: Optional[PatternFill] = None,
+        border: Optional[Border] = None,
+        alignment: Optional[Alignment] = None,
+        number_format: Optional[str] = None
+    ) -> None:
+        """
+        Ustawia style komórki (pominięte argumenty pozostają bez zmian).
+        
+        Wynikowa tablica indeksów stylu jest zapamiętywana per skoroszyt
+        dla kombinacji (styl wyjściowy komórki, przekazane obiekty), więc
+        stylowanie dużych zakresów tą samą kombinacją to kopia tablicy.
+        Obiekty powinny pochodzić z rejestru (klucz to ich tożsamość).
+        
+        Args:
+            cell: Komórka
+            font: Czcionka
+            fill: Wypełnienie
+            border: Ramka
+            alignment: Wyrównanie
+            number_format: Format liczby
+        """
+        cache = self._cell_styles.get(cell.parent.parent)
+        if cache is None:
+            cache = self._cell_styles[cell.parent.parent] = {}
+        key = (tuple(cell._style or ()), id(font), id(fill), id(border), id(alignment), number_format)
+        cached = cache.get(key)
+        if cached is not None:
+            cell._style = copy(cached[0])
+            return
+        
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if border is not None:
+            cell.border = border
+        if alignment is not None:
+            cell.alignment = alignment
+        if number_format is not None:
+            cell.number_format = number_format
+        # Obiekty trzymane w pamięci podręcznej - ich id() nie zostanie użyte ponownie
+        cache[key] = (copy(cell._style), font, fill, border, alignment)
+    
+    def apply_title_style(self, cell: Cell, size: int = 14) -> None:
+        """Aplikuje styl tytułu arkusza (biały tekst na tle nagłówka)."""
+        self.apply(
+            cell,
+            font=self.font(bold=True, size=size, color=COLORS.HEADER_TEXT),
+            fill=self.header_fill
         )
-    )
     
     def apply_header_style(self, cell: Cell) -> None:
         """Aplikuje styl nagłówka do komórki."""
-        cell.font = self.header_font
-        cell.fill = self.header_fill
-        cell.alignment = self.header_align
-        cell.border = self.thin_border
+        self.apply(
+            cell,
+            font=self.header_font,
+            fill=self.header_fill,
+            border=self.thin_border,
+            alignment=self.header_align
+        )
     
     def apply_input_style(self, cell: Cell) -> None:
         """Aplikuje styl komórki do wpisywania."""
-        cell.fill = self.input_fill
-        cell.border = self.thin_border
+        self.apply(cell, fill=self.input_fill, border=self.thin_border)
     
     def apply_formula_style(self, cell: Cell) -> None:
         """Aplikuje styl komórki z formułą."""
-        cell.font = self.formula_font
-        cell.fill = self.formula_fill
-        cell.border = self.thin_border
+        self.apply(cell, font=self.formula_font, fill=self.formula_fill, border=self.thin_border)
     
     def apply_info_style(self, cell: Cell) -> None:
         """Aplikuje styl tekstu informacyjnego."""
-        cell.font = self.info_font
+        self.apply(cell, font=self.info_font)
     
     def get_section_border(self, is_section_end: bool) -> Border:
         """
@@ -4,17 +4,22 @@ Funkcje narzędziowe dla Dziennika Kolarza.
 Ten moduł zawiera funkcje pomocnicze do:
 - Walidacji i bezpieczeństwa ścieżek plików
 - Konfiguracji logowania
+- Zapisu skoroszytów do pamięci i archiwów zip
 - Innych operacji wspólnych
 """
 
 
+import datetime
+import io
 import logging
 import re
 import sys
+import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional, Tuple, Union
 
 from openpyxl import Workbook
+from openpyxl.writer.excel import ExcelWriter
 
 
 def setup_logging(
@@ -127,11 +132,140 @@ def validate_output_path(
     return output_path
 
 
+# Stała data plików powtarzalnych (najwcześniejsza data w formacie zip)
+REPRODUCIBLE_TIMESTAMP = datetime.datetime(1980, 1, 1)
+
+
+class _ReproducibleZipFile(zipfile.ZipFile):
+    """Archiwum zip ze stałą datą i uprawnieniami wpisów."""
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            zinfo = zipfile.ZipInfo(
+                zinfo_or_arcname, date_time=REPRODUCIBLE_TIMESTAMP.timetuple()[:6]
+            )
+            zinfo.external_attr = 0o600 << 16
+            zinfo.compress_type = self.compression
+            zinfo_or_arcname = zinfo
+            if compresslevel is None:
+                compresslevel = self.compresslevel
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        # openpyxl dopisuje arkusze z plików tymczasowych - data pliku pomijana
+        with open(filename, "rb") as f:
+            data = f.read()
+        self.writestr(arcname or Path(filename).name, data, compress_type, compresslevel)
+
+
+def save_workbook_to(
+    workbook: Workbook,
+    target: Union[Path, str, BinaryIO],
+    compresslevel: Optional[int] = None,
+    reproducible: bool = False
+) -> None:
+    """
+    Zapisuje skoroszyt do pliku lub strumienia z wybranym poziomem kompresji.
+
+    Odpowiednik ``workbook.save`` (openpyxl zawsze używa domyślnego
+    poziomu deflate). Strumień nie musi obsługiwać ``seek`` - można pisać
+    do ``BytesIO``, ``SpooledTemporaryFile`` lub wpisu innego archiwum zip.
+
+    W trybie powtarzalnym daty wpisów zip oraz daty utworzenia
+    i modyfikacji we właściwościach dokumentu są stałe
+    (``REPRODUCIBLE_TIMESTAMP``), więc ten sam skoroszyt daje te same bajty.
+
+    Args:
+        workbook: Skoroszyt do zapisania
+        target: Ścieżka lub binarny strumień do zapisu
+        compresslevel: Poziom deflate 0-9 (None = domyślny zlib, 6)
+        reproducible: Stałe daty (plik identyczny bajt w bajt)
+
+    Raises:
+        ValueError: Przy poziomie kompresji spoza 0-9
+        TypeError: Dla skoroszytu otwartego tylko do odczytu
+    """
+    if compresslevel is not None and not 0 <= compresslevel <= 9:
+        raise ValueError(f"Poziom kompresji musi być w zakresie 0-9, podano: {compresslevel}")
+    if workbook.read_only:
+        raise TypeError("Skoroszyt otwarty tylko do odczytu")
+    if workbook.write_only and not workbook.worksheets:
+        workbook.create_sheet()
+    zip_class = _ReproducibleZipFile if reproducible else zipfile.ZipFile
+    archive = zip_class(
+        target, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compresslevel
+    )
+    if reproducible:
+        workbook.properties.created = REPRODUCIBLE_TIMESTAMP
+        workbook.properties.modified = REPRODUCIBLE_TIMESTAMP
+    else:
+        workbook.properties.modified = datetime.datetime.now(
+            tz=datetime.timezone.utc
+        ).replace(tzinfo=None)
+    ExcelWriter(workbook, archive).save()
+
+
+def workbook_to_bytes(workbook: Workbook, compresslevel: Optional[int] = None) -> bytes:
+    """
+    Zwraca plik xlsx skoroszytu jako bajty (bez plików tymczasowych).
+
+    Args:
+        workbook: Skoroszyt do zapisania
+        compresslevel: Poziom deflate 0-9 (None = domyślny)
+
+    Returns:
+        Zawartość pliku xlsx
+    """
+    buffer = io.BytesIO()
+    save_workbook_to(workbook, buffer, compresslevel)
+    # getvalue() na końcu bufora nie kopiuje danych
+    return buffer.getvalue()
+
+
+def zip_workbooks(
+    target: Union[Path, str, BinaryIO],
+    workbooks: Iterable[Tuple[str, Workbook]],
+    compresslevel: Optional[int] = None
+) -> int:
+    """
+    Zapisuje wiele skoroszytów jako pliki xlsx wewnątrz jednego archiwum zip.
+
+    Każdy skoroszyt trafia bezpośrednio do wpisu archiwum (bez pośredniej
+    kopii w pamięci). Wpisy są nieskompresowane (ZIP_STORED) - xlsx jest
+    już skompresowany, a ponowny deflate kosztuje CPU bez zysku rozmiaru.
+    Skoroszyty mogą być generowane leniwie (np. generator po zawodnikach).
+
+    Args:
+        target: Ścieżka lub binarny strumień archiwum
+        workbooks: Pary (nazwa pliku w archiwum, skoroszyt)
+        compresslevel: Poziom deflate plików xlsx 0-9 (None = domyślny)
+
+    Returns:
+        Liczba zapisanych skoroszytów
+
+    Raises:
+        ValueError: Przy niebezpiecznej lub powtórzonej nazwie pliku
+    """
+    names = set()
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, workbook in workbooks:
+            safe_name = sanitize_filename(name)
+            if not safe_name.lower().endswith(".xlsx"):
+                safe_name += ".xlsx"
+            if safe_name in names:
+                raise ValueError(f"Powtórzona nazwa pliku w archiwum: {safe_name}")
+            names.add(safe_name)
+            with archive.open(safe_name, "w", force_zip64=True) as entry:
+                save_workbook_to(workbook, entry, compresslevel)
+    return len(names)
+
+
 def safe_save_workbook(
     workbook: Workbook,
     filename: str,
     output_dir: Optional[Path] = None,
-    logger: Optional[logging.Logger] = None
+    logger: Optional[logging.Logger] = None,
+    compresslevel: Optional[int] = None
 ) -> Path:
     """
     Bezpiecznie zapisuje skoroszyt Excel.
@@ -141,6 +275,7 @@ def safe_save_workbook(
         filename: Nazwa pliku
         output_dir: Katalog wyjściowy
         logger: Logger do komunikatów
+        compresslevel: Poziom deflate 0-9 (None = domyślny)
         
     Returns:
         Ścieżka do zapisanego pliku
@@ -158,7 +293,7 @@ def safe_save_workbook(
     logger.info(f"Zapisywanie do: {output_path}")
     
     try:
-        workbook.save(output_path)
+        save_workbook_to(workbook, output_path, compresslevel)
         logger.info(f"Plik zapisany pomyślnie: {output_path}")
         return output_path
     except PermissionError:
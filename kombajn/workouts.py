@@ -0,0 +1,139 @@
+"""
+Biblioteka treningów strukturalnych i plan kontra wykonanie.
+
+Podsumowuje pliki .zwo/.erg/.mrc z katalogu (czas, NP, IF, TSS przy
+FTP z arkusza Ustawienia), a z harmonogramem CSV (Data;Trening) liczy
+planowane obciążenie dni i zestawia je z wykonaniem z Dziennika.
+
+Użycie:
+    python -m kombajn workouts treningi/ --cache .kombajn_workouts.json --ftp 280
+    python -m kombajn workouts treningi/ --schedule plan.csv --journal dziennik.xlsx --csv plan_vs.csv
+"""
+
+import argparse
+import csv
+import math
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from kombajn.engine.metrics import journal_metrics
+from kombajn.engine.workouts import (
+    PlanComparison,
+    PlannedDay,
+    WorkoutLibrary,
+    compare_plan,
+    load_schedule,
+    planned_days,
+    summarize_library,
+)
+from kombajn.journal import load_journal, read_settings
+
+
+def _value(value: float, digits: int = 1) -> Any:
+    """Liczba zaokrąglona do zapisu w CSV (NaN -> pusta komórka)."""
+    return "" if math.isnan(value) else round(value, digits)
+
+
+def write_library_csv(path: Path, library: WorkoutLibrary, ftp: float) -> None:
+    """Zapisuje podsumowania treningów do pliku CSV (separator ";")."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Plik", "Trening", "Sport", "Czas (min)", "NP (W)", "IF", "TSS"])
+        for file, summary in library.summaries.items():
+            writer.writerow([
+                file.name, summary.name, summary.sport, _value(summary.minutes),
+                _value(summary.normalized_power(ftp), 0), _value(summary.intensity(ftp), 2),
+                _value(summary.tss(ftp)),
+            ])
+
+
+def write_plan_csv(path: Path, days: Sequence[PlannedDay]) -> None:
+    """Zapisuje planowany TSS dni (format ``--taper`` / ``load_planned_tss``)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Data", "TSS"])
+        for day in days:
+            writer.writerow([day.day.isoformat(), _value(day.tss)])
+
+
+def write_comparison_csv(path: Path, comparison: Sequence[PlanComparison]) -> None:
+    """Zapisuje plan kontra wykonanie dzień po dniu (separator ";")."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow([
+            "Data", "Treningi", "Plan czas (min)", "Plan NP (W)", "Plan IF", "Plan TSS",
+            "Czas (min)", "TSS", "Różnica TSS",
+        ])
+        for row in comparison:
+            plan = row.planned
+            writer.writerow([
+                plan.day.isoformat(), " + ".join(plan.workouts), _value(plan.minutes),
+                _value(plan.normalized_power, 0), _value(plan.intensity, 2), _value(plan.tss),
+                _value(row.minutes), _value(row.tss), _value(row.tss_difference),
+            ])
+
+
+def add_parser(subparsers: Any) -> None:
+    """Rejestruje polecenie ``workouts`` w parserze CLI."""
+    parser = subparsers.add_parser(
+        "workouts",
+        help="Planowany TSS z plików treningów (.zwo/.erg/.mrc)",
+        description="Podsumowuje bibliotekę treningów i zestawia harmonogram z wykonaniem z Dziennika.",
+    )
+    parser.add_argument("library", type=Path, help="Katalog biblioteki treningów")
+    parser.add_argument("--schedule", type=Path, default=None,
+                        help="Harmonogram CSV (kolumny Data i Trening)")
+    parser.add_argument("--journal", type=Path, default=None,
+                        help="Dziennik (xlsx) - FTP z Ustawień i wykonanie")
+    parser.add_argument("--ftp", type=float, default=None,
+                        help="FTP (W); domyślnie z arkusza Ustawienia")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="Plik pamięci podręcznej podsumowań (JSON)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Liczba procesów analizy (domyślnie: 1)")
+    parser.add_argument("--csv", type=Path, default=None, dest="csv_output",
+                        help="Zapisz treningi (bez --schedule) lub plan kontra wykonanie do CSV")
+    parser.add_argument("--plan-csv", type=Path, default=None,
+                        help="Zapisz planowany TSS dni (Data;TSS) dla --taper")
+    parser.set_defaults(handler=run)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Uruchamia polecenie ``workouts`` (kod wyjścia 1 przy błędzie)."""
+    try:
+        workbook = load_journal(args.journal) if args.journal is not None else None
+        ftp: Optional[float] = args.ftp
+        if ftp is None and workbook is not None:
+            ftp = read_settings(workbook).get("FTP (W)")
+        if not isinstance(ftp, (int, float)) or ftp <= 0:
+            raise ValueError("Brak poprawnego FTP - podaj --ftp lub dziennik z uzupełnionymi [Ustawieniami]")
+        if not args.library.is_dir():
+            raise ValueError(f"Katalog biblioteki {args.library} nie istnieje")
+
+        library = summarize_library(args.library, args.workers, args.cache)
+        print(f"Treningi: {len(library.summaries)} (przeliczone: {library.computed}, "
+              f"pominięte: {len(library.errors)}), FTP {ftp:g} W")
+        if args.schedule is None:
+            if args.csv_output is not None:
+                write_library_csv(args.csv_output, library, ftp)
+                print(f"CSV: {args.csv_output}")
+            return 0
+
+        days = planned_days(load_schedule(args.schedule), library, ftp)
+        planned = sum(day.tss for day in days)
+        print(f"Plan: {len(days)} dni, {sum(day.minutes for day in days) / 60:.1f} h, TSS {planned:.0f}")
+        if args.plan_csv is not None:
+            write_plan_csv(args.plan_csv, days)
+            print(f"Plan TSS: {args.plan_csv}")
+        if workbook is not None:
+            comparison = compare_plan(days, journal_metrics(workbook))
+            done = sum(row.tss for row in comparison if not math.isnan(row.tss))
+            share = f" ({done / planned:.0%} planu)" if planned > 0 else ""
+            print(f"Wykonanie: TSS {done:.0f}{share}")
+            if args.csv_output is not None:
+                write_comparison_csv(args.csv_output, comparison)
+                print(f"CSV: {args.csv_output}")
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"[BŁĄD] {e}")
+        return 1
+    return 0
@@ -19,6 +19,7 @@ from kombajn.config import (
     LOG_HEADERS,
     CHO_HEADERS,
     POWER_ZONES,
+    log_column,
 )
 from kombajn.styles import ExcelStyles, DEFAULT_STYLES
 from kombajn.utils import (
@@ -74,8 +75,8 @@ class TestConfig:
         assert SHEET_CONFIG.ATL_DAYS == 7
     
     def test_log_headers_count(self):
-        """Sprawdza liczbę nagłówków dziennika (42 kolumny)."""
-        assert len(LOG_HEADERS) == 42
+        """Sprawdza liczbę nagłówków dziennika (45 kolumn)."""
+        assert len(LOG_HEADERS) == 45
     
     def test_log_headers_contain_power_metrics(self):
         """Sprawdza czy nagłówki zawierają metryki mocy."""
@@ -95,6 +96,33 @@ class TestStyles:
         assert DEFAULT_STYLES is not None
         assert isinstance(DEFAULT_STYLES, ExcelStyles)
 
+    def test_registry_interns_objects(self):
+        """Te same parametry zwracają ten sam obiekt; liczniki trafień/chybień."""
+        styles = ExcelStyles()
+        assert styles.stats().misses == 0
+
+        assert styles.font(bold=True) is styles.formula_font
+        assert styles.fill(COLORS.ZONE_3) is styles.fill(COLORS.ZONE_3)
+        assert styles.border(right="thick") is styles.thick_right_border
+        stats = styles.stats()
+        assert (stats.hits, stats.misses) == (3, 1)
+
+    def test_apply_reuses_cell_style(self):
+        """apply daje ten sam wynik co przypisanie i zapamiętuje kombinację."""
+        styles = ExcelStyles()
+        ws = Workbook().active
+        fill = styles.fill(COLORS.ZONE_1)
+        for row in range(1, 101):
+            styles.apply(ws.cell(row=row, column=1), fill=fill, border=styles.thin_border,
+                         number_format="0%")
+        ws["B1"].fill = fill
+        ws["B1"].border = styles.thin_border
+        ws["B1"].number_format = "0%"
+
+        assert styles.stats().cell_styles == 1
+        assert list(ws["A100"]._style) == list(ws["B1"]._style)
+        assert ws["A100"].number_format == "0%"
+
 
 class TestUtils:
     """Testy funkcji narzędziowych."""
@@ -119,6 +147,31 @@ class TestUtils:
             path = validate_output_path("../../etc/passwd", Path(tmpdir))
             assert str(path).startswith(tmpdir)
             assert path.name == "passwd.xlsx"
+    
+    def test_workbook_to_bytes_and_zip(self):
+        """Zapis do pamięci i do wpisów archiwum zip bez plików tymczasowych."""
+        import io
+        import zipfile
+        from openpyxl import load_workbook
+        from kombajn.utils import workbook_to_bytes, zip_workbooks
+        
+        wb = create_workbook()
+        fast, small = workbook_to_bytes(wb, 1), workbook_to_bytes(wb, 9)
+        assert len(small) < len(fast)
+        assert load_workbook(io.BytesIO(small))["Ustawienia"]["B6"].value == POWER_DEFAULTS.FTP
+        
+        buffer = io.BytesIO()
+        assert zip_workbooks(buffer, [("anna", wb), ("../jan.xlsx", create_workbook())]) == 2
+        with zipfile.ZipFile(buffer) as archive:
+            assert archive.namelist() == ["anna.xlsx", "jan.xlsx"]
+            assert archive.getinfo("anna.xlsx").compress_type == zipfile.ZIP_STORED
+            inner = load_workbook(io.BytesIO(archive.read("jan.xlsx")))
+            assert inner["Dziennik"].tables["Dziennik"].ref == "A1:AS91"
+        
+        with pytest.raises(ValueError):
+            workbook_to_bytes(wb, 10)
+        with pytest.raises(ValueError):
+            zip_workbooks(io.BytesIO(), [("a", wb), ("a.xlsx", wb)])
 
 
 class TestSheets:
@@ -143,10 +196,74 @@ class TestSheets:
         assert sheet.title == "Dziennik"
         assert sheet.cell(row=1, column=1).value == "Data"
         # Sprawdź metryki WKO5
-        headers = [sheet.cell(row=1, column=i).value for i in range(1, 43)]
+        headers = [sheet.cell(row=1, column=i).value for i in range(1, len(LOG_HEADERS) + 1)]
+        assert headers == LOG_HEADERS
         assert "TSS" in headers
         assert "CTL" in headers
-    
+        assert headers[-2:] == ["Sport", "Alert obciążenia"]
+
+    def test_log_sheet_column_styles(self):
+        """Tło i ramki jako style kolumn; strefy formatowaniem warunkowym."""
+        wb = Workbook()
+        wb.active.title = "Temp"
+        sheet = LogSheet(wb).create()
+
+        # Brak pustych, formatowanych komórek do MAX_LOG_ROWS
+        assert sheet.max_row == SHEET_CONFIG.INITIAL_DAYS_COUNT + 1
+        assert sheet.column_dimensions["A"].fill.fgColor.rgb.endswith(COLORS.INPUT_BG)
+        assert sheet.column_dimensions["T"].fill.fgColor.rgb.endswith(COLORS.FORMULA_BG)
+        # Zapisane komórki mają styl kolumny jawnie
+        assert sheet["A50"].fill.fgColor.rgb.endswith(COLORS.INPUT_BG)
+        assert sheet["U2"].fill.fgColor.rgb.endswith(COLORS.FORMULA_BG)
+        assert sheet["U2"].font.b and sheet["U2"].border.left.style == "thin"
+
+        # Formatowanie warunkowe tylko w wierszach tabeli (nie całe kolumny)
+        zone_range = f"W2:W{SHEET_CONFIG.INITIAL_DAYS_COUNT + 1}"
+        rules = [rule for cf in sheet.conditional_formatting if str(cf.sqref) == zone_range
+                 for rule in cf.rules]
+        assert [rule.formula for rule in rules] == [[f'"Z{i}"'] for i in range(1, 8)]
+        assert rules[6].dxf.fill.fgColor.rgb.endswith(COLORS.ZONE_7)
+
+    def test_log_sheet_table(self):
+        """Dziennik jest tabelą Excela z formułami kolumn obliczanych."""
+        wb = Workbook()
+        wb.active.title = "Temp"
+        sheet = LogSheet(wb, rows=14).create()
+        DashboardSheet(wb).create()
+
+        table = sheet.tables["Dziennik"]
+        assert table.ref == "A1:AS15"
+        assert [column.name for column in table.tableColumns] == LOG_HEADERS
+        tss = table.tableColumns[log_column("TSS") - 1].calculatedColumnFormula
+        assert tss.attr_text == sheet["U2"].value[1:] == sheet["U15"].value[1:]
+        assert table.tableColumns[0].calculatedColumnFormula is None
+        assert sheet.max_row == 15
+        assert "SUMIFS(Dziennik[TSS], Dziennik[Tydzień]" in wb["Dashboard"]["B21"].value
+
+    def test_journal_cells_get_column_style(self):
+        """Wiersze dopisane za wierszami startowymi powiększają tabelę i dostają styl kolumny."""
+        import datetime
+        from kombajn.journal import load_journal, log_date_rows, log_table, write_log_values
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dziennik.xlsx"
+            wb = create_workbook()
+            wb["Dziennik"]["A2"] = datetime.date(2026, 1, 1)
+            wb.save(path)
+
+            ws = load_journal(path)["Dziennik"]
+            day = datetime.date(2026, 1, 1) + datetime.timedelta(days=200)
+            assert write_log_values(ws, "Czas jazdy (min)", {day: 60}) == 1
+            assert log_date_rows(ws)[day] == 202
+            assert log_table(ws).ref == "A1:AS202"
+            # Kolory stref, alerty i lista dyscyplin rosną razem z tabelą
+            ranges = sorted(str(cf.sqref) for cf in ws.conditional_formatting)
+            assert ranges == ["AS2:AS202", "W2:W202"]
+            assert [str(v.sqref) for v in ws.data_validations.dataValidation] == ["AR2:AR202"]
+            assert "Dziennik[[#This Row],[TSS]]" in ws["AA202"].value
+            assert "X201" in ws["X202"].value and "X200" not in ws["X202"].value
+            assert ws["A202"].fill.fgColor.rgb.endswith(COLORS.INPUT_BG)
+            assert ws["K202"].fill.fgColor.rgb.endswith(COLORS.INPUT_BG)
+
     def test_dashboard_sheet_creation(self):
         """Testuje tworzenie arkusza Dashboard."""
         wb = Workbook()
@@ -158,6 +275,40 @@ class TestSheets:
         assert any("CTL" in str(cell.value or "") 
                    for row in sheet.iter_rows(max_row=20) for cell in row)
     
+    def test_dashboard_charts(self):
+        """Dashboard zawiera natywne wykresy PMC i tygodniowego TSS."""
+        import datetime
+        from kombajn.calc import Evaluator
+        from kombajn.journal import load_journal, write_log_values
+        wb = create_workbook()
+        pmc, weekly = wb["Dashboard"]._charts
+        last = SHEET_CONFIG.INITIAL_DAYS_COUNT + 1
+        assert [s.val.numRef.f for s in pmc.series] == [
+            f"'Dziennik'!${c}$2:${c}${last}" for c in "XYZ"
+        ]
+        assert [s.graphicalProperties.line.solidFill.srgbClr for s in pmc.series] == [
+            COLORS.CTL_COLOR, COLORS.ATL_COLOR, COLORS.TSB_COLOR
+        ]
+        assert weekly.series[0].val.numRef.f == "'Dashboard'!$B$43:$B$54"
+
+        # Tabela tygodniowa kończy się tygodniem ostatniego treningu
+        ev = Evaluator(wb)
+        ev.set_value("Dziennik", "A2", datetime.date(2026, 3, 2))
+        ev.set_values("Dziennik", {"K2": 60, "O2": 250, "K10": 120, "O10": 250})
+        assert ev.value("Dashboard", "A54") == ev.value("Dziennik", "A9")   # pon. 2026-03-09
+        assert [ev.value("Dashboard", f"B{row}") for row in (52, 53, 54)] == [0, 100, 200]
+
+        # Dopisanie wierszy do tabeli wydłuża serie wykresu PMC
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dziennik.xlsx"
+            wb["Dziennik"]["A2"] = datetime.date(2026, 1, 1)
+            wb.save(path)
+            journal = load_journal(path)
+            write_log_values(journal["Dziennik"], "TSS", {datetime.date(2026, 5, 1): 80})
+            pmc = journal["Dashboard"]._charts[0]
+            assert pmc.series[0].val.numRef.f == "'Dziennik'!$X$2:$X$122"
+            assert pmc.series[0].cat.numRef.f == "'Dziennik'!$A$2:$A$122"
+
     def test_power_zones_sheet_creation(self):
         """Testuje tworzenie arkusza Strefy Mocy."""
         wb = Workbook()
@@ -246,5 +397,1587 @@ class TestFormulas:
         assert min_w_cell.value is not None and str(min_w_cell.value).startswith('=')
 
 
+class TestIntervals:
+    """Testy detektora interwałów."""
+    
+    @staticmethod
+    def _workout(efforts: int = 4, power: float = 290.0):
+        """Rozgrzewka, N × 5 min wysiłku z przerwami 3 min, schłodzenie."""
+        import numpy as np
+        block = np.r_[np.full(300, power), np.full(180, 120.0)]
+        return np.r_[np.full(600, 150.0), np.tile(block, efforts), np.full(600, 150.0)]
+    
+    def test_detects_efforts_with_zone(self):
+        """Wykrywa 4 wysiłki Z5 o czasie ~5 min."""
+        from kombajn.engine import detect_intervals
+        intervals = detect_intervals(self._workout(), ftp=250)
+        
+        assert len(intervals) == 4
+        assert all(i.zone == 5 for i in intervals)
+        assert all(abs(i.duration - 300) <= 10 for i in intervals)
+        assert all(abs(i.avg_power - 290) < 1 for i in intervals)
+    
+    def test_hysteresis_ignores_short_dips(self):
+        """Krótki spadek mocy nie dzieli wysiłku na dwa."""
+        import numpy as np
+        from kombajn.engine import detect_intervals
+        power = np.r_[np.full(300, 100.0), np.full(600, 230.0), np.full(300, 100.0)]
+        power[600:610] = 180.0  # wygładzona moc spada poniżej progu wejścia
+        
+        intervals = detect_intervals(power, ftp=250)
+        assert len(intervals) == 1
+        assert intervals[0].zone_label == "Z4"
+    
+    def test_summary_groups_similar_efforts(self):
+        """Podsumowanie grupuje wysiłki o tej samej strefie i czasie."""
+        from kombajn.engine import detect_intervals, summarize_intervals
+        summary = summarize_intervals(detect_intervals(self._workout(), ftp=250))
+        assert summary == "Interwały: 4×5:00 Z5 (śr. 290 W)"
+        assert summarize_intervals([]) == ""
+    
+    def test_archive_batch_writes_notes(self):
+        """Analiza archiwum dopisuje podsumowanie do kolumny Notatki."""
+        import datetime
+        from kombajn.engine import annotate_journal
+        from kombajn.journal import load_journal, log_date_rows
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            archive = tmp / "archiwum"
+            archive.mkdir()
+            with (archive / "2026-03-02_vo2.csv").open("w") as f:
+                f.write("time,power\n")
+                for t, p in enumerate(self._workout()):
+                    f.write(f"{t},{p}\n")
+            (archive / "2026-03-03_z2.json").write_text("[150, 150, 150]")
+            
+            wb = create_workbook()
+            wb["Dziennik"]["A2"] = datetime.date(2026, 3, 1)
+            journal = safe_save_workbook(wb, "dziennik.xlsx", tmp)
+            
+            assert annotate_journal(journal, archive) == 1
+            # Ponowne uruchomienie nie duplikuje notatek
+            assert annotate_journal(journal, archive) == 0
+            
+            ws = load_journal(journal)["Dziennik"]
+            row = log_date_rows(ws)[datetime.date(2026, 3, 2)]
+            assert row == 3
+            notes_col = log_column("Notatki")
+            assert ws.cell(row=row, column=notes_col).value.startswith("Interwały: 4×5:00 Z5")
+
+
+class TestMetabolic:
+    """Testy modelu spalania CHO/tłuszczów."""
+    
+    def test_cho_share_grows_with_power(self):
+        """Udział CHO rośnie z intensywnością, tłuszcze maleją powyżej FatMax."""
+        import numpy as np
+        from kombajn.engine import substrate_rates
+        cho, fat = substrate_rates(np.array([100.0, 150.0, 200.0, 250.0]))
+        
+        assert np.all(np.diff(cho) > 0)
+        assert fat[2] < fat[1]
+        assert np.all(fat >= 0)
+    
+    def test_higher_vlamax_burns_more_cho(self):
+        """Wyższe VLaMax = więcej spalonego CHO przy tej samej mocy."""
+        import numpy as np
+        from kombajn.engine import MetabolicProfile, ride_combustion, fatmax_power
+        power = np.full(3600, 180.0)
+        low = ride_combustion(power, MetabolicProfile(vlamax=0.3))
+        high = ride_combustion(power, MetabolicProfile(vlamax=0.7))
+        
+        assert high.cho_g > low.cho_g
+        assert fatmax_power(MetabolicProfile(vlamax=0.7)) < fatmax_power(MetabolicProfile(vlamax=0.3))
+    
+    def test_season_matches_single_rides(self):
+        """Przebieg sezonowy daje te same sumy co pojedyncze aktywności."""
+        import numpy as np
+        from kombajn.engine import ride_combustion, season_combustion
+        rng = np.random.default_rng(0)
+        streams = [rng.uniform(50, 350, n) for n in (3600, 0, 5400)]
+        
+        season = season_combustion(streams)
+        assert season[1].duration_s == 0 and season[1].cho_g == 0
+        for stream, combustion in zip(streams, season):
+            single = ride_combustion(stream)
+            assert combustion.duration_s == stream.size
+            assert abs(combustion.cho_g - single.cho_g) < 1e-6
+    
+    def test_profile_from_settings(self):
+        """Profil czyta VO2max/VLaMax z Ustawień, puste pola -> domyślne."""
+        from kombajn.engine import MetabolicProfile
+        from kombajn.journal import read_settings
+        
+        wb = create_workbook()
+        wb["Ustawienia"]["B16"] = 0.65
+        profile = MetabolicProfile.from_settings(read_settings(wb))
+        assert profile.vlamax == 0.65
+        assert profile.vo2max == METABOLIC_DEFAULTS.VO2MAX
+        assert MetabolicProfile.from_settings({"VO2max (ml/kg/min)": ""}).vo2max == 55.0
+    
+    def test_cho_burned_written_after_notes(self):
+        """Spalone CHO trafia do kolumny dopisanej za "Notatki" (stare kolumny bez zmian)."""
+        import datetime
+        from kombajn.engine import annotate_cho_burned
+        from kombajn.journal import load_journal
+        
+        assert log_column("CHO spalone (g)") == log_column("Notatki") + 1
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            archive = tmp / "archiwum"
+            archive.mkdir()
+            (archive / "2026-05-10_a.json").write_text(str([200] * 3600))
+            (archive / "2026-05-10_b.json").write_text(str([150] * 1800))
+            
+            wb = create_workbook()
+            wb["Dziennik"]["A2"] = datetime.date(2026, 5, 9)
+            journal = safe_save_workbook(wb, "dziennik.xlsx", tmp)
+            
+            assert annotate_cho_burned(journal, archive) == 1
+            ws = load_journal(journal)["Dziennik"]
+            burned = ws.cell(row=3, column=log_column("CHO spalone (g)")).value
+            assert 150 < burned < 250
+
+
+class TestFueling:
+    """Testy planera żywienia."""
+    
+    def test_products_from_sample_data(self):
+        """Produkty do jazdy z CHO w porcji, bez posiłków."""
+        from kombajn.engine.fueling import products_from_table
+        products = {p.name: p for p in products_from_table()}
+        
+        assert products["Żel Maurten 100"].cho_g == 25.0
+        assert "Makaron (ugotowany)" not in products
+        assert abs(products["Mix MD:Fruktoza 1:0.8"].fructose_share - 0.8 / 1.8) < 1e-9
+    
+    def test_slot_uses_fewest_items(self):
+        """Slot 30 g przy produktach 10/30 g -> jedna porcja 30 g."""
+        from kombajn.engine.fueling import FuelingPlanner, FuelProduct
+        planner = FuelingPlanner(
+            [FuelProduct("A", 10.0, 0.44), FuelProduct("B", 30.0, 0.44)]
+        )
+        assert planner.best_combination(30)[2] == ("B",)
+        assert planner.best_combination(40)[2] == ("A", "B")
+    
+    def test_ratio_constraint(self):
+        """Stosunek 1:0.8 wymusza mieszankę glukozy i fruktozy."""
+        from kombajn.engine.fueling import FuelingPlanner, FuelProduct
+        products = [FuelProduct("MD", 25.0, 0.0), FuelProduct("FR", 20.0, 1.0)]
+        cho, fructose, names = FuelingPlanner(products).best_combination(45)
+        
+        assert sorted(names) == ["FR", "MD"]
+        assert abs(fructose / cho - 0.8 / 1.8) < 0.1
+
+    def test_large_catalogue_is_pruned(self):
+        """Duży katalog: przeszukiwanych jest najwyżej max_products produktów."""
+        import random
+        from kombajn.engine.fueling import FuelingPlanner, FuelProduct
+        rng = random.Random(7)
+        products = [
+            FuelProduct(f"P{i}", round(rng.uniform(5, 100), 1), round(rng.random(), 2))
+            for i in range(10000)
+        ]
+        planner = FuelingPlanner(products, max_products=24)
+        plan = planner.plan(90, 4)
+
+        assert all(len(products) <= 24 for products, _ in planner._levels)
+        assert all(abs(s.cumulative_cho_g - s.target_cho_g) <= 5 for s in plan.slots)
+        assert all(abs(s.fructose_g / s.cho_g - 0.8 / 1.8) <= 0.1 for s in plan.slots)
+
+    def test_plan_tracks_cumulative_target(self):
+        """Narastające CHO nie odbiega od celu o więcej niż jedną porcję."""
+        from kombajn.engine.fueling import FuelingPlanner
+        planner = FuelingPlanner()
+        plan = planner.plan(90, 4)
+        
+        assert len(plan.slots) == 16
+        assert abs(plan.total_cho_g - 360) <= 30
+        assert all(abs(s.cumulative_cho_g - s.target_cho_g) <= 30 for s in plan.slots)
+        assert planner.cache_hits > 0
+    
+    def test_plan_total_within_tolerance(self):
+        """Odchyłka narastająca nie rośnie ze slotami - suma w celu ± tolerancja."""
+        from kombajn.engine.fueling import FuelingPlanner
+        planner = FuelingPlanner()
+        plan = planner.plan(90, 4)
+        
+        assert abs(plan.total_cho_g - 360) <= planner.tolerance_g
+        assert all(
+            abs(s.cumulative_cho_g - s.target_cho_g) <= planner.tolerance_g + 1e-9
+            for s in plan.slots
+        )
+    
+    def test_plan_skips_slot_instead_of_overshooting(self):
+        """Pusty slot, gdy każda porcja przekroczyłaby cel bardziej niż brak porcji."""
+        from kombajn.engine.fueling import FuelingPlanner, FuelProduct
+        planner = FuelingPlanner([FuelProduct("Żel", 25.0, 0.44)])
+        plan = planner.plan(50, 1)
+        
+        assert [s.items for s in plan.slots] == [(), ("Żel",), (), ("Żel",)]
+        assert abs(plan.total_cho_g - 50) <= planner.tolerance_g
+    
+    def test_all_durations_are_prefixes(self):
+        """Plany krótsze są prefiksami planu najdłuższego."""
+        from kombajn.engine.fueling import FuelingPlanner
+        plans = FuelingPlanner().plan_all_durations(60, 3)
+        
+        assert sorted(plans) == [0.25 * n for n in range(1, 13)]
+        assert plans[3.0].slots[:4] == plans[1.0].slots
+    
+    def test_fueling_plan_sheet(self):
+        """Plan trafia do arkusza [Plan żywienia] jako oś czasu."""
+        from kombajn.engine.fueling import FuelingPlanner
+        plan = FuelingPlanner().plan(60, 2)
+        wb = create_workbook(plan)
+        
+        assert len(wb.sheetnames) == 6
+        ws = wb["Plan żywienia"]
+        values = [cell.value for row in ws.iter_rows() for cell in row]
+        assert "Minuta" in values
+        assert 105 in values  # ostatni slot 2h planu
+
+
+class TestProducts:
+    """Testy bazy produktów CHO."""
+    
+    def test_default_store_matches_sample_data(self):
+        """Domyślna baza odtwarza CHO_SAMPLE_DATA."""
+        from kombajn.config import CHO_SAMPLE_DATA
+        from kombajn.products import default_store
+        store = default_store()
+        
+        assert len(store) == len(CHO_SAMPLE_DATA)
+        assert list(store.rows()) == [tuple(row) for row in CHO_SAMPLE_DATA]
+        assert store[1].cho_per_portion == 25.0
+    
+    def test_indexes_and_prefix_search(self):
+        """Indeksy typu/wchłaniania i wyszukiwanie po prefiksie."""
+        from kombajn.products import default_store
+        store = default_store()
+        
+        gels = {store.names[i] for i in store.by_type("żel")}
+        assert gels == {"Żel SiS GO", "Żel Maurten 100", "Żel z kofeiną"}
+        assert {store.names[i] for i in store.search_prefix("ŻEL")} == gels | {"Żelki Haribo"}
+        assert len(store.search_prefix("xyz")) == 0
+        fast_gels = store.query(product_type="żel", prefix="żel m")
+        assert [store.names[i] for i in fast_gels] == ["Żel Maurten 100"]
+        assert len(store.by_absorption("bardzo szybka")) == 1
+    
+    def test_csv_and_json_roundtrip(self):
+        """Baza wczytuje CSV (polskie nagłówki) i JSON."""
+        import json
+        from kombajn.products import ProductStore, default_store
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = Path(tmpdir) / "katalog.csv"
+            default_store().save_csv(csv_path)
+            assert list(ProductStore.load(csv_path).rows()) == list(default_store().rows())
+            
+            pl_path = Path(tmpdir) / "sklep.csv"
+            pl_path.write_text("Nazwa produktu,Porcja (g)\nŻel testowy,40\n", encoding="utf-8")
+            assert ProductStore.load(pl_path)[0].portion_g == 40.0
+            
+            json_path = Path(tmpdir) / "katalog.json"
+            json_path.write_text(json.dumps([
+                {"name": "Izo", "portion_g": 500, "cho_100g": 6, "type": "napój",
+                 "fructose_share": 0.3}
+            ]), encoding="utf-8")
+            product = ProductStore.load(json_path)[0]
+            assert product.product_type == "napój"
+            assert abs(product.fructose_share - 0.3) < 1e-6
+    
+    def test_large_catalogue_sheet(self):
+        """Arkusz Źródła CHO budowany z dużego katalogu."""
+        import time
+        from kombajn.products import ProductStore, default_store
+        base = list(default_store().rows())
+        rows = [(f"{r[0]} #{i}",) + r[1:] for i in range(200) for r in base]
+        store = ProductStore.from_rows(rows)
+        
+        wb = Workbook()
+        wb.active.title = "Temp"
+        start = time.perf_counter()
+        ws = CHOSourcesSheet(wb, store).create()
+        elapsed = time.perf_counter() - start
+        
+        assert ws.cell(row=len(rows) + 2, column=1).value == rows[-1][0]
+        last_formula = ws.cell(row=len(rows) + 2, column=5)
+        assert last_formula.value.startswith(f"=IF(OR(B{len(rows) + 2}")
+        assert last_formula.fill.fgColor.rgb.endswith(COLORS.FORMULA_BG)
+        assert elapsed < 2.0
+    
+    def test_planner_uses_store_fructose(self):
+        """Planer korzysta z udziału fruktozy zapisanego w bazie."""
+        from kombajn.engine.fueling import products_from_store
+        from kombajn.products import default_store
+        products = {p.name: p for p in products_from_store(default_store(), product_type="żel")}
+        
+        assert set(products) == {"Żel SiS GO", "Żel Maurten 100", "Żel z kofeiną"}
+        assert abs(products["Żel Maurten 100"].fructose_share - 0.8 / 1.8) < 1e-3
+
+class TestPMC:
+    """Testy symulatora PMC i optymalizatora taperu."""
+    
+    def test_matches_recurrence(self):
+        """Wektorowy PMC daje to samo co rekurencja dzień po dniu (także > 1 blok)."""
+        import numpy as np
+        from kombajn.engine.pmc import pmc
+        tss = np.random.default_rng(1).uniform(0, 150, 600)
+        ctl, atl, tsb = pmc(tss, 50.0, 40.0)
+        
+        c, a = 50.0, 40.0
+        for t, ctl_v, atl_v in zip(tss, ctl, atl):
+            c += (t - c) / SHEET_CONFIG.CTL_DAYS
+            a += (t - a) / SHEET_CONFIG.ATL_DAYS
+            assert abs(ctl_v - c) < 1e-9 and abs(atl_v - a) < 1e-9
+        assert np.allclose(tsb, ctl - atl)
+    
+    def test_batch_of_plans(self):
+        """Wiele planów liczone naraz z osobnymi wartościami startowymi."""
+        import numpy as np
+        from kombajn.engine.pmc import ewma_load
+        plans = np.array([[100.0] * 10, [0.0] * 10])
+        loads = ewma_load(plans, np.array([0.0, 70.0]), 7)
+        assert loads.shape == (2, 10)
+        assert np.all(np.diff(loads[0]) > 0) and np.all(np.diff(loads[1]) < 0)
+    
+    def test_taper_hits_race_window(self):
+        """Taper trafia w okno TSB +10..+25 przy niewielkiej utracie CTL."""
+        import datetime
+        from kombajn.engine.pmc import optimize_taper
+        start = datetime.date(2026, 4, 1)
+        race = start + datetime.timedelta(days=70)
+        plan = optimize_taper([90.0] * 80, start, race, ctl0=70.0, atl0=80.0)
+        
+        assert plan.in_window
+        assert SHEET_CONFIG.TSB_RACE_MIN <= plan.race_tsb <= SHEET_CONFIG.TSB_RACE_MAX
+        assert 0 < plan.ctl_loss < 15
+        assert plan.candidates > 1000
+        # TSB w dniu wyścigu to forma z końca przeddnia
+        race_index = plan.dates.index(race)
+        assert abs(plan.tsb[race_index - 1] - plan.race_tsb) < 1e-9
+        assert plan.tss[race_index - 1] < 90.0
+    
+    def test_race_outside_plan(self):
+        """Wyścig poza planem zgłasza błąd."""
+        import datetime
+        from kombajn.engine.pmc import optimize_taper
+        start = datetime.date(2026, 4, 1)
+        with pytest.raises(ValueError):
+            optimize_taper([80.0] * 10, start, start + datetime.timedelta(days=30))
+    
+    def test_plan_sheet(self):
+        """Arkusz Plan z prognozą trafia do skoroszytu."""
+        import datetime
+        from kombajn.engine.pmc import load_planned_tss, optimize_taper
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "plan.csv"
+            lines = ["Data;TSS"] + [
+                f"{datetime.date(2026, 5, 1) + datetime.timedelta(days=i)};{80 + i % 3 * 20}"
+                for i in range(0, 60) if i % 7 != 6
+            ]
+            path.write_text("\n".join(lines), encoding="utf-8")
+            start, tss = load_planned_tss(path)
+        
+        assert start == datetime.date(2026, 5, 1)
+        assert len(tss) == 60 and tss[6] == 0.0
+        
+        plan = optimize_taper(tss, start, datetime.date(2026, 6, 20), ctl0=60.0, atl0=60.0)
+        wb = create_workbook(taper_plan=plan)
+        ws = wb["Plan"]
+        assert ws['A1'].value.startswith("🏁")
+        notes = [ws.cell(row=r, column=7).value for r in range(1, ws.max_row + 1)]
+        assert notes.count("🏁 Wyścig") == 1
+        assert notes.count("Taper") == plan.taper_days
+
+class TestCalc:
+    """Testy ewaluatora formuł."""
+    
+    @pytest.fixture(scope="class")
+    @classmethod
+    def workbook(cls):
+        return create_workbook()
+    
+    def test_tokenize_references(self):
+        """Tokenizer rozpoznaje funkcje, odwołania arkuszy i całe kolumny."""
+        from kombajn.calc import parse_reference, tokenize
+        tokens = tokenize("=IFERROR(SUMIFS('Dziennik'!U:U, 'Dziennik'!B:B, $B$18), \"--\")")
+        kinds = [t.kind for t in tokens]
+        assert kinds[:3] == ["FUNC", "LPAREN", "FUNC"]
+        assert [t.text for t in tokens if t.kind == "REF"] == ["'Dziennik'!U:U", "'Dziennik'!B:B", "$B$18"]
+        
+        whole = parse_reference("'Dziennik'!U:U")
+        assert whole.sheet == "Dziennik" and whole.is_unbounded and whole.min_col == 21
+        assert parse_reference("Ustawienia!$B$6").is_cell
+    
+    def test_expressions(self):
+        """Priorytety operatorów, porównania i błędy jak w Excelu."""
+        from kombajn.calc import Evaluator, ExcelError
+        wb = Workbook()
+        ws = wb.active
+        ws["A1"] = 4
+        ws["B1"] = '=-A1^2 + 10%*A1 & "x"'
+        ws["B2"] = '=IF(A2="", "pusta", A2)'
+        ws["B3"] = "=A1/A2"
+        ws["B4"] = '=IFERROR(B3, "błąd")'
+        ws["B5"] = "=ROUND(2.675, 2) + ROUND(-0.5, 0)"
+        ws["B6"] = "=FOO(1)"
+        ev = Evaluator(wb)
+        
+        assert ev.value("Sheet", "B1") == "16.4x"
+        assert ev.value("Sheet", "B2") == "pusta"
+        assert ev.value("Sheet", "B3") == ExcelError("#DIV/0!")
+        assert ev.value("Sheet", "B4") == "błąd"
+        assert abs(ev.value("Sheet", "B5") - (2.68 - 1)) < 1e-9
+        assert ev.value("Sheet", "B6") == ExcelError("#NAME?")
+    
+    def test_blank_template(self, workbook):
+        """Pusty szablon liczy się bez błędów."""
+        import datetime
+        from kombajn.calc import Evaluator, ExcelError
+        ev = Evaluator(workbook)
+        ev.recalculate()
+        errors = [
+            (key, compiled.text) for key, compiled in ev.formulas()
+            if isinstance(ev.cell_value(*key), ExcelError)
+        ]
+        assert errors == []
+        assert ev.value("Ustawienia", "B25") == 2300
+        assert ev.value("Dashboard", "B4") == "--"
+        # Puste pole wyboru -> bieżący tydzień liczony formułą (szara komórka)
+        dashboard = workbook["Dashboard"]
+        assert dashboard["B18"].value is None
+        assert dashboard["B18"].fill.fgColor.rgb.endswith(COLORS.INPUT_BG)
+        assert dashboard["C18"].fill.fgColor.rgb.endswith(COLORS.FORMULA_BG)
+        today = datetime.date.today()
+        jan1 = datetime.date(today.year, 1, 1)
+        assert ev.value("Dashboard", "C18") == ((today - jan1).days + jan1.weekday()) // 7 + 1
+        assert ev.value("Strefy Mocy", "C3") == POWER_DEFAULTS.FTP
+    
+    def test_log_row_values(self, workbook):
+        """Formuły dziennika i Dashboardu dają poprawne liczby."""
+        import datetime
+        from kombajn.calc import Evaluator
+        ev = Evaluator(workbook)
+        ev.set_value("Dziennik", "A2", datetime.date(2026, 3, 2))
+        ev.set_values("Dziennik", {"D2": 74.0, "K2": 60, "O2": 250})
+        ev.set_value("Dashboard", "B18", 10)
+        assert ev.value("Dashboard", "C18") == 10
+        
+        assert ev.value("Dziennik", "B2") == 10
+        assert ev.value("Dziennik", "C2") == "Mon"
+        assert ev.value("Dziennik", "T2") == 1.0
+        assert ev.value("Dziennik", "U2") == 100
+        assert ev.value("Dziennik", "W2") == "Z4"
+        # CTL/ATL: rekurencja wykładnicza od wartości startowych (0)
+        assert abs(ev.value("Dziennik", "X2") - 100 / SHEET_CONFIG.CTL_DAYS) < 1e-9
+        assert abs(ev.value("Dziennik", "Z2") - (100 / 42 - 100 / 7)) < 1e-9
+        # TDEE = CPM (2300) + kcal treningu (100 TSS * FTP / 100 * 3.6)
+        assert ev.value("Dziennik", "AB2") == 2300 + 900
+        assert ev.value("Dziennik", "AC2") == 3200 - DEFAULTS.DEFICIT
+        assert ev.value("Dziennik", "AF2") == DEFAULTS.PROTEIN_RATIO * POWER_DEFAULTS.WEIGHT_KG
+        # Dashboard: CTL dnia ostatniego treningu, nie ostatniego wiersza tabeli
+        last = SHEET_CONFIG.INITIAL_DAYS_COUNT + 1
+        assert ev.value("Dashboard", "B4") == ev.value("Dziennik", "X2")
+        assert ev.value("Dashboard", "B4") != ev.value("Dziennik", f"X{last}")
+        assert ev.value("Dashboard", "B21") == 100
+        assert ev.value("Dashboard", "B28") == 1
+        assert ev.value("Strefy Mocy", "F6") == round(POWER_DEFAULTS.FTP * POWER_ZONES[0].max_pct)
+    
+    def test_structured_references(self, workbook):
+        """Odwołania do tabeli są rozwijane wg jej bieżącego zakresu."""
+        from kombajn.calc import expand_structured, workbook_tables
+        tables = workbook_tables(workbook)
+        last = SHEET_CONFIG.INITIAL_DAYS_COUNT + 1
+        
+        assert expand_structured("=SUM(Dziennik[TSS])", "Dashboard", 5, 2, tables) == \
+            f"=SUM('Dziennik'!$U$2:$U${last})"
+        assert expand_structured("=[@TSS]*2", "Dziennik", 7, 27, tables) == "='Dziennik'!$U$7*2"
+        assert expand_structured("=Dziennik[[#This Row],[TSS]]", "Dashboard", 1, 1, tables) == "=#REF!"
+        assert expand_structured('="[x]"&Dziennik[[#Headers],[Waga (kg)]:[Waga śr. 7d]]',
+                                 "Dashboard", 1, 1, tables) == \
+            "=\"[x]\"&'Dziennik'!$D$1:$E$1"
+    
+    def test_incremental_recalculation(self, workbook):
+        """Po zmianie przeliczane są tylko komórki zależne."""
+        from kombajn.calc import Evaluator
+        ev = Evaluator(workbook)
+        full = ev.recalculate()
+        
+        ev.set_value("Dziennik", "D2", 80)
+        # Waga 7d we wszystkich wierszach tabeli i średnia waga w Dashboard
+        assert ev.recalculate() == SHEET_CONFIG.INITIAL_DAYS_COUNT + 1
+        assert ev.value("Dziennik", "E2") == 80
+        
+        ev.set_value("Ustawienia", "B6", 300)
+        touched = ev.recalculate()
+        assert 0 < touched < full
+        assert ev.value("Strefy Mocy", "C3") == 300
+        assert ev.value("Ustawienia", "B17") == 165
+        assert ev.recalculate() == 0
+
+class TestFormulaCost:
+    """Testy analizy kosztu formuł."""
+    
+    def test_flags_volatile_and_unbounded(self):
+        """Analiza zgłasza INDIRECT/TODAY i odwołania do całych kolumn."""
+        from kombajn.calc import analyze_workbook
+        wb = Workbook()
+        ws = wb.active
+        ws["A1"] = "=SUM(B:B)"
+        ws["A2"] = '=AVERAGE(INDIRECT("B1:B"&ROW()))'
+        ws["A3"] = "=TODAY()-B1"
+        ws["A4"] = "=SUM(B1:C10)"
+        report = analyze_workbook(wb)
+        
+        assert [i.coordinate for i in report.issues_of("unbounded")] == ["A1"]
+        assert sorted(i.detail for i in report.issues_of("volatile")) == ["INDIRECT", "TODAY"]
+        cost = report.sheets["Sheet"]
+        assert cost.formulas == 4 and cost.volatile_formulas == 2
+        assert cost.cell_visits == 1_048_576 + 1 + 20
+        assert report.over_budget(max_cell_visits=1000, max_volatile=1) == [
+            "[Sheet] 1,048,597 odwiedzin komórek (limit 1,000)",
+            "[Sheet] 2 formuł ulotnych (limit 1)",
+        ]
+    
+    def test_generated_workbook_within_budget(self):
+        """Wygenerowany skoroszyt mieści się w budżecie przeliczania."""
+        import time
+        from kombajn.calc import analyze_workbook
+        wb = create_workbook()
+        start = time.perf_counter()
+        report = analyze_workbook(wb)
+        elapsed = time.perf_counter() - start
+        
+        assert report.issues_of("unbounded") == []
+        assert report.over_budget() == []
+        assert report.sheets["Dashboard"].formulas > 0
+        assert elapsed < 1.0
+
+
+class TestCrossValidation:
+    """Testy walidacji krzyżowej formuł Dziennika z silnikiem."""
+    
+    def test_log_metrics(self):
+        """Metryki silnika dla prostego dziennika."""
+        import numpy as np
+        from kombajn.engine import log_metrics
+        m = log_metrics([60, np.nan, 90], [200, np.nan, 300], ftp=200, weight_kg=80)
+        
+        assert m.intensity[0] == 1.0 and np.isnan(m.intensity[1])
+        assert m.tss[0] == pytest.approx(100.0)
+        assert m.tss[2] == pytest.approx(337.5)
+        assert m.w_per_kg[2] == pytest.approx(3.75)
+        assert list(m.zone) == ["Z4", "", "Z7"]
+        assert m.ctl[0] == pytest.approx(100 / 42)
+        assert m.tsb[0] == pytest.approx(m.ctl[0] - m.atl[0])
+    
+    def test_local_backend_matches_engine(self):
+        """Formuły przeliczone przez kombajn.calc zgadzają się z silnikiem."""
+        from kombajn.crossval import cross_validate
+        report = cross_validate(cases=8, workers=1, backend="local", days=30)
+        assert report.ok, report.mismatches[:5]
+        assert report.cases == 8
+    
+    def test_compare_case_reports_mismatch(self):
+        """Zmieniona wartość arkusza jest zgłaszana jako rozbieżność."""
+        from kombajn.crossval import LocalBackend, compare_case, synthetic_log
+        log = synthetic_log(seed=3, days=20)
+        values = LocalBackend(20).evaluate(log)
+        assert compare_case(log, values) == []
+        
+        day = next(i for i, tss in enumerate(values["TSS"]) if tss not in ("", None))
+        values["TSS"][day] += 1.0
+        mismatches = compare_case(log, values)
+        assert [(m.day, m.column) for m in mismatches] == [(day, "TSS")]
+
+
+
+class TestRollover:
+    """Testy zamknięcia sezonu."""
+    
+    def test_rollover_archives_and_carries_pmc(self):
+        """Stare wpisy trafiają do archiwum, CTL/ATL przechodzą do nowego sezonu."""
+        import datetime
+        import numpy as np
+        from openpyxl import load_workbook
+        from kombajn.calc import Evaluator
+        from kombajn.engine.metrics import log_metrics
+        from kombajn.rollover import rollover
+        
+        start = datetime.date(2025, 12, 1)
+        minutes = [60 + 5 * (i % 7) if i % 3 else None for i in range(45)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dziennik.xlsx"
+            wb = create_workbook()
+            ws = wb["Dziennik"]
+            ws["A2"] = start
+            for i, duration in enumerate(minutes):
+                if duration is not None:
+                    ws[f"K{i + 2}"], ws[f"O{i + 2}"] = duration, 240
+            ws["AP40"] = "po sezonie"
+            wb.save(path)
+            
+            result = rollover(path, 2026)
+            assert result.archived_days == 31 and result.kept_days == 10
+            
+            # Archiwum: same wartości, metryki jak w silniku
+            engine = log_metrics(
+                np.array([m or np.nan for m in minutes[:31]], dtype=float),
+                np.where([m is None for m in minutes[:31]], np.nan, 240.0),
+                POWER_DEFAULTS.FTP, POWER_DEFAULTS.WEIGHT_KG,
+            )
+            archive = load_workbook(result.archive_path)["Dziennik"]
+            rows = list(archive.iter_rows(min_row=2, values_only=True))
+            assert len(rows) == 31 and rows[0][0].date() == start
+            assert not any(isinstance(v, str) and v.startswith("=") for row in rows for v in row)
+            assert rows[1][log_column("TSS") - 1] == pytest.approx(engine.tss[1])
+            # Pełna precyzja (zaokrągla tylko format liczb Ustawień)
+            assert result.ctl_seed == pytest.approx(engine.ctl[-1], rel=1e-12)
+            
+            # Aktywny dziennik: sezon od 1 stycznia, PMC kontynuowane
+            journal = load_workbook(path)
+            assert journal.sheetnames.index("Dziennik") == 1
+            assert journal["Dziennik"]["A2"].value.date() == datetime.date(2026, 1, 1)
+            assert journal["Dziennik"]["AP9"].value == "po sezonie"
+            assert journal["Ustawienia"]["B38"].value == result.ctl_seed
+            continued = log_metrics(
+                np.array([m or np.nan for m in minutes], dtype=float),
+                np.where([m is None for m in minutes], np.nan, 240.0),
+                POWER_DEFAULTS.FTP, POWER_DEFAULTS.WEIGHT_KG,
+            )
+            ctl = Evaluator(journal).value("Dziennik", "X10")
+            assert ctl == pytest.approx(continued.ctl[39], abs=1e-9)
+            
+            with pytest.raises(ValueError):
+                rollover(path, 2026)
+
+    def test_seed_decays_over_gap(self):
+        """Przerwa między ostatnim wpisem a początkiem sezonu wygasza CTL/ATL."""
+        import datetime
+        import math
+        import numpy as np
+        from kombajn.engine.metrics import log_metrics
+        from kombajn.rollover import rollover
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dziennik.xlsx"
+            wb = create_workbook()
+            ws = wb["Dziennik"]
+            ws["A2"] = datetime.date(2025, 12, 1)
+            ws["K2"], ws["O2"] = 60, 240
+            # Dziennik kończy się na jednym dniu - sezon od 11 grudnia (9 dni przerwy)
+            ws.delete_rows(3, ws.max_row)
+            wb.save(path)
+            result = rollover(path, 2026, start=datetime.date(2025, 12, 11))
+
+            engine = log_metrics(np.array([60.0]), np.array([240.0]),
+                                 POWER_DEFAULTS.FTP, POWER_DEFAULTS.WEIGHT_KG)
+            assert result.archived_days == 1
+            assert result.ctl_seed == pytest.approx(engine.ctl[0] * math.exp(-9 / 42))
+            assert result.atl_seed == pytest.approx(engine.atl[0] * math.exp(-9 / 7))
+
+
+class TestMerge:
+    """Testy scalania kopii dziennika."""
+    
+    def test_merge_resolves_per_column_policy(self):
+        """Konflikty wg polityk kolumn, daty tylko z B są dopisywane."""
+        import csv
+        import datetime
+        from openpyxl import load_workbook
+        from kombajn.journal import write_log_values
+        from kombajn.merge import merge_journals
+        
+        start = datetime.date(2026, 3, 2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            wb = create_workbook()
+            ws = wb["Dziennik"]
+            ws["A2"] = start
+            ws["D2"], ws["K2"], ws["AP2"] = 74.0, 60, "laptop"
+            wb.save(tmp / "a.xlsx")
+            ws["D2"], ws["AP2"] = 73.5, "telefon"
+            ws["K3"] = 45
+            # 120. dzień - poza wierszami startowymi tabeli
+            write_log_values(ws, "Czas jazdy (min)", {start + datetime.timedelta(days=119): 90})
+            wb.save(tmp / "b.xlsx")
+            
+            report = merge_journals(
+                tmp / "a.xlsx", tmp / "b.xlsx", tmp / "wynik.xlsx",
+                policy="prefer-A", column_policies={"Waga (kg)": "prefer-B"},
+                report_path=tmp / "roznice.csv",
+            )
+            assert (report.days, report.only_a, report.only_b) == (3, 0, 2)
+            assert [(d.header, d.source) for d in report.conflicts] == [
+                ("Waga (kg)", "B"), ("Notatki", "A")
+            ]
+            
+            merged = load_workbook(tmp / "wynik.xlsx")["Dziennik"]
+            assert merged["D2"].value == 73.5 and merged["AP2"].value == "laptop"
+            assert merged["K3"].value == 45 and merged["K121"].value == 90
+            assert merged.tables["Dziennik"].ref == "A1:AS121"
+            with open(tmp / "roznice.csv", encoding="utf-8") as f:
+                assert len(list(csv.reader(f, delimiter=";"))) == 1 + len(report.diffs)
+            
+            with pytest.raises(ValueError):
+                merge_journals(tmp / "a.xlsx", tmp / "b.xlsx", tmp / "x.xlsx",
+                               column_policies={"TSS": "prefer-A"})
+
+    def test_unknown_layout_rejected(self):
+        """Zapis wg pozycji tylko do dzienników ze znanym układem kolumn."""
+        import datetime
+        from kombajn.journal import append_notes, check_log_layout, write_log_values
+        from kombajn.merge import merge_journals
+
+        day = datetime.date(2026, 3, 2)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            wb = create_workbook()
+            ws = wb["Dziennik"]
+            ws["A2"] = day
+            assert check_log_layout(ws) == len(LOG_HEADERS)
+            wb.save(tmp / "a.xlsx")
+
+            # Starszy dziennik bez kolumn dopisanych na końcu
+            for column in range(log_column("CHO spalone (g)"), len(LOG_HEADERS) + 1):
+                ws.cell(row=1, column=column).value = None
+            assert check_log_layout(ws) == log_column("Notatki")
+            assert append_notes(ws, {day: "ok"}) == 1
+            with pytest.raises(ValueError, match="starszy układ"):
+                write_log_values(ws, "CHO spalone (g)", {day: 120})
+
+            # Kolumna wstawiona w środek układu
+            ws.insert_cols(log_column("CHO/h (g)") + 1)
+            ws.cell(row=1, column=log_column("CHO/h (g)") + 1).value = "CHO spalone (g)"
+            with pytest.raises(ValueError, match="Nieznany układ"):
+                append_notes(ws, {day: "źle"})
+            wb.save(tmp / "b.xlsx")
+            with pytest.raises(ValueError, match="b.xlsx"):
+                merge_journals(tmp / "a.xlsx", tmp / "b.xlsx", tmp / "wynik.xlsx")
+
+
+class TestMigrate:
+    """Testy migracji dzienników v2."""
+    
+    def test_migrate_directory(self):
+        """Wpisy v2 trafiają do kolumn v3, kolumny bez odpowiednika do Notatek."""
+        import datetime
+        import subprocess
+        import sys
+        from openpyxl import load_workbook
+        from kombajn.migrate import migrate_paths
+        
+        script = Path(__file__).resolve().parent.parent / "Excel_Kombajn.py"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            subprocess.run([sys.executable, str(script)], cwd=tmp, check=True,
+                           capture_output=True)
+            v2 = tmp / "kombajn_triathlonisty_v2.xlsx"
+            wb = load_workbook(v2)
+            ws = wb["Dziennik"]
+            ws["A2"] = datetime.date(2025, 5, 1)
+            ws["C2"], ws["K2"], ws["J2"], ws["M2"] = 72.5, 90, 800, "kolano"
+            ws["C5"], ws["Q5"] = 72.0, 2500
+            ws["A100"], ws["K100"] = datetime.date(2025, 9, 1), 60
+            wb["Ustawienia i Cele"]["B2"] = 1700
+            wb.save(v2)
+            create_workbook().save(tmp / "nowy.xlsx")
+            
+            results = migrate_paths([tmp], tmp / "v3", workers=2)
+            assert [r.source.name for r in results] == [v2.name, "nowy.xlsx"]
+            ok, failed = results
+            assert (ok.days, ok.values, ok.notes, ok.settings) == (3, 6, 1, 6)
+            assert not failed.ok and "v2" in failed.error
+            
+            migrated = load_workbook(ok.output)
+            log = migrated["Dziennik"]
+            assert log["D2"].value == 72.5 and log["K2"].value == 90
+            assert log["AP2"].value == "Kcal treningu: 800; Dolegliwości: kolano"
+            assert log["AD5"].value == 2500 and log["K125"].value == 60
+            assert log.tables["Dziennik"].ref == "A1:AS125"
+            assert migrated["Ustawienia"]["B22"].value == 1700
+            assert migrated["Ustawienia"]["B3"].value == 72.0
+
+
+class TestServe:
+    """Testy serwisu HTTP generującego dzienniki."""
+    
+    def test_workbook_over_localhost(self):
+        """POST /workbook zwraca xlsx z ustawieniami, /metrics liczy opóźnienia."""
+        import asyncio
+        import io
+        import json
+        from openpyxl import load_workbook
+        from kombajn.serve import WorkbookServer
+        
+        async def request(port, method, path, payload=None):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(payload).encode() if payload is not None else b""
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            head, _, content = response.partition(b"\r\n\r\n")
+            return int(head.split()[1]), head.decode("latin-1"), content
+        
+        async def scenario():
+            server = WorkbookServer(port=0, workers=1)
+            await server.start()
+            try:
+                payload = {"settings": {"FTP (W)": 300}, "start": "2026-01-05", "filename": "jan"}
+                results = await asyncio.gather(*(
+                    request(server.port, "POST", "/workbook", payload) for _ in range(2)
+                ))
+                invalid = await request(server.port, "POST", "/workbook", {"settings": {"W/kg": 3}})
+                missing = await request(server.port, "GET", "/workbook")
+                metrics = await request(server.port, "GET", "/metrics")
+            finally:
+                await server.close()
+            return results, invalid, missing, metrics
+        
+        results, invalid, missing, metrics = asyncio.run(scenario())
+        for status, head, content in results:
+            assert status == 200 and 'filename="jan.xlsx"' in head
+            assert "filename*=UTF-8''jan.xlsx" in head
+            wb = load_workbook(io.BytesIO(content))
+            assert wb["Ustawienia"]["B6"].value == 300
+            assert wb["Dziennik"]["A2"].value.date().isoformat() == "2026-01-05"
+        assert invalid[0] == 400 and "formułą" in json.loads(invalid[2])["error"]
+        assert missing[0] == 405
+        stats = json.loads(metrics[2])
+        assert (stats["workbooks"], stats["errors"]) == (2, 2)
+        assert stats["render_ms"]["max"] >= stats["render_ms"]["p50"] > 0
+
+    def test_filename_cannot_split_headers(self):
+        """Nazwa pliku z CRLF jest odrzucana, polskie znaki idą w filename* (RFC 5987)."""
+        import asyncio
+        import json
+        from kombajn.serve import WorkbookServer, content_disposition, parse_request
+
+        async def scenario():
+            server = WorkbookServer(port=0, workers=1)
+            await server.start()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                body = json.dumps({"filename": "a.xlsx\r\nSet-Cookie: x=1"}).encode()
+                writer.write(b"POST /workbook HTTP/1.1\r\nHost: localhost\r\n"
+                             + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            finally:
+                await server.close()
+            return response
+
+        head = asyncio.run(scenario()).partition(b"\r\n\r\n")[0]
+        assert head.split()[1] == b"400" and b"Set-Cookie" not in head
+        for name in ('a"b.xlsx', "a\\b.xlsx", "a\tb"):
+            with pytest.raises(ValueError):
+                parse_request({"filename": name})
+
+        filename = parse_request({"filename": "Żółw <zima>"})[3]
+        assert filename == "Żółw _zima_.xlsx"
+        assert content_disposition(filename) == (
+            'attachment; filename="Zo_w _zima_.xlsx"; '
+            "filename*=UTF-8''%C5%BB%C3%B3%C5%82w%20_zima_.xlsx"
+        )
+
+
+class TestBuildCache:
+    """Testy pamięci podręcznej gotowych dzienników."""
+    
+    def test_reproducible_bytes(self):
+        """Ten sam skoroszyt zapisany dwukrotnie daje identyczne bajty."""
+        import io
+        from kombajn.utils import save_workbook_to
+        
+        outputs = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            save_workbook_to(create_workbook(), buffer, reproducible=True)
+            outputs.append(buffer.getvalue())
+        assert outputs[0] == outputs[1]
+    
+    def test_key_covers_version_config_and_inputs(self, monkeypatch):
+        """Klucz zmienia się z danymi zawodnika, wersją i konfiguracją."""
+        import dataclasses
+        import kombajn
+        from kombajn import config
+        from kombajn.cache import build_key
+        from kombajn.engine.fueling import FuelingPlanner
+        
+        plan = FuelingPlanner().plan(90, 3)
+        key = build_key({"fueling_plan": plan, "settings": {"FTP (W)": 280}})
+        assert key == build_key({"settings": {"FTP (W)": 280}, "fueling_plan": plan})
+        assert key != build_key({"fueling_plan": plan, "settings": {"FTP (W)": 281}})
+        
+        base = build_key({})
+        with monkeypatch.context() as m:
+            m.setattr(kombajn, "__version__", "9.9.9")
+            assert build_key({}) != base
+        with monkeypatch.context() as m:
+            m.setattr(config, "POWER_DEFAULTS", dataclasses.replace(config.POWER_DEFAULTS, FTP=300))
+            assert build_key({}) != base
+        assert build_key({}) == base
+    
+    def test_hit_links_cached_file(self):
+        """Przy trafieniu skoroszyt nie jest budowany, wynik to kopia lub hardlink."""
+        import os
+        import stat
+        from kombajn.cache import BuildCache, cached_save
+        
+        builds = []
+        
+        def build():
+            builds.append(1)
+            return create_workbook()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            cache = BuildCache(tmp / "cache", link=True)
+            inputs = {"settings": {"FTP (W)": 280}}
+            assert cached_save(build, tmp / "a.xlsx", inputs, cache) is False
+            assert cached_save(build, tmp / "b.xlsx", inputs, cache) is True
+            assert cached_save(build, tmp / "b.xlsx", inputs, cache) is True
+            assert len(builds) == 1 and (cache.hits, cache.misses) == (2, 1)
+            assert (tmp / "a.xlsx").read_bytes() == (tmp / "b.xlsx").read_bytes()
+            assert os.stat(tmp / "b.xlsx").st_nlink == 2
+            assert sorted(p.name for p in tmp.iterdir()) == ["a.xlsx", "b.xlsx", "cache"]
+            
+            # Domyślnie kopia - dziennik zapisywalny w Excelu
+            copied = BuildCache(tmp / "cache")
+            assert cached_save(build, tmp / "c.xlsx", inputs, copied) is True
+            assert os.stat(tmp / "c.xlsx").st_nlink == 1
+            assert os.stat(tmp / "c.xlsx").st_mode & stat.S_IWUSR
+            assert not os.stat(tmp / "b.xlsx").st_mode & stat.S_IWUSR
+            # Zbudowany wynik ma zwykłe uprawnienia (0o666 z umask procesu)
+            mask = os.umask(0o022)
+            os.umask(mask)
+            assert stat.S_IMODE(os.stat(tmp / "a.xlsx").st_mode) == 0o666 & ~mask
+            
+            assert cached_save(build, tmp / "b.xlsx", {"settings": {}}, cache) is False
+            assert len(builds) == 2
+
+
+class TestProfiles:
+    """Testy profili zawodników (TOML/JSON)."""
+
+    def test_profile_feeds_sheets_and_engine(self):
+        """Profil trafia do Ustawień, Stref Mocy i modelu metabolicznego."""
+        from kombajn.engine.metabolic import MetabolicProfile
+        from kombajn.journal import read_settings
+        from kombajn.profiles import profile_from_dict
+
+        profile = profile_from_dict({
+            "name": "Anna", "weight_kg": 62, "ftp": 240, "vo2max": 61.5,
+            "ctl_start": 55, "power_zones": [0.56, 0.76, 0.91, 1.06, 1.21, 1.51],
+        })
+        wb = create_workbook(profile=profile)
+        settings = read_settings(wb)
+        assert settings["Imię / Pseudonim"] == "Anna"
+        assert (settings["FTP (W)"], settings["Waga (kg)"]) == (240, 62.0)
+        assert wb["Ustawienia"]["B38"].value == 55.0
+        zones = wb["Strefy Mocy"]
+        assert (zones["C7"].value, zones["D7"].value) == (0.56, 0.76)
+        assert zones["D12"].value == 3.0
+        assert [zones.cell(row=r, column=3).value for r in range(19, 24)] == [0.5, 0.6, 0.7, 0.8, 0.9]
+
+        metabolic = MetabolicProfile.from_athlete(profile)
+        assert (metabolic.weight_kg, metabolic.vo2max) == (62.0, 61.5)
+
+    def test_validation(self):
+        """Nieznane pola, złe typy i zakresy są odrzucane z nazwą pola."""
+        from kombajn.profiles import profile_from_dict
+
+        for data, message in [
+            ({"fpt": 250}, "fpt"),
+            ({"ftp": "250"}, "ftp"),
+            ({"ftp": 250.5}, "całkowitą"),
+            ({"weight_kg": 620}, "weight_kg"),
+            ({"resting_hr": 110, "max_hr": 105}, "spoczynkowe"),
+            ({"hr_zones": [0.6, 0.7, 0.9, 0.8]}, "rosnąć"),
+            ({"power_zones": [0.55, 0.75]}, "6 granic"),
+        ]:
+            with pytest.raises(ValueError, match=message):
+                profile_from_dict(data)
+
+        from kombajn.serve import parse_request
+        profile, settings, _, _ = parse_request({"profile": {"ftp": 280}, "settings": {"FTP (W)": 290}})
+        assert (profile.ftp, settings["FTP (W)"]) == (280, 290)
+        with pytest.raises(ValueError, match="fpt"):
+            parse_request({"profile": {"fpt": 280}})
+
+    def test_load_memoized_by_mtime(self):
+        """Plik jest parsowany ponownie dopiero po zmianie; katalog daje profil na plik."""
+        import json
+        import os
+        from kombajn.profiles import load_profile, load_profiles
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            path = tmp / "anna.json"
+            path.write_text(json.dumps({"name": "Anna", "ftp": 240}))
+            (tmp / "jan.toml").write_text('name = "Jan"\nftp = 300\n')
+            (tmp / "notatki.txt").write_text("-")
+
+            first = load_profile(path)
+            assert load_profile(path) is first
+
+            path.write_text(json.dumps({"name": "Anna", "ftp": 250}))
+            info = os.stat(path)
+            os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns + 1_000_000))
+            assert load_profile(path).ftp == 250
+
+            profiles = load_profiles(tmp)
+            assert list(profiles) == ["anna", "jan"]
+            assert profiles["jan"].ftp == 300
+
+            path.write_text(json.dumps({"ftp": 10}))
+            with pytest.raises(ValueError, match="anna.json"):
+                load_profile(path)
+
+
+class TestImporter:
+    """Testy importu eksportów aktywności CSV."""
+
+    STRAVA_CSV = (
+        "Activity ID,Activity Date,Activity Type,Moving Time,Distance,Elevation Gain,"
+        "Weighted Average Power,Average Heart Rate,Max Heart Rate,Distance\n"
+        '1,"Mar 14, 2024, 7:12:33 AM",Ride,3600,30.5,"1,200",200,140,170,30500\n'
+        '2,"Mar 14, 2024, 6:00:00 PM",VirtualRide,1800,15.25,100,300,150,181,15250\n'
+        '3,"Mar 16, 2024, 8:00:00 AM",Ride,5400,50,,,130,160,50000\n'
+        "4,wczoraj,Ride,60,1,,,,,1000\n"
+    )
+
+    def test_aggregates_days_across_chunks(self):
+        """Aktywności jednego dnia: sumy, średnie ważone czasem, NP kwadratowo."""
+        from kombajn.importer import import_activities
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "activities.csv"
+            path.write_text(self.STRAVA_CSV, encoding="utf-8")
+            result = import_activities(path, chunk_rows=1)
+            assert import_activities(path).days == result.days
+
+        import datetime
+        assert (result.format, result.activities, result.skipped) == ("strava", 3, 1)
+        day = result.days[datetime.date(2024, 3, 14)]
+        assert day["Czas jazdy (min)"] == 90.0
+        assert day["Dystans (km)"] == 45.75  # pierwsza kolumna "Distance" (km)
+        assert day["Przewyższenia (m)"] == 1300
+        assert day["NP (W)"] == 238  # sqrt((60·200² + 30·300²) / 90)
+        assert day["Avg HR"] == 143 and day["Max HR"] == 181
+        assert day["Typ treningu"] == "Ride, VirtualRide"
+        assert "NP (W)" not in result.days[datetime.date(2024, 3, 16)]
+
+    def test_writes_journal_input_columns(self):
+        """Import do Dziennika: kolumny wejściowe, TSS zostaje formułą, puste komórki."""
+        import datetime
+        from openpyxl import load_workbook
+        from kombajn.importer import import_journal
+        from kombajn.journal import log_date_rows
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "export.csv").write_text(
+                "Dzień;Czas;Moc NP;TSS\n"
+                "2024-01-01;01:00:00;250;100,0\n"
+                "2024-12-31;00:30:00;200;\n",
+                encoding="utf-8",
+            )
+            create_workbook().save(tmp / "dziennik.xlsx")
+            wb = load_workbook(tmp / "dziennik.xlsx")
+            wb["Dziennik"]["A2"] = None
+            wb["Dziennik"].cell(row=2, column=log_column("NP (W)")).value = 999
+            wb.save(tmp / "dziennik.xlsx")
+
+            columns = {"Data": "Dzień", "Czas jazdy (min)": "Czas", "NP (W)": "Moc NP", "TSS": "TSS"}
+            result = import_journal(tmp / "export.csv", tmp / "dziennik.xlsx",
+                                    columns=columns, decimal=",")
+            assert result.days[datetime.date(2024, 1, 1)]["TSS"] == 100.0
+            ws = load_workbook(tmp / "dziennik.xlsx")["Dziennik"]
+            rows = log_date_rows(ws)
+            last = rows[datetime.date(2024, 12, 31)]
+            assert ws.tables["Dziennik"].ref == f"A1:AS{last}" and last == 367
+            assert ws.cell(row=last, column=log_column("Czas jazdy (min)")).value == 30.0
+            assert ws.cell(row=2, column=log_column("NP (W)")).value == 999
+            assert ws.cell(row=2, column=log_column("TSS")).value.startswith("=")
+            assert result.written == 3
+
+            import_journal(tmp / "export.csv", tmp / "dziennik.xlsx", columns=columns, overwrite=True)
+            ws = load_workbook(tmp / "dziennik.xlsx")["Dziennik"]
+            assert ws.cell(row=2, column=log_column("NP (W)")).value == 250
+
+            with pytest.raises(ValueError, match="Nie rozpoznano"):
+                import_journal(tmp / "export.csv", tmp / "dziennik.xlsx")
+
+    def test_brick_day_with_one_powered_activity(self):
+        """Jazda z mocą + bieg bez mocy: TSS dnia w arkuszu = TSS samej jazdy."""
+        import datetime
+        from kombajn.calc import Evaluator
+        from kombajn.importer import import_journal
+        from kombajn.journal import load_journal, log_date_rows
+
+        ftp = POWER_DEFAULTS.FTP
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "export.csv").write_text(
+                "Activity ID,Activity Date,Activity Type,Moving Time,Distance,Weighted Average Power\n"
+                f'1,"Mar 14, 2024, 7:00:00 AM",Ride,3600,30,{ftp}\n'
+                '2,"Mar 14, 2024, 9:00:00 AM",Run,3600,12,\n',
+                encoding="utf-8",
+            )
+            create_workbook().save(tmp / "dziennik.xlsx")
+            result = import_journal(tmp / "export.csv", tmp / "dziennik.xlsx")
+            day = result.days[datetime.date(2024, 3, 14)]
+            assert day["Czas jazdy (min)"] == 120.0
+            assert day["NP (W)"] == round(ftp / 2 ** 0.5)  # sqrt(60·FTP² / 120)
+
+            wb = load_journal(tmp / "dziennik.xlsx")
+            row = log_date_rows(wb["Dziennik"])[datetime.date(2024, 3, 14)]
+            tss = Evaluator(wb).cell_value("Dziennik", row, log_column("TSS"))
+            assert tss == pytest.approx(100, abs=0.5)
+
+
+class TestActivities:
+    """Testy aktywności pod dziennymi wierszami."""
+
+    def test_daily_totals_fourth_power_np(self):
+        """Sumy dnia: czas, kJ i TSS sumowane, NP jako średnia rzędu 4."""
+        import datetime
+        import math
+        from kombajn.engine.activities import Activity, ActivityLog
+
+        day = datetime.date(2024, 3, 14)
+        log = ActivityLog.from_activities([
+            Activity(day + datetime.timedelta(days=1), "Ride", minutes=30, normalized_power=200),
+            Activity(day, "Ride", minutes=60, avg_power=180, normalized_power=200),
+            Activity(day, "VirtualRide", minutes=30, avg_power=250, normalized_power=300, tss=40.0),
+        ])
+        assert log.dates == [day, day + datetime.timedelta(days=1)]
+        assert [a.kind for a in log.on(day)] == ["Ride", "VirtualRide"]
+
+        totals = log.daily(ftp=250)
+        assert list(totals.count) == [2, 1]
+        assert totals.minutes[0] == 90
+        assert totals.kilojoules[0] == pytest.approx(180 * 3.6 + 250 * 1.8)
+        assert totals.tss[0] == pytest.approx(64.0 + 40.0)  # 60 min przy IF 0.8 + TSS z eksportu
+        expected = ((60 * 200 ** 4 + 30 * 300 ** 4) / 90) ** 0.25
+        assert totals.normalized_power[0] == pytest.approx(expected)
+        assert math.isnan(totals.kilojoules[1])
+
+        replaced = log.merged(ActivityLog.from_activities([Activity(day, "Run", minutes=45)]))
+        assert [a.kind for a in replaced.on(day)] == ["Run"]
+        assert len(replaced) == 2
+
+    def test_import_writes_linked_sheet(self):
+        """Import z arkuszem Aktywności: TSS dnia sumuje aktywności, odnośnik w Typie."""
+        import datetime
+        from openpyxl import load_workbook
+        from kombajn.importer import import_journal
+        from kombajn.journal import log_date_rows
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "export.csv").write_text(TestImporter.STRAVA_CSV, encoding="utf-8")
+            create_workbook().save(tmp / "dziennik.xlsx")
+            wb = load_workbook(tmp / "dziennik.xlsx")
+            wb["Dziennik"]["A2"] = datetime.date(2024, 3, 1)
+            wb.save(tmp / "dziennik.xlsx")
+
+            result = import_journal(tmp / "export.csv", tmp / "dziennik.xlsx", activities_sheet=True)
+            assert len(result.activity_log) == 3
+            wb = load_workbook(tmp / "dziennik.xlsx")
+            sheet, ws = wb["Aktywności"], wb["Dziennik"]
+            assert [sheet.cell(row=r, column=2).value for r in (2, 3, 4)] == ["Ride", "VirtualRide", "Ride"]
+            row = log_date_rows(ws)[datetime.date(2024, 3, 14)]
+            assert ws.cell(row=row, column=log_column("NP (W)")).value == 248  # rms dałoby 238
+            assert ws.cell(row=row, column=log_column("TSS")).value == \
+                "=IF(COUNT('Aktywności'!M2:M3)>0, SUM('Aktywności'!M2:M3), \"\")"
+            link = ws.cell(row=row, column=log_column("Typ treningu")).hyperlink
+            assert link.location == "'Aktywności'!A2"
+
+            # Kolejny import zastępuje aktywności tych samych dni
+            (tmp / "export.csv").write_text(
+                TestImporter.STRAVA_CSV.splitlines()[0] + "\n"
+                '5,"Mar 16, 2024, 9:00:00 AM",Run,2700,9,,,140,170,9000\n',
+                encoding="utf-8",
+            )
+            import_journal(tmp / "export.csv", tmp / "dziennik.xlsx", activities_sheet=True)
+            sheet = load_workbook(tmp / "dziennik.xlsx")["Aktywności"]
+            assert [sheet.cell(row=r, column=2).value for r in (2, 3, 4)] == ["Ride", "VirtualRide", "Run"]
+
+
+class TestSports:
+    """Testy obciążenia wielu dyscyplin (rTSS, sTSS, hrTSS)."""
+
+    def test_threshold_hour_is_100_per_sport(self):
+        """Godzina na progu daje 100 w każdym modelu; brak tempa -> hrTSS."""
+        import datetime
+        import math
+        import numpy as np
+        from kombajn.engine.sports import (
+            SportThresholds, daily_load, hr_tss, running_tss, session_load, sport_of, swim_tss
+        )
+
+        t = SportThresholds(ftp=250, max_hr=190, resting_hr=50, lthr_bike=160, lthr_run=170,
+                            run_pace=4.0, swim_pace=1.5)
+        assert running_tss(np.array([60.0]), np.array([15.0]), t.run_pace)[0] == pytest.approx(100)
+        assert swim_tss(np.array([60.0]), np.array([4.0]), t.swim_pace)[0] == pytest.approx(100)
+        assert hr_tss(60, 170, t.lthr_run, t.resting_hr, t.max_hr) == pytest.approx(100)
+
+        load = session_load(
+            ["Rower", "bieg", "Bieg", "Pływanie", "", "Kajak"],
+            {
+                "minutes": np.array([60, 30, 45, 60, 90, 60], dtype=float),
+                "distance_km": np.array([30, 7.5, np.nan, 4, np.nan, np.nan]),
+                "normalized_power": np.array([250, np.nan, np.nan, np.nan, np.nan, 200]),
+                "avg_hr": np.array([np.nan, 150, 170, np.nan, 160, np.nan]),
+            },
+            t,
+        )
+        assert load[0] == pytest.approx(100)
+        assert load[1] == pytest.approx(50)                      # 30 min na progu (4:00/km)
+        assert load[2] == pytest.approx(75)                      # hrTSS na LTHR biegu
+        assert load[3] == pytest.approx(100)
+        assert load[4] == pytest.approx(150)                     # hrTSS na LTHR roweru
+        assert load[5] == pytest.approx(60 / 60 * 0.8 ** 2 * 100)  # nieznana -> jak rower
+        assert sport_of("VirtualRide") == "Rower" and sport_of("Trail Run") is None
+        assert sport_of("pływanie") == "Pływanie"
+
+        day = datetime.date(2026, 5, 1)
+        first, daily = daily_load([day, day, day + datetime.timedelta(days=2)], [50.0, 60.0, math.nan])
+        assert first == day and list(daily) == [110.0, 0.0, 0.0]
+
+    def test_log_sport_column_and_thresholds(self):
+        """Dziennik: kolumna Sport z listą, progi dyscyplin w Ustawieniach i profilu."""
+        from kombajn.profiles import profile_from_dict
+
+        profile = profile_from_dict({"run_pace": 4.75, "lthr_run": 175, "max_hr": 190})
+        wb = create_workbook(profile=profile)
+        settings, ws = wb["Ustawienia"], wb["Dziennik"]
+        assert (settings["A43"].value, settings["B43"].value) == ("Tempo progowe biegu (min/km)", 4.75)
+        assert settings["B42"].value == 175
+        assert ws.cell(row=1, column=log_column("Sport")).value == "Sport"
+        assert "Ustawienia!$B$43" in ws.cell(row=2, column=log_column("TSS")).value
+        assert ws.data_validations.dataValidation[0].formula1 == '"Rower,Bieg,Pływanie,Inne"'
+
+        with pytest.raises(ValueError, match="lthr_run"):
+            profile_from_dict({"lthr_run": 195, "max_hr": 190})
+
+    def test_import_sets_sport_and_activity_load(self):
+        """Import: Sport dla dni jednej dyscypliny, rTSS aktywności bez mocy."""
+        import datetime
+        from openpyxl import load_workbook
+        from kombajn.importer import import_journal
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "export.csv").write_text(
+                "Activity Date,Activity Type,Moving Time,Distance,Weighted Average Power\n"
+                "2024-03-14 07:00:00,Run,3600,13.333,\n"
+                "2024-03-15 07:00:00,Swim,1800,2,\n"
+                "2024-03-15 18:00:00,Ride,3600,30,200\n",
+                encoding="utf-8",
+            )
+            create_workbook().save(tmp / "dziennik.xlsx")
+            result = import_journal(tmp / "export.csv", tmp / "dziennik.xlsx", activities_sheet=True)
+            assert result.days[datetime.date(2024, 3, 14)]["Sport"] == "Bieg"
+            assert "Sport" not in result.days[datetime.date(2024, 3, 15)]
+
+            sheet = load_workbook(tmp / "dziennik.xlsx")["Aktywności"]
+            tss = [sheet.cell(row=r, column=13).value for r in (2, 3, 4)]
+            assert tss[0] == pytest.approx(100, abs=0.1)  # godzina w tempie progowym 4:30/km
+            assert tss[1] == pytest.approx(50 * (1.75 * 20 / 30) ** 3, abs=0.1)
+            assert isinstance(tss[2], str) and tss[2].startswith("=")  # moc -> formuła z FTP
+
+
+
+class TestWorkouts:
+    """Testy plików treningów (.zwo/.erg/.mrc) i planowanego TSS."""
+
+    ZWO = """<?xml version="1.0" encoding="UTF-8"?>
+<workout_file>
+    <name>Sweet spot 3x10</name>
+    <sportType>bike</sportType>
+    <workout>
+        <Warmup Duration="600" PowerLow="0.5" PowerHigh="0.7"/>
+        <IntervalsT Repeat="3" OnDuration="600" OffDuration="300" OnPower="0.9" OffPower="0.5"/>
+        <textevent timeoffset="10" message="Start"/>
+        <SteadyState Duration="3600" Power="1.0"/>
+    </workout>
+</workout_file>
+"""
+
+    def test_zwo_expands_blocks_per_second(self):
+        """Bloki .zwo rozwijane do mocy 1 Hz; godzina na FTP = 100 TSS."""
+        from kombajn.engine.workouts import parse_zwo, summarize_workout
+
+        workout = parse_zwo(self.ZWO)
+        target = workout.target
+        assert workout.name == "Sweet spot 3x10" and workout.relative
+        assert target.size == 600 + 3 * 900 + 3600
+        assert target[0] == pytest.approx(0.5) and target[300] == pytest.approx(0.6)
+        assert target[600] == 0.9 and target[1200] == 0.5 and target[-1] == 1.0
+        assert workout.power(250)[600] == pytest.approx(225)
+
+        hour = parse_zwo('<workout_file><workout><SteadyState Duration="3600" Power="1.0"/>'
+                         '</workout></workout_file>', "Próg")
+        assert hour.name == "Próg"
+        summary = summarize_workout(hour)
+        assert summary.duration_s == 3600
+        assert summary.intensity(300) == pytest.approx(1.0)
+        assert summary.tss(300) == pytest.approx(100)
+        assert summary.normalized_power(300) == pytest.approx(300)
+
+    def test_erg_and_mrc_points(self):
+        """.erg z FTP i .mrc przeliczane na ułamek FTP; .erg bez FTP w watach."""
+        from kombajn.engine.workouts import parse_erg, summarize_workout
+
+        erg = (
+            "[COURSE HEADER]\nDESCRIPTION = Próg\nFTP = 250\nMINUTES WATTS\n[END COURSE HEADER]\n"
+            "[COURSE DATA]\n0\t125\n10\t250\n10\t250\n40\t250\n[END COURSE DATA]\n"
+        )
+        workout = parse_erg(erg)
+        assert workout.name == "Próg" and workout.relative
+        assert workout.target.size == 40 * 60
+        assert workout.target[0] == pytest.approx(0.5) and workout.target[-1] == pytest.approx(1.0)
+
+        watts = parse_erg(erg.replace("FTP = 250\n", ""))
+        assert not watts.relative
+        summary = summarize_workout(watts)
+        assert summary.intensity(250) == pytest.approx(summarize_workout(workout).intensity(300))
+
+        mrc = parse_erg("[COURSE HEADER]\nMINUTES PERCENT\n[END COURSE HEADER]\n"
+                        "[COURSE DATA]\n0 100\n60 100\n[END COURSE DATA]\n")
+        assert summarize_workout(mrc).tss(280) == pytest.approx(100)
+
+        with pytest.raises(ValueError, match="MINUTES"):
+            parse_erg("[COURSE HEADER]\nMINUTES KM\n[COURSE DATA]\n0 1\n1 1\n")
+
+    def test_library_cache_and_plan_vs_actual(self):
+        """Biblioteka z pamięcią podręczną; plan dnia zestawiony z Dziennikiem."""
+        import datetime
+        import math
+        from kombajn.engine.metrics import journal_metrics
+        from kombajn.engine.workouts import (
+            compare_plan, load_schedule, planned_days, summarize_library
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            library_dir = tmp / "treningi"
+            (library_dir / "zwift").mkdir(parents=True)
+            (library_dir / "zwift" / "ss.zwo").write_text(self.ZWO, encoding="utf-8")
+            (library_dir / "prog.mrc").write_text(
+                "[COURSE HEADER]\nMINUTES PERCENT\n[END COURSE HEADER]\n"
+                "[COURSE DATA]\n0 100\n60 100\n[END COURSE DATA]\n", encoding="utf-8"
+            )
+            (library_dir / "zly.zwo").write_text("<workout_file>", encoding="utf-8")
+            cache = tmp / "cache.json"
+
+            library = summarize_library(library_dir, cache_path=cache)
+            assert library.computed == 3 and len(library.summaries) == 2
+            assert [p.name for p in library.errors] == ["zly.zwo"]
+            cached = summarize_library(library_dir, cache_path=cache)
+            assert cached.computed == 1 and cached.summaries == library.summaries
+
+            (tmp / "plan.csv").write_text(
+                "Data;Trening\n2026-03-01;prog\n2026-03-02;ss.zwo\n2026-03-02;PROG\n2026-04-01;prog\n",
+                encoding="utf-8",
+            )
+            schedule = load_schedule(tmp / "plan.csv")
+            days = planned_days(schedule, library, ftp=250)
+            assert [d.tss for d in days][0] == pytest.approx(100)
+            assert days[1].workouts == ("ss.zwo", "PROG") and days[1].minutes == pytest.approx(175)
+            with pytest.raises(ValueError, match="spoza biblioteki"):
+                planned_days({datetime.date(2026, 3, 3): ["tempo"]}, library, 250)
+
+            wb = create_workbook()
+            ws = wb["Dziennik"]
+            ws["A2"] = datetime.date(2026, 3, 1)
+            ws.cell(row=2, column=log_column("Czas jazdy (min)"), value=60)
+            ws.cell(row=2, column=log_column("NP (W)"), value=wb["Ustawienia"]["B6"].value * 0.9)
+            comparison = compare_plan(days, journal_metrics(wb))
+            assert comparison[0].minutes == 60
+            assert comparison[0].tss == pytest.approx(81)
+            assert comparison[0].tss_difference == pytest.approx(-19)
+            assert math.isnan(comparison[1].tss) and math.isnan(comparison[2].tss)
+            assert comparison[1].tss_difference == pytest.approx(-days[1].tss)
+
+
+
+class TestCompliance:
+    """Testy realizacji planu (silnik i arkusz Realizacja planu)."""
+
+    def test_indexed_join_many_athletes(self):
+        """Złączenie po zawodniku i dniu; wyniki, statusy i tygodnie."""
+        import datetime
+        import math
+        from kombajn.engine.compliance import (
+            TrainingDays, session_compliance, weekly_compliance, week_start
+        )
+
+        monday = datetime.date(2026, 3, 2).toordinal()
+        assert week_start([monday, monday + 6, monday + 7]).tolist() == [monday, monday, monday + 7]
+
+        plan = TrainingDays(
+            days=[monday + 1, monday, monday, monday + 2, monday, monday + 8],
+            kinds=["Z2", "Sweet Spot", "Core", "Wolne", "VO2max", "Próg"],
+            tss=[100, 60, 20, 0, 90, 50],
+            minutes=[120, 60, 20, 0, 60, 60],
+            athletes=[0, 0, 0, 0, 7, 0],
+        )
+        assert len(plan) == 5 and plan.kinds[0] == "Sweet Spot + Core"
+        actual = TrainingDays(
+            days=[monday, monday + 1, monday + 5, monday, monday + 8],
+            kinds=["Sweet Spot", "Z2", "Wycieczka", "VO2max", ""],
+            tss=[80, 160, 40, 95, math.nan],
+            minutes=[70, 180, 90, 60, math.nan],
+            athletes=[0, 0, 0, 7, 0],
+        )
+        sessions = session_compliance(plan, actual)
+        assert sessions.kinds[:2] == ["Sweet Spot", "Z2"] and sessions.kinds[-1] == "VO2max"
+        assert sessions.ratio[:2].tolist() == pytest.approx([1.0, 1.6])
+        assert sessions.status.tolist() == ["Zgodny", "Niezgodny", "Wolne", "Pominięty", "Zgodny"]
+        assert sessions.score[1] == pytest.approx(40) and math.isnan(sessions.score[2])
+
+        weeks = weekly_compliance(sessions, actual)
+        assert weeks.athletes.tolist() == [0, 0, 7]
+        assert weeks.tss.tolist() == [280, 0, 95]          # cały tydzień z Dziennika
+        assert weeks.sessions.tolist() == [3, 1, 1] and weeks.completed.tolist() == [2, 0, 1]
+        assert weeks.ratio[0] == pytest.approx(280 / 180)
+
+    def test_sheet_matches_engine(self):
+        """Formuły arkusza Realizacja planu zgodne z silnikiem."""
+        import datetime
+        import math
+        from kombajn.calc import Evaluator
+        from kombajn.compliance import write_compliance
+        from kombajn.engine.compliance import (
+            TrainingDays, load_plan, session_compliance, weekly_compliance
+        )
+        from kombajn.engine.metrics import journal_metrics
+
+        wb = create_workbook()
+        ws = wb["Dziennik"]
+        ws["A2"] = datetime.date(2026, 3, 2)
+        for row, (minutes, power, kind) in {2: (60, 240, "Sweet Spot"), 3: (150, 170, "Z2"),
+                                           7: (45, 150, "Regeneracja")}.items():
+            ws.cell(row=row, column=log_column("Czas jazdy (min)"), value=minutes)
+            ws.cell(row=row, column=log_column("NP (W)"), value=power)
+            ws.cell(row=row, column=log_column("Typ treningu"), value=kind)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "plan.csv"
+            path.write_text(
+                "Data;Typ;TSS;Czas (min)\n2026-03-02;Sweet Spot;70;60\n2026-03-03;Z2;80;120\n"
+                "2026-03-04;VO2max;90;75\n2026-03-05;;;\n2026-03-10;Z2;;90\n", encoding="utf-8"
+            )
+            plan = load_plan(path)
+        actual = TrainingDays.from_journal(journal_metrics(wb))
+        sessions = session_compliance(plan, actual)
+        weeks = weekly_compliance(sessions, actual)
+        sheet = write_compliance(wb, plan)
+        assert sheet.title == "Realizacja planu" and "Dziennik[TSS]" in sheet["G2"].value
+        assert sheet["N2"].value.startswith("=SUMIFS($D$2:$D$6, $B$2:$B$6")
+
+        ev = Evaluator(wb)
+        ev.recalculate()
+        values = [ev.values("Realizacja planu", [f"F{r}", f"G{r}", f"I{r}", f"J{r}", f"K{r}"])
+                  for r in range(2, len(plan) + 2)]
+        assert [v[0] for v in values] == ["Sweet Spot", "Z2", "", "", ""]
+        assert [v[1] for v in values] == pytest.approx(sessions.tss.tolist())
+        assert [v[4] for v in values] == sessions.status.tolist()
+        for (_, _, ratio, score, _), expected, expected_score in zip(
+                values, sessions.ratio, sessions.score):
+            if ratio == "":
+                assert math.isnan(expected) and score == ""
+            else:
+                assert ratio == pytest.approx(expected) and score == pytest.approx(expected_score)
+        week = ev.values("Realizacja planu", ["N2", "O2", "P2", "R2", "S2", "O3"])
+        assert week == pytest.approx([240, weeks.tss[0], weeks.ratio[0], 4, 2, weeks.tss[1]])
+
+
+class TestLoadAlerts:
+    """Testy alertów obciążenia (ACWR, rampa CTL) i rankingu kadry."""
+
+    def test_log_column_and_dashboard_match_engine(self):
+        """Kolumna Alert obciążenia i panel Dashboardu zgodne z silnikiem."""
+        import datetime
+        from openpyxl.utils import get_column_letter
+        from kombajn.calc import Evaluator
+        from kombajn.engine.alerts import load_alerts
+        from kombajn.engine.metrics import journal_metrics
+
+        wb = create_workbook()
+        wb["Ustawienia"]["B38"] = 30
+        wb["Ustawienia"]["B39"] = 25
+        ws = wb["Dziennik"]
+        ws["A2"] = datetime.date(2026, 3, 2)
+        # Baza 3 tyg., blok 10 dni (skok ACWR i rampy), potem 10 dni luzu z 2 treningami
+        minutes = [60] * 21 + [200] * 10 + [None] * 6 + [40, None, None, 40]
+        for row, value in enumerate(minutes, 2):
+            if value is not None:
+                ws.cell(row=row, column=log_column("Czas jazdy (min)"), value=value)
+                ws.cell(row=row, column=log_column("NP (W)"), value=200)
+
+        metrics = journal_metrics(wb).metrics
+        alerts = load_alerts(metrics.ctl, metrics.atl, 30.0)
+        assert {"ACWR wysoki", "ACWR krytyczny + Rampa CTL", "ACWR niski", ""} <= set(metrics.alert.tolist())
+
+        ev = Evaluator(wb)
+        ev.recalculate()
+        column = get_column_letter(log_column("Alert obciążenia"))
+        assert ev.values("Dziennik", [f"{column}{r}" for r in range(2, len(metrics.alert) + 2)]) == \
+            [flag or "" for flag in metrics.alert.tolist()]
+
+        dashboard = wb["Dashboard"]
+        rows = {dashboard.cell(row=r, column=1).value: r for r in range(1, dashboard.max_row + 1)}
+        last = len(minutes) - 1
+        acwr, ramp, flag, days = ev.values("Dashboard", [
+            f"B{rows['ACWR (ATL / CTL)']}", f"B{rows['Rampa CTL (7 dni)']}",
+            f"B{rows['Alert (ostatni trening)']}", f"B{rows['Dni z alertem (28 dni)']}",
+        ])
+        assert acwr == pytest.approx(alerts.acwr[last]) and ramp == pytest.approx(alerts.ramp[last])
+        assert flag == metrics.alert[last]
+        assert days == sum(1 for f in metrics.alert[last - 27:last + 1] if f)
+
+    def test_roster_risk_single_pass(self):
+        """Ranking kadry na wspólnym kalendarzu zgodny z alertami dzienników."""
+        import datetime
+        import numpy as np
+        from kombajn.engine.alerts import roster_risk
+        from kombajn.engine.metrics import JournalMetrics, log_metrics
+
+        def journal(start, minutes, ctl0):
+            metrics = log_metrics(np.array(minutes, dtype=float), np.full(len(minutes), 250.0),
+                                  ftp=250, weight_kg=70, ctl0=ctl0, atl0=ctl0)
+            days = [start + datetime.timedelta(days=i) for i in range(len(minutes))]
+            return JournalMetrics(days, metrics.tss, [""] * len(days), metrics, ctl0, ctl0)
+
+        start = datetime.date(2026, 1, 5)
+        journals = {
+            "stały": journal(start, [60.0] * 70, 60.0),
+            "blok": journal(start, [60.0] * 50 + [180.0] * 20, 60.0),
+            "nowy": journal(start + datetime.timedelta(days=60), [90.0] * 3 + [np.nan] * 7, 50.0),
+        }
+        risk = roster_risk(journals, days=14)
+        assert risk.as_of == start + datetime.timedelta(days=69)
+        assert risk.athletes[0] == "blok" and risk.score[0] > 0 and risk.alert_days[0] > 0
+        assert risk.score[risk.athletes.index("stały")] == 0
+        for i, athlete in enumerate(risk.athletes):
+            alert = journals[athlete].metrics.alert
+            offset = (risk.as_of - journals[athlete].days[0]).days
+            assert risk.flags[i] == alert[offset]
+            assert risk.alert_days[i] == sum(1 for f in alert[max(offset - 13, 0):offset + 1] if f)
+        with pytest.raises(ValueError, match="przed początkiem"):
+            roster_risk(journals, as_of=start - datetime.timedelta(days=1))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])